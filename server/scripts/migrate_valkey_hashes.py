@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Rewrite game state hash fields still stored as JSON text (written by servers
+before the packed field encoding) as msgpack.
+
+Servers read both formats, so this can run at any time, including while the
+server is up; it only speeds up reads and shrinks the stored values.
+
+Usage:
+    docker exec -it rpg_server python /app/server/scripts/migrate_valkey_hashes.py
+"""
+
+import asyncio
+import sys
+
+sys.path.insert(0, '/app/server/src')
+sys.path.insert(0, '/app')
+
+from server.src.core.database import get_valkey
+from server.src.services.game_state import init_all_managers, rewrite_packed_hash_fields
+
+
+async def main():
+    valkey = await get_valkey()
+    init_all_managers(valkey)
+
+    rewritten = await rewrite_packed_hash_fields()
+    print(f"Rewrote {rewritten} hashes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""
+Cross-worker relay of broadcasts for the sharded deployment.
+
+Each map worker only holds the sockets of players on its own maps, so a
+message addressed beyond them (global chat, a DM or admin update to a player
+on another map) would never reach players connected to other workers. The
+ConnectionManager hands such messages to the BroadcastRelay, which publishes
+them on BROADCAST_RELAY_CHANNEL; every worker subscribes with a dedicated
+pub/sub client (see core.database.create_pubsub_client) and delivers them to
+its own sockets only, without relaying them again.
+
+Envelopes are msgpack maps: the publishing worker's index (so it skips its
+own messages), the target player IDs (None for everyone) and the encoded
+websocket message, forwarded unchanged.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, List, Optional, Set
+
+import msgpack
+from glide import PubSubMsg
+
+from server.src.core.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from server.src.api.connection_manager import ConnectionManager
+
+logger = get_logger(__name__)
+
+BROADCAST_RELAY_CHANNEL = "broadcast:relay"
+
+
+class BroadcastRelay:
+    """Publishes broadcasts for other workers and delivers theirs locally."""
+
+    def __init__(self, valkey, manager: "ConnectionManager", origin: int):
+        """
+        Args:
+            valkey: Client used to publish (the shared client pool)
+            manager: Connection manager delivering relayed messages
+            origin: Index of this worker
+        """
+        self._valkey = valkey
+        self._manager = manager
+        self._origin = origin
+        # Pub/sub callbacks may run off the event loop thread
+        self._loop = asyncio.get_running_loop()
+        # Keep references to delivery tasks until they finish
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def publish(self, message: bytes, player_ids: Optional[List[int]] = None) -> bool:
+        """
+        Relay a message to other workers.
+
+        Args:
+            message: The encoded websocket message
+            player_ids: Players to deliver to, or None for every player
+
+        Returns:
+            True if the message was published
+        """
+        envelope = msgpack.packb(
+            {"origin": self._origin, "players": player_ids, "message": message},
+            use_bin_type=True,
+        )
+        try:
+            await self._valkey.publish(envelope, BROADCAST_RELAY_CHANNEL)
+            return True
+        except Exception as e:
+            logger.warning(
+                "Could not relay broadcast to other workers",
+                extra={"error": str(e)},
+            )
+            return False
+
+    def on_message(self, message: PubSubMsg, context: Any) -> None:
+        """Pub/sub callback scheduling delivery of a relayed message."""
+        self._loop.call_soon_threadsafe(self._schedule_delivery, message.message)
+
+    def _schedule_delivery(self, envelope: bytes) -> None:
+        task = self._loop.create_task(self.deliver(envelope))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def deliver(self, envelope: bytes) -> None:
+        """Send a relayed message to the addressed players connected here."""
+        try:
+            data = msgpack.unpackb(envelope, raw=False)
+            if data["origin"] == self._origin:
+                return
+            if data["players"] is None:
+                await self._manager.broadcast_to_all(data["message"], relay=False)
+            else:
+                await self._manager.broadcast_to_players(data["players"], data["message"])
+        except Exception as e:
+            logger.warning(
+                "Could not deliver relayed broadcast",
+                extra={"error": str(e)},
+            )
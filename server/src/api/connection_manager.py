@@ -15,15 +15,24 @@ KEY IMPROVEMENTS:
 - Atomic connection state changes
 - Safe concurrent broadcasting
 - Race condition prevention for connect/disconnect operations
+- Per-connection outbound queues: sends only enqueue, and a writer task per
+  connection drains its queue, so one slow client cannot stall the game loop
+- In the sharded deployment, messages for players connected to other map
+  workers go through the BroadcastRelay (see api.broadcast_relay)
 """
 
 import asyncio
 from collections import defaultdict
-from typing import Dict, List, Any
-from fastapi import WebSocket
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Optional, Set
+from fastapi import WebSocket, status
 from starlette.websockets import WebSocketState
+from server.src.api.outbound_queue import OutboundQueue, OutboundQueuePolicy
+from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
+if TYPE_CHECKING:
+    from server.src.api.broadcast_relay import BroadcastRelay
+
 logger = get_logger(__name__)
 
 
@@ -40,10 +49,26 @@ class ConnectionManager:
         - `connections_by_map`: Stores connections per map: {map_id: {player_id: WebSocket}}
         - `player_to_map`: Maps a player_id to their current map_id for quick lookups
         - `_connection_lock`: Protects connection state changes
+        - `_outbound`: Outbound queue of each connected player: {player_id: OutboundQueue}
+        - `_relay`: Relay to other map workers, set only in the sharded deployment
         """
         self.connections_by_map: Dict[str, Dict[int, WebSocket]] = defaultdict(dict)
         self.player_to_map: Dict[int, str] = {}
         self._connection_lock = asyncio.Lock()
+        self._outbound: Dict[int, OutboundQueue] = {}
+        self._outbound_policy = OutboundQueuePolicy(settings.OUTBOUND_QUEUE_FULL_POLICY)
+        # Keep references to slow-consumer close tasks until they finish
+        self._close_tasks: Set[asyncio.Task] = set()
+        self._relay: Optional["BroadcastRelay"] = None
+
+    def set_relay(self, relay: Optional["BroadcastRelay"]):
+        """
+        Set the relay reaching players connected to other map workers.
+
+        Args:
+            relay: The worker's BroadcastRelay, or None to stop relaying.
+        """
+        self._relay = relay
 
     async def connect(self, websocket: WebSocket, player_id: int, map_id: str):
         """
@@ -71,10 +96,22 @@ class ConnectionManager:
                     del self.connections_by_map[old_map_id][player_id]
                     if not self.connections_by_map[old_map_id]:
                         del self.connections_by_map[old_map_id]
+            old_queue = self._outbound.pop(player_id, None)
+            if old_queue:
+                await old_queue.close()
             
             # Add new connection
             self.connections_by_map[map_id][player_id] = websocket
             self.player_to_map[player_id] = map_id
+            outbound = OutboundQueue(
+                websocket,
+                player_id,
+                max_messages=settings.OUTBOUND_QUEUE_MAX_MESSAGES,
+                policy=self._outbound_policy,
+                on_failure=self._handle_outbound_failure,
+            )
+            outbound.start()
+            self._outbound[player_id] = outbound
             
             logger.debug(
                 "Player connected to map",
@@ -92,6 +129,9 @@ class ConnectionManager:
             player_id: The player's unique database ID.
         """
         async with self._connection_lock:
+            outbound = self._outbound.pop(player_id, None)
+            if outbound:
+                await outbound.close()
             map_id = self.player_to_map.pop(player_id, None)
             if map_id and player_id in self.connections_by_map[map_id]:
                 del self.connections_by_map[map_id][player_id]
@@ -140,8 +180,8 @@ class ConnectionManager:
                     failed_connections.append(player_id)
                     continue
                     
-                await connection.send_bytes(message)
-                successful_sends += 1
+                if await self._send(player_id, connection, message):
+                    successful_sends += 1
                 
             except Exception as e:
                 # Log the error for debugging and mark connection for removal
@@ -163,6 +203,9 @@ class ConnectionManager:
                     current_map = self.player_to_map.get(player_id)
                     if current_map == map_id:
                         # Remove from both mappings
+                        outbound = self._outbound.pop(player_id, None)
+                        if outbound:
+                            await outbound.close()
                         self.player_to_map.pop(player_id, None)
                         if player_id in self.connections_by_map[map_id]:
                             del self.connections_by_map[map_id][player_id]
@@ -179,15 +222,18 @@ class ConnectionManager:
                 }
             )
 
-    async def broadcast_to_all(self, message: bytes):
+    async def broadcast_to_all(self, message: bytes, relay: bool = True):
         """
         Broadcasts a message to all connected players across all maps.
 
         Args:
             message: The message to be sent, as bytes.
+            relay: Also send it to the players of other map workers.
         """
         for map_id in list(self.connections_by_map.keys()):
             await self.broadcast_to_map(map_id, message)
+        if relay and self._relay is not None:
+            await self._relay.publish(message)
 
     async def get_all_connections(self) -> List[Dict[str, Any]]:
         """
@@ -206,13 +252,17 @@ class ConnectionManager:
                     })
         return connections
 
-    async def broadcast_to_players(self, player_ids: List[int], message: bytes):
+    async def broadcast_to_players(
+        self, player_ids: List[int], message: bytes, relay: bool = False
+    ):
         """
         Broadcasts a message to specific players by player_id (thread-safe).
 
         Args:
             player_ids: List of player IDs to send the message to.
             message: The message to be sent, as bytes.
+            relay: Send it through the other map workers to the players not
+                connected here.
         """
         player_id_set = set(player_ids)
         failed_connections = []
@@ -225,6 +275,11 @@ class ConnectionManager:
                 for player_id, connection in connections.items():
                     if player_id in player_id_set:
                         connections_snapshot.append((player_id, connection, map_id))
+
+        if relay and self._relay is not None:
+            remote_player_ids = player_id_set - {entry[0] for entry in connections_snapshot}
+            if remote_player_ids:
+                await self._relay.publish(message, sorted(remote_player_ids))
         
         # Send messages without holding the lock
         for player_id, connection, map_id in connections_snapshot:
@@ -234,7 +289,7 @@ class ConnectionManager:
                     failed_connections.append(player_id)
                     continue
                     
-                await connection.send_bytes(message)
+                await self._send(player_id, connection, message)
             except Exception as e:
                 logger.warning(
                     "Failed to send message to player",
@@ -250,13 +305,28 @@ class ConnectionManager:
             for player_id in failed_connections:
                 await self.disconnect(player_id)
 
-    async def send_personal_message(self, player_id: int, message: bytes):
+    async def send_personal_message(
+        self,
+        player_id: int,
+        message: bytes,
+        droppable: bool = False,
+        on_drop: Optional[Callable[[], None]] = None,
+        relay: bool = False,
+    ) -> bool:
         """
         Sends a message to a specific player (thread-safe).
 
         Args:
             player_id: The player's unique database ID.
             message: The message to be sent, as bytes.
+            droppable: True for state updates the outbound queue may drop
+                when the player falls behind.
+            on_drop: Called if the message is dropped before being sent.
+            relay: Send it through the other map workers if the player is
+                not connected here.
+
+        Returns:
+            True if the message was queued, sent or relayed.
         """
         # Get connection info under lock
         connection_info = None
@@ -266,24 +336,27 @@ class ConnectionManager:
                 connection_info = (self.connections_by_map[map_id][player_id], map_id)
         
         if not connection_info:
+            if relay and self._relay is not None:
+                return await self._relay.publish(message, [player_id])
             logger.warning(
                 "Attempted to send personal message to unknown player",
                 extra={"player_id": player_id}
             )
-            return
+            return False
             
         connection, map_id = connection_info
         try:
             # Validate connection state before sending
             if hasattr(connection, 'client_state') and connection.client_state == WebSocketState.DISCONNECTED:
                 await self.disconnect(player_id)
-                return
+                return False
                 
-            await connection.send_bytes(message)
+            sent = await self._send(player_id, connection, message, droppable, on_drop)
             logger.debug(
                 "Personal message sent successfully",
                 extra={"player_id": player_id}
             )
+            return sent
         except Exception as e:
             logger.warning(
                 "Failed to send personal message",
@@ -293,6 +366,63 @@ class ConnectionManager:
                 }
             )
             await self.disconnect(player_id)
+            return False
+
+    async def _send(
+        self,
+        player_id: int,
+        connection: WebSocket,
+        message: bytes,
+        droppable: bool = False,
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """
+        Hand a message to the player's outbound queue.
+
+        Falls back to a direct send for connections without a queue. Returns
+        False if the queue refused the message; the queue then reports the
+        connection through _handle_outbound_failure itself.
+        """
+        outbound = self._outbound.get(player_id)
+        if outbound is not None and outbound.websocket is connection:
+            return outbound.enqueue(message, droppable=droppable, on_drop=on_drop)
+        await connection.send_bytes(message)
+        return True
+
+    async def _handle_outbound_failure(self, player_id: int, websocket: WebSocket):
+        """
+        Drop a connection whose outbound queue gave up on it (slow consumer or
+        failed send) and close the socket so the client reconnects.
+        """
+        async with self._connection_lock:
+            map_id = self.player_to_map.get(player_id)
+            if map_id and self.connections_by_map.get(map_id, {}).get(player_id) is websocket:
+                del self.connections_by_map[map_id][player_id]
+                if not self.connections_by_map[map_id]:
+                    del self.connections_by_map[map_id]
+                self.player_to_map.pop(player_id, None)
+            outbound = self._outbound.get(player_id)
+            if outbound is not None and outbound.websocket is websocket:
+                del self._outbound[player_id]
+                await outbound.close()
+
+        if getattr(websocket, "client_state", None) == WebSocketState.DISCONNECTED:
+            return
+        close_task = asyncio.create_task(
+            self._close_websocket(player_id, websocket),
+            name=f"ws_close_{player_id}",
+        )
+        self._close_tasks.add(close_task)
+        close_task.add_done_callback(self._close_tasks.discard)
+
+    async def _close_websocket(self, player_id: int, websocket: WebSocket):
+        try:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except Exception as e:
+            logger.debug(
+                "Error closing slow WebSocket connection",
+                extra={"player_id": player_id, "error": str(e)}
+            )
 
     def get_player_websocket(self, player_id: int) -> WebSocket | None:
         """
@@ -316,9 +446,17 @@ class ConnectionManager:
         Clear all connections (thread-safe). Used for test isolation.
         """
         async with self._connection_lock:
+            await self._close_outbound_queues()
             self.connections_by_map.clear()
             self.player_to_map.clear()
 
+    async def _close_outbound_queues(self):
+        """Close every outbound queue (caller holds the connection lock)."""
+        outbound_queues = list(self._outbound.values())
+        self._outbound.clear()
+        for outbound in outbound_queues:
+            await outbound.close()
+
     async def disconnect_all(self):
         """
         Disconnect all active WebSocket connections and clear data structures (thread-safe).
@@ -337,6 +475,7 @@ class ConnectionManager:
                 for player_id, websocket in map_connections.items():
                     connections_to_close.append((player_id, websocket, map_id))
 
+            await self._close_outbound_queues()
             self.connections_by_map.clear()
             self.player_to_map.clear()
 
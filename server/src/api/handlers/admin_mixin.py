@@ -200,7 +200,7 @@ class AdminHandlerMixin:
             )
 
             packed = msgpack.packb(state_update.model_dump(), use_bin_type=True)
-            await manager.send_personal_message(target_player_id, packed)
+            await manager.send_personal_message(target_player_id, packed, relay=True)
 
         except Exception as e:
             # Target may be offline — this is expected and not an error
@@ -221,6 +221,8 @@ class CombatHandlerMixin:
                     {
                         "target_type": payload.target_type.value,
                         "target_id": int(payload.target_id),
+                        "last_attack_tick": game_state.tick_counter,
+                        "attack_speed": attack_speed,
                         "auto_retaliate": False
                     }
                 )
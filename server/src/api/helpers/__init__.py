@@ -5,7 +5,11 @@ These helpers provide common functionality used by the WebSocket endpoint.
 """
 
 from server.src.api.helpers.rate_limiter import OperationRateLimiter
-from server.src.api.helpers.auth_helpers import receive_auth_message, authenticate_player
+from server.src.api.helpers.auth_helpers import (
+    receive_auth_message,
+    authenticate_player,
+    authenticate_relayed_player,
+)
 from server.src.api.helpers.connection_helpers import (
     initialize_player_connection,
     handle_player_disconnect,
@@ -20,6 +24,7 @@ __all__ = [
     "OperationRateLimiter",
     "receive_auth_message",
     "authenticate_player",
+    "authenticate_relayed_player",
     "initialize_player_connection",
     "handle_player_disconnect",
     "send_welcome_message",
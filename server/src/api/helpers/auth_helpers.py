@@ -59,6 +59,30 @@ async def receive_auth_message(websocket) -> WSMessage:
         )
 
 
+def _check_player_can_connect(player) -> None:
+    """
+    Reject banned and timed out players.
+
+    Raises:
+        WebSocketDisconnect: If the player may not connect
+    """
+    if player.is_banned:
+        raise WebSocketDisconnect(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason="Account is banned"
+        )
+
+    timeout_until = player.timeout_until
+    if timeout_until:
+        if timeout_until.tzinfo is None:
+            timeout_until = timeout_until.replace(tzinfo=timezone.utc)
+        if timeout_until > datetime.now(timezone.utc):
+            raise WebSocketDisconnect(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason=f"Account is timed out until {timeout_until.isoformat()}"
+            )
+
+
 async def authenticate_player(auth_message: WSMessage) -> Tuple[str, int]:
     """
     Authenticate player and return username and player_id.
@@ -102,21 +126,7 @@ async def authenticate_player(auth_message: WSMessage) -> Tuple[str, int]:
                 reason="Player not found"
             )
         
-        if player.is_banned:
-            raise WebSocketDisconnect(
-                code=status.WS_1008_POLICY_VIOLATION,
-                reason="Account is banned"
-            )
-        
-        timeout_until = player.timeout_until
-        if timeout_until:
-            if timeout_until.tzinfo is None:
-                timeout_until = timeout_until.replace(tzinfo=timezone.utc)
-            if timeout_until > datetime.now(timezone.utc):
-                raise WebSocketDisconnect(
-                    code=status.WS_1008_POLICY_VIOLATION,
-                    reason=f"Account is timed out until {timeout_until.isoformat()}"
-                )
+        _check_player_can_connect(player)
         
         logger.info("Player authenticated via WebSocket", extra={"username": username, "player_id": player.id})
         return username, player.id
@@ -133,3 +143,33 @@ async def authenticate_player(auth_message: WSMessage) -> Tuple[str, int]:
             code=status.WS_1008_POLICY_VIOLATION,
             reason="Invalid authentication token"
         )
+
+
+async def authenticate_relayed_player(player_id: int) -> Tuple[str, int]:
+    """
+    Authenticate a player relayed by the gateway of the sharded deployment.
+
+    The gateway validated the client's token at login, so only the player's
+    existence and ban/timeout status are checked; the token may have expired
+    since, e.g. when the player is handed off to another map worker.
+
+    Args:
+        player_id: Player the gateway authenticated
+
+    Returns:
+        Tuple of (username, player_id)
+
+    Raises:
+        WebSocketDisconnect: If the player does not exist or may not connect
+    """
+    player = await PlayerService.get_player_by_id(player_id)
+    if not player:
+        raise WebSocketDisconnect(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason="Player not found"
+        )
+
+    _check_player_can_connect(player)
+
+    logger.info("Player authenticated via gateway", extra={"username": player.username, "player_id": player.id})
+    return player.username, player.id
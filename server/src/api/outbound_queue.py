@@ -0,0 +1,250 @@
+"""
+Per-connection outbound message queue.
+
+Every WebSocket connection gets a bounded queue drained by its own writer
+task, so the game loop and broadcasts only enqueue bytes and never wait on a
+slow client's socket.
+
+Messages are either:
+- droppable: periodic state updates (game update diffs) that a later
+  message can make up for. Dropping one invokes its on_drop callback so the
+  sender can resynchronise the client.
+- non-droppable: events (combat, chat, chunk data) that must arrive in order.
+
+What happens when the queue is full is decided by OutboundQueuePolicy.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Deque, Optional
+
+from fastapi import WebSocket
+
+from server.src.core.logging_config import get_logger
+from server.src.core.metrics import (
+    websocket_outbound_dropped_total,
+    websocket_outbound_queue_depth,
+    websocket_slow_consumer_disconnects_total,
+)
+
+logger = get_logger(__name__)
+
+
+class OutboundQueuePolicy(str, Enum):
+    """Behaviour when a connection's outbound queue is full."""
+
+    # Drop the oldest queued state update to make room
+    DROP_STALE = "drop_stale"
+    # Keep at most one pending state update; a new one replaces older ones
+    COALESCE = "coalesce"
+    # Disconnect the client as soon as the queue fills up
+    DISCONNECT = "disconnect"
+
+
+@dataclass
+class OutboundMessage:
+    """A message waiting to be written to a WebSocket."""
+
+    data: bytes
+    droppable: bool = False
+    on_drop: Optional[Callable[[], None]] = None
+
+
+class OutboundQueue:
+    """
+    Bounded outbound queue with a dedicated writer task for one connection.
+
+    Slow consumers are handled according to the configured policy. When the
+    queue cannot accept a message that must be delivered, or a send fails,
+    the queue closes itself and reports the connection through on_failure.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        player_id: int,
+        max_messages: int,
+        policy: OutboundQueuePolicy,
+        on_failure: Callable[[int, WebSocket], Awaitable[None]],
+    ):
+        """
+        Args:
+            websocket: Connection to write to
+            player_id: Player owning the connection
+            max_messages: Maximum number of queued messages
+            policy: Behaviour when the queue is full
+            on_failure: Called once with (player_id, websocket) when the
+                connection has to be dropped
+        """
+        self.websocket = websocket
+        self.player_id = player_id
+        self._max_messages = max(1, max_messages)
+        self._policy = policy
+        self._on_failure = on_failure
+        self._queue: Deque[OutboundMessage] = deque()
+        self._wakeup = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._failure_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._depth_gauge = websocket_outbound_queue_depth.labels(player_id=str(player_id))
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> None:
+        """Start the writer task."""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(
+                self._run_writer(), name=f"ws_writer_{self.player_id}"
+            )
+
+    async def close(self) -> None:
+        """Stop the writer task and discard anything still queued."""
+        self._closed = True
+        self._queue.clear()
+        if self._writer_task is not None and self._writer_task is not asyncio.current_task():
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._writer_task = None
+        self._remove_player_metrics()
+
+    def enqueue(
+        self,
+        data: bytes,
+        droppable: bool = False,
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """
+        Queue a message for the writer task.
+
+        Args:
+            data: Packed message bytes
+            droppable: True for state updates that may be dropped under load
+            on_drop: Called if this message is dropped before being sent
+
+        Returns:
+            True if the message was queued
+        """
+        if self._closed:
+            return False
+
+        message = OutboundMessage(data=data, droppable=droppable, on_drop=on_drop)
+
+        if droppable and self._policy == OutboundQueuePolicy.COALESCE:
+            self._drop_pending_state_updates("coalesced")
+
+        if len(self._queue) >= self._max_messages:
+            if self._policy == OutboundQueuePolicy.DISCONNECT:
+                self._fail("outbound queue full")
+                return False
+            if not self._drop_oldest_state_update():
+                if droppable:
+                    # Only events are queued; this update is the stale one
+                    self._drop(message, "stale")
+                    return False
+                self._fail("outbound queue full of undeliverable events")
+                return False
+
+        self._queue.append(message)
+        self._depth_gauge.set(len(self._queue))
+        self._wakeup.set()
+        return True
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _remove_player_metrics(self) -> None:
+        """Drop per-player label sets so disconnected players don't linger."""
+        player_label = str(self.player_id)
+        for metric, labels in (
+            (websocket_outbound_queue_depth, (player_label,)),
+            (websocket_outbound_dropped_total, (player_label, "stale")),
+            (websocket_outbound_dropped_total, (player_label, "coalesced")),
+        ):
+            try:
+                metric.remove(*labels)
+            except KeyError:
+                pass
+
+    def _drop(self, message: OutboundMessage, reason: str) -> None:
+        websocket_outbound_dropped_total.labels(
+            player_id=str(self.player_id), reason=reason
+        ).inc()
+        if message.on_drop is not None:
+            try:
+                message.on_drop()
+            except Exception as e:
+                logger.warning(
+                    "Outbound drop callback failed",
+                    extra={"player_id": self.player_id, "error": str(e)},
+                )
+
+    def _drop_oldest_state_update(self) -> bool:
+        for index, message in enumerate(self._queue):
+            if message.droppable:
+                del self._queue[index]
+                self._drop(message, "stale")
+                return True
+        return False
+
+    def _drop_pending_state_updates(self, reason: str) -> None:
+        if not any(message.droppable for message in self._queue):
+            return
+        kept: Deque[OutboundMessage] = deque()
+        for message in self._queue:
+            if message.droppable:
+                self._drop(message, reason)
+            else:
+                kept.append(message)
+        self._queue = kept
+
+    def _fail(self, reason: str) -> None:
+        """Close the queue and hand the connection to on_failure (once)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.clear()
+        self._depth_gauge.set(0)
+        websocket_slow_consumer_disconnects_total.inc()
+        logger.warning(
+            "Dropping slow WebSocket consumer",
+            extra={"player_id": self.player_id, "reason": reason, "policy": self._policy.value},
+        )
+        self._failure_task = asyncio.create_task(
+            self._on_failure(self.player_id, self.websocket),
+            name=f"ws_writer_failure_{self.player_id}",
+        )
+
+    async def _run_writer(self) -> None:
+        while not self._closed:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            message = self._queue.popleft()
+            self._depth_gauge.set(len(self._queue))
+            try:
+                await self.websocket.send_bytes(message.data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "Failed to send message to player",
+                    extra={"player_id": self.player_id, "error": str(e)},
+                )
+                if not self._closed:
+                    self._closed = True
+                    self._queue.clear()
+                    await self._on_failure(self.player_id, self.websocket)
+                return
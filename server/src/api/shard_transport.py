@@ -0,0 +1,193 @@
+"""
+Gateway <-> map worker transport for the sharded deployment.
+
+Each client websocket held by the gateway is relayed over its own Unix socket
+connection to the worker owning the player's map. Both directions carry
+length-prefixed frames: a kind byte, a 4-byte big-endian length and the
+payload. Data frames hold one websocket message, already msgpack-encoded, so
+neither side re-encodes anything; a close frame carries a 2-byte close code
+and ends the connection. Every connection starts with a session frame
+carrying the 8-byte ID of the player the gateway authenticated, so workers
+never see (or re-validate) the client's token.
+
+StreamWebSocket lets a worker run the regular websocket_endpoint over such a
+connection, as if the client were connected to it directly.
+"""
+
+import asyncio
+import struct
+from typing import Optional, Tuple
+
+from fastapi import WebSocketDisconnect, status
+from starlette.websockets import WebSocketState
+
+from server.src.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+FRAME_DATA = 1
+FRAME_CLOSE = 2
+FRAME_SESSION = 3
+
+# Close code a worker ends a session with when the player moved to a map
+# owned by another worker; the gateway then reconnects them there
+SHARD_HANDOFF_CLOSE_CODE = 4001
+
+_FRAME_HEADER = struct.Struct(">BI")
+_CLOSE_PAYLOAD = struct.Struct(">H")
+_SESSION_PAYLOAD = struct.Struct(">Q")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+
+def encode_frame(kind: int, payload: bytes = b"") -> bytes:
+    """Header and payload of a frame, for a single write."""
+    return _FRAME_HEADER.pack(kind, len(payload)) + payload
+
+
+def encode_close_frame(code: int) -> bytes:
+    return encode_frame(FRAME_CLOSE, _CLOSE_PAYLOAD.pack(code))
+
+
+def decode_close_code(payload: bytes) -> int:
+    if len(payload) != _CLOSE_PAYLOAD.size:
+        return status.WS_1011_INTERNAL_ERROR
+    return _CLOSE_PAYLOAD.unpack(payload)[0]
+
+
+def encode_session_frame(player_id: int) -> bytes:
+    return encode_frame(FRAME_SESSION, _SESSION_PAYLOAD.pack(player_id))
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Tuple[int, bytes]]:
+    """
+    Read the next frame.
+
+    Returns:
+        (kind, payload), or None once the connection is closed
+
+    Raises:
+        ValueError: If the frame is larger than MAX_FRAME_BYTES
+    """
+    try:
+        header = await reader.readexactly(_FRAME_HEADER.size)
+        kind, length = _FRAME_HEADER.unpack(header)
+        if length > MAX_FRAME_BYTES:
+            raise ValueError(f"Frame of {length} bytes exceeds the limit")
+        payload = await reader.readexactly(length) if length else b""
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    return kind, payload
+
+
+async def read_session(reader: asyncio.StreamReader) -> Optional[int]:
+    """
+    Read the session frame a gateway connection starts with.
+
+    Returns:
+        The authenticated player's ID, or None if the connection did not
+        start with a valid session frame
+    """
+    try:
+        frame = await read_frame(reader)
+    except ValueError:
+        return None
+    if frame is None:
+        return None
+    kind, payload = frame
+    if kind != FRAME_SESSION or len(payload) != _SESSION_PAYLOAD.size:
+        return None
+    return _SESSION_PAYLOAD.unpack(payload)[0]
+
+
+class StreamWebSocket:
+    """
+    WebSocket-like view of a gateway connection, for use in a map worker.
+
+    Implements the part of the Starlette WebSocket interface used by
+    websocket_endpoint and the ConnectionManager. close() ends the session
+    on the worker side (the pending receive_bytes raises WebSocketDisconnect),
+    while the close frame itself is sent by finish() once the endpoint has
+    run its disconnect cleanup, so the gateway only routes a handed-off
+    player to their next worker after their state was saved.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        gateway_player_id: Optional[int] = None,
+    ):
+        """
+        Args:
+            reader: Worker end of the gateway connection
+            writer: Worker end of the gateway connection
+            gateway_player_id: Player the gateway authenticated (read_session)
+        """
+        self.gateway_player_id = gateway_player_id
+        self._reader = reader
+        self._writer = writer
+        self._incoming: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._peer_closed = False
+        self.client_state = WebSocketState.CONNECTING
+        self.close_code: Optional[int] = None
+
+    async def accept(self) -> None:
+        self.client_state = WebSocketState.CONNECTED
+        self._reader_task = asyncio.create_task(self._read_frames(), name="shard_stream_reader")
+
+    async def receive_bytes(self) -> bytes:
+        if self.close_code is None:
+            data = await self._incoming.get()
+            if data is not None:
+                return data
+        raise WebSocketDisconnect(code=self.close_code or status.WS_1000_NORMAL_CLOSURE)
+
+    async def send_bytes(self, data: bytes) -> None:
+        if self.client_state != WebSocketState.CONNECTED:
+            raise RuntimeError("WebSocket is not connected")
+        self._writer.write(encode_frame(FRAME_DATA, data))
+        await self._writer.drain()
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE, reason: Optional[str] = None) -> None:
+        self._end(code)
+
+    async def finish(self) -> None:
+        """Send the close frame (unless the gateway closed first) and drop the connection."""
+        self._end(status.WS_1000_NORMAL_CLOSURE)
+        if self._reader_task:
+            self._reader_task.cancel()
+        try:
+            if not self._peer_closed:
+                self._writer.write(encode_close_frame(self.close_code))
+                await self._writer.drain()
+            self._writer.close()
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    def _end(self, code: int) -> None:
+        if self.close_code is not None:
+            return
+        self.close_code = code
+        self.client_state = WebSocketState.DISCONNECTED
+        self._incoming.put_nowait(None)
+
+    async def _read_frames(self) -> None:
+        try:
+            while True:
+                frame = await read_frame(self._reader)
+                if frame is None:
+                    self._peer_closed = True
+                    self._end(status.WS_1006_ABNORMAL_CLOSURE)
+                    return
+                kind, payload = frame
+                if kind == FRAME_DATA:
+                    self._incoming.put_nowait(payload)
+                elif kind == FRAME_CLOSE:
+                    self._peer_closed = True
+                    self._end(decode_close_code(payload))
+                    return
+        except ValueError as e:
+            logger.warning("Invalid frame from gateway", extra={"error": str(e)})
+            self._end(status.WS_1009_MESSAGE_TOO_BIG)
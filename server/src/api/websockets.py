@@ -30,6 +30,7 @@ from server.src.core.metrics import (
 )
 
 from server.src.services.game_state import get_player_state_manager
+from server.src.services.hp_service import HpService
 from server.src.services.player_service import PlayerService
 from server.src.services.connection_service import ConnectionService
 from server.src.game.game_loop import cleanup_disconnected_player
@@ -54,6 +55,7 @@ from common.src.websocket_utils import (
 )
 
 from server.src.game.game_loop import register_player_login
+from server.src.game.tick_recorder import get_tick_recorder
 
 from server.src.api.handlers import (
     BaseHandlerMixin,
@@ -72,6 +74,7 @@ from server.src.api.helpers import (
     OperationRateLimiter,
     receive_auth_message,
     authenticate_player,
+    authenticate_relayed_player,
     initialize_player_connection,
     send_welcome_message,
     handle_player_join_broadcast,
@@ -155,6 +158,10 @@ class WebSocketHandler(
         Args:
             message: Parsed WebSocket message
         """
+        recorder = get_tick_recorder()
+        if recorder:
+            recorder.record_command(self.player_id, message)
+        
         # Track correlation ID
         if message.id:
             correlation_manager.register_request(message.id, message.type, self.player_id)
@@ -229,12 +236,19 @@ async def websocket_endpoint(
     websocket_connections_active.inc()
     
     try:
-        # Receive and validate authentication message
-        auth_data = await receive_auth_message(websocket)
+        # Sessions relayed by the gateway (sharded deployment) were
+        # authenticated there; everyone else sends their token
+        gateway_player_id = getattr(websocket, "gateway_player_id", None)
+        if gateway_player_id is None:
+            # Receive and validate authentication message
+            auth_data = await receive_auth_message(websocket)
         
         # Authenticate player
         try:
-            username, player_id = await authenticate_player(auth_data)
+            if gateway_player_id is not None:
+                username, player_id = await authenticate_relayed_player(gateway_player_id)
+            else:
+                username, player_id = await authenticate_player(auth_data)
         except WebSocketDisconnect:
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
@@ -255,6 +269,13 @@ async def websocket_endpoint(
         await manager.connect(websocket, player_id, player_map)
         players_online.inc()
         
+        recorder = get_tick_recorder()
+        if recorder and position:
+            current_hp, max_hp = await HpService.get_hp(player_id)
+            recorder.record_connect(
+                player_id, username, position.map_id, position.x, position.y, current_hp, max_hp
+            )
+        
         # Send welcome message
         await send_welcome_message(websocket, username, player_id)
         
@@ -352,6 +373,10 @@ async def websocket_endpoint(
             
             # Cleanup game loop state and visibility service for disconnected player
             await cleanup_disconnected_player(player_id)
+            
+            recorder = get_tick_recorder()
+            if recorder:
+                recorder.record_disconnect(player_id)
         
         # Record metrics
         duration = time.time() - start_time
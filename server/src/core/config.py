@@ -1,7 +1,7 @@
 import os
 import yaml
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Any, ClassVar, Dict, List, Tuple
 from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -92,6 +92,15 @@ class Settings(BaseSettings):
             str(game_config.get("server", {}).get("valkey", {}).get("port", 6379))
         )
     )
+    # Valkey client pool: clients per lane (see core.valkey_pool)
+    VALKEY_POOL_LANES: Dict[str, int] = game_config.get("server", {}).get("valkey", {}).get(
+        "pool", {}
+    ).get("lanes", {"game_loop": 1, "requests": 1, "persistence": 1})
+    VALKEY_HEALTH_CHECK_INTERVAL: float = float(
+        game_config.get("server", {}).get("valkey", {}).get("pool", {}).get(
+            "health_check_interval", 10
+        )
+    )
     MAPS_DIRECTORY: str = os.getenv("MAPS_DIRECTORY", "/app/server/maps")
 
     # Game state cache TTL settings (in seconds)
@@ -100,6 +109,7 @@ class Settings(BaseSettings):
         "inventory_ttl": 1800,      # Tier 2: inventory
         "equipment_ttl": 1800,      # Tier 2: equipment
         "skills_ttl": 900,          # Tier 2: skills
+        "ttl_refresh_window": 60,   # Reads refresh a key's TTL at most this often
     }
 
     # Logging settings
@@ -171,6 +181,16 @@ class Settings(BaseSettings):
         )
     )
 
+    # Near-cache (in-process cache of cold data, see game_state.near_cache)
+    NEAR_CACHE_ENABLED: bool = os.getenv(
+        "NEAR_CACHE_ENABLED",
+        str(game_config.get("cache", {}).get("near_cache", {}).get("enabled", True)),
+    ).lower() == "true"
+    # Per-namespace overrides: {namespace: {"ttl": seconds, "max_size": entries}}
+    NEAR_CACHE: Dict[str, Dict[str, float]] = game_config.get("cache", {}).get(
+        "near_cache", {}
+    ).get("namespaces", {})
+
     # Security settings from config.yml
     CHAT_MAX_MESSAGE_LENGTH: int = int(
         os.getenv(
@@ -234,6 +254,56 @@ class Settings(BaseSettings):
         game_config.get("game", {}).get("db_sync_interval_ticks", 200)
     )
 
+    # Hot state write-behind interval (in game ticks)
+    # Positions, HP and combat state of connected players are held in memory by
+    # the game loop and flushed to Valkey at this interval
+    HOT_STATE_FLUSH_INTERVAL_TICKS: int = int(
+        game_config.get("game", {}).get("hot_state", {}).get("flush_interval_ticks", 10)
+    )
+
+    # Tick scheduling when the game loop falls behind its deadlines
+    # "catch_up" runs late ticks back to back (up to max_catch_up_ticks behind),
+    # "skip" drops missed ticks and realigns to the schedule
+    # (values of game.tick_scheduler.TickOverrunPolicy)
+    TICK_OVERRUN_POLICIES: ClassVar[Tuple[str, ...]] = ("catch_up", "skip")
+    TICK_OVERRUN_POLICY: str = str(
+        game_config.get("game", {}).get("tick_scheduler", {}).get("overrun_policy", "catch_up")
+    )
+    TICK_MAX_CATCH_UP_TICKS: int = int(
+        game_config.get("game", {}).get("tick_scheduler", {}).get("max_catch_up_ticks", 5)
+    )
+
+    # Tick recording for offline replay (empty path disables recording)
+    TICK_RECORDING_PATH: str = str(
+        game_config.get("game", {}).get("tick_recording", {}).get("path", "")
+    )
+
+    # Multi-process map sharding (see gateway.py and shard_worker.py)
+    # With more than one worker, each worker process owns the maps assigned to
+    # it in map_assignments ({map_id: worker_index}); other maps are spread by
+    # a hash of their id. SHARD_INDEX is set per worker process.
+    SHARD_WORKERS: int = int(
+        game_config.get("game", {}).get("sharding", {}).get("workers", 1)
+    )
+    SHARD_INDEX: int = 0
+    SHARD_MAP_ASSIGNMENTS: Dict[str, int] = dict(
+        game_config.get("game", {}).get("sharding", {}).get("map_assignments", {}) or {}
+    )
+    SHARD_SOCKET_DIR: str = str(
+        game_config.get("game", {}).get("sharding", {}).get("socket_dir", "/tmp/rpg-shards")
+    )
+
+    # Per-connection outbound queue
+    # Each WebSocket has a bounded queue drained by its own writer task; the
+    # policy decides what happens when a slow client lets it fill up
+    # ("drop_stale", "coalesce" or "disconnect")
+    OUTBOUND_QUEUE_MAX_MESSAGES: int = int(
+        game_config.get("game", {}).get("outbound_queue", {}).get("max_messages", 256)
+    )
+    OUTBOUND_QUEUE_FULL_POLICY: str = str(
+        game_config.get("game", {}).get("outbound_queue", {}).get("full_policy", "drop_stale")
+    )
+
     # Death and respawn settings from config.yml
     DEATH_RESPAWN_DELAY: float = float(
         game_config.get("game", {}).get("death", {}).get("respawn_delay", 5.0)
@@ -265,6 +335,11 @@ class Settings(BaseSettings):
     ENTITY_AI_IDLE_MAX: int = int(
         game_config.get("game", {}).get("entity_ai", {}).get("idle_to_wander_max_ticks", 100)
     )
+    # Idle/wandering entities more than this many chunks from every player are
+    # dormant; a negative value keeps every entity active
+    ENTITY_AI_WAKE_RADIUS_CHUNKS: int = int(
+        game_config.get("game", {}).get("entity_ai", {}).get("wake_radius_chunks", 2)
+    )
 
     # Database settings
     DATABASE_ECHO: bool = os.getenv("DATABASE_ECHO", "").lower() in ("true", "1", "yes")
@@ -296,4 +371,20 @@ class Settings(BaseSettings):
         return self
 
 
+    @model_validator(mode="after")
+    def validate_tick_scheduler(self) -> "Settings":
+        """Reject tick scheduler settings the game loop would fail on at startup."""
+        if self.TICK_OVERRUN_POLICY not in self.TICK_OVERRUN_POLICIES:
+            raise ValueError(
+                f"game.tick_scheduler.overrun_policy must be one of "
+                f"{', '.join(self.TICK_OVERRUN_POLICIES)}, got {self.TICK_OVERRUN_POLICY!r}"
+            )
+        if self.TICK_MAX_CATCH_UP_TICKS < 0:
+            raise ValueError(
+                f"game.tick_scheduler.max_catch_up_ticks must be >= 0, "
+                f"got {self.TICK_MAX_CATCH_UP_TICKS}"
+            )
+        return self
+
+
 settings = Settings()
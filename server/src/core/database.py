@@ -6,20 +6,24 @@ and the in-memory cache (Valkey/Redis). It provides dependency injection
 functions (`get_db` and `get_valkey`) for use in other parts of the application.
 
 Notes for the next agent:
-- The Valkey client is created as a singleton instance. This is generally
-  fine for most applications, but for very high-concurrency scenarios,
-  you might consider a connection pool if the client library supports it.
+- The Valkey client is a singleton ValkeyClientPool (core.valkey_pool): one
+  client per lane (game loop, request handlers, persistence), so request
+  bursts cannot delay the game loop's commands. Clients per lane are set in
+  config.yml under server.valkey.pool.
 - The database engine is configured with `echo=True`, which logs all SQL
   statements. This is useful for development but should be disabled in
   production for performance and security reasons.
 """
 
 import logging
+from typing import Any, Callable, Set
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from glide import GlideClient, GlideClientConfiguration, NodeAddress, BackoffStrategy
+from glide import GlideClient, GlideClientConfiguration, NodeAddress, BackoffStrategy, PubSubMsg
 
 from server.src.core.config import settings
+from server.src.core.valkey_pool import ValkeyClientPool
 
 logger = logging.getLogger(__name__)
 
@@ -157,6 +161,15 @@ class ResilientValkeyClient:
                 )
                 raise
 
+    def reset(self) -> None:
+        """Drop the connection; the next call reconnects."""
+        self._client = None
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
     def __getattr__(self, name: str):
         """Proxy all method calls through _call_with_reconnect."""
         async def method_wrapper(*args, **kwargs):
@@ -164,16 +177,48 @@ class ResilientValkeyClient:
         return method_wrapper
 
 
-valkey_client: ResilientValkeyClient | None = None
+async def create_pubsub_client(
+    channels: Set[str], callback: Callable[[PubSubMsg, Any], None]
+) -> GlideClient:
+    """
+    Create a dedicated Valkey client subscribed to the given channels.
+
+    A subscribed connection cannot run regular commands, so subscribers get
+    their own client instead of the shared one. Glide resubscribes after a
+    reconnect; callback runs for every message received.
+    """
+    config = GlideClientConfiguration(
+        [NodeAddress(host, port)],
+        request_timeout=500,
+        reconnect_strategy=BackoffStrategy(
+            num_of_retries=5,
+            factor=100,
+            exponent_base=2,
+        ),
+        pubsub_subscriptions=GlideClientConfiguration.PubSubSubscriptions(
+            channels_and_patterns={
+                GlideClientConfiguration.PubSubChannelModes.Exact: set(channels),
+            },
+            callback=callback,
+            context=None,
+        ),
+    )
+    return await GlideClient.create(config)
+
+
+valkey_client: ValkeyClientPool | None = None
 
 
-async def get_valkey() -> ResilientValkeyClient:
+async def get_valkey() -> ValkeyClientPool:
     """
-    Dependency to get a Valkey client wrapped with automatic reconnection.
+    Dependency to get the Valkey client pool. Its clients reconnect
+    automatically; calls go to the lane of the calling task.
     """
     global valkey_client
     if valkey_client is None:
-        valkey_client = ResilientValkeyClient(valkey_config)
+        valkey_client = ValkeyClientPool(
+            settings.VALKEY_POOL_LANES, lambda: ResilientValkeyClient(valkey_config)
+        )
     return valkey_client
 
 
@@ -190,5 +235,5 @@ def reset_valkey():
     """
     global valkey_client
     if valkey_client is not None:
-        valkey_client._client = None  # Force reconnection on next use
+        valkey_client.reset()  # Force reconnection on next use
     valkey_client = None
@@ -104,6 +104,32 @@ websocket_connection_duration_seconds = Histogram(
     registry=REGISTRY,
 )
 
+websocket_outbound_queue_depth = Gauge(
+    "rpg_websocket_outbound_queue_depth",
+    "Messages waiting in a connection's outbound queue",
+    ["player_id"],
+    registry=REGISTRY,
+)
+
+websocket_outbound_dropped_total = Counter(
+    "rpg_websocket_outbound_dropped_total",
+    "Outbound state updates dropped because a client fell behind",
+    ["player_id", "reason"],
+    registry=REGISTRY,
+)
+
+websocket_slow_consumer_disconnects_total = Counter(
+    "rpg_websocket_slow_consumer_disconnects_total",
+    "Connections closed because their outbound queue could not keep up",
+    registry=REGISTRY,
+)
+
+shard_map_handoffs_total = Counter(
+    "rpg_shard_map_handoffs_total",
+    "Players handed off to the worker owning the map they moved to",
+    registry=REGISTRY,
+)
+
 # =============================================================================
 # GAME METRICS
 # =============================================================================
@@ -165,6 +191,85 @@ game_state_broadcasts_total = Counter(
     registry=REGISTRY,
 )
 
+# Tick profiler metrics (phase breakdown of a single game loop iteration)
+game_loop_phase_duration_seconds = Histogram(
+    "rpg_game_loop_phase_duration_seconds",
+    "Time spent in each game loop phase per map",
+    ["phase", "map_id"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    registry=REGISTRY,
+)
+
+game_loop_overruns_total = Counter(
+    "rpg_game_loop_overruns_total",
+    "Total number of game loop iterations that exceeded the tick budget",
+    registry=REGISTRY,
+)
+
+# Tick scheduler metrics (lateness of each tick against its absolute deadline)
+game_loop_tick_lag_seconds = Gauge(
+    "rpg_game_loop_tick_lag_seconds",
+    "How late the most recent tick started relative to its deadline",
+    registry=REGISTRY,
+)
+
+game_loop_tick_jitter_seconds = Histogram(
+    "rpg_game_loop_tick_jitter_seconds",
+    "Distribution of tick start lateness relative to the tick deadline",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+    registry=REGISTRY,
+)
+
+game_loop_skipped_ticks_total = Counter(
+    "rpg_game_loop_skipped_ticks_total",
+    "Total number of ticks skipped because the game loop fell behind",
+    registry=REGISTRY,
+)
+
+# Timing wheel metrics (delayed game actions fired by tick)
+game_loop_timers_fired_total = Counter(
+    "rpg_game_loop_timers_fired_total",
+    "Total number of timing wheel callbacks fired",
+    registry=REGISTRY,
+)
+
+game_loop_timers_pending = Gauge(
+    "rpg_game_loop_timers_pending",
+    "Number of timers waiting in the timing wheel",
+    registry=REGISTRY,
+)
+
+# Per-map tick pipeline metrics (maps are processed concurrently)
+game_loop_map_duration_seconds = Histogram(
+    "rpg_game_loop_map_duration_seconds",
+    "Duration of a single map's tick pipeline in seconds",
+    ["map_id"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    registry=REGISTRY,
+)
+
+game_loop_map_errors_total = Counter(
+    "rpg_game_loop_map_errors_total",
+    "Total number of map tick pipelines that failed",
+    ["map_id"],
+    registry=REGISTRY,
+)
+
+# Entity AI interest management (entities far from every player are dormant)
+entity_ai_active_entities = Gauge(
+    "rpg_entity_ai_active_entities",
+    "Entities whose AI state machine ran in the last tick",
+    ["map_id"],
+    registry=REGISTRY,
+)
+
+entity_ai_dormant_entities = Gauge(
+    "rpg_entity_ai_dormant_entities",
+    "Entities dormant because no player is near their chunk",
+    ["map_id"],
+    registry=REGISTRY,
+)
+
 # =============================================================================
 # DATABASE METRICS
 # =============================================================================
@@ -221,6 +326,36 @@ cache_misses_total = Counter(
     registry=REGISTRY,
 )
 
+valkey_ttl_refreshes_skipped_total = Counter(
+    "rpg_valkey_ttl_refreshes_skipped_total",
+    "EXPIRE commands skipped on reads because the key's TTL was refreshed recently",
+    ["key_type"],
+    registry=REGISTRY,
+)
+
+# Valkey client pool (see core.valkey_pool)
+valkey_command_duration_seconds = Histogram(
+    "rpg_valkey_command_duration_seconds",
+    "Valkey command latency per client pool lane",
+    ["lane", "command"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+    registry=REGISTRY,
+)
+
+valkey_command_errors_total = Counter(
+    "rpg_valkey_command_errors_total",
+    "Total number of failed Valkey commands per client pool lane",
+    ["lane"],
+    registry=REGISTRY,
+)
+
+valkey_lane_healthy = Gauge(
+    "rpg_valkey_lane_healthy",
+    "Whether every client of the lane answered the last health check (1) or not (0)",
+    ["lane"],
+    registry=REGISTRY,
+)
+
 # =============================================================================
 # ERROR METRICS
 # =============================================================================
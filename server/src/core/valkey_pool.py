@@ -0,0 +1,184 @@
+"""
+Valkey client pool with separate lanes per kind of traffic.
+
+A glide client multiplexes every command over one connection, so a burst
+of request-handler or persistence commands queues in front of the game
+loop's. The pool keeps a separate set of clients ("lane") for each kind of
+traffic:
+
+- game_loop: commands issued by the game loop task (and tasks it spawns)
+- requests: everything else, e.g. websocket and HTTP handlers (default)
+- persistence: batch sync of dirty state to the database
+
+The pool has the client interface, so managers hold one object. Each call
+is routed to the lane of the calling task, selected with a ContextVar:
+use_valkey_lane() for the rest of a task, valkey_lane() for a block,
+in_valkey_lane() for a coroutine function.
+Command latency and errors are recorded per lane, and run_health_checks()
+PINGs every client periodically, publishing the lane's health.
+
+Usage:
+    from server.src.core.valkey_pool import VALKEY_LANE_PERSISTENCE, valkey_lane
+
+    with valkey_lane(VALKEY_LANE_PERSISTENCE):
+        await coordinator.sync_all()
+"""
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Mapping, TypeVar
+
+from server.src.core.logging_config import get_logger
+from server.src.core.metrics import (
+    valkey_command_duration_seconds,
+    valkey_command_errors_total,
+    valkey_lane_healthy,
+)
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+VALKEY_LANE_GAME_LOOP = "game_loop"
+VALKEY_LANE_REQUESTS = "requests"
+VALKEY_LANE_PERSISTENCE = "persistence"
+VALKEY_LANES = (VALKEY_LANE_GAME_LOOP, VALKEY_LANE_REQUESTS, VALKEY_LANE_PERSISTENCE)
+
+_current_lane: ContextVar[str] = ContextVar("valkey_lane", default=VALKEY_LANE_REQUESTS)
+
+
+def _check_lane(lane: str) -> None:
+    if lane not in VALKEY_LANES:
+        raise ValueError(f"Unknown Valkey lane {lane!r}, expected one of {VALKEY_LANES}")
+
+
+def current_valkey_lane() -> str:
+    return _current_lane.get()
+
+
+def use_valkey_lane(lane: str) -> None:
+    """Route the current task's (and its child tasks') Valkey calls to lane."""
+    _check_lane(lane)
+    _current_lane.set(lane)
+
+
+@contextmanager
+def valkey_lane(lane: str) -> Iterator[None]:
+    """Route Valkey calls made inside the block to lane."""
+    _check_lane(lane)
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def in_valkey_lane(lane: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorator routing the Valkey calls of an async function to lane."""
+    _check_lane(lane)
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            with valkey_lane(lane):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ValkeyClientPool:
+    """Valkey clients grouped by lane, used through the client interface."""
+
+    def __init__(self, lane_sizes: Mapping[str, int], client_factory: Callable[[], Any]):
+        """
+        Args:
+            lane_sizes: Clients per lane; missing lanes get one client
+            client_factory: Creates one (lazily connecting) client
+        """
+        for lane in lane_sizes:
+            _check_lane(lane)
+        self._lanes: Dict[str, List[Any]] = {
+            lane: [client_factory() for _ in range(max(1, int(lane_sizes.get(lane, 1))))]
+            for lane in VALKEY_LANES
+        }
+        self._next_index: Dict[str, int] = {lane: 0 for lane in VALKEY_LANES}
+
+    def clients(self, lane: str) -> List[Any]:
+        return list(self._lanes[lane])
+
+    def client_for(self, lane: str) -> Any:
+        """Next client of lane (round robin)."""
+        clients = self._lanes[lane]
+        index = self._next_index[lane]
+        self._next_index[lane] = (index + 1) % len(clients)
+        return clients[index]
+
+    async def _call(self, method_name: str, *args, **kwargs) -> Any:
+        lane = _current_lane.get()
+        method = getattr(self.client_for(lane), method_name)
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception:
+            valkey_command_errors_total.labels(lane=lane).inc()
+            raise
+        finally:
+            valkey_command_duration_seconds.labels(lane=lane, command=method_name).observe(
+                time.perf_counter() - start
+            )
+
+    def __getattr__(self, name: str):
+        """Proxy client methods to the current lane."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def method_wrapper(*args, **kwargs):
+            return await self._call(name, *args, **kwargs)
+        return method_wrapper
+
+    async def check_health(self) -> Dict[str, bool]:
+        """
+        PING every client and publish each lane's health (healthy if all of
+        its clients answered).
+        """
+        health: Dict[str, bool] = {}
+        for lane, clients in self._lanes.items():
+            healthy = True
+            for client in clients:
+                try:
+                    await client.ping()
+                except Exception as e:
+                    healthy = False
+                    logger.warning(
+                        "Valkey health check failed",
+                        extra={"lane": lane, "error": str(e)},
+                    )
+            valkey_lane_healthy.labels(lane=lane).set(1 if healthy else 0)
+            health[lane] = healthy
+        return health
+
+    async def run_health_checks(self, interval: float) -> None:
+        """Check health every interval seconds until cancelled."""
+        while True:
+            try:
+                await self.check_health()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep checking; a dead task would freeze the health gauges
+                logger.error("Valkey health check errored", extra={"error": str(e)}, exc_info=True)
+            await asyncio.sleep(interval)
+
+    def reset(self) -> None:
+        """Drop every client's connection; they reconnect on next use."""
+        for clients in self._lanes.values():
+            for client in clients:
+                client.reset()
+
+    async def close(self) -> None:
+        for clients in self._lanes.values():
+            for client in clients:
+                await client.close()
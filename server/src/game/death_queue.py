@@ -0,0 +1,79 @@
+"""
+Queue of players whose HP reached zero, for the game loop's death check.
+
+HP only changes through HpService, which reports every write here: a player
+is queued when their HP is set to zero and dropped again if it goes back up
+before the game loop looks. Each map tick then takes the queued players on
+its map instead of reading every player's HP to find the dead ones.
+
+Usage:
+    from server.src.game.death_queue import get_death_queue
+
+    get_death_queue().report_hp(player_id, new_hp)
+
+    # In the map tick
+    for player_id in get_death_queue().take(map_player_ids):
+        ...
+"""
+
+from typing import Iterable, List, Optional, Set
+
+
+class PlayerDeathQueue:
+    """Players at zero HP whose death the game loop has not handled yet."""
+
+    def __init__(self):
+        self._pending: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def report_hp(self, player_id: int, current_hp: int) -> None:
+        """Record a player's new HP, queueing them if it reached zero."""
+        if current_hp <= 0:
+            self._pending.add(player_id)
+        else:
+            self._pending.discard(player_id)
+
+    def take(self, player_ids: Iterable[int]) -> List[int]:
+        """
+        Remove and return the queued players among player_ids.
+
+        Players queued but not in player_ids (on another map) stay queued.
+        """
+        if not self._pending:
+            return []
+        taken = [player_id for player_id in player_ids if player_id in self._pending]
+        self._pending.difference_update(taken)
+        return taken
+
+    def discard(self, player_id: int) -> None:
+        """Forget a player (e.g. on disconnect)."""
+        self._pending.discard(player_id)
+
+
+# Singleton instance
+_death_queue: Optional[PlayerDeathQueue] = None
+
+
+def get_death_queue() -> PlayerDeathQueue:
+    """
+    Get or create the singleton PlayerDeathQueue instance.
+
+    Returns:
+        The global PlayerDeathQueue instance.
+    """
+    global _death_queue
+    if _death_queue is None:
+        _death_queue = PlayerDeathQueue()
+    return _death_queue
+
+
+def reset_death_queue() -> None:
+    """
+    Reset the singleton instance.
+
+    Used for testing to ensure clean state between tests.
+    """
+    global _death_queue
+    _death_queue = None
@@ -10,6 +10,7 @@ KEY DESIGN PRINCIPLE:
 """
 
 import asyncio
+import heapq
 import time
 import traceback
 import msgpack
@@ -17,12 +18,17 @@ from typing import Dict, List, Optional, Set, Tuple, Any
 from glide import GlideClient
 
 from server.src.api.connection_manager import ConnectionManager
+from server.src.api.shard_transport import SHARD_HANDOFF_CLOSE_CODE
 from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
+from server.src.core.valkey_pool import VALKEY_LANE_GAME_LOOP, use_valkey_lane
 from server.src.core.metrics import (
     game_loop_iterations_total,
     game_loop_duration_seconds,
+    game_loop_map_duration_seconds,
+    game_loop_map_errors_total,
     game_state_broadcasts_total,
+    shard_map_handoffs_total,
 )
 from server.src.services.map_service import get_map_manager
 from server.src.services.game_state import (
@@ -30,13 +36,23 @@ from server.src.services.game_state import (
     get_entity_manager,
     get_batch_sync_coordinator,
     get_reference_data_manager,
+    unit_of_work,
 )
+from server.src.services.game_state.combat_scheduler import attack_interval_ticks
+from server.src.services.game_state.spatial_index import CHUNK_SIZE
 from server.src.services.visibility_service import get_visibility_service
 from server.src.services.visual_registry import get_visual_registry
 from server.src.services.visual_state_service import VisualStateService
 from server.src.services.ai_service import AIService
 from server.src.services.entity_spawn_service import EntitySpawnService
-from server.src.core.entities import EntityState
+from server.src.services.entity_render_registry import get_entity_render_registry
+from server.src.game.death_queue import get_death_queue
+from server.src.game.map_shards import owned_map_ids, owns_map, sharding_enabled
+from server.src.game.tick_profiler import TickProfiler
+from server.src.game.tick_recorder import get_tick_recorder
+from server.src.game.tick_scheduler import TickOverrunPolicy, TickScheduler
+from server.src.game.timing_wheel import get_timing_wheel
+from server.src.core.entities import EntityState, EntityType
 from common.src.protocol import (
     WSMessage,
     MessageType,
@@ -52,12 +68,12 @@ from server.src.schemas.item import EquipmentData
 
 logger = get_logger(__name__)
 
-# Default chunk size in tiles
-CHUNK_SIZE = 16
-
 # Visibility radius in chunks (1 = 3x3 grid of chunks around player)
 VISIBILITY_RADIUS = 1
 
+# Ticks a dying entity stays visible before its death is finalized
+ENTITY_DEATH_ANIMATION_TICKS = 10
+
 
 class GameLoopState:
     """
@@ -69,13 +85,18 @@ class GameLoopState:
     All player identification uses player_id (int), never username.
     """
     
-    def __init__(self):
+    def __init__(self, start_tick: int = 0):
         self._lock = asyncio.Lock()
         self._player_chunk_positions: Dict[int, Tuple[int, int]] = {}  # player_id -> chunk
-        self._global_tick_counter: int = 0
+        self._global_tick_counter: int = start_tick
         self._player_login_ticks: Dict[int, int] = {}  # player_id -> tick
         self._players_dying: Set[int] = set()
         self._active_tasks: Set[asyncio.Task] = set()
+        # HP regen due-time queue: heap of (due_tick, player_id); entries whose
+        # tick no longer matches _hp_regen_due_ticks are stale and skipped
+        self._hp_regen_heap: List[Tuple[int, int]] = []
+        self._hp_regen_due_ticks: Dict[int, int] = {}  # player_id -> due tick
+        self._hp_regen_due_now: Set[int] = set()
     
     @property
     def tick_counter(self) -> int:
@@ -106,6 +127,72 @@ class GameLoopState:
         """Register a player's login tick for staggered HP regen."""
         async with self._lock:
             self._player_login_ticks[player_id] = self._global_tick_counter
+            # Requeue on the new login's stagger
+            self._unschedule_hp_regen(player_id)
+    
+    # HP regen schedule. Synchronous: only used by the game loop, and no
+    # operation awaits, so none can interleave with another.
+
+    def schedule_hp_regen(self, player_id: int, current_tick: int, interval: int) -> int:
+        """
+        Queue a damaged player for their next HP regen tick.
+
+        Regen ticks are staggered per player: they fall on multiples of the
+        interval counted from the player's login tick. Does nothing if the
+        player is already queued.
+
+        Returns:
+            The tick the player's next regen is due
+        """
+        due_tick = self._hp_regen_due_ticks.get(player_id)
+        if due_tick is not None:
+            return due_tick
+        login_tick = self._player_login_ticks.get(player_id, current_tick)
+        due_tick = current_tick + interval - (current_tick - login_tick) % interval
+        self._hp_regen_due_ticks[player_id] = due_tick
+        heapq.heappush(self._hp_regen_heap, (due_tick, player_id))
+        return due_tick
+
+    def collect_hp_regen_due(self, current_tick: int) -> int:
+        """
+        Pop every player whose regen is due by this tick. Called once per
+        tick before maps are processed; each map then claims its players with
+        take_hp_regen_due. Unclaimed players are dropped and get requeued the
+        next time they are seen damaged.
+
+        Returns:
+            Number of players due this tick
+        """
+        due_now: Set[int] = set()
+        heap = self._hp_regen_heap
+        while heap and heap[0][0] <= current_tick:
+            due_tick, player_id = heapq.heappop(heap)
+            if self._hp_regen_due_ticks.get(player_id) == due_tick:
+                del self._hp_regen_due_ticks[player_id]
+                due_now.add(player_id)
+        self._hp_regen_due_now = due_now
+        return len(due_now)
+
+    def take_hp_regen_due(self, player_id: int) -> bool:
+        """Claim a player's regen for the current tick, if it is due."""
+        if player_id in self._hp_regen_due_now:
+            self._hp_regen_due_now.discard(player_id)
+            return True
+        return False
+
+    def is_hp_regen_scheduled(self, player_id: int) -> bool:
+        """Check if a player is waiting in the HP regen queue."""
+        return player_id in self._hp_regen_due_ticks
+
+    def _unschedule_hp_regen(self, player_id: int) -> None:
+        # Heap entry is left behind and skipped when popped
+        self._hp_regen_due_ticks.pop(player_id, None)
+        self._hp_regen_due_now.discard(player_id)
+        if len(self._hp_regen_heap) > 2 * len(self._hp_regen_due_ticks) + 64:
+            self._hp_regen_heap = [
+                (due_tick, pid) for pid, due_tick in self._hp_regen_due_ticks.items()
+            ]
+            heapq.heapify(self._hp_regen_heap)
     
     async def is_player_dying(self, player_id: int) -> bool:
         """Check if a player is currently in death sequence."""
@@ -134,6 +221,7 @@ class GameLoopState:
         async with self._lock:
             self._player_chunk_positions.pop(player_id, None)
             self._player_login_ticks.pop(player_id, None)
+            self._unschedule_hp_regen(player_id)
     
     def track_task(self, task: asyncio.Task) -> None:
         """
@@ -184,6 +272,17 @@ def get_game_loop_state() -> GameLoopState:
     return _game_loop_state
 
 
+def reset_game_loop_state(start_tick: int = 0) -> None:
+    """
+    Reset the singleton instance.
+
+    Used by tests and headless tools; a non-zero start_tick makes the next
+    tick run start_tick + 1 (e.g. to line up with a recording).
+    """
+    global _game_loop_state
+    _game_loop_state = GameLoopState(start_tick) if start_tick else None
+
+
 def get_chunk_coordinates(x: int, y: int, chunk_size: int = CHUNK_SIZE) -> Tuple[int, int]:
     """Convert tile coordinates to chunk coordinates."""
     return (x // chunk_size, y // chunk_size)
@@ -257,6 +356,128 @@ def _build_visual_state(
     return VisualStateService._build_visual_state(appearance, equipped_items)
 
 
+def _build_player_payload(player: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the wire representation of a player entity.
+
+    Args:
+        player: Player entry from the tick's player snapshot
+
+    Returns:
+        Entity dict as sent to clients
+    """
+    player_id = player.get("player_id")
+    payload = {
+        "id": f"player_{player_id}",  # Entity ID for client tracking
+        "type": "player",
+        "player_id": player_id,
+        "username": player.get("username", ""),  # For display
+        "x": player.get("x", 0),
+        "y": player.get("y", 0),
+        "current_hp": player.get("current_hp", 0),
+        "max_hp": player.get("max_hp", 0),
+        "facing_direction": player.get("facing_direction", "DOWN"),
+    }
+
+    # Include visual hash and state for sprite rendering
+    if "visual_hash" in player:
+        payload["visual_hash"] = player["visual_hash"]
+    if "visual_state" in player:
+        payload["visual_state"] = player["visual_state"]
+
+    return payload
+
+
+def _build_npc_entity_payload(entity: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Build the wire representation of an NPC/monster entity instance.
+
+    Static rendering data (display name, behavior, sprite sheet, visual state)
+    comes precomputed from the EntityRenderRegistry.
+
+    Args:
+        entity: Entity instance from EntityManager
+
+    Returns:
+        Entity dict as sent to clients, or None for fully despawned entities
+    """
+    entity_state = entity.get("state", EntityState.IDLE.value)
+
+    # Show entities in "dying" state (10-tick death animation)
+    # Skip entities fully despawned (state == "dead")
+    if entity_state == EntityState.DEAD.value:
+        return None
+
+    entity_name = entity.get("entity_name", "")
+    entity_type = entity.get("entity_type", EntityType.MONSTER.value)
+    descriptor = get_entity_render_registry().get(entity_name)
+    is_dying = entity_state == EntityState.DYING.value
+
+    payload = {
+        "type": "entity",
+        "id": entity.get("instance_id"),
+        "entity_type": entity_type,
+        "entity_name": entity_name,
+        "display_name": descriptor.display_name if descriptor else entity_name,
+        "behavior_type": descriptor.behavior_type if descriptor else "PASSIVE",
+        "x": int(entity.get("x", 0)),
+        "y": int(entity.get("y", 0)),
+        "facing_direction": entity.get("facing_direction", "DOWN"),
+        "current_hp": int(entity.get("current_hp", 0)),
+        "max_hp": int(entity.get("max_hp", 0)),
+        "state": entity_state,
+        "is_attackable": (descriptor.is_attackable if descriptor else True) and not is_dying,
+    }
+
+    # Add type-specific fields
+    if entity_type == EntityType.HUMANOID_NPC.value:
+        if descriptor and descriptor.visual_state is not None:
+            payload["visual_hash"] = descriptor.visual_hash
+            payload["visual_state"] = descriptor.visual_state
+    elif entity_type == EntityType.MONSTER.value:
+        payload["sprite_sheet_id"] = descriptor.sprite_sheet_id if descriptor else None
+
+    return payload
+
+
+def build_player_payloads(all_players: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """
+    Build every player's wire representation once for the tick.
+
+    The returned dicts are shared by all viewers and must not be mutated.
+
+    Args:
+        all_players: All player entities on the map
+
+    Returns:
+        Dict of {player_id: entity_data}
+    """
+    return {player["player_id"]: _build_player_payload(player) for player in all_players}
+
+
+def build_npc_entity_payloads(
+    all_entity_instances: List[Dict[str, Any]]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Build every NPC/monster's wire representation once for the tick.
+
+    The returned dicts are shared by all viewers and must not be mutated.
+    Fully despawned entities are left out.
+
+    Args:
+        all_entity_instances: All entity instances on the map
+
+    Returns:
+        Dict of {instance_id: entity_data}
+    """
+    payloads = {}
+    for entity in all_entity_instances:
+        payload = _build_npc_entity_payload(entity)
+        if payload is not None:
+            payloads[payload["id"]] = payload
+    return payloads
+
+
 def get_visible_players(
     player_x: int, player_y: int, 
     all_players: List[Dict[str, Any]], 
@@ -279,29 +500,8 @@ def get_visible_players(
         if entity_player_id == own_player_id:
             continue
             
-        entity_x = entity.get("x", 0)
-        entity_y = entity.get("y", 0)
-        
-        if is_in_visible_range(player_x, player_y, entity_x, entity_y):
-            entity_data = {
-                "id": f"player_{entity_player_id}",  # Entity ID for client tracking
-                "type": "player",
-                "player_id": entity_player_id,
-                "username": entity.get("username", ""),  # For display
-                "x": entity_x,
-                "y": entity_y,
-                "current_hp": entity.get("current_hp", 0),
-                "max_hp": entity.get("max_hp", 0),
-                "facing_direction": entity.get("facing_direction", "DOWN"),
-            }
-            
-            # Include visual hash and state for sprite rendering
-            if "visual_hash" in entity:
-                entity_data["visual_hash"] = entity["visual_hash"]
-            if "visual_state" in entity:
-                entity_data["visual_state"] = entity["visual_state"]
-            
-            visible[entity_player_id] = entity_data
+        if is_in_visible_range(player_x, player_y, entity.get("x", 0), entity.get("y", 0)):
+            visible[entity_player_id] = _build_player_payload(entity)
     
     return visible
 
@@ -320,84 +520,15 @@ def get_visible_npc_entities(
     Returns:
         Dict of {entity_key: entity_data} for visible entities
     """
-    from server.src.core.entities import EntityState, get_entity_by_name, EntityType
-    from server.src.core.humanoids import HumanoidDefinition
-    from server.src.core.monsters import MonsterDefinition
-    
     visible = {}
     for entity in all_entity_instances:
-        entity_state = entity.get("state", EntityState.IDLE.value)
-        
-        # Show entities in "dying" state (10-tick death animation)
-        # Skip entities fully despawned (state == "dead")
-        if entity_state == EntityState.DEAD.value:
-            continue
-            
         entity_x = int(entity.get("x", 0))
         entity_y = int(entity.get("y", 0))
         
         if is_in_visible_range(player_x, player_y, entity_x, entity_y):
-            entity_id = entity.get("instance_id")
-            entity_name = entity.get("entity_name", "")
-            entity_type = entity.get("entity_type", EntityType.MONSTER.value)
-            
-            # Get entity definition for display name and behavior
-            entity_enum = get_entity_by_name(entity_name)
-            display_name = entity_name
-            behavior_type = "PASSIVE"
-            is_attackable = True
-            
-            # Entity-type specific rendering data
-            sprite_sheet_id = None  # For monsters
-            visual_state = None  # For humanoids
-            
-            if entity_enum:
-                entity_def = entity_enum.value
-                display_name = entity_def.display_name
-                behavior_type = entity_def.behavior.name
-                is_attackable = entity_def.is_attackable and entity_state != EntityState.DYING.value
-                
-                # Extract type-specific rendering data
-                if isinstance(entity_def, HumanoidDefinition):
-                    # Build visual state from humanoid appearance and equipment
-                    appearance = entity_def.appearance.to_dict() if entity_def.appearance else None
-                    equipped_items = None
-                    if entity_def.equipped_items:
-                        equipped_items = {
-                            slot.value: item.value.equipped_sprite_id 
-                            for slot, item in entity_def.equipped_items.items()
-                            if item.value.equipped_sprite_id
-                        }
-                    visual_state = _build_visual_state(appearance, equipped_items)
-                elif isinstance(entity_def, MonsterDefinition):
-                    sprite_sheet_id = entity_def.sprite_sheet_id
-            else:
-                is_attackable = entity_state != EntityState.DYING.value
-            
-            entity_data = {
-                "type": "entity",
-                "id": entity_id,
-                "entity_type": entity_type,
-                "entity_name": entity_name,
-                "display_name": display_name,
-                "behavior_type": behavior_type,
-                "x": entity_x,
-                "y": entity_y,
-                "facing_direction": entity.get("facing_direction", "DOWN"),
-                "current_hp": int(entity.get("current_hp", 0)),
-                "max_hp": int(entity.get("max_hp", 0)),
-                "state": entity_state,
-                "is_attackable": is_attackable,
-            }
-            
-            # Add type-specific fields
-            if entity_type == EntityType.HUMANOID_NPC.value and visual_state:
-                entity_data["visual_hash"] = visual_state.compute_hash()
-                entity_data["visual_state"] = visual_state.to_dict()
-            elif entity_type == EntityType.MONSTER.value:
-                entity_data["sprite_sheet_id"] = sprite_sheet_id
-            
-            visible[f"entity_{entity_id}"] = entity_data
+            entity_data = _build_npc_entity_payload(entity)
+            if entity_data is not None:
+                visible[f"entity_{entity_data['id']}"] = entity_data
     
     return visible
 
@@ -406,39 +537,32 @@ async def _process_auto_attacks(
     player_mgr,
     entity_mgr,
     manager: ConnectionManager,
-    tick_counter: int
+    tick_counter: int,
+    player_ids: Optional[Set[int]] = None,
 ) -> None:
     """
-    Process all players in combat and execute auto-attacks.
+    Execute the auto-attacks that are due this tick.
     
-    Called every game tick (20 TPS = 50ms per tick).
+    Called every game tick (20 TPS = 50ms per tick). Only players whose next
+    attack is due (collected from the player manager's combat scheduler at
+    the start of the tick) are looked at.
     
     Args:
         player_mgr: PlayerStateManager instance
         entity_mgr: EntityManager instance
         manager: ConnectionManager for broadcasting
         tick_counter: Current tick number
+        player_ids: Only process these players (default: every due attacker).
+            Map tasks run concurrently, so each must own a disjoint set.
     """
     from ..services.combat_service import CombatService
-    from ..services.player_service import PlayerService
-    
-    players_in_combat = await player_mgr.get_all_players_in_combat()
     
-    for combat_entry in players_in_combat:
-        player_id = combat_entry["player_id"]
-        combat_state = combat_entry["combat_state"]
+    for player_id in player_mgr.combat_scheduler.take_due(player_ids):
+        combat_state = await player_mgr.get_player_combat_state(player_id)
+        if not combat_state:
+            continue
         
         try:
-            # Calculate ticks since last attack
-            last_attack_tick = combat_state["last_attack_tick"]
-            attack_speed = combat_state["attack_speed"]
-            ticks_required = int(attack_speed * settings.GAME_TICK_RATE)  # Convert seconds to ticks
-            
-            ticks_since_last_attack = tick_counter - last_attack_tick
-            
-            if ticks_since_last_attack < ticks_required:
-                continue  # Not ready to attack yet
-            
             # Get player position
             player_pos = await player_mgr.get_player_position(player_id)
             if not player_pos:
@@ -490,15 +614,14 @@ async def _process_auto_attacks(
                 )
                 
                 if result.success:
-                    # Update last attack tick
+                    # Update last attack tick (schedules the next attack)
                     await player_mgr.set_player_combat_state(
                         player_id,
-                        target_type.value,
-                        target_id
+                        {**combat_state, "last_attack_tick": tick_counter},
                     )
                     
                     # Get username for display in combat event
-                    username = await PlayerService.get_username_by_player_id(player_id)
+                    username = await player_mgr.get_username_for_player(player_id)
                     if username:
                         combat_event = WSMessage(
                             id=None,
@@ -529,8 +652,12 @@ async def _process_auto_attacks(
                 else:
                     # Attack failed, clear combat state
                     await player_mgr.clear_player_combat_state(player_id)
-            
-            # TODO: Handle player vs player combat when implemented
+            else:
+                # TODO: Handle player vs player combat when implemented;
+                # until then the player just stays scheduled
+                player_mgr.combat_scheduler.schedule(
+                    player_id, tick_counter + attack_interval_ticks(combat_state)
+                )
             
         except Exception as e:
             logger.error(
@@ -547,7 +674,12 @@ async def _process_auto_attacks(
 
 
 async def send_chunk_update_if_needed(
-    player_id: int, map_id: str, x: int, y: int, websocket, chunk_size: int = CHUNK_SIZE
+    player_id: int,
+    map_id: str,
+    x: int,
+    y: int,
+    manager: ConnectionManager,
+    chunk_size: int = CHUNK_SIZE,
 ) -> None:
     """
     Send chunk data if player moved to a new chunk.
@@ -556,7 +688,7 @@ async def send_chunk_update_if_needed(
         player_id: Player's unique database ID
         map_id: Current map ID
         x, y: Player's current tile position
-        websocket: Player's WebSocket connection
+        manager: ConnectionManager holding the player's outbound queue
         chunk_size: Size of chunks in tiles
     """
     try:
@@ -592,9 +724,11 @@ async def send_chunk_update_if_needed(
                     version=PROTOCOL_VERSION
                 )
 
-                await websocket.send_bytes(
-                    msgpack.packb(chunk_message.model_dump(), use_bin_type=True)
+                sent = await manager.send_personal_message(
+                    player_id, msgpack.packb(chunk_message.model_dump(), use_bin_type=True)
                 )
+                if not sent:
+                    return
 
                 # Update tracked position
                 await state.set_player_chunk_position(player_id, current_chunk)
@@ -622,16 +756,20 @@ async def send_chunk_update_if_needed(
 
 async def send_diff_update(
     player_id: int, 
-    websocket, 
+    manager: ConnectionManager, 
     diff: Dict[str, List[Dict[str, Any]]],
     map_id: str
 ) -> None:
     """
     Send a diff-based game state update to a specific player.
+
+    The update is queued as droppable: if the player's outbound queue sheds
+    it, the player's visibility state is marked for a full resync so the
+    next diff makes up for it.
     
     Args:
         player_id: Player's unique database ID
-        websocket: Player's WebSocket connection
+        manager: ConnectionManager holding the player's outbound queue
         diff: The entity diff (added/updated/removed)
         map_id: The map identifier
     """
@@ -689,7 +827,17 @@ async def send_diff_update(
         
         packed = msgpack.packb(update_message.model_dump(), use_bin_type=True)
         if packed:
-            await websocket.send_bytes(packed)
+            recorder = get_tick_recorder()
+            if recorder:
+                recorder.record_outbound(player_id, packed)
+            removed_keys = [e.get("id") for e in diff["removed"]]
+            visibility_service = get_visibility_service()
+            await manager.send_personal_message(
+                player_id,
+                packed,
+                droppable=True,
+                on_drop=lambda: visibility_service.mark_resync(player_id, removed_keys),
+            )
             
     except Exception as e:
         logger.error(
@@ -706,6 +854,11 @@ async def cleanup_disconnected_player(player_id: int) -> None:
     """Clean up state tracking for a disconnected player."""
     state = get_game_loop_state()
     await state.cleanup_player(player_id)
+    get_death_queue().discard(player_id)
+
+    # Write back and release any hot state still owned by the game loop
+    player_mgr = get_player_state_manager()
+    await player_mgr.detach_hot_state(player_id)
     
     # Remove player from VisibilityService
     visibility_service = get_visibility_service()
@@ -813,381 +966,627 @@ async def _handle_player_death(
         await state.remove_dying_player(player_id)
 
 
+async def finalize_dying_entity(instance_id: int) -> None:
+    """
+    Finish an entity's death once its death animation is over.
+
+    Scheduled on the timing wheel for the entity's death_tick when it is
+    marked as dying.
+    """
+    await get_entity_manager().finalize_entity_death(instance_id)
+    # Clean up AI timer state for dead entity
+    AIService.cleanup_entity_timers(instance_id)
+
+
+async def rearm_dying_entities(current_tick: int) -> int:
+    """
+    Schedule finalize_dying_entity for the dying entities of this process's
+    maps.
+
+    Death timers only live on the in-process timing wheel, so an entity that
+    was dying when the game loop (or the process) stopped would otherwise
+    stay dying. Run when the game loop starts. A death_tick further away than
+    the death animation comes from an earlier tick counter and is finalized
+    on the next tick; finalizing twice is harmless.
+
+    Returns:
+        Number of entities scheduled
+    """
+    entity_mgr = get_entity_manager()
+    timing_wheel = get_timing_wheel()
+    map_ids = list(get_map_manager().maps.keys())
+    owned = owned_map_ids(map_ids)
+
+    rearmed = 0
+    for map_id in map_ids if owned is None else owned:
+        for entity in await entity_mgr.get_map_entities(map_id):
+            if entity.get("state") != EntityState.DYING.value:
+                continue
+            death_tick = entity.get("death_tick") or 0
+            if not current_tick < death_tick <= current_tick + ENTITY_DEATH_ANIMATION_TICKS:
+                death_tick = current_tick + 1
+            timing_wheel.schedule_at(death_tick, finalize_dying_entity, entity["instance_id"])
+            rearmed += 1
+    return rearmed
+
+
 async def register_player_login(player_id: int) -> None:
     """Register a player's login tick for staggered HP regen."""
     state = get_game_loop_state()
     await state.register_player_login(player_id)
 
 
-async def game_loop(manager: ConnectionManager, valkey: GlideClient) -> None:
+async def _hand_off_departed_players(
+    player_ids: List[int],
+    player_states: Dict[int, Dict[str, Any]],
+    map_id: str,
+    manager: ConnectionManager,
+) -> List[int]:
     """
-    The main game loop with diff-based visibility broadcasting.
-    
-    Each player only receives updates about entities within their visible
-    chunk range, and only when those entities have changed since the last tick.
+    Hand players now on a map owned by another worker over to that worker.
+
+    Their session is closed with SHARD_HANDOFF_CLOSE_CODE: the websocket
+    endpoint saves their state on the way out, then the gateway reconnects
+    them to the worker owning their new map.
+
+    Returns:
+        The players that stay on this worker
+    """
+    staying: List[int] = []
+    for player_id in player_ids:
+        player_map = (player_states.get(player_id) or {}).get("map_id") or map_id
+        if player_map == map_id or owns_map(player_map):
+            staying.append(player_id)
+            continue
+
+        websocket = manager.get_player_websocket(player_id)
+        if websocket is not None and getattr(websocket, "close_code", None) is None:
+            shard_map_handoffs_total.inc()
+            logger.info(
+                "Handing player off to the worker owning their map",
+                extra={"player_id": player_id, "from_map": map_id, "to_map": player_map},
+            )
+            await websocket.close(code=SHARD_HANDOFF_CLOSE_CODE)
+    return staying
+
+
+async def _process_map_tick(
+    map_id: str,
+    map_connections: Dict[int, Any],
+    manager: ConnectionManager,
+    current_tick: int,
+    profiler: TickProfiler,
+) -> None:
+    """
+    Run one tick of the pipeline for a single map.
+
+    Fetches player state, runs HP regeneration, entity AI, combat and death
+    checks, then computes and sends each player's visibility diff.
 
     Args:
-        manager: The connection manager.
-        valkey: The Valkey client.
+        map_id: Map being processed
+        map_connections: {player_id: websocket} for players on this map
+        manager: ConnectionManager for broadcasting
+        current_tick: Current tick number
+        profiler: Profiler for the current tick
     """
     from ..services.hp_service import HpService
     from ..services.equipment_service import EquipmentService
     
     state = get_game_loop_state()
-    tick_interval = 1 / settings.GAME_TICK_RATE
     hp_regen_interval = settings.HP_REGEN_INTERVAL_TICKS
-    db_sync_interval = settings.DB_SYNC_INTERVAL_TICKS
-    cleanup_interval = settings.GROUND_ITEMS_CLEANUP_INTERVAL * settings.GAME_TICK_RATE
 
-    while True:
-        loop_start_time = time.time()
-        try:
-            # Track game loop iteration
-            game_loop_iterations_total.inc()
-            
-            # Increment global tick counter
-            current_tick = state.increment_tick()
 
-            # Periodic batch sync of dirty data to database
-            if current_tick % db_sync_interval == 0:
-                try:
-                    sync_coordinator = get_batch_sync_coordinator()
-                    await sync_coordinator.sync_all()
-                except Exception as sync_error:
-                    logger.error(
-                        "Batch sync failed",
-                        extra={
-                            "error": str(sync_error),
-                            "tick": current_tick,
-                            "traceback": traceback.format_exc(),
-                        },
-                    )
+    # map_connections is now {player_id: websocket}
+    player_ids = list(map_connections.keys())
+                
+    player_mgr = get_player_state_manager()
+    entity_mgr = get_entity_manager()
+    reference_mgr = get_reference_data_manager()
+    visibility_service = get_visibility_service()
+    visual_registry = get_visual_registry()
+                
+    # Process player data and collect HP regeneration updates
+    all_player_data: List[Dict[str, Any]] = []
+    player_positions: Dict[int, Tuple[int, int]] = {}  # player_id -> (x, y)
+    hp_updates: List[Tuple[int, int]] = []  # (player_id, new_hp)
 
-            # Process entity respawn queue (every 10 ticks = 2x/sec)
-            if current_tick % 10 == 0:
-                try:
-                    entity_mgr = get_entity_manager()
-                    await EntitySpawnService.check_respawn_queue(entity_mgr)
-                except TimeoutError as timeout_error:
-                    # Transient timeout on non-critical operation - just warn
-                    logger.warning(
-                        "Entity respawn queue check timed out (retrying next cycle)",
-                        extra={
-                            "error": str(timeout_error),
-                            "tick": current_tick,
-                        },
-                    )
-                except Exception as respawn_error:
-                    logger.error(
-                        "Entity respawn processing failed",
-                        extra={
-                            "error": str(respawn_error),
-                            "tick": current_tick,
-                            "traceback": traceback.format_exc(),
-                        },
-                    )
+    # Fetch all player states for this map in one round trip; attached
+    # players are served from memory from now on
+    with profiler.phase("player_fetch", map_id):
+        await player_mgr.attach_hot_states(player_ids)
+        player_states = await player_mgr.get_many_full_states(player_ids)
 
-            # Clean up expired ground items periodically
-            if current_tick % cleanup_interval == 0:
-                try:
-                    from ..services.ground_item_service import GroundItemService
-                    
-                    active_maps = list(manager.connections_by_map.keys())
-                    total_cleaned = 0
-                    for map_id in active_maps:
-                        cleaned = await GroundItemService.cleanup_expired_items(map_id)
-                        total_cleaned += cleaned
-                    
-                    if total_cleaned > 0:
-                        logger.info(
-                            "Cleaned up expired ground items",
-                            extra={
-                                "total_cleaned": total_cleaned,
-                                "maps_checked": len(active_maps),
-                                "tick": current_tick,
-                            },
-                        )
-                except Exception as cleanup_error:
-                    logger.error(
-                        "Ground item cleanup failed",
-                        extra={
-                            "error": str(cleanup_error),
-                            "tick": current_tick,
-                            "traceback": traceback.format_exc(),
-                        },
-                    )
+    # In a sharded deployment, players who moved to a map owned by another
+    # worker are handed off to it rather than ticked here
+    if sharding_enabled():
+        player_ids = await _hand_off_departed_players(
+            player_ids, player_states, map_id, manager
+        )
 
-            # Process each active map
-            active_maps = list(manager.connections_by_map.keys())
-            for map_id in active_maps:
-                map_connections = manager.connections_by_map.get(map_id, {})
-                if not map_connections:
-                    continue
-                
-                # map_connections is now {player_id: websocket}
-                player_ids = list(map_connections.keys())
-                
-                player_mgr = get_player_state_manager()
-                entity_mgr = get_entity_manager()
-                reference_mgr = get_reference_data_manager()
-                visibility_service = get_visibility_service()
-                visual_registry = get_visual_registry()
-                
-                # Process player data and collect HP regeneration updates
-                all_player_data: List[Dict[str, Any]] = []
-                player_positions: Dict[int, Tuple[int, int]] = {}  # player_id -> (x, y)
-                hp_updates: List[Tuple[int, int]] = []  # (player_id, new_hp)
-                
-                # Fetch player states directly by player_id
-                for player_id in player_ids:
-                    # Get player state directly using player_id
-                    data = await player_mgr.get_player_full_state(player_id)
-                    if data:
-                        x = int(data.get("x", 0))
-                        y = int(data.get("y", 0))
-                        current_hp = int(data.get("current_hp", 10))
-                        max_hp = int(data.get("max_hp", 10))
-                        appearance = data.get("appearance")  # Dict or None
-                        facing_direction = data.get("facing_direction", "DOWN")
-                        username = data.get("username", "")
-                        
-                        # Calculate HP regeneration based on player login time
-                        login_tick = await state.get_player_login_tick(player_id) or current_tick
-                        ticks_since_login = current_tick - login_tick
-                        should_regen = (
-                            ticks_since_login > 0 
-                            and ticks_since_login % hp_regen_interval == 0
-                            and current_hp < max_hp
-                        )
-                        
-                        if should_regen:
-                            new_hp = min(current_hp + 1, max_hp)
-                            hp_updates.append((player_id, new_hp))
-                            current_hp = new_hp  # Use updated HP for this tick
-                        
-                        # Get equipped items for paperdoll rendering
-                        equipment_data = await EquipmentService.get_equipment(player_id)
-                        equipped_items = _build_equipped_items_map(equipment_data, reference_mgr)
+    for player_id in player_ids:
+        data = player_states.get(player_id)
+        if data:
+            x = int(data.get("x", 0))
+            y = int(data.get("y", 0))
+            current_hp = int(data.get("current_hp", 10))
+            max_hp = int(data.get("max_hp", 10))
+            appearance = data.get("appearance")  # Dict or None
+            facing_direction = data.get("facing_direction", "DOWN")
+            username = data.get("username", "")
+
+            # HP regeneration: damaged players wait in a due-time queue, so
+            # players at full HP cost nothing here
+            if current_hp < max_hp:
+                if state.take_hp_regen_due(player_id):
+                    current_hp += 1  # Use updated HP for this tick
+                    hp_updates.append((player_id, current_hp))
+                if current_hp < max_hp:
+                    state.schedule_hp_regen(player_id, current_tick, hp_regen_interval)
+
+            # Get equipped items for paperdoll rendering
+            with profiler.phase("equipment_fetch", map_id):
+                equipment_data = await EquipmentService.get_equipment(player_id)
+                equipped_items = _build_equipped_items_map(equipment_data, reference_mgr)
                         
-                        # Build visual state and register with visual registry
-                        # Wrapped in try/except to prevent one bad player from crashing all players
-                        try:
-                            visual_state = _build_visual_state(appearance, equipped_items)
-                            visual_hash = await visual_registry.register_visual_state(
-                                f"player_{player_id}", visual_state
-                            )
-                        except Exception as visual_error:
-                            logger.error(
-                                "Failed to build visual state for player",
-                                extra={
-                                    "player_id": player_id,
-                                    "username": username,
-                                    "error": str(visual_error),
-                                    "appearance": str(appearance)[:200] if appearance else None,
-                                },
-                            )
-                            # Skip this player for this tick - they'll be retried next tick
-                            continue
+            # Build visual state and register with visual registry
+            # Wrapped in try/except to prevent one bad player from crashing all players
+            try:
+                with profiler.phase("visual_state", map_id):
+                    visual_state = _build_visual_state(appearance, equipped_items)
+                    visual_hash = await visual_registry.register_visual_state(
+                        f"player_{player_id}", visual_state
+                    )
+            except Exception as visual_error:
+                logger.error(
+                    "Failed to build visual state for player",
+                    extra={
+                        "player_id": player_id,
+                        "username": username,
+                        "error": str(visual_error),
+                        "appearance": str(appearance)[:200] if appearance else None,
+                    },
+                )
+                # Skip this player for this tick - they'll be retried next tick
+                continue
                         
-                        all_player_data.append({
-                            "player_id": player_id,
-                            "username": username,  # For display
-                            "x": x,
-                            "y": y,
-                            "current_hp": current_hp,
-                            "max_hp": max_hp,
-                            "facing_direction": facing_direction,
-                            "visual_hash": visual_hash,
-                            "visual_state": visual_state.to_dict(),
-                        })
-                        player_positions[player_id] = (x, y)
-
-                # Execute batch HP regeneration updates via HpService
-                # Filter out dying players - they should not regenerate HP
-                if hp_updates:
-                    valid_hp_updates = [
-                        (player_id, new_hp) 
-                        for player_id, new_hp in hp_updates 
-                        if not await state.is_player_dying(player_id)
-                    ]
-                    if valid_hp_updates:
-                        await HpService.batch_regenerate_hp(valid_hp_updates)
-
-                # Fetch all entity instances once for this map (reused for visibility)
-                all_map_entity_instances = await entity_mgr.get_map_entities(map_id)
+            all_player_data.append({
+                "player_id": player_id,
+                "username": username,  # For display
+                "x": x,
+                "y": y,
+                "current_hp": current_hp,
+                "max_hp": max_hp,
+                "facing_direction": facing_direction,
+                "visual_hash": visual_hash,
+                "visual_state": visual_state.to_dict(),
+            })
+            player_positions[player_id] = (x, y)
+
+    # Execute batch HP regeneration updates via HpService
+    # Filter out dying players - they should not regenerate HP
+    if hp_updates:
+        with profiler.phase("hp_regen", map_id):
+            valid_hp_updates = [
+                (player_id, new_hp)
+                for player_id, new_hp in hp_updates
+                if not await state.is_player_dying(player_id)
+            ]
+            if valid_hp_updates:
+                await HpService.batch_regenerate_hp(valid_hp_updates)
+
+    # Fetch all entity instances once for this map (reused for visibility)
+    with profiler.phase("entity_fetch", map_id):
+        all_map_entity_instances = await entity_mgr.get_map_entities(map_id)
+
+    # Process entity AI for this map; entity writes go out as one batch
+    with profiler.phase("ai", map_id):
+        async with unit_of_work(entity_mgr.valkey):
+            entity_combat_events = await AIService.process_entities(
+                entity_mgr=entity_mgr,
+                map_id=map_id,
+                current_tick=current_tick,
+                wake_radius_chunks=settings.ENTITY_AI_WAKE_RADIUS_CHUNKS,
+            )
                 
-                # Process dying entities (death animation completion)
-                for entity in all_map_entity_instances:
-                    if entity.get("state") == EntityState.DYING.value:
-                        death_tick = int(entity.get("death_tick", 0))
-                        if current_tick >= death_tick:
-                            # Death animation complete, finalize death
-                            await entity_mgr.finalize_entity_death(entity["instance_id"])
-                            # Clean up AI timer state for dead entity
-                            AIService.cleanup_entity_timers(entity["instance_id"])
-
-                # Process entity AI for this map
-                entity_combat_events = await AIService.process_entities(
-                    entity_mgr=entity_mgr,
-                    map_id=map_id,
-                    current_tick=current_tick,
+    # Broadcast any entity combat events
+    if entity_combat_events:
+        with profiler.phase("combat_event_broadcast", map_id):
+            for combat_event in entity_combat_events:
+                event_message = WSMessage(
+                    id=None,
+                    type=MessageType.EVENT_COMBAT_ACTION,
+                    payload={
+                        "attacker_type": CombatTargetType.ENTITY.value,
+                        "attacker_id": combat_event.attacker_id,
+                        "attacker_name": combat_event.attacker_name,
+                        "defender_type": CombatTargetType.PLAYER.value,
+                        "defender_id": combat_event.defender_id,
+                        "defender_name": combat_event.defender_name,
+                        "hit": combat_event.hit,
+                        "damage": combat_event.damage,
+                        "defender_hp": combat_event.defender_hp,
+                        "defender_died": combat_event.defender_died,
+                        "message": combat_event.message,
+                    },
+                    version=PROTOCOL_VERSION,
                 )
-                
-                # Broadcast any entity combat events
-                if entity_combat_events:
-                    for combat_event in entity_combat_events:
-                        event_message = WSMessage(
-                            id=None,
-                            type=MessageType.EVENT_COMBAT_ACTION,
-                            payload={
-                                "attacker_type": CombatTargetType.ENTITY.value,
-                                "attacker_id": combat_event.attacker_id,
-                                "attacker_name": combat_event.attacker_name,
-                                "defender_type": CombatTargetType.PLAYER.value,
-                                "defender_id": combat_event.defender_id,
-                                "defender_name": combat_event.defender_name,
-                                "hit": combat_event.hit,
-                                "damage": combat_event.damage,
-                                "defender_hp": combat_event.defender_hp,
-                                "defender_died": combat_event.defender_died,
-                                "message": combat_event.message,
-                            },
-                            version=PROTOCOL_VERSION,
-                        )
-                        packed_event = msgpack.packb(event_message.model_dump(), use_bin_type=True)
-                        if packed_event:
-                            await manager.broadcast_to_map(combat_event.map_id, packed_event)
-                
-                # Check for player deaths and spawn death handlers
-                for player_id in player_ids:
-                    # Skip players already in death sequence
-                    if await state.is_player_dying(player_id):
-                        continue
-                    
-                    # Check player HP via HpService
-                    current_hp, max_hp = await HpService.get_hp(player_id)
-                    if current_hp <= 0:
-                        # Player died - add to dying set and spawn death handler
-                        if await state.add_dying_player(player_id):
-                            task = asyncio.create_task(
-                                _handle_player_death(player_id, map_id, manager),
-                                name=f"death_handler_{player_id}"
-                            )
-                            state.track_task(task)
-
-                # Process auto-attacks for all players in combat
-                await _process_auto_attacks(player_mgr, entity_mgr, manager, current_tick)
-
-                # For each connected player, compute and send their personalized diff
-                for player_id in player_ids:
-                    if player_id not in player_positions:
-                        continue
+                packed_event = msgpack.packb(event_message.model_dump(), use_bin_type=True)
+                if packed_event:
+                    await manager.broadcast_to_map(combat_event.map_id, packed_event)
+
+    # Spawn death handlers for players whose HP reached zero (HpService
+    # queues them as it writes HP, including AI attacks from this tick)
+    with profiler.phase("death_check", map_id):
+        for player_id in get_death_queue().take(player_ids):
+            # Players already in their death sequence are skipped
+            if await state.add_dying_player(player_id):
+                task = asyncio.create_task(
+                    _handle_player_death(player_id, map_id, manager),
+                    name=f"death_handler_{player_id}"
+                )
+                state.track_task(task)
+
+    # Process auto-attacks for players on this map that are in combat
+    with profiler.phase("auto_attacks", map_id):
+        await _process_auto_attacks(
+            player_mgr, entity_mgr, manager, current_tick, player_ids=set(player_ids)
+        )
+
+    # Build each player's and entity's wire representation once for this tick;
+    # per-viewer work below only selects references into these dicts.
+    # Visibility candidates come from the managers' spatial indexes.
+    with profiler.phase("entity_payloads", map_id):
+        player_payloads = build_player_payloads(all_player_data)
+        entity_payloads = build_npc_entity_payloads(all_map_entity_instances)
+    visible_range = (VISIBILITY_RADIUS + 1) * CHUNK_SIZE
+
+    # For each connected player, compute and send their personalized diff
+    for player_id in player_ids:
+        if player_id not in player_positions:
+            continue
                         
-                    websocket = map_connections.get(player_id)
-                    if not websocket:
-                        continue
-                    
-                    player_x, player_y = player_positions[player_id]
-                    
-                    # Get player entities currently visible to this player
-                    current_visible_players = get_visible_players(
-                        player_x, player_y, all_player_data, player_id
-                    )
-                    
-                    # Get entity instances visible to this player (reuse already fetched data)
-                    current_visible_entities = get_visible_npc_entities(
-                        player_x, player_y, all_map_entity_instances
-                    )
-                    
-                    # Get ground items visible to this player
-                    from ..services.ground_item_service import GroundItemService
-                    visible_ground_items = await GroundItemService.get_visible_ground_items(
-                        player_id=player_id,
-                        map_id=map_id,
-                        center_x=player_x,
-                        center_y=player_y,
-                        tile_radius=32,  # Same as visibility range
-                    )
-                    
-                    # Convert GroundItem Pydantic models to dicts for visibility tracking
-                    current_visible_ground_items = {}
-                    for ground_item in visible_ground_items:
-                        current_visible_ground_items[ground_item.id] = {
-                            "type": "ground_item",
-                            "id": ground_item.id,
-                            "item_id": ground_item.item.id,
-                            "item_name": ground_item.item.name,
-                            "display_name": ground_item.item.display_name,
-                            "rarity": ground_item.item.rarity.value,
-                            "x": ground_item.x,
-                            "y": ground_item.y,
-                            "quantity": ground_item.quantity,
-                            "is_protected": not ground_item.is_yours and ground_item.is_protected,
-                            "icon_sprite_id": ground_item.item.icon_sprite_id,
-                        }
-                    
-                    # Combine players and ground items into single visibility state
-                    combined_visible_entities: Dict[str, Dict[str, Any]] = {}
-                    
-                    # Add the player's own data (so client can track its own position)
-                    own_player_data = None
-                    for entity in all_player_data:
-                        if entity.get("player_id") == player_id:
-                            own_player_data = {
-                                "id": f"player_{player_id}",  # Entity ID for client tracking
-                                "type": "player",
-                                "player_id": player_id,
-                                "username": entity.get("username", ""),  # For display
-                                "x": entity.get("x", player_x),
-                                "y": entity.get("y", player_y),
-                                "current_hp": entity.get("current_hp", 0),
-                                "max_hp": entity.get("max_hp", 0),
-                                "facing_direction": entity.get("facing_direction", "DOWN"),
-                            }
-                            if "visual_hash" in entity:
-                                own_player_data["visual_hash"] = entity["visual_hash"]
-                            if "visual_state" in entity:
-                                own_player_data["visual_state"] = entity["visual_state"]
-                            break
-                    
-                    if own_player_data:
-                        combined_visible_entities[f"player_{player_id}"] = own_player_data
-                    else:
-                        logger.warning("own_player_data is None for player", extra={"player_id": player_id})
+        websocket = map_connections.get(player_id)
+        if not websocket:
+            continue
                     
-                    # Add other players with 'player_' prefix to avoid ID conflicts with ground items
-                    for other_player_id, player_data in current_visible_players.items():
-                        combined_visible_entities[f"player_{other_player_id}"] = player_data
+        player_x, player_y = player_positions[player_id]
+
+        with profiler.phase("visibility", map_id):
+            # Get player entities currently visible to this player
+            current_visible_players = {}
+            for other_id in player_mgr.get_player_ids_near(
+                map_id, player_x, player_y, visible_range
+            ):
+                payload = player_payloads.get(other_id)
+                if (
+                    other_id != player_id
+                    and payload is not None
+                    and is_in_visible_range(player_x, player_y, payload["x"], payload["y"])
+                ):
+                    current_visible_players[other_id] = payload
+
+            # Get entity instances visible to this player (reuse already built payloads)
+            current_visible_entities = {}
+            for instance_id in entity_mgr.get_entity_ids_near(
+                map_id, player_x, player_y, visible_range
+            ):
+                payload = entity_payloads.get(instance_id)
+                if payload is not None and is_in_visible_range(
+                    player_x, player_y, payload["x"], payload["y"]
+                ):
+                    current_visible_entities[f"entity_{instance_id}"] = payload
+
+        # Get ground items visible to this player
+        from ..services.ground_item_service import GroundItemService
+        with profiler.phase("ground_items", map_id):
+            visible_ground_items = await GroundItemService.get_visible_ground_items(
+                player_id=player_id,
+                map_id=map_id,
+                center_x=player_x,
+                center_y=player_y,
+                tile_radius=visible_range,
+            )
                     
-                    # Add ground items directly (they already have unique IDs)
-                    for ground_item_id, ground_item_data in current_visible_ground_items.items():
-                        combined_visible_entities[f"ground_item_{ground_item_id}"] = ground_item_data
+        # Convert GroundItem Pydantic models to dicts for visibility tracking
+        current_visible_ground_items = {}
+        for ground_item in visible_ground_items:
+            current_visible_ground_items[ground_item.id] = {
+                "type": "ground_item",
+                "id": ground_item.id,
+                "item_id": ground_item.item.id,
+                "item_name": ground_item.item.name,
+                "display_name": ground_item.item.display_name,
+                "rarity": ground_item.item.rarity.value,
+                "x": ground_item.x,
+                "y": ground_item.y,
+                "quantity": ground_item.quantity,
+                "is_protected": not ground_item.is_yours and ground_item.is_protected,
+                "icon_sprite_id": ground_item.item.icon_sprite_id,
+            }
                     
-                    # Add entity instances (already has entity_ prefix from helper function)
-                    for entity_key, entity_data in current_visible_entities.items():
-                        combined_visible_entities[entity_key] = entity_data
+        # Combine players and ground items into single visibility state
+        combined_visible_entities: Dict[str, Dict[str, Any]] = {}
                     
-                    # Use VisibilityService to compute diff and update state
-                    diff = await visibility_service.update_player_visible_entities(player_id, combined_visible_entities)
+        # Add the player's own data (so client can track its own position)
+        own_player_data = player_payloads.get(player_id)
+        if own_player_data:
+            combined_visible_entities[f"player_{player_id}"] = own_player_data
+        else:
+            logger.warning("own_player_data is None for player", extra={"player_id": player_id})
                     
-                    # Send diff update if there are changes
-                    await send_diff_update(player_id, websocket, diff, map_id)
+        # Add other players with 'player_' prefix to avoid ID conflicts with ground items
+        for other_player_id, player_data in current_visible_players.items():
+            combined_visible_entities[f"player_{other_player_id}"] = player_data
+
+        # Add ground items directly (they already have unique IDs).
+        # Their payload differs per viewer (is_protected), so each variant is
+        # versioned under its own key to avoid viewers bumping each other.
+        ground_item_versions: Dict[str, int] = {}
+        for ground_item_id, ground_item_data in current_visible_ground_items.items():
+            entity_key = f"ground_item_{ground_item_id}"
+            variant = "protected" if ground_item_data["is_protected"] else "public"
+            combined_visible_entities[entity_key] = ground_item_data
+            ground_item_versions[entity_key] = visibility_service.entity_versions.stamp(
+                f"{entity_key}:{variant}", ground_item_data
+            )
+
+        # Add entity instances (already has entity_ prefix from helper function)
+        for entity_key, entity_data in current_visible_entities.items():
+            combined_visible_entities[entity_key] = entity_data
                     
-                    # Check if player needs chunk updates
-                    await send_chunk_update_if_needed(
-                        player_id, map_id, player_x, player_y, websocket
-                    )
+        # Use VisibilityService to compute diff and update state
+        with profiler.phase("visibility_diff", map_id):
+            diff = await visibility_service.update_player_visible_entities(
+                player_id, combined_visible_entities, versions=ground_item_versions
+            )
+
+        with profiler.phase("send", map_id):
+            # Send diff update if there are changes
+            await send_diff_update(player_id, manager, diff, map_id)
+
+            # Check if player needs chunk updates
+            await send_chunk_update_if_needed(
+                player_id, map_id, player_x, player_y, manager
+            )
                     
-                # Track broadcast for metrics
-                game_state_broadcasts_total.labels(map_id=map_id).inc()
+    # Track broadcast for metrics
+    game_state_broadcasts_total.labels(map_id=map_id).inc()
+
+
+async def _run_map_tick(
+    map_id: str,
+    map_connections: Dict[int, Any],
+    manager: ConnectionManager,
+    current_tick: int,
+    profiler: TickProfiler,
+) -> None:
+    """
+    Run a map's tick pipeline with failure isolation and duration metrics.
+
+    Exceptions are logged and counted rather than propagated, so one failing
+    map never cancels the other maps' tasks in the same tick.
+    """
+    started = time.perf_counter()
+    try:
+        await _process_map_tick(map_id, map_connections, manager, current_tick, profiler)
+    except Exception as e:
+        game_loop_map_errors_total.labels(map_id=map_id).inc()
+        logger.error(
+            "Map tick failed",
+            extra={
+                "map_id": map_id,
+                "tick": current_tick,
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "traceback": traceback.format_exc(),
+            },
+        )
+    finally:
+        game_loop_map_duration_seconds.labels(map_id=map_id).observe(
+            time.perf_counter() - started
+        )
+
+
+async def run_game_tick(
+    manager: ConnectionManager,
+    current_tick: int,
+    profiler: TickProfiler,
+    sync_to_database: bool = True,
+) -> None:
+    """
+    Run every stage of one game loop tick.
+
+    Covers delayed actions, periodic write-behind and maintenance, and the
+    per-map ticks (run concurrently, one task per map). Pacing, tick
+    counting and metrics are left to the caller, so headless tools can drive
+    ticks without the scheduler.
+
+    Args:
+        manager: The connection manager.
+        current_tick: The tick being run.
+        profiler: Profiler collecting this tick's phase timings.
+        sync_to_database: Whether to run the periodic batch sync to the
+            database (off for tools running without one).
+    """
+    state = get_game_loop_state()
+    db_sync_interval = settings.DB_SYNC_INTERVAL_TICKS
+    hot_state_flush_interval = settings.HOT_STATE_FLUSH_INTERVAL_TICKS
+    cleanup_interval = settings.GROUND_ITEMS_CLEANUP_INTERVAL * settings.GAME_TICK_RATE
+
+    # Delayed actions (death animations, respawn delays, ...) due this tick
+    with profiler.phase("timers"):
+        await get_timing_wheel().run_due(current_tick)
+
+    # Periodic write-behind of in-memory player state to Valkey
+    if current_tick % hot_state_flush_interval == 0:
+        try:
+            with profiler.phase("hot_state_flush"):
+                await get_player_state_manager().flush_hot_state()
+        except Exception as flush_error:
+            logger.error(
+                "Hot state flush failed",
+                extra={
+                    "error": str(flush_error),
+                    "tick": current_tick,
+                    "traceback": traceback.format_exc(),
+                },
+            )
+
+    # Periodic batch sync of dirty data to database
+    if sync_to_database and current_tick % db_sync_interval == 0:
+        try:
+            with profiler.phase("db_sync"):
+                sync_coordinator = get_batch_sync_coordinator()
+                await sync_coordinator.sync_all()
+        except Exception as sync_error:
+            logger.error(
+                "Batch sync failed",
+                extra={
+                    "error": str(sync_error),
+                    "tick": current_tick,
+                    "traceback": traceback.format_exc(),
+                },
+            )
+
+    # Process entity respawn queue (every 10 ticks = 2x/sec)
+    if current_tick % 10 == 0:
+        try:
+            with profiler.phase("respawn_queue"):
+                entity_mgr = get_entity_manager()
+                await EntitySpawnService.check_respawn_queue(
+                    entity_mgr, map_ids=owned_map_ids(get_map_manager().maps.keys())
+                )
+        except TimeoutError as timeout_error:
+            # Transient timeout on non-critical operation - just warn
+            logger.warning(
+                "Entity respawn queue check timed out (retrying next cycle)",
+                extra={
+                    "error": str(timeout_error),
+                    "tick": current_tick,
+                },
+            )
+        except Exception as respawn_error:
+            logger.error(
+                "Entity respawn processing failed",
+                extra={
+                    "error": str(respawn_error),
+                    "tick": current_tick,
+                    "traceback": traceback.format_exc(),
+                },
+            )
+
+    # Clean up expired ground items periodically
+    if current_tick % cleanup_interval == 0:
+        try:
+            from ..services.ground_item_service import GroundItemService
+
+            active_maps = list(manager.connections_by_map.keys())
+            total_cleaned = 0
+            for map_id in active_maps:
+                with profiler.phase("ground_item_cleanup", map_id):
+                    cleaned = await GroundItemService.cleanup_expired_items(map_id)
+                total_cleaned += cleaned
+
+            if total_cleaned > 0:
+                logger.info(
+                    "Cleaned up expired ground items",
+                    extra={
+                        "total_cleaned": total_cleaned,
+                        "maps_checked": len(active_maps),
+                        "tick": current_tick,
+                    },
+                )
+        except Exception as cleanup_error:
+            logger.error(
+                "Ground item cleanup failed",
+                extra={
+                    "error": str(cleanup_error),
+                    "tick": current_tick,
+                    "traceback": traceback.format_exc(),
+                },
+            )
+
+    # Players whose HP regen or auto-attack is due; claimed by their map below
+    state.collect_hp_regen_due(current_tick)
+    get_player_state_manager().combat_scheduler.collect_due(current_tick)
+
+    # Process each active map concurrently; a slow map does not delay the others
+    active_maps = [
+        (map_id, map_connections)
+        for map_id, map_connections in list(manager.connections_by_map.items())
+        if map_connections
+    ]
+    async with asyncio.TaskGroup() as task_group:
+        for map_id, map_connections in active_maps:
+            task_group.create_task(
+                _run_map_tick(map_id, map_connections, manager, current_tick, profiler),
+                name=f"map_tick_{map_id}",
+            )
+
+    # Forget versions of entities that no map produced this tick
+    await get_visibility_service().prune_entity_versions()
+
+
+async def game_loop(manager: ConnectionManager, valkey: GlideClient) -> None:
+    """
+    The main game loop with diff-based visibility broadcasting.
+    
+    Each player only receives updates about entities within their visible
+    chunk range, and only when those entities have changed since the last tick.
+
+    Every stage is timed by a TickProfiler so that ticks exceeding the budget
+    are reported with a per-phase, per-map breakdown. Maps are processed
+    concurrently, one task per map. Ticks are paced by a TickScheduler against
+    absolute deadlines on the monotonic clock. With TICK_RECORDING_PATH set,
+    every tick is written to a TickRecorder for offline replay. Valkey calls
+    use the pool's game loop lane.
+
+    Args:
+        manager: The connection manager.
+        valkey: The Valkey client.
+    """
+    # Keep tick commands off the clients used by request handlers
+    use_valkey_lane(VALKEY_LANE_GAME_LOOP)
+    state = get_game_loop_state()
+    tick_interval = 1 / settings.GAME_TICK_RATE
+    recorder = get_tick_recorder()
+    scheduler = TickScheduler(
+        tick_interval,
+        overrun_policy=TickOverrunPolicy(settings.TICK_OVERRUN_POLICY),
+        max_catch_up_ticks=settings.TICK_MAX_CATCH_UP_TICKS,
+    )
+
+    # Dying entities whose death timers were lost with a previous loop
+    try:
+        rearmed = await rearm_dying_entities(state.tick_counter)
+        if rearmed:
+            logger.info("Rescheduled dying entities", extra={"entity_count": rearmed})
+    except Exception as e:
+        logger.warning("Could not reschedule dying entities", extra={"error": str(e)})
+
+    while True:
+        scheduler.begin_tick()
+        loop_start_time = time.perf_counter()
+        try:
+            # Track game loop iteration
+            game_loop_iterations_total.inc()
+            
+            # Increment global tick counter
+            current_tick = state.increment_tick()
+            profiler = TickProfiler(tick=current_tick, budget_seconds=tick_interval)
+
+            await run_game_tick(manager, current_tick, profiler)
+
+            # Record phase breakdown and report budget overruns
+            tick_duration = profiler.finish()
+            if recorder:
+                recorder.end_tick(current_tick, tick_duration, profiler.get_breakdown())
 
-            # Track loop duration and calculate precise sleep time
-            loop_duration = time.time() - loop_start_time
-            game_loop_duration_seconds.observe(loop_duration)
+            game_loop_duration_seconds.observe(time.perf_counter() - loop_start_time)
 
-            # Sleep for remaining tick time to maintain consistent tick rate
-            sleep_time = max(0, tick_interval - loop_duration)
-            await asyncio.sleep(sleep_time)
+            # Sleep until the next tick deadline (or catch up/skip if behind)
+            await scheduler.wait_for_next_tick()
 
         except Exception as e:
             logger.error(
@@ -1200,3 +1599,5 @@ async def game_loop(manager: ConnectionManager, valkey: GlideClient) -> None:
             )
             # Avoid rapid-fire loops on persistent errors
             await asyncio.sleep(1)
+            # Don't try to catch up on the ticks missed while backing off
+            scheduler.reset()
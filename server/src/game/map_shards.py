@@ -0,0 +1,56 @@
+"""
+Map ownership for the sharded deployment.
+
+With SHARD_WORKERS > 1 the game runs as one gateway process and several
+worker processes (see gateway.py and shard_worker.py). Every map is owned by
+exactly one worker, which spawns its entities and runs its ticks; the gateway
+uses the same assignment to route each player to the worker owning their
+map. A single-process server owns every map.
+"""
+
+import os
+import zlib
+from typing import Iterable, Optional, Set
+
+from server.src.core.config import settings
+
+
+def sharding_enabled() -> bool:
+    """Whether the server runs as gateway + map workers."""
+    return settings.SHARD_WORKERS > 1
+
+
+def shard_for_map(map_id: str) -> int:
+    """
+    Index of the worker owning a map.
+
+    Maps listed in SHARD_MAP_ASSIGNMENTS go to their configured worker, the
+    rest are spread by a stable hash of the map id, so every process agrees
+    on the owner without coordinating.
+    """
+    workers = max(settings.SHARD_WORKERS, 1)
+    assigned = settings.SHARD_MAP_ASSIGNMENTS.get(map_id)
+    if assigned is not None:
+        return int(assigned) % workers
+    return zlib.crc32(map_id.encode("utf-8")) % workers
+
+
+def owns_map(map_id: str) -> bool:
+    """Whether this process runs the given map."""
+    return not sharding_enabled() or shard_for_map(map_id) == settings.SHARD_INDEX
+
+
+def owned_map_ids(map_ids: Iterable[str]) -> Optional[Set[str]]:
+    """
+    The maps among map_ids owned by this process.
+
+    Returns None when sharding is off, meaning every map.
+    """
+    if not sharding_enabled():
+        return None
+    return {map_id for map_id in map_ids if owns_map(map_id)}
+
+
+def worker_socket_path(index: int) -> str:
+    """Unix socket a map worker listens on for gateway connections."""
+    return os.path.join(settings.SHARD_SOCKET_DIR, f"worker-{index}.sock")
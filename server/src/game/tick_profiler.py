@@ -0,0 +1,100 @@
+"""
+Tick profiler for the game loop.
+
+Breaks a single game loop iteration down into named phases (per map where
+applicable), exports per-phase Prometheus histograms and emits a structured
+"Tick overrun" log record with the full phase breakdown whenever a tick
+exceeds its time budget.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from server.src.core.logging_config import get_logger
+from server.src.core.metrics import (
+    game_loop_phase_duration_seconds,
+    game_loop_overruns_total,
+)
+
+logger = get_logger(__name__)
+
+# Label used for phases that are not tied to a single map (db sync, respawns, ...)
+GLOBAL_MAP_ID = "global"
+
+
+class TickProfiler:
+    """
+    Collects phase timings for one game loop tick.
+
+    Usage:
+        profiler = TickProfiler(tick=current_tick, budget_seconds=0.05)
+        with profiler.phase("ai", map_id):
+            ...
+        profiler.finish()
+
+    Timings for the same (phase, map_id) pair are accumulated, so a phase that
+    runs inside a per-player loop is reported as a single total. Maps run as
+    concurrent tasks, so phases are wall-clock time and phases of different
+    maps can overlap.
+    """
+
+    def __init__(self, tick: int, budget_seconds: float):
+        self.tick = tick
+        self.budget_seconds = budget_seconds
+        self._start = time.perf_counter()
+        self._phases: Dict[Tuple[str, str], float] = {}
+
+    @contextmanager
+    def phase(self, name: str, map_id: Optional[str] = None) -> Iterator[None]:
+        """Time a block of code as the given phase."""
+        key = (name, map_id or GLOBAL_MAP_ID)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[key] = self._phases.get(key, 0.0) + (time.perf_counter() - started)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds elapsed since the profiler was created."""
+        return time.perf_counter() - self._start
+
+    def get_breakdown(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get phase timings grouped by map.
+
+        Returns:
+            Dict of map_id -> {phase: milliseconds}
+        """
+        breakdown: Dict[str, Dict[str, float]] = {}
+        for (name, map_id), duration in self._phases.items():
+            breakdown.setdefault(map_id, {})[name] = round(duration * 1000, 3)
+        return breakdown
+
+    def finish(self) -> float:
+        """
+        Export phase metrics and report an overrun if the tick went over budget.
+
+        Returns:
+            Total tick duration in seconds
+        """
+        duration = self.elapsed
+
+        for (name, map_id), phase_duration in self._phases.items():
+            game_loop_phase_duration_seconds.labels(phase=name, map_id=map_id).observe(phase_duration)
+
+        if duration > self.budget_seconds:
+            game_loop_overruns_total.inc()
+            logger.warning(
+                "Tick overrun",
+                extra={
+                    "tick": self.tick,
+                    "duration_ms": round(duration * 1000, 3),
+                    "budget_ms": round(self.budget_seconds * 1000, 3),
+                    "overrun_ms": round((duration - self.budget_seconds) * 1000, 3),
+                    "phases": self.get_breakdown(),
+                },
+            )
+
+        return duration
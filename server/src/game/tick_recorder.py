@@ -0,0 +1,217 @@
+"""
+Tick recorder for offline replay of production traffic.
+
+While recording, every frame written describes one game loop tick: the
+inputs that reached the server since the previous tick (connections,
+commands handled by WebSocketHandler.process_message, disconnections), the
+RNG seed the tick ran with and the state diffs sent to each player. Frames
+are msgpack maps appended to a single file, so a recording can be cut at
+any point and still be read back.
+
+CombatService and AIService draw from the global random module, so the
+recorder reseeds it with a fresh seed after each tick; commands handled
+before the next tick and the tick itself both draw from that seed. A replay
+that reseeds with the recorded seed, feeds the recorded inputs and runs the
+tick follows the same random sequence (see tests/stress/replay_ticks.py).
+
+Usage:
+    recorder = get_tick_recorder()  # None unless TICK_RECORDING_PATH is set
+    if recorder:
+        recorder.record_command(player_id, message)
+
+    for frame in read_tick_recording(path):
+        ...
+"""
+
+import random
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import msgpack
+
+from common.src.protocol import WSMessage
+from server.src.core.config import settings
+from server.src.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RECORDING_FORMAT_VERSION = 1
+
+# Frame kinds
+FRAME_HEADER = "header"
+FRAME_TICK = "tick"
+
+# Input kinds within a tick frame
+INPUT_CONNECT = "connect"
+INPUT_COMMAND = "command"
+INPUT_DISCONNECT = "disconnect"
+
+
+class TickRecorder:
+    """
+    Appends one frame per game loop tick to a recording file.
+
+    Owned by the event loop; the recording methods only buffer in memory and
+    end_tick writes the frame, so recording adds no awaits to the tick.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Recording file; frames are appended if it already exists
+        """
+        self.path = path
+        self._file = open(path, "ab")
+        self._seed_source = random.SystemRandom()
+        self._inputs: List[Dict[str, Any]] = []
+        self._outbound: List[List[Any]] = []
+        self._seed = self._reseed()
+        self._write(
+            {
+                "kind": FRAME_HEADER,
+                "version": RECORDING_FORMAT_VERSION,
+                "tick_rate": settings.GAME_TICK_RATE,
+                "started_at": time.time(),
+            }
+        )
+        logger.info("Tick recording started", extra={"path": path})
+
+    def _reseed(self) -> int:
+        seed = self._seed_source.getrandbits(64)
+        random.seed(seed)
+        return seed
+
+    def _write(self, frame: Dict[str, Any]) -> None:
+        self._file.write(msgpack.packb(frame, use_bin_type=True))
+        self._file.flush()
+
+    # =========================================================================
+    # Inputs
+    # =========================================================================
+
+    def record_connect(
+        self,
+        player_id: int,
+        username: str,
+        map_id: str,
+        x: int,
+        y: int,
+        current_hp: int,
+        max_hp: int,
+    ) -> None:
+        """Record a player joining with the state they were initialised with."""
+        self._inputs.append(
+            {
+                "kind": INPUT_CONNECT,
+                "player_id": player_id,
+                "username": username,
+                "map_id": map_id,
+                "x": x,
+                "y": y,
+                "current_hp": current_hp,
+                "max_hp": max_hp,
+            }
+        )
+
+    def record_command(self, player_id: int, message: WSMessage) -> None:
+        """Record a message about to be handled for a player."""
+        self._inputs.append(
+            {
+                "kind": INPUT_COMMAND,
+                "player_id": player_id,
+                "message": message.model_dump(),
+            }
+        )
+
+    def record_disconnect(self, player_id: int) -> None:
+        """Record a player leaving."""
+        self._inputs.append({"kind": INPUT_DISCONNECT, "player_id": player_id})
+
+    # =========================================================================
+    # Outputs
+    # =========================================================================
+
+    def record_outbound(self, player_id: int, data: bytes) -> None:
+        """Record an encoded state update queued for a player."""
+        self._outbound.append([player_id, data])
+
+    def end_tick(self, tick: int, duration: float, phases: Dict[str, Dict[str, float]]) -> None:
+        """
+        Write the frame of a finished tick and reseed for the next one.
+
+        Args:
+            tick: Tick that just ran
+            duration: Tick duration in seconds
+            phases: Phase breakdown from TickProfiler.get_breakdown()
+        """
+        frame = {
+            "kind": FRAME_TICK,
+            "tick": tick,
+            "seed": self._seed,
+            "inputs": self._inputs,
+            "outbound": self._outbound,
+            "duration_ms": round(duration * 1000, 3),
+            "phases": phases,
+        }
+        self._inputs = []
+        self._outbound = []
+        try:
+            self._write(frame)
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(
+                "Failed to write tick recording frame",
+                extra={"path": self.path, "tick": tick, "error": str(e)},
+            )
+        self._seed = self._reseed()
+
+    def close(self) -> None:
+        """Stop recording; inputs of an unfinished tick are discarded."""
+        if not self._file.closed:
+            self._file.close()
+            logger.info("Tick recording stopped", extra={"path": self.path})
+
+
+def read_tick_recording(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read the frames of a recording in order.
+
+    A frame cut short by a crash at the end of the file is ignored.
+
+    Args:
+        path: Recording file
+
+    Yields:
+        Header and tick frames as dicts
+    """
+    with open(path, "rb") as f:
+        unpacker = msgpack.Unpacker(f, raw=False, strict_map_key=False)
+        yield from unpacker
+
+
+# Singleton instance
+_tick_recorder: Optional[TickRecorder] = None
+
+
+def get_tick_recorder() -> Optional[TickRecorder]:
+    """
+    Get the singleton TickRecorder, creating it on first use.
+
+    Returns:
+        The global TickRecorder, or None when recording is disabled
+    """
+    global _tick_recorder
+    if _tick_recorder is None and settings.TICK_RECORDING_PATH:
+        _tick_recorder = TickRecorder(settings.TICK_RECORDING_PATH)
+    return _tick_recorder
+
+
+def reset_tick_recorder() -> None:
+    """
+    Close and reset the singleton instance.
+
+    Used on shutdown and in tests to ensure clean state between tests.
+    """
+    global _tick_recorder
+    if _tick_recorder is not None:
+        _tick_recorder.close()
+    _tick_recorder = None
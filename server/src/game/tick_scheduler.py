@@ -0,0 +1,136 @@
+"""
+Tick scheduler for the game loop.
+
+Ticks are scheduled against absolute deadlines on the monotonic clock
+(tick N is due at start + N * interval), so a slow tick does not shift every
+later tick and wall-clock adjustments do not affect timing. When the loop
+falls behind, the overrun policy decides whether late ticks are run back to
+back to catch up or skipped.
+"""
+
+import asyncio
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+from server.src.core.logging_config import get_logger
+from server.src.core.metrics import (
+    game_loop_skipped_ticks_total,
+    game_loop_tick_jitter_seconds,
+    game_loop_tick_lag_seconds,
+)
+
+logger = get_logger(__name__)
+
+NANOSECONDS = 1_000_000_000
+
+
+class TickOverrunPolicy(str, Enum):
+    """What the scheduler does with tick deadlines that have already passed."""
+
+    # Run late ticks immediately, back to back, up to max_catch_up_ticks behind
+    CATCH_UP = "catch_up"
+    # Drop deadlines that have fully passed and run the current tick right away
+    SKIP = "skip"
+
+
+class TickScheduler:
+    """
+    Paces the game loop at a fixed tick rate.
+
+    Usage:
+        scheduler = TickScheduler(tick_interval=0.05)
+        while True:
+            scheduler.begin_tick()
+            ...
+            await scheduler.wait_for_next_tick()
+
+    Skipped ticks are not run and do not advance the tick counter; with the
+    default catch-up policy ticks are only skipped when the loop is more than
+    max_catch_up_ticks behind, so tick-based timers keep pace with real time
+    through short stalls.
+    """
+
+    def __init__(
+        self,
+        tick_interval: float,
+        overrun_policy: TickOverrunPolicy = TickOverrunPolicy.CATCH_UP,
+        max_catch_up_ticks: int = 5,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ):
+        """
+        Args:
+            tick_interval: Seconds between tick deadlines
+            overrun_policy: Behaviour when deadlines have been missed
+            max_catch_up_ticks: Maximum backlog of late ticks run back to back
+                (catch-up policy only)
+            clock: Monotonic clock in nanoseconds
+        """
+        self._interval_ns = max(1, round(tick_interval * NANOSECONDS))
+        self._policy = overrun_policy
+        self._max_catch_up_ticks = max(0, max_catch_up_ticks)
+        self._clock = clock
+        self._deadline_ns: Optional[int] = None
+        self.skipped_ticks = 0
+
+    @property
+    def tick_interval(self) -> float:
+        return self._interval_ns / NANOSECONDS
+
+    def reset(self) -> None:
+        """Make the next tick due now, forgetting any backlog."""
+        self._deadline_ns = self._clock()
+
+    def begin_tick(self) -> float:
+        """
+        Record how late the current tick started relative to its deadline.
+
+        Returns:
+            Lag in seconds (0 if the tick started on time)
+        """
+        if self._deadline_ns is None:
+            self.reset()
+        lag = max(0, self._clock() - self._deadline_ns) / NANOSECONDS
+        game_loop_tick_lag_seconds.set(lag)
+        game_loop_tick_jitter_seconds.observe(lag)
+        return lag
+
+    def schedule_next_tick(self) -> float:
+        """
+        Advance to the next tick deadline, applying the overrun policy.
+
+        Returns:
+            Seconds to wait before the next tick (0 if it is already due)
+        """
+        if self._deadline_ns is None:
+            self.reset()
+        self._deadline_ns += self._interval_ns
+
+        behind_ns = self._clock() - self._deadline_ns
+        if behind_ns <= 0:
+            return -behind_ns / NANOSECONDS
+
+        # Deadlines after the next one that have also passed already
+        missed = behind_ns // self._interval_ns
+        if self._policy == TickOverrunPolicy.SKIP:
+            skip = missed
+        else:
+            skip = max(0, missed - self._max_catch_up_ticks)
+
+        if skip:
+            self._deadline_ns += skip * self._interval_ns
+            self.skipped_ticks += skip
+            game_loop_skipped_ticks_total.inc(skip)
+            logger.warning(
+                "Game loop behind schedule, skipping ticks",
+                extra={
+                    "skipped_ticks": skip,
+                    "behind_ms": round(behind_ns / 1_000_000, 3),
+                    "policy": self._policy.value,
+                },
+            )
+        return 0.0
+
+    async def wait_for_next_tick(self) -> None:
+        """Sleep until the next tick is due (always yields to the event loop)."""
+        await asyncio.sleep(self.schedule_next_tick())
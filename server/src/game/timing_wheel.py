@@ -0,0 +1,266 @@
+"""
+Hierarchical timing wheel for delayed game actions.
+
+Subsystems register callbacks against a game tick instead of scanning their
+state every tick for deadlines that have passed. The game loop advances the
+wheel once per tick, so the per-tick cost is proportional to the number of
+timers that fire (plus an occasional cascade), not to the number pending.
+
+The wheel has LEVELS levels of SLOTS slots. Level 0 holds timers due within
+the current 64-tick rotation, level 1 within the current 4096-tick rotation,
+and so on; when a lower level wraps around, the matching slot of the level
+above is cascaded down. Timers further out than the top level wait in an
+overflow list.
+
+Usage:
+    from server.src.game.timing_wheel import get_timing_wheel
+
+    handle = get_timing_wheel().schedule_at(death_tick, finalize, instance_id)
+    handle.cancel()
+
+    # In a coroutine driven by the game loop
+    await get_timing_wheel().sleep(ticks)
+"""
+
+import asyncio
+import inspect
+import traceback
+from typing import Any, Callable, List, Optional
+
+from server.src.core.logging_config import get_logger
+from server.src.core.metrics import (
+    game_loop_timers_fired_total,
+    game_loop_timers_pending,
+)
+
+logger = get_logger(__name__)
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 4
+
+
+class TimerHandle:
+    """A scheduled callback. Cancelling is O(1); the entry is skipped when reached."""
+
+    __slots__ = ("due_tick", "callback", "args", "_wheel", "_done")
+
+    def __init__(self, wheel: "TimingWheel", due_tick: int, callback: Callable[..., Any], args: tuple):
+        self.due_tick = due_tick
+        self.callback = callback
+        self.args = args
+        self._wheel = wheel
+        self._done = False
+
+    @property
+    def active(self) -> bool:
+        """True until the timer fires or is cancelled."""
+        return not self._done
+
+    def cancel(self) -> None:
+        """Cancel the timer. Does nothing if it already fired or was cancelled."""
+        if not self._done:
+            self._done = True
+            self._wheel._pending -= 1
+
+
+class TimingWheel:
+    """
+    Tick-based hierarchical timing wheel.
+
+    Not thread-safe; it is owned by the game loop and only touched from the
+    event loop. Callbacks may be plain functions or coroutine functions.
+    """
+
+    def __init__(self, current_tick: int = 0):
+        self._current_tick = current_tick
+        self._levels: List[List[List[TimerHandle]]] = [
+            [[] for _ in range(SLOTS)] for _ in range(LEVELS)
+        ]
+        self._overflow: List[TimerHandle] = []
+        # Timers scheduled for a tick that has already been processed
+        self._ready: List[TimerHandle] = []
+        self._pending = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    @property
+    def current_tick(self) -> int:
+        """The last tick the wheel was advanced to."""
+        return self._current_tick
+
+    # =========================================================================
+    # Scheduling
+    # =========================================================================
+
+    def schedule_at(self, tick: int, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """
+        Run a callback when the wheel reaches a tick.
+
+        Ticks that have already been processed fire on the next advance.
+
+        Args:
+            tick: Game tick the callback is due
+            callback: Function or coroutine function to call
+            *args: Arguments for the callback
+
+        Returns:
+            TimerHandle that can cancel the timer
+        """
+        handle = TimerHandle(self, tick, callback, args)
+        self._pending += 1
+        self._insert(handle)
+        return handle
+
+    def schedule_in(self, ticks: int, callback: Callable[..., Any], *args: Any) -> TimerHandle:
+        """Run a callback a number of ticks after the current tick."""
+        return self.schedule_at(self._current_tick + max(1, ticks), callback, *args)
+
+    async def sleep(self, ticks: int) -> None:
+        """Wait a number of game ticks (only resumes while the game loop runs)."""
+        future = asyncio.get_running_loop().create_future()
+        handle = self.schedule_in(ticks, _resolve_future, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+    def _insert(self, handle: TimerHandle) -> None:
+        due_tick = handle.due_tick
+        if due_tick <= self._current_tick:
+            self._ready.append(handle)
+            return
+        for level in range(LEVELS):
+            shift = SLOT_BITS * (level + 1)
+            # Same rotation of this level: the timer belongs in it
+            if (due_tick >> shift) == (self._current_tick >> shift):
+                slot = (due_tick >> (SLOT_BITS * level)) & SLOT_MASK
+                self._levels[level][slot].append(handle)
+                return
+        self._overflow.append(handle)
+
+    # =========================================================================
+    # Advancing
+    # =========================================================================
+
+    def advance(self, tick: int) -> List[TimerHandle]:
+        """
+        Advance the wheel to a tick and collect the timers that became due.
+
+        Args:
+            tick: Tick to advance to (ticks already processed are ignored)
+
+        Returns:
+            Due timers in firing order; already marked as fired
+        """
+        due = self._take_ready()
+
+        while self._current_tick < tick:
+            self._current_tick += 1
+            self._cascade(self._current_tick)
+            # Cascaded timers due exactly now land in the ready list
+            due.extend(self._take_ready())
+            slot = self._levels[0][self._current_tick & SLOT_MASK]
+            if slot:
+                due.extend(handle for handle in slot if not handle._done)
+                slot.clear()
+
+        for handle in due:
+            handle._done = True
+        self._pending -= len(due)
+        return due
+
+    def _take_ready(self) -> List[TimerHandle]:
+        if not self._ready:
+            return []
+        ready, self._ready = self._ready, []
+        return [handle for handle in ready if not handle._done]
+
+    def _cascade(self, tick: int) -> None:
+        """Move timers down from higher levels when lower levels wrap around."""
+        if tick & SLOT_MASK:
+            return
+        # Find the highest level that wrapped, then cascade from the top down
+        top = 1
+        while top < LEVELS and not (tick >> (SLOT_BITS * top)) & SLOT_MASK:
+            top += 1
+        if top == LEVELS:
+            overflow, self._overflow = self._overflow, []
+            for handle in overflow:
+                if not handle._done:
+                    self._insert(handle)
+            top = LEVELS - 1
+        for level in range(top, 0, -1):
+            slot_index = (tick >> (SLOT_BITS * level)) & SLOT_MASK
+            slot = self._levels[level][slot_index]
+            if not slot:
+                continue
+            self._levels[level][slot_index] = []
+            for handle in slot:
+                if not handle._done:
+                    self._insert(handle)
+
+    async def run_due(self, tick: int) -> int:
+        """
+        Advance to a tick and run every due callback.
+
+        A failing callback is logged and does not affect the others.
+
+        Returns:
+            Number of callbacks run
+        """
+        due = self.advance(tick)
+        for handle in due:
+            try:
+                result = handle.callback(*handle.args)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(
+                    "Timer callback failed",
+                    extra={
+                        "callback": getattr(handle.callback, "__qualname__", repr(handle.callback)),
+                        "tick": tick,
+                        "error": str(e),
+                        "traceback": traceback.format_exc(),
+                    },
+                )
+        if due:
+            game_loop_timers_fired_total.inc(len(due))
+        game_loop_timers_pending.set(self._pending)
+        return len(due)
+
+
+def _resolve_future(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# Singleton instance
+_timing_wheel: Optional[TimingWheel] = None
+
+
+def get_timing_wheel() -> TimingWheel:
+    """
+    Get or create the singleton TimingWheel instance.
+
+    Returns:
+        The global TimingWheel instance.
+    """
+    global _timing_wheel
+    if _timing_wheel is None:
+        _timing_wheel = TimingWheel()
+    return _timing_wheel
+
+
+def reset_timing_wheel(current_tick: int = 0) -> None:
+    """
+    Reset the singleton instance.
+
+    Used for testing to ensure clean state between tests, and by headless
+    tools to start the wheel at a given tick.
+    """
+    global _timing_wheel
+    _timing_wheel = TimingWheel(current_tick) if current_tick else None
@@ -0,0 +1,206 @@
+"""
+Gateway process of the sharded deployment.
+
+With SHARD_WORKERS > 1 the game no longer runs in one event loop: the
+gateway starts one map worker process per shard (shard_worker.py), each
+running the game loop for the maps it owns, and keeps the client websockets
+itself. Every client is authenticated here, then relayed over a Unix socket
+to the worker owning the map they are on (game/map_shards.py); messages are
+forwarded as-is in both directions, so outbound frames are never decoded or
+re-encoded on the way.
+
+Each worker connection starts with a session frame naming the player the
+gateway authenticated; the client's token is only validated here, at login.
+When a player moves to a map owned by another worker, their worker saves
+their state and closes the session with SHARD_HANDOFF_CLOSE_CODE; the
+gateway then opens a session for them on the worker owning the new map,
+which loads the player like a fresh login (even if their token expired in
+the meantime). The client keeps its websocket and receives a new welcome
+message.
+
+Run with:
+    uvicorn server.src.gateway:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+import msgpack
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import select
+
+from server.src.api.helpers import authenticate_player
+from server.src.api.shard_transport import (
+    FRAME_CLOSE,
+    FRAME_DATA,
+    SHARD_HANDOFF_CLOSE_CODE,
+    decode_close_code,
+    encode_close_frame,
+    encode_frame,
+    encode_session_frame,
+    read_frame,
+)
+from server.src.core import database
+from server.src.core.config import settings
+from server.src.core.logging_config import setup_logging, get_logger
+from server.src.core.metrics import init_metrics
+from server.src.game.map_shards import shard_for_map, worker_socket_path
+from server.src.models.player import Player
+from server.src.services.game_state import init_all_managers
+from common.src.protocol import MessageType, WSMessage
+
+setup_logging()
+init_metrics()
+logger = get_logger(__name__)
+
+_workers: List[asyncio.subprocess.Process] = []
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the map workers and stop them on shutdown."""
+    valkey = await database.get_valkey()
+    init_all_managers(valkey, database.AsyncSessionLocal)
+
+    for index in range(max(settings.SHARD_WORKERS, 1)):
+        worker = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "server.src.shard_worker", "--index", str(index)
+        )
+        _workers.append(worker)
+    logger.info("Map workers started", extra={"workers": len(_workers)})
+
+    yield
+
+    for worker in _workers:
+        if worker.returncode is None:
+            worker.terminate()
+    for worker in _workers:
+        await worker.wait()
+    _workers.clear()
+    logger.info("Map workers stopped")
+
+
+app = FastAPI(title="RPG Gateway", version="0.1.0", lifespan=lifespan)
+
+
+@app.get("/", summary="Health check endpoint", tags=["Status"])
+def read_root():
+    """Root endpoint for health checks."""
+    return {"status": "ok"}
+
+
+async def _load_player_map(player_id: int) -> str:
+    """Map a player is saved on (their worker saves it when they leave it)."""
+    async with database.AsyncSessionLocal() as db:
+        result = await db.execute(select(Player.map_id).where(Player.id == player_id))
+        return result.scalar_one_or_none() or settings.DEFAULT_MAP
+
+
+async def _relay(
+    websocket: WebSocket,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> Optional[int]:
+    """
+    Relay frames between a client and a worker until either side closes.
+
+    Returns:
+        The worker's close code, or None if the client disconnected first
+    """
+
+    async def client_to_worker() -> None:
+        try:
+            while True:
+                data = await websocket.receive_bytes()
+                writer.write(encode_frame(FRAME_DATA, data))
+                await writer.drain()
+        except WebSocketDisconnect as e:
+            code = e.code
+        except Exception:
+            code = status.WS_1006_ABNORMAL_CLOSURE
+        try:
+            writer.write(encode_close_frame(code))
+            await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+
+    async def worker_to_client() -> int:
+        while True:
+            frame = await read_frame(reader)
+            if frame is None:
+                return status.WS_1011_INTERNAL_ERROR
+            kind, payload = frame
+            if kind == FRAME_DATA:
+                await websocket.send_bytes(payload)
+            elif kind == FRAME_CLOSE:
+                return decode_close_code(payload)
+
+    upstream = asyncio.create_task(client_to_worker(), name="gateway_upstream")
+    downstream = asyncio.create_task(worker_to_client(), name="gateway_downstream")
+    try:
+        done, _ = await asyncio.wait({upstream, downstream}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        upstream.cancel()
+        downstream.cancel()
+        writer.close()
+
+    if downstream not in done:
+        return None
+    if downstream.exception() is not None:
+        return status.WS_1011_INTERNAL_ERROR
+    return downstream.result()
+
+
+@app.websocket("/ws")
+async def gateway_endpoint(websocket: WebSocket):
+    """
+    Authenticate a client and relay it to the worker owning its map,
+    following it across workers as it changes maps.
+    """
+    await websocket.accept()
+
+    try:
+        auth_bytes = await websocket.receive_bytes()
+        auth_message = WSMessage(**msgpack.unpackb(auth_bytes, raw=False))
+        if auth_message.type != MessageType.CMD_AUTHENTICATE:
+            raise WebSocketDisconnect(code=status.WS_1008_POLICY_VIOLATION)
+        _, player_id = await authenticate_player(auth_message)
+    except WebSocketDisconnect:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    except (msgpack.exceptions.UnpackException, ValueError) as e:
+        logger.error("Invalid authentication message", extra={"error": str(e)})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    while True:
+        map_id = await _load_player_map(player_id)
+        shard_index = shard_for_map(map_id)
+        try:
+            reader, writer = await asyncio.open_unix_connection(worker_socket_path(shard_index))
+        except OSError as e:
+            logger.error(
+                "Map worker unavailable",
+                extra={"player_id": player_id, "map_id": map_id, "shard_index": shard_index, "error": str(e)},
+            )
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+
+        # The token was validated above; workers trust the session frame
+        writer.write(encode_session_frame(player_id))
+        close_code = await _relay(websocket, reader, writer)
+
+        if close_code != SHARD_HANDOFF_CLOSE_CODE:
+            if close_code is not None:
+                try:
+                    await websocket.close(code=close_code)
+                except RuntimeError:
+                    pass  # Client already gone
+            return
+
+        logger.info(
+            "Player handed off to another map worker",
+            extra={"player_id": player_id, "from_shard": shard_index},
+        )
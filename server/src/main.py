@@ -8,20 +8,28 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Response
 import msgpack
 from server.src.api import websockets, auth, assets, appearance
+from server.src.api.broadcast_relay import BROADCAST_RELAY_CHANNEL, BroadcastRelay
 from server.src.core.logging_config import setup_logging, get_logger
 from server.src.core.config import settings
 from server.src.core.metrics import init_metrics, get_metrics, get_metrics_content_type, metrics
 from server.src.services.map_service import get_map_manager
-from server.src.core.database import get_valkey, AsyncSessionLocal
+from server.src.core.database import get_valkey, reset_valkey, create_pubsub_client, AsyncSessionLocal
+from server.src.core.valkey_pool import VALKEY_LANE_PERSISTENCE, valkey_lane
 from server.src.game.game_loop import game_loop, cleanup_disconnected_player
+from server.src.game.tick_recorder import reset_tick_recorder
+from server.src.game.map_shards import owned_map_ids, sharding_enabled
 from server.src.services.game_state import (
     init_all_managers,
+    load_valkey_functions,
     get_reference_data_manager,
     get_entity_manager,
     get_ground_item_manager,
+    get_player_state_manager,
     get_batch_sync_coordinator,
 )
+from server.src.services.game_state.near_cache import NEAR_CACHE_CHANNEL, on_invalidation_message
 from server.src.core.concurrency import initialize_concurrency_infrastructure
+from server.src.services.entity_render_registry import get_entity_render_registry
 from common.src.protocol import MessageType, WSMessage
 
 # Initialize logging and metrics as early as possible
@@ -31,12 +39,18 @@ logger = get_logger(__name__)
 
 # Game loop task reference for cleanup
 _game_loop_task = None
+# Subscriber applying near-cache invalidations from other server processes
+_near_cache_listener = None
+# Subscriber delivering broadcasts relayed by other map workers
+_broadcast_relay_listener = None
+# Periodic health checks of the Valkey client pool
+_valkey_health_task = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    global _game_loop_task
+    global _game_loop_task, _near_cache_listener, _broadcast_relay_listener, _valkey_health_task
     
     # Startup
     logger.info("RPG Server starting up", extra={"version": "0.1.0"})
@@ -49,14 +63,54 @@ async def lifespan(app: FastAPI):
     # Initialize Valkey connection
     valkey = await get_valkey()
     
+    _valkey_health_task = asyncio.create_task(
+        valkey.run_health_checks(settings.VALKEY_HEALTH_CHECK_INTERVAL),
+        name="valkey_health_checks",
+    )
+    
     # Initialize all game state managers
     init_all_managers(valkey, AsyncSessionLocal)
     ref_manager = get_reference_data_manager()
     entity_mgr = get_entity_manager()
     ground_item_mgr = get_ground_item_manager()
     
+    # Register the Valkey functions used for compound writes; managers
+    # also load them on first use if this fails
+    try:
+        await load_valkey_functions(valkey)
+    except Exception as e:
+        logger.warning("Could not load Valkey functions", extra={"error": str(e)})
+
     # Initialize concurrency infrastructure with Valkey client
     initialize_concurrency_infrastructure(valkey)
+
+    # Keep near-cached reference data coherent with other server processes
+    try:
+        _near_cache_listener = await create_pubsub_client(
+            {NEAR_CACHE_CHANNEL}, on_invalidation_message
+        )
+    except Exception as e:
+        logger.warning(
+            "Could not subscribe to near-cache invalidations; relying on TTLs",
+            extra={"error": str(e)},
+        )
+
+    # Reach players connected to other map workers
+    if sharding_enabled():
+        relay = BroadcastRelay(valkey, websockets.manager, settings.SHARD_INDEX)
+        websockets.manager.set_relay(relay)
+        try:
+            _broadcast_relay_listener = await create_pubsub_client(
+                {BROADCAST_RELAY_CHANNEL}, relay.on_message
+            )
+        except Exception as e:
+            logger.error(
+                "Could not subscribe to relayed broadcasts; players here miss other workers' chat",
+                extra={"error": str(e)},
+            )
+
+    # Precompute render descriptors of all NPC and monster definitions
+    get_entity_render_registry()
     
     # Sync items to database and load item cache for reference data
     try:
@@ -81,18 +135,29 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("Could not sync entities to database", extra={"error": str(e)})
     
+    # Maps whose entities this process runs (None: all of them; a map worker
+    # of a sharded deployment only runs its own)
+    owned_maps = owned_map_ids(map_manager.maps.keys())
+
+    # Nobody is connected yet; drop online index entries of a previous run
+    try:
+        await get_player_state_manager().clear_online_players(owned_maps)
+    except Exception as e:
+        logger.warning("Could not clear stale online players", extra={"error": str(e)})
+
     # Clear stale entity instances and spawn entities from Tiled maps
     try:
         # Clear any stale entity instances from previous server run
-        await entity_mgr.clear_all_entity_instances()
+        await entity_mgr.clear_all_entity_instances(owned_maps)
         logger.info("Cleared stale entity instances from Valkey")
         
         # Spawn entities for all loaded maps
         from server.src.services.entity_spawn_service import EntitySpawnService
-        from server.src.services.game_state import get_player_state_manager
         total_spawned = 0
         player_mgr = get_player_state_manager()
         for map_id in map_manager.maps.keys():
+            if owned_maps is not None and map_id not in owned_maps:
+                continue
             spawned = await EntitySpawnService.spawn_map_entities(player_mgr, entity_mgr, map_id)
             total_spawned += spawned
         
@@ -162,7 +227,7 @@ async def lifespan(app: FastAPI):
     
     # Sync ground items from Valkey to database before shutdown
     try:
-        async with AsyncSessionLocal() as db:
+        async with AsyncSessionLocal() as db, valkey_lane(VALKEY_LANE_PERSISTENCE):
             await ground_item_mgr.sync_ground_items_to_db(db)
             await db.commit()
         logger.info("Synced ground items to database")
@@ -181,6 +246,29 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             logger.info("Game loop stopped")
 
+    if _near_cache_listener is not None:
+        await _near_cache_listener.close()
+        _near_cache_listener = None
+
+    websockets.manager.set_relay(None)
+    if _broadcast_relay_listener is not None:
+        await _broadcast_relay_listener.close()
+        _broadcast_relay_listener = None
+
+    if _valkey_health_task:
+        _valkey_health_task.cancel()
+        try:
+            await _valkey_health_task
+        except asyncio.CancelledError:
+            pass
+        _valkey_health_task = None
+    await valkey.close()
+    # Later get_valkey() calls (restart within the process, tests) get a new pool
+    reset_valkey()
+
+    # Close the tick recording, if one was being written
+    reset_tick_recorder()
+
 
 # OpenAPI Documentation for WebSockets is not directly supported in the same way as HTTP endpoints.
 # A common practice is to describe the WebSocket endpoint in the main app description.
@@ -21,8 +21,10 @@ from typing import Dict, List, Optional, Set, Tuple, Any
 from server.src.core.config import settings
 from server.src.core.entities import EntityBehavior, EntityState, get_entity_by_name
 from server.src.core.logging_config import get_logger
+from server.src.core.metrics import entity_ai_active_entities, entity_ai_dormant_entities
 from server.src.core.monsters import MonsterDefinition
-from server.src.services.game_state import PlayerStateManager, EntityManager, get_entity_manager, get_player_state_manager
+from server.src.services.game_state import PlayerStateManager, EntityManager, SpatialIndex, get_entity_manager, get_player_state_manager
+from server.src.services.game_state.spatial_index import CHUNK_SIZE
 from server.src.services.map_service import get_map_manager
 from server.src.services.pathfinding_service import PathfindingService
 from server.src.services.player_service import PlayerService
@@ -64,11 +66,15 @@ class AIService:
     # {instance_id: {"idle_timer": int, "wander_target": (x, y) or None, ...}}
     _entity_timers: Dict[int, Dict[str, Any]] = {}
     
+    # Entities currently dormant because no player is near their chunk
+    _dormant_entities: Set[int] = set()
+    
     @staticmethod
     async def process_entities(
         entity_mgr: EntityManager,
         map_id: str,
         current_tick: int,
+        wake_radius_chunks: Optional[int] = None,
     ) -> List[EntityCombatEvent]:
         """
         Process all entities on a map for one tick.
@@ -79,6 +85,9 @@ class AIService:
             entity_mgr: EntityManager instance
             map_id: Map to process entities for
             current_tick: Current global tick counter
+            wake_radius_chunks: If given and not negative, idle and wandering
+                entities whose chunk is more than this many chunks from every
+                player are dormant and skipped (see _split_dormant_entities)
             
         Returns:
             List of combat events that occurred this tick, to be broadcast to clients.
@@ -107,6 +116,19 @@ class AIService:
         # Get all players on this map for aggro checks
         players_on_map = await PlayerService.get_players_on_map(map_id)
         
+        # Bucket this tick's player snapshot by chunk so each aggro check
+        # only looks at players near the entity
+        players_index = SpatialIndex()
+        players_by_id: Dict[int, NearbyPlayer] = {}
+        for player in players_on_map:
+            players_index.update(player.player_id, map_id, player.x, player.y)
+            players_by_id[player.player_id] = player
+        
+        if wake_radius_chunks is not None and wake_radius_chunks >= 0:
+            entities = await AIService._split_dormant_entities(
+                entity_mgr, map_id, entities, players_on_map, wake_radius_chunks
+            )
+        
         for entity in entities:
             try:
                 combat_event = await AIService._process_single_entity(
@@ -117,6 +139,8 @@ class AIService:
                     players_on_map=players_on_map,
                     current_tick=current_tick,
                     map_id=map_id,
+                    players_index=players_index,
+                    players_by_id=players_by_id,
                 )
                 if combat_event:
                     combat_events.append(combat_event)
@@ -132,6 +156,63 @@ class AIService:
         
         return combat_events
     
+    @staticmethod
+    async def _split_dormant_entities(
+        entity_mgr: EntityManager,
+        map_id: str,
+        entities: List[Dict[str, Any]],
+        players_on_map: List[NearbyPlayer],
+        wake_radius_chunks: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Put entities nobody is near to sleep and return the ones to process.
+        
+        An idle or wandering entity is dormant while its chunk is more than
+        wake_radius_chunks chunks (Chebyshev) from every player's chunk: its
+        idle timer, wander and aggro checks do not run. Entities in combat or
+        returning home stay active until they settle back into IDLE. A
+        wandering entity is put back to IDLE when it goes dormant, so it
+        wakes up without a stale wander target.
+        
+        Returns:
+            Entities that should run their state machine this tick
+        """
+        interest_chunks: Set[Tuple[int, int]] = set()
+        for player in players_on_map:
+            player_cx, player_cy = player.x // CHUNK_SIZE, player.y // CHUNK_SIZE
+            for dx in range(-wake_radius_chunks, wake_radius_chunks + 1):
+                for dy in range(-wake_radius_chunks, wake_radius_chunks + 1):
+                    interest_chunks.add((player_cx + dx, player_cy + dy))
+        
+        active: List[Dict[str, Any]] = []
+        dormant_count = 0
+        for entity in entities:
+            instance_id = entity.get("instance_id")
+            state = entity.get("state", EntityState.IDLE.value)
+            chunk = (int(entity.get("x", 0)) // CHUNK_SIZE, int(entity.get("y", 0)) // CHUNK_SIZE)
+            if (
+                state not in (EntityState.IDLE, EntityState.WANDER)
+                or chunk in interest_chunks
+            ):
+                AIService._dormant_entities.discard(instance_id)
+                active.append(entity)
+                continue
+            
+            dormant_count += 1
+            if instance_id in AIService._dormant_entities:
+                continue
+            AIService._dormant_entities.add(instance_id)
+            if state == EntityState.WANDER:
+                timers = AIService._entity_timers.get(instance_id)
+                if timers is not None:
+                    await AIService._transition_to_idle(entity_mgr, instance_id, timers)
+                else:
+                    await entity_mgr.set_entity_state(instance_id, EntityState.IDLE)
+        
+        entity_ai_active_entities.labels(map_id=map_id).set(len(active))
+        entity_ai_dormant_entities.labels(map_id=map_id).set(dormant_count)
+        return active
+    
     @staticmethod
     async def _process_single_entity(
         entity_mgr: EntityManager,
@@ -141,11 +222,15 @@ class AIService:
         players_on_map: List[NearbyPlayer],
         current_tick: int,
         map_id: str,
+        players_index: Optional[SpatialIndex] = None,
+        players_by_id: Optional[Dict[int, NearbyPlayer]] = None,
     ) -> Optional[EntityCombatEvent]:
         """
         Process AI for a single entity.
         
-        Dispatches to state-specific handlers.
+        Dispatches to state-specific handlers. When players_index and
+        players_by_id are given, aggro checks only consider players in
+        chunks near the entity.
         
         Returns:
             EntityCombatEvent if an attack occurred, None otherwise.
@@ -210,10 +295,21 @@ class AIService:
             if current_tick - timers["last_aggro_check_tick"] >= settings.ENTITY_AI_AGGRO_CHECK_INTERVAL:
                 timers["last_aggro_check_tick"] = current_tick
                 
+                aggro_candidates = players_on_map
+                aggro_radius = entity.get("aggro_radius") or entity_def.aggro_radius
+                if players_index is not None and players_by_id is not None and aggro_radius > 0:
+                    # Chebyshev range is a superset of the Manhattan check in _check_aggro
+                    aggro_candidates = [
+                        players_by_id[player_id]
+                        for player_id in players_index.query_radius(
+                            map_id, entity.get("x", 0), entity.get("y", 0), aggro_radius
+                        )
+                    ]
+                
                 aggro_target = await AIService._check_aggro(
                     entity=entity,
                     entity_def=entity_def,
-                    players_on_map=players_on_map,
+                    players_on_map=aggro_candidates,
                     collision_grid=collision_grid,
                 )
                 
@@ -570,11 +666,11 @@ class AIService:
                     blocked_positions=own_blocked,
                     max_distance=settings.ENTITY_AI_MAX_PATHFINDING_DISTANCE,
                 )
-                
-        if next_step:
-            facing_direction = AIService._direction_from_delta(entity_x, entity_y, next_step[0], next_step[1])
-            await entity_mgr.update_entity_position(instance_id, next_step[0], next_step[1], facing_direction)
-            timers["last_move_tick"] = current_tick
+
+                if next_step:
+                    facing_direction = AIService._direction_from_delta(entity_x, entity_y, next_step[0], next_step[1])
+                    await entity_mgr.update_entity_position(instance_id, next_step[0], next_step[1], facing_direction)
+                    timers["last_move_tick"] = current_tick
         
         return None
     
@@ -741,6 +837,7 @@ class AIService:
         Called when entity dies or despawns.
         """
         AIService._entity_timers.pop(instance_id, None)
+        AIService._dormant_entities.discard(instance_id)
     
     @staticmethod
     def reset_all_timers() -> None:
@@ -750,6 +847,7 @@ class AIService:
         Called on server startup to clear stale state.
         """
         AIService._entity_timers.clear()
+        AIService._dormant_entities.clear()
     
     @staticmethod
     async def clear_entities_targeting_player(
@@ -473,7 +473,9 @@ class ChatService:
                         # recipient_data contains player_id (int) - use it for ConnectionManager
                         recipient_player_id = recipient_data["player_id"]
                         packed_message = msgpack.packb(chat_response.model_dump(), use_bin_type=True)
-                        await connection_manager.send_personal_message(recipient_player_id, packed_message)
+                        await connection_manager.send_personal_message(
+                            recipient_player_id, packed_message, relay=True
+                        )
                         recipients = [target_username]
                     else:
                         # Send system error message for DM recipient not found
@@ -22,6 +22,7 @@ from server.src.core.logging_config import get_logger
 from server.src.core.skills import SkillType
 from server.src.services.game_state import get_player_state_manager, get_skills_manager, get_equipment_manager, get_entity_manager, get_reference_data_manager
 from server.src.services.skill_service import SkillService
+from server.src.services.hp_service import HpService
 from server.src.core.entities import get_entity_by_name
 from server.src.core.humanoids import HumanoidDefinition
 from server.src.core.monsters import MonsterDefinition
@@ -438,16 +439,22 @@ class CombatService:
         player_mgr = get_player_state_manager()
         entity_mgr = get_entity_manager()
         if defender_type == CombatTargetType.PLAYER:
-            await player_mgr.set_player_hp(defender_id, new_defender_hp)
+            await HpService.set_hp(defender_id, new_defender_hp)
         else:
             await entity_mgr.update_entity_hp(defender_id, new_defender_hp)
             
             # If entity died, mark as dying for death animation
             if defender_died:
-                from server.src.game.game_loop import get_game_loop_state
+                from server.src.game.game_loop import (
+                    ENTITY_DEATH_ANIMATION_TICKS,
+                    finalize_dying_entity,
+                    get_game_loop_state,
+                )
+                from server.src.game.timing_wheel import get_timing_wheel
                 game_state = get_game_loop_state()
-                death_tick = game_state.tick_counter + 10  # 10 ticks for death animation
+                death_tick = game_state.tick_counter + ENTITY_DEATH_ANIMATION_TICKS
                 await entity_mgr.mark_entity_dying(defender_id, death_tick=death_tick, respawn_delay_seconds=30)
+                get_timing_wheel().schedule_at(death_tick, finalize_dying_entity, defender_id)
         
         # Calculate XP (only for player attackers)
         xp_gained = {}
@@ -520,11 +527,14 @@ class CombatService:
                 
                 # Set combat state to retaliate
                 await player_mgr.set_player_combat_state(
-                    player_id=defender_id,
-                    target_type=attacker_type,
-                    target_id=attacker_id,
-                    last_attack_tick=game_state.tick_counter,
-                    attack_speed=defender_attack_speed,
+                    defender_id,
+                    {
+                        "target_type": attacker_type.value,
+                        "target_id": attacker_id,
+                        "last_attack_tick": game_state.tick_counter,
+                        "attack_speed": defender_attack_speed,
+                        "auto_retaliate": True,
+                    },
                 )
                 
                 logger.info(
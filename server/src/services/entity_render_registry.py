@@ -0,0 +1,151 @@
+"""
+Entity Render Registry - Precomputed rendering data for NPC and monster definitions.
+
+Everything an entity payload needs besides its live state (display name,
+behavior, sprite sheet, humanoid visual state and its hash) comes from the
+static definitions in core/humanoids.py and core/monsters.py. This registry
+derives it once per definition so building a payload costs one dict lookup
+instead of an enum scan, isinstance checks and a visual hash per entity.
+
+Usage:
+    from server.src.services.entity_render_registry import get_entity_render_registry
+
+    descriptor = get_entity_render_registry().get("GOBLIN")
+    if descriptor:
+        payload["display_name"] = descriptor.display_name
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+from server.src.core.humanoids import HumanoidDefinition, HumanoidID
+from server.src.core.logging_config import get_logger
+from server.src.core.monsters import MonsterDefinition, MonsterID
+from server.src.services.visual_state_service import VisualStateService
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class EntityRenderDescriptor:
+    """
+    Static rendering data of one entity definition.
+
+    visual_state is shared by every payload built from the descriptor and
+    must not be mutated.
+    """
+
+    display_name: str
+    behavior_type: str
+    is_attackable: bool
+    sprite_sheet_id: Optional[str] = None
+    visual_hash: Optional[str] = None
+    visual_state: Optional[Dict[str, Any]] = None
+
+
+def build_render_descriptor(
+    definition: Union[HumanoidDefinition, MonsterDefinition],
+) -> EntityRenderDescriptor:
+    """
+    Derive the render descriptor of an entity definition.
+
+    Args:
+        definition: Humanoid or monster definition
+
+    Returns:
+        EntityRenderDescriptor for the definition
+    """
+    sprite_sheet_id = None
+    visual_hash = None
+    visual_state = None
+
+    if isinstance(definition, HumanoidDefinition):
+        # Build visual state from humanoid appearance and equipment
+        appearance = definition.appearance.to_dict() if definition.appearance else None
+        equipped_items = None
+        if definition.equipped_items:
+            equipped_items = {
+                slot.value: item.value.equipped_sprite_id
+                for slot, item in definition.equipped_items.items()
+                if item.value.equipped_sprite_id
+            }
+        state = VisualStateService._build_visual_state(appearance, equipped_items)
+        visual_hash = state.compute_hash()
+        visual_state = state.to_dict()
+    elif isinstance(definition, MonsterDefinition):
+        sprite_sheet_id = definition.sprite_sheet_id
+
+    return EntityRenderDescriptor(
+        display_name=definition.display_name,
+        behavior_type=definition.behavior.name,
+        is_attackable=definition.is_attackable,
+        sprite_sheet_id=sprite_sheet_id,
+        visual_hash=visual_hash,
+        visual_state=visual_state,
+    )
+
+
+class EntityRenderRegistry:
+    """
+    Render descriptors of every humanoid and monster definition, by name.
+
+    Built once from the definition enums; lookups are case-insensitive like
+    get_entity_by_name, and humanoids win over monsters on a name clash.
+    """
+
+    def __init__(self):
+        self._descriptors: Dict[str, EntityRenderDescriptor] = {}
+        for monster in MonsterID:
+            self._descriptors[monster.name] = build_render_descriptor(monster.value)
+        for humanoid in HumanoidID:
+            self._descriptors[humanoid.name] = build_render_descriptor(humanoid.value)
+
+        logger.info(
+            "Entity render registry built",
+            extra={"descriptor_count": len(self._descriptors)},
+        )
+
+    def __len__(self) -> int:
+        return len(self._descriptors)
+
+    def get(self, entity_name: str) -> Optional[EntityRenderDescriptor]:
+        """
+        Get the render descriptor of an entity definition.
+
+        Args:
+            entity_name: Entity name (e.g., "GOBLIN", "village_guard")
+
+        Returns:
+            EntityRenderDescriptor, or None for unknown names
+        """
+        descriptor = self._descriptors.get(entity_name)
+        if descriptor is None and entity_name:
+            descriptor = self._descriptors.get(entity_name.upper())
+        return descriptor
+
+
+# Singleton instance
+_entity_render_registry: Optional[EntityRenderRegistry] = None
+
+
+def get_entity_render_registry() -> EntityRenderRegistry:
+    """
+    Get or create the singleton EntityRenderRegistry instance.
+
+    Returns:
+        The global EntityRenderRegistry instance.
+    """
+    global _entity_render_registry
+    if _entity_render_registry is None:
+        _entity_render_registry = EntityRenderRegistry()
+    return _entity_render_registry
+
+
+def reset_entity_render_registry() -> None:
+    """
+    Reset the singleton instance.
+
+    Used for testing to ensure clean state between tests.
+    """
+    global _entity_render_registry
+    _entity_render_registry = None
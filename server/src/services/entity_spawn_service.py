@@ -177,7 +177,9 @@ class EntitySpawnService:
         return instance_id
     
     @staticmethod
-    async def check_respawn_queue(entity_mgr: EntityManager) -> int:
+    async def check_respawn_queue(
+        entity_mgr: EntityManager, map_ids: Optional[Set[str]] = None
+    ) -> int:
         """
         Check respawn queue and respawn entities that are ready.
         
@@ -185,6 +187,8 @@ class EntitySpawnService:
         
         Args:
             entity_mgr: EntityManager instance
+            map_ids: Only respawn entities on these maps (a map worker's own
+                maps); others stay queued for their owner. None for all maps.
             
         Returns:
             Number of entities respawned
@@ -206,6 +210,8 @@ class EntitySpawnService:
                 logger.warning("Entity not found for respawn", extra={"instance_id": instance_id})
                 await entity_mgr.remove_from_respawn_queue(instance_id)
                 continue
+            if map_ids is not None and entity_data.get("map_id") not in map_ids:
+                continue
             
             # Get spawn coordinates from entity data or fall back to current position
             spawn_x = entity_data.get("spawn_x", entity_data.get("x"))
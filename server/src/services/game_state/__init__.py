@@ -9,6 +9,10 @@ Provides focused managers for different aspects of game state:
 - GroundItemManager: Ground items (dropped items)
 - EntityManager: Entity instances (ephemeral combat entities)
 - ReferenceDataManager: Item/skill/entity definitions (permanent cache)
+- HotStateStore: In-memory authoritative state for game-loop-owned players
+- SpatialIndex: Chunk-bucketed positions for proximity queries
+- unit_of_work: Batches manager writes into one Valkey round trip
+- NearCache: In-process cache of cold data with pub/sub invalidation
 """
 
 from glide import GlideClient
@@ -16,6 +20,11 @@ from sqlalchemy.orm import sessionmaker
 from typing import Optional
 
 from .base_manager import BaseManager
+from .hot_state_store import HotStateStore
+from .near_cache import NearCache, NearCacheNamespace, get_near_cache, reset_near_cache
+from .spatial_index import SpatialIndex
+from .unit_of_work import UnitOfWork, current_unit_of_work, unit_of_work
+from .valkey_functions import load_valkey_functions
 from .player_state_manager import (
     PlayerStateManager,
     get_player_state_manager,
@@ -65,6 +74,15 @@ from .batch_sync import BatchSyncCoordinator, get_batch_sync_coordinator
 
 __all__ = [
     "BaseManager",
+    "HotStateStore",
+    "SpatialIndex",
+    "NearCache",
+    "NearCacheNamespace",
+    "get_near_cache",
+    "UnitOfWork",
+    "current_unit_of_work",
+    "unit_of_work",
+    "load_valkey_functions",
     "PlayerStateManager",
     "get_player_state_manager",
     "InventoryManager",
@@ -83,6 +101,7 @@ __all__ = [
     "get_batch_sync_coordinator",
     "init_all_managers",
     "reset_all_managers",
+    "rewrite_packed_hash_fields",
 ]
 
 
@@ -138,9 +157,32 @@ def reset_all_managers() -> None:
     reset_ground_item_manager()
     reset_entity_manager()
     reset_reference_data_manager()
+    reset_near_cache()
     _batch_sync_coordinator = None
 
 
+async def rewrite_packed_hash_fields() -> int:
+    """
+    Upgrade hash fields still holding JSON text to the packed format in every
+    manager (see hash_codecs). Idempotent.
+
+    Returns:
+        Number of hashes rewritten
+    """
+    managers = (
+        _player_state_manager,
+        _inventory_manager,
+        _equipment_manager,
+        _skills_manager,
+        _reference_data_manager,
+    )
+    rewritten = 0
+    for manager in managers:
+        if manager is not None:
+            rewritten += await manager.rewrite_packed_fields()
+    return rewritten
+
+
 # Convenience exports
 player = get_player_state_manager
 inventory = get_inventory_manager
@@ -2,33 +2,56 @@
 Shared infrastructure for all game state managers.
 
 Provides database session management, Valkey operations, TTL handling,
-and serialization utilities used across all managers.
+and serialization utilities used across all managers. Write helpers queue
+into the active unit of work, if any (see unit_of_work). Compound writes
+run as one Valkey function call (see valkey_functions). Reads refresh TTLs
+lazily (see ttl_refresh). Cold lookups can be served from the process
+near-cache (see near_cache).
 """
 
 import json
 import traceback
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set, Callable, Awaitable
+from typing import Any, Dict, Iterable, List, Optional, Set, Callable, Awaitable
 
-from glide import GlideClient
+from glide import Batch, GlideClient, RequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
+from .hash_codecs import EncodedValue, FieldType, HashSchema, decode_value, encode_value, is_packed
+from .near_cache import (
+    NEAR_CACHE_CHANNEL,
+    NearCache,
+    NearCacheNamespace,
+    encode_invalidation,
+    get_near_cache,
+)
+from .ttl_refresh import TtlRefreshTracker
+from .unit_of_work import current_unit_of_work
+from .valkey_functions import is_missing_function_error, load_valkey_functions
+
 logger = get_logger(__name__)
 
 # TTL Configuration (in seconds)
 TIER1_TTL = settings.GAME_STATE_CACHE.get("essential_data_ttl", 3600)
 TIER2_TTL = settings.GAME_STATE_CACHE.get("inventory_ttl", 1800)
 SKILLS_TTL = settings.GAME_STATE_CACHE.get("skills_ttl", 900)
+TTL_REFRESH_WINDOW = settings.GAME_STATE_CACHE.get("ttl_refresh_window", 60)
 
 
 class BaseManager:
     """Base class providing shared infrastructure for all game state managers."""
 
+    # Field types of the hashes a manager owns, by key prefix (see hash_codecs)
+    HASH_SCHEMAS: Dict[str, HashSchema] = {}
+
+    # Near-cache namespaces a manager reads through (see near_cache)
+    NEAR_CACHE_NAMESPACES: Dict[str, NearCacheNamespace] = {}
+
     def __init__(
         self,
         valkey_client: Optional[GlideClient] = None,
@@ -37,6 +60,7 @@ class BaseManager:
         self._valkey = valkey_client
         self._session_factory = session_factory
         self._bound_test_session: Optional[AsyncSession] = None
+        self._ttl_refresh = TtlRefreshTracker(TTL_REFRESH_WINDOW)
 
     @property
     def valkey(self) -> Optional[GlideClient]:
@@ -111,8 +135,34 @@ class BaseManager:
         return value
 
     async def _refresh_ttl(self, key: str, ttl: int) -> None:
-        if self._valkey and ttl > 0:
-            await self._valkey.expire(key, ttl)
+        """Refresh the TTL of a key unless it was refreshed within the window."""
+        if not self._valkey or not self._ttl_refresh.is_due(key, ttl):
+            return
+        self._ttl_refresh.note_refreshed(key, ttl)
+        unit = current_unit_of_work()
+        if unit is not None:
+            unit.expire(key, ttl)
+            return
+        await self._valkey.expire(key, ttl)
+
+    async def _refresh_many_ttl(self, keys: Iterable[str], ttl: int) -> None:
+        """Refresh the TTL of several keys (those due) in a single round trip."""
+        if not self._valkey or ttl <= 0:
+            return
+        due = [key for key in keys if self._ttl_refresh.is_due(key, ttl)]
+        for key in due:
+            self._ttl_refresh.note_refreshed(key, ttl)
+        unit = current_unit_of_work()
+        if unit is not None:
+            for key in due:
+                unit.expire(key, ttl)
+            return
+
+        if due:
+            batch = Batch(is_atomic=False)
+            for key in due:
+                batch.expire(key, ttl)
+            await self._valkey.exec(batch, raise_on_error=True)
 
     async def _cache_in_valkey(
         self, key: str, data: Dict[str, Any], ttl: int
@@ -120,36 +170,265 @@ class BaseManager:
         if not self._valkey:
             return
 
-        encoded_data = {k: self._encode_for_valkey(v) for k, v in data.items()}
-        await self._valkey.hset(key, encoded_data)
+        self._ttl_refresh.note_refreshed(key, ttl)
+        unit = current_unit_of_work()
+        if unit is not None:
+            unit.hset(key, self._encode_hash(key, data))
+            if ttl > 0:
+                unit.expire(key, ttl)
+            return
+
+        await self._valkey.hset(key, self._encode_hash(key, data))
         # Only set TTL if > 0; ttl=0 means permanent storage (no expiration)
         if ttl > 0:
             await self._valkey.expire(key, ttl)
 
-    async def _get_from_valkey(self, key: str) -> Optional[Dict[str, Any]]:
+    async def _cache_many_in_valkey(
+        self, items: Dict[str, Dict[str, Any]], ttl: int
+    ) -> None:
+        """
+        Write several hashes (HSET, plus EXPIRE if ttl > 0) in a single
+        round trip.
+
+        Args:
+            items: Fields to write, by hash key
+            ttl: TTL in seconds for every key (0 = leave as is)
+        """
+        if not self._valkey or not items:
+            return
+
+        for key in items:
+            self._ttl_refresh.note_refreshed(key, ttl)
+        unit = current_unit_of_work()
+        if unit is not None:
+            for key, data in items.items():
+                unit.hset(key, self._encode_hash(key, data))
+                if ttl > 0:
+                    unit.expire(key, ttl)
+            return
+
+        batch = Batch(is_atomic=False)
+        for key, data in items.items():
+            batch.hset(key, self._encode_hash(key, data))
+            if ttl > 0:
+                batch.expire(key, ttl)
+        await self._valkey.exec(batch, raise_on_error=True)
+
+    async def _get_from_valkey(self, key: str, ttl: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Fetch and decode a hash.
+
+        Args:
+            key: Valkey hash key
+            ttl: If > 0, refresh the key's TTL when due (see ttl_refresh), in
+                the same round trip as the read
+
+        Returns:
+            Decoded hash, or None if missing
+        """
         if not self._valkey:
             return None
 
-        raw = await self._valkey.hgetall(key)
+        unit = current_unit_of_work()
+        if unit is not None and unit.is_deleted(key):
+            return None
+
+        if unit is None and self._ttl_refresh.is_due(key, ttl):
+            batch = Batch(is_atomic=False)
+            batch.hgetall(key)
+            batch.expire(key, ttl)
+            # Noted even if the key is missing, so misses are not re-probed
+            self._ttl_refresh.note_refreshed(key, ttl)
+            raw, _ = await self._valkey.exec(batch, raise_on_error=True)
+        else:
+            raw = await self._valkey.hgetall(key)
+        if unit is not None:
+            raw = unit.overlay(key, raw)
+            if raw:
+                await self._refresh_ttl(key, ttl)
         if not raw:
             return None
 
-        result = {}
-        for k, v in raw.items():
-            decoded_key = self._decode_bytes(k)
-            decoded_value = self._decode_bytes(v)
-            # Try to parse JSON strings back into dicts/lists
-            if isinstance(decoded_value, str):
-                try:
-                    decoded_value = json.loads(decoded_value)
-                except json.JSONDecodeError:
-                    pass  # Keep as string if not valid JSON
-            result[decoded_key] = decoded_value
-        return result
+        return self._decode_hash(raw, key)
+
+    def _hash_schema(self, key: str) -> Optional[HashSchema]:
+        """Schema of the hash at key, looked up by key prefix."""
+        return self.HASH_SCHEMAS.get(key.split(":", 1)[0])
+
+    def _encode_hash(self, key: str, data: Dict[str, Any]) -> Dict[str, EncodedValue]:
+        """Encode a dict of field values for HSET on the hash at key."""
+        schema = self._hash_schema(key)
+        if schema is None:
+            return {k: self._encode_for_valkey(v) for k, v in data.items()}
+        return schema.encode(data)
+
+    def _encode_field(self, key: str, field: str, value: Any) -> EncodedValue:
+        """Encode a single field value for HSET on the hash at key."""
+        schema = self._hash_schema(key)
+        return encode_value(value, schema.field_type(field) if schema else None)
+
+    def _decode_hash(self, raw: Dict[Any, Any], key: str) -> Dict[str, Any]:
+        """Decode a raw HGETALL reply of the hash at key into typed values."""
+        schema = self._hash_schema(key)
+        decoded = {}
+        for raw_field, value in raw.items():
+            field = self._decode_bytes(raw_field)
+            decoded[field] = decode_value(value, schema.field_type(field) if schema else None)
+        return decoded
+
+    def _as_cached(self, key: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize values to what a Valkey round trip of the hash at key (or
+        key template, e.g. PLAYER_KEY) would return.
+
+        Used for in-memory copies so that readers see identical types whether
+        the data came from memory or from Valkey.
+        """
+        return self._decode_hash(self._encode_hash(key, data), key)
+
+    async def _get_many_from_valkey(
+        self, keys: List[str], ttl: int = 0
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch several hashes in a single pipelined round trip.
+
+        Args:
+            keys: Valkey hash keys to fetch
+            ttl: If > 0, refresh the TTL of the keys due for it (see
+                ttl_refresh) in the same batch
+
+        Returns:
+            Decoded hash (or None if missing) for each key, in input order
+        """
+        if not self._valkey or not keys:
+            return [None] * len(keys)
+
+        batch = Batch(is_atomic=False)
+        refreshing: List[bool] = []
+        for key in keys:
+            batch.hgetall(key)
+            refreshing.append(self._ttl_refresh.is_due(key, ttl))
+            if refreshing[-1]:
+                batch.expire(key, ttl)
+                self._ttl_refresh.note_refreshed(key, ttl)
+        results = iter(await self._valkey.exec(batch, raise_on_error=True) or [])
+
+        raws: List[Any] = []
+        for refresh in refreshing:
+            raws.append(next(results, None))
+            if refresh:
+                next(results, None)  # EXPIRE reply
+        unit = current_unit_of_work()
+        if unit is not None:
+            raws = [unit.overlay(key, raw) for key, raw in zip(keys, raws)]
+        return [
+            self._decode_hash(raw, key) if raw else None
+            for key, raw in zip(keys, raws)
+        ]
+
+    async def _fcall(self, function: str, keys: List[str], args: List[EncodedValue]) -> Any:
+        """Call a function of the Valkey library, loading it if Valkey lost it."""
+        unit = current_unit_of_work()
+        if unit is not None:
+            # Keep writes queued earlier in this unit ahead of the function's
+            await unit.flush(self._valkey)
+        try:
+            return await self._valkey.fcall(function, keys, args)
+        except RequestError as e:
+            if not is_missing_function_error(e):
+                raise
+            await load_valkey_functions(self._valkey)
+            return await self._valkey.fcall(function, keys, args)
+
+    async def _write_hash(
+        self,
+        key: str,
+        data: Dict[str, Any],
+        ttl: int,
+        dirty_key: Optional[str] = None,
+        dirty_member: Any = None,
+        delete_fields: Iterable[str] = (),
+        only_if_exists: bool = False,
+    ) -> bool:
+        """
+        Write fields of a hash in one atomic round trip: HSET data, HDEL
+        delete_fields, refresh the TTL (if > 0) and add dirty_member to the
+        dirty_key set.
+
+        Args:
+            only_if_exists: Skip the write if the hash does not exist
+
+        Returns:
+            False if the write was skipped
+        """
+        encoded = self._encode_hash(key, data)
+        args: List[EncodedValue] = [
+            "1" if only_if_exists else "0",
+            str(ttl),
+            "" if dirty_member is None else str(dirty_member),
+            str(len(encoded)),
+        ]
+        for field, value in encoded.items():
+            args.extend((field, value))
+        args.extend(delete_fields)
+
+        written = await self._fcall("rpg_write_hash", [key, dirty_key or key], args)
+        if written:
+            self._ttl_refresh.note_refreshed(key, ttl)
+        return bool(written)
 
     async def _delete_from_valkey(self, key: str) -> None:
-        if self._valkey:
-            await self._valkey.delete([key])
+        if not self._valkey:
+            return
+        self._ttl_refresh.forget(key)
+        unit = current_unit_of_work()
+        if unit is not None:
+            unit.delete([key])
+            return
+        await self._valkey.delete([key])
+
+    def _near_cache(self) -> NearCache:
+        near_cache = get_near_cache()
+        for name, namespace in self.NEAR_CACHE_NAMESPACES.items():
+            if not near_cache.is_configured(name):
+                near_cache.configure(name, namespace)
+        return near_cache
+
+    async def _near_cached(
+        self, namespace: str, key: Any, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Read a value through the near-cache, calling loader on a miss.
+
+        None results are not cached, so a missing record is looked up again
+        next time (e.g. a player created since).
+        """
+        near_cache = self._near_cache()
+        hit, value = near_cache.lookup(namespace, key)
+        if hit:
+            return value
+
+        value = await loader()
+        if value is not None:
+            near_cache.store(namespace, key, value)
+        return value
+
+    async def _invalidate_near_cache(self, namespace: str, key: Any = None) -> None:
+        """
+        Drop a near-cache entry (or the whole namespace if key is None) in
+        this process and, through pub/sub, in every other server process.
+        """
+        self._near_cache().invalidate(namespace, key)
+        if not self._valkey or not settings.USE_VALKEY:
+            return
+        try:
+            await self._valkey.publish(encode_invalidation(namespace, key), NEAR_CACHE_CHANNEL)
+        except Exception as e:
+            # Other processes fall back to the namespace TTL
+            logger.warning(
+                "Could not publish near-cache invalidation",
+                extra={"namespace": namespace, "error": str(e)},
+            )
 
     async def _scan_keys(self, pattern: str) -> List[str]:
         """
@@ -183,6 +462,39 @@ class BaseManager:
 
         return keys
 
+    async def rewrite_packed_fields(self) -> int:
+        """
+        Rewrite PACKED fields still holding JSON text in the msgpack format.
+
+        Scans every hash prefix in HASH_SCHEMAS that has packed fields. Safe
+        to run while the server is up: only fields that still hold JSON are
+        written, and readers accept both formats.
+
+        Returns:
+            Number of hashes rewritten
+        """
+        if not self._valkey:
+            return 0
+
+        rewritten = 0
+        for prefix, schema in self.HASH_SCHEMAS.items():
+            if not schema.has_packed_fields:
+                continue
+            for key in await self._scan_keys(f"{prefix}:*"):
+                raw = await self._valkey.hgetall(key)
+                updates = {}
+                for raw_field, value in (raw or {}).items():
+                    field = self._decode_bytes(raw_field)
+                    if schema.field_type(field) is not FieldType.PACKED or is_packed(value):
+                        continue
+                    decoded = decode_value(value, FieldType.PACKED)
+                    if isinstance(decoded, (dict, list)):
+                        updates[field] = encode_value(decoded, FieldType.PACKED)
+                if updates:
+                    await self._valkey.hset(key, updates)
+                    rewritten += 1
+        return rewritten
+
     async def auto_load_with_ttl(
         self,
         key: str,
@@ -204,10 +516,8 @@ class BaseManager:
         """
         # 1. Try Valkey first
         if self._valkey and settings.USE_VALKEY:
-            cached = await self._get_from_valkey(key)
+            cached = await self._get_from_valkey(key, ttl)
             if cached:
-                await self._refresh_ttl(key, ttl)
-
                 if decoder:
                     return {
                         k: self._decode_from_valkey(v, decoder.get(k, str))
@@ -13,6 +13,7 @@ from sqlalchemy.orm import sessionmaker
 
 from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
+from server.src.core.valkey_pool import VALKEY_LANE_PERSISTENCE, in_valkey_lane
 
 from .player_state_manager import PlayerStateManager
 from .inventory_manager import InventoryManager
@@ -42,6 +43,7 @@ class BatchSyncCoordinator:
         self._ground_items = ground_item_manager
         self._session_factory = session_factory
 
+    @in_valkey_lane(VALKEY_LANE_PERSISTENCE)
     async def sync_all(self) -> Dict[str, int]:
         """Sync all dirty data to database. Returns counts of synced items."""
         if not self._session_factory:
@@ -52,6 +54,9 @@ class BatchSyncCoordinator:
         try:
             from sqlalchemy.ext.asyncio import AsyncSession
 
+            # Write pending hot-state changes so dirty flags and values are current
+            await self._player.flush_hot_state()
+
             async with self._session_factory() as db:
                 # Collect dirty items first
                 dirty_positions = await self._player.get_dirty_positions()
@@ -105,6 +110,7 @@ class BatchSyncCoordinator:
             )
             raise
 
+    @in_valkey_lane(VALKEY_LANE_PERSISTENCE)
     async def sync_all_on_shutdown(self) -> Dict[str, int]:
         """Sync all online player data before server shutdown."""
         if not self._session_factory:
@@ -113,6 +119,7 @@ class BatchSyncCoordinator:
         stats = {"players": 0}
 
         try:
+            await self._player.flush_hot_state()
             online_players = await self._player.get_all_online_player_ids()
 
             async with self._session_factory() as db:
@@ -235,6 +242,7 @@ class BatchSyncCoordinator:
         
         return results
 
+    @in_valkey_lane(VALKEY_LANE_PERSISTENCE)
     async def sync_and_commit_player(self, player_id: int) -> Dict[str, Any]:
         """
         Sync all data for a single player to database with internal session management.
@@ -0,0 +1,117 @@
+"""
+In-process schedule of player auto-attacks.
+
+Players in combat are kept in a min-heap keyed by the tick of their next
+auto-attack, so the game loop only looks at the attackers that are due
+instead of scanning every combat state each tick. The combat state itself
+(target, last attack tick, attack speed) stays in PlayerStateManager, which
+persists it to Valkey for crash recovery and keeps this schedule in step
+with every write.
+
+This module holds data only; PlayerStateManager owns the instance.
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from server.src.core.config import settings
+
+
+def attack_interval_ticks(combat_state: Dict[str, Any]) -> int:
+    """Ticks between two auto-attacks for a combat state's attack speed (seconds)."""
+    attack_speed = float(combat_state.get("attack_speed") or 0)
+    return max(1, int(attack_speed * settings.GAME_TICK_RATE))
+
+
+def next_attack_tick(combat_state: Dict[str, Any]) -> int:
+    """Tick of the next auto-attack of a combat state (0 when never attacked)."""
+    last_attack_tick = combat_state.get("last_attack_tick")
+    if last_attack_tick is None:
+        return 0
+    return int(last_attack_tick) + attack_interval_ticks(combat_state)
+
+
+class CombatScheduler:
+    """
+    Players in combat ordered by next-attack tick.
+
+    Rescheduling or unscheduling leaves the old heap entry behind; entries
+    whose tick no longer matches _next_attack_ticks are skipped when popped.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int]] = []
+        self._next_attack_ticks: Dict[int, int] = {}  # player_id -> next attack tick
+        self._due_now: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._next_attack_ticks) + len(self._due_now)
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._next_attack_ticks or player_id in self._due_now
+
+    def schedule(self, player_id: int, attack_tick: int) -> None:
+        """Schedule (or move) a player's next auto-attack."""
+        self._due_now.discard(player_id)
+        if self._next_attack_ticks.get(player_id) == attack_tick:
+            return
+        self._next_attack_ticks[player_id] = attack_tick
+        heapq.heappush(self._heap, (attack_tick, player_id))
+        self._compact()
+
+    def unschedule(self, player_id: int) -> None:
+        """Stop auto-attacking for a player (combat ended or player left)."""
+        self._next_attack_ticks.pop(player_id, None)
+        self._due_now.discard(player_id)
+        self._compact()
+
+    def collect_due(self, current_tick: int) -> int:
+        """
+        Pop every player whose auto-attack is due by this tick. Called once
+        per tick before maps are processed; each map then claims its players
+        with take_due. Unclaimed players stay due until claimed or
+        unscheduled.
+
+        Returns:
+            Number of players due
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= current_tick:
+            attack_tick, player_id = heapq.heappop(heap)
+            if self._next_attack_ticks.get(player_id) == attack_tick:
+                del self._next_attack_ticks[player_id]
+                self._due_now.add(player_id)
+        return len(self._due_now)
+
+    def take_due(self, player_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Claim the due players among player_ids (all due players if None).
+
+        Claimed players are no longer scheduled; writing their combat state
+        after the attack schedules the next one.
+        """
+        if not self._due_now:
+            return []
+        if player_ids is None:
+            taken = list(self._due_now)
+        else:
+            taken = [player_id for player_id in player_ids if player_id in self._due_now]
+        self._due_now.difference_update(taken)
+        return taken
+
+    def get_next_attack_tick(self, player_id: int) -> Optional[int]:
+        """Tick a player's next auto-attack is scheduled for, if any."""
+        return self._next_attack_ticks.get(player_id)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._next_attack_ticks.clear()
+        self._due_now.clear()
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self._next_attack_ticks) + 64:
+            self._heap = [
+                (attack_tick, player_id)
+                for player_id, attack_tick in self._next_attack_ticks.items()
+            ]
+            heapq.heapify(self._heap)
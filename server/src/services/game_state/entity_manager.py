@@ -3,12 +3,13 @@ Entity instance management - ephemeral combat entities.
 
 Handles monster and NPC instances spawned in the world. Valkey-only (no DB persistence).
 Entity definitions are reference data; instances are runtime-only.
+Instance positions are mirrored in an in-process SpatialIndex for proximity queries.
 """
 
 import time as time_mod
 import traceback
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from glide import GlideClient, RangeByScore, ScoreBoundary
 from sqlalchemy.orm import sessionmaker
@@ -17,6 +18,9 @@ from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
 from .base_manager import BaseManager
+from .hash_codecs import FieldType, HashSchema
+from .spatial_index import SpatialIndex
+from .unit_of_work import unit_of_work
 
 logger = get_logger(__name__)
 
@@ -26,6 +30,32 @@ MAP_ENTITIES_KEY = "map_entities:{map_id}"
 ENTITY_INSTANCE_COUNTER_KEY = "entity_instance_counter"
 ENTITY_RESPAWN_QUEUE_KEY = "entity_respawn_queue"
 
+# Values of entity instance fields not (yet) written, e.g. before
+# store_spawn_metadata() runs
+ENTITY_INSTANCE_DEFAULTS: Dict[str, Any] = {
+    "instance_id": None,
+    "entity_id": None,
+    "map_id": "",
+    "x": None,
+    "y": None,
+    "current_hp": None,
+    "max_hp": None,
+    "state": "idle",
+    "target_player_id": None,
+    "spawned_at": None,
+    "respawn_delay_seconds": None,
+    "entity_name": "",
+    "entity_type": "monster",
+    "spawn_x": None,
+    "spawn_y": None,
+    "wander_radius": None,
+    "spawn_point_id": None,
+    "aggro_radius": None,
+    "disengage_radius": None,
+    "death_tick": None,
+    "facing_direction": "DOWN",
+}
+
 # Entity instance TTL (0 = permanent storage, entities never expire)
 ENTITY_TTL = 0
 
@@ -33,12 +63,49 @@ ENTITY_TTL = 0
 class EntityManager(BaseManager):
     """Manages entity instances spawned in the world."""
 
+    HASH_SCHEMAS = {
+        "entity_instance": HashSchema({
+            "instance_id": FieldType.INT,
+            "entity_id": FieldType.INT,
+            "map_id": FieldType.STR,
+            "x": FieldType.INT,
+            "y": FieldType.INT,
+            "current_hp": FieldType.INT,
+            "max_hp": FieldType.INT,
+            "state": FieldType.STR,
+            "target_player_id": FieldType.INT,
+            "spawned_at": FieldType.FLOAT,
+            "respawn_delay_seconds": FieldType.INT,
+            "entity_name": FieldType.STR,
+            "entity_type": FieldType.STR,
+            "spawn_x": FieldType.INT,
+            "spawn_y": FieldType.INT,
+            "wander_radius": FieldType.INT,
+            "spawn_point_id": FieldType.INT,
+            "aggro_radius": FieldType.INT,
+            "disengage_radius": FieldType.INT,
+            "death_tick": FieldType.INT,
+            "facing_direction": FieldType.STR,
+        }),
+        "entity_respawn": HashSchema({
+            "entity_id": FieldType.INT,
+            "map_id": FieldType.STR,
+            "death_tick": FieldType.INT,
+            "respawn_at": FieldType.FLOAT,
+        }),
+    }
+
     def __init__(
         self,
         valkey_client: Optional[GlideClient] = None,
         session_factory: Optional[sessionmaker] = None,
     ):
         super().__init__(valkey_client, session_factory)
+        self._spatial_index = SpatialIndex()
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        return self._spatial_index
 
     # =========================================================================
     # Entity Instance Lifecycle
@@ -82,6 +149,8 @@ class EntityManager(BaseManager):
             map_key = MAP_ENTITIES_KEY.format(map_id=map_id)
             await self._valkey.sadd(map_key, [str(instance_id)])
 
+            self._spatial_index.update(instance_id, map_id, x, y)
+
         return instance_id
 
     async def _get_next_instance_id(self) -> int:
@@ -98,75 +167,106 @@ class EntityManager(BaseManager):
             return None
 
         key = ENTITY_INSTANCE_KEY.format(instance_id=instance_id)
-        data = await self._get_from_valkey(key)
+        data = await self._get_from_valkey(key, ENTITY_TTL)
 
         if data:
-            await self._refresh_ttl(key, ENTITY_TTL)
             return self._decode_entity_instance(data)
 
         return None
 
-    def _decode_entity_instance(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Decode entity instance data from Valkey."""
+    async def get_entity_instances(self, instance_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several entity instances in a single round trip.
+
+        Returns:
+            Instance data by instance ID (missing instances are omitted)
+        """
+        if not self._valkey or not settings.USE_VALKEY:
+            return {}
+
+        instance_ids = list(instance_ids)
+        keys = [ENTITY_INSTANCE_KEY.format(instance_id=instance_id) for instance_id in instance_ids]
+        results = await self._get_many_from_valkey(keys, ttl=ENTITY_TTL)
         return {
-            "instance_id": self._decode_from_valkey(data.get("instance_id"), int),
-            "entity_id": self._decode_from_valkey(data.get("entity_id"), int),
-            "map_id": data.get("map_id", ""),
-            "x": self._decode_from_valkey(data.get("x"), int),
-            "y": self._decode_from_valkey(data.get("y"), int),
-            "current_hp": self._decode_from_valkey(data.get("current_hp"), int),
-            "max_hp": self._decode_from_valkey(data.get("max_hp"), int),
-            "state": data.get("state", "idle"),
-            "target_player_id": self._decode_from_valkey(
-                data.get("target_player_id"), int
-            ),
-            "spawned_at": self._decode_from_valkey(data.get("spawned_at"), float),
-            "respawn_delay_seconds": self._decode_from_valkey(
-                data.get("respawn_delay_seconds"), int
-            ),
-            # Spawn metadata stored by store_spawn_metadata()
-            "entity_name": data.get("entity_name", ""),
-            "entity_type": data.get("entity_type", "monster"),
-            "spawn_x": self._decode_from_valkey(data.get("spawn_x"), int),
-            "spawn_y": self._decode_from_valkey(data.get("spawn_y"), int),
-            "wander_radius": self._decode_from_valkey(data.get("wander_radius"), int),
-            "spawn_point_id": self._decode_from_valkey(data.get("spawn_point_id"), int),
-            "aggro_radius": self._decode_from_valkey(data.get("aggro_radius"), int),
-            "disengage_radius": self._decode_from_valkey(data.get("disengage_radius"), int),
-            "death_tick": self._decode_from_valkey(data.get("death_tick"), int),
-            "facing_direction": data.get("facing_direction", "DOWN"),
+            instance_id: self._decode_entity_instance(data)
+            for instance_id, data in zip(instance_ids, results)
+            if data
         }
 
+    async def _get_instance_ids(self, map_key: str) -> List[int]:
+        instance_ids = await self._valkey.smembers(map_key)
+        return [int(self._decode_bytes(instance_id)) for instance_id in instance_ids]
+
+    def _decode_entity_instance(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in defaults for fields missing from an entity instance hash."""
+        return {**ENTITY_INSTANCE_DEFAULTS, **data}
+
     async def get_map_entities(self, map_id: str) -> List[Dict[str, Any]]:
         """Get all entity instances on a specific map."""
         if not self._valkey or not settings.USE_VALKEY:
             return []
 
-        map_key = MAP_ENTITIES_KEY.format(map_id=map_id)
-        instance_ids = await self._valkey.smembers(map_key)
+        instance_ids = await self._get_instance_ids(MAP_ENTITIES_KEY.format(map_id=map_id))
+        instances = await self.get_entity_instances(instance_ids)
 
         entities = []
-        for instance_id_bytes in instance_ids:
-            instance_id = int(self._decode_bytes(instance_id_bytes))
-            entity = await self.get_entity_instance(instance_id)
+        for instance_id in instance_ids:
+            entity = instances.get(instance_id)
             if entity:
                 entities.append(entity)
+                # Keeps the index complete for instances spawned by another process
+                self._spatial_index.update(instance_id, map_id, entity["x"] or 0, entity["y"] or 0)
+            else:
+                self._spatial_index.remove(instance_id)
 
         return entities
 
+    def get_entity_ids_near(
+        self, map_id: str, x: int, y: int, radius: int
+    ) -> List[int]:
+        """
+        Get instance IDs of entities on a map within `radius` tiles of (x, y).
+
+        Served from the in-process spatial index (Chebyshev distance).
+        """
+        return self._spatial_index.query_radius(map_id, x, y, radius)
+
     async def update_entity_position(self, instance_id: int, x: int, y: int, facing_direction: str = "DOWN") -> None:
         """Update entity position and facing direction."""
         if not self._valkey or not settings.USE_VALKEY:
             return
 
-        key = ENTITY_INSTANCE_KEY.format(instance_id=instance_id)
-        data = await self._get_from_valkey(key)
+        await self.update_entity_positions({instance_id: (x, y, facing_direction)})
 
-        if data:
-            data["x"] = x
-            data["y"] = y
-            data["facing_direction"] = facing_direction
-            await self._cache_in_valkey(key, data, ENTITY_TTL)
+    async def update_entity_positions(
+        self, moves: Dict[int, Tuple[int, int, str]]
+    ) -> None:
+        """
+        Update the position and facing direction of several entities in two
+        round trips. Instances that no longer exist are skipped.
+
+        Args:
+            moves: (x, y, facing_direction) by instance ID
+        """
+        if not self._valkey or not settings.USE_VALKEY or not moves:
+            return
+
+        instance_ids = list(moves)
+        keys = [ENTITY_INSTANCE_KEY.format(instance_id=instance_id) for instance_id in instance_ids]
+        existing = await self._get_many_from_valkey(keys)
+
+        writes: Dict[str, Dict[str, Any]] = {}
+        for instance_id, key, data in zip(instance_ids, keys, existing):
+            if not data:
+                continue
+            x, y, facing_direction = moves[instance_id]
+            writes[key] = {"x": x, "y": y, "facing_direction": facing_direction}
+
+            map_id = data.get("map_id")
+            if map_id:
+                self._spatial_index.update(instance_id, map_id, x, y)
+
+        await self._cache_many_in_valkey(writes, ENTITY_TTL)
 
     async def update_entity_hp(self, instance_id: int, current_hp: int) -> None:
         """Update entity HP."""
@@ -177,8 +277,7 @@ class EntityManager(BaseManager):
         data = await self._get_from_valkey(key)
 
         if data:
-            data["current_hp"] = current_hp
-            await self._cache_in_valkey(key, data, ENTITY_TTL)
+            await self._cache_in_valkey(key, {"current_hp": current_hp}, ENTITY_TTL)
 
     async def set_entity_state(
         self,
@@ -197,10 +296,10 @@ class EntityManager(BaseManager):
             # Convert enum to string value for consistent serialization
             if isinstance(state, Enum):
                 state = state.value
-            data["state"] = state
+            fields: Dict[str, Any] = {"state": state}
             if target_player_id is not None:
-                data["target_player_id"] = target_player_id
-            await self._cache_in_valkey(key, data, ENTITY_TTL)
+                fields["target_player_id"] = target_player_id
+            await self._cache_in_valkey(key, fields, ENTITY_TTL)
 
     async def mark_entity_dying(
         self, instance_id: int, death_tick: int, respawn_delay_seconds: int = 30
@@ -227,13 +326,15 @@ class EntityManager(BaseManager):
             return
 
         # Set state to dying and store death_tick for animation period
-        data["state"] = "dying"
-        data["death_tick"] = death_tick
-        data["respawn_delay_seconds"] = respawn_delay_seconds
-        data["current_hp"] = 0  # Ensure HP is 0
+        fields = {
+            "state": "dying",
+            "death_tick": death_tick,
+            "respawn_delay_seconds": respawn_delay_seconds,
+            "current_hp": 0,  # Ensure HP is 0
+        }
         
         # Update in Valkey (entity stays visible during animation)
-        await self._cache_in_valkey(key, data, ENTITY_TTL)
+        await self._cache_in_valkey(key, fields, ENTITY_TTL)
         
         logger.debug(
             "Entity marked as dying",
@@ -262,6 +363,7 @@ class EntityManager(BaseManager):
 
         # Remove from active entities
         await self._delete_from_valkey(key)
+        self._spatial_index.remove(instance_id)
 
         if map_id:
             map_key = MAP_ENTITIES_KEY.format(map_id=map_id)
@@ -296,13 +398,22 @@ class EntityManager(BaseManager):
         respawn_key = f"entity_respawn:{instance_id}"
         await self._delete_from_valkey(respawn_key)
 
-    async def clear_all_entity_instances(self) -> None:
-        """Clear all entity instances (server shutdown)."""
+    async def clear_all_entity_instances(self, map_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Clear all entity instances (server startup/shutdown).
+
+        Args:
+            map_ids: Only clear the instances of these maps (a map worker
+                leaves the other workers' maps alone). None for all maps.
+        """
         if not self._valkey or not settings.USE_VALKEY:
             return
 
-        # Get all map keys using scan (GlideClient-compatible)
-        map_keys = await self._scan_keys("map_entities:*")
+        if map_ids is None:
+            # Get all map keys using scan (GlideClient-compatible)
+            map_keys = await self._scan_keys("map_entities:*")
+        else:
+            map_keys = [MAP_ENTITIES_KEY.format(map_id=map_id) for map_id in map_ids]
 
         # Get all instance IDs from all maps
         all_instance_ids: Set[str] = set()
@@ -310,17 +421,23 @@ class EntityManager(BaseManager):
             instance_ids = await self._valkey.smembers(map_key)
             all_instance_ids.update(self._decode_bytes(i) for i in instance_ids)
 
-        # Delete all instance data
-        for instance_id in all_instance_ids:
-            key = ENTITY_INSTANCE_KEY.format(instance_id=instance_id)
-            await self._delete_from_valkey(key)
+        async with unit_of_work(self._valkey):
+            # Delete all instance data
+            for instance_id in all_instance_ids:
+                key = ENTITY_INSTANCE_KEY.format(instance_id=instance_id)
+                await self._delete_from_valkey(key)
 
-        # Delete all map indices
-        for map_key in map_keys:
-            await self._delete_from_valkey(map_key)
+            # Delete all map indices
+            for map_key in map_keys:
+                await self._delete_from_valkey(map_key)
 
         # Clear respawn queue
-        await self._delete_from_valkey(ENTITY_RESPAWN_QUEUE_KEY)
+        if map_ids is None:
+            await self._delete_from_valkey(ENTITY_RESPAWN_QUEUE_KEY)
+        elif all_instance_ids:
+            await self._valkey.zrem(ENTITY_RESPAWN_QUEUE_KEY, list(all_instance_ids))
+
+        self._spatial_index.clear()
 
         logger.info("Cleared entity instances", extra={"instance_count": len(all_instance_ids)})
 
@@ -333,13 +450,10 @@ class EntityManager(BaseManager):
         map_keys = await self._scan_keys("map_entities:*")
 
         for map_key in map_keys:
-            instance_ids = await self._valkey.smembers(map_key)
-
-            for instance_id_bytes in instance_ids:
-                instance_id = int(self._decode_bytes(instance_id_bytes))
-                entity = await self.get_entity_instance(instance_id)
+            instances = await self.get_entity_instances(await self._get_instance_ids(map_key))
 
-                if entity and entity.get("target_player_id") == player_id:
+            for instance_id, entity in instances.items():
+                if entity.get("target_player_id") == player_id:
                     await self.set_entity_state(instance_id, "idle", None)
 
     async def get_entities_targeting_player(self, player_id: int) -> List[int]:
@@ -351,13 +465,10 @@ class EntityManager(BaseManager):
         map_keys = await self._scan_keys("map_entities:*")
 
         for map_key in map_keys:
-            instance_ids = await self._valkey.smembers(map_key)
-
-            for instance_id_bytes in instance_ids:
-                instance_id = int(self._decode_bytes(instance_id_bytes))
-                entity = await self.get_entity_instance(instance_id)
+            instances = await self.get_entity_instances(await self._get_instance_ids(map_key))
 
-                if entity and entity.get("target_player_id") == player_id:
+            for instance_id, entity in instances.items():
+                if entity.get("target_player_id") == player_id:
                     targeting.append(instance_id)
 
         return targeting
@@ -423,17 +534,19 @@ class EntityManager(BaseManager):
         current_data = await self._get_from_valkey(key)
         
         if current_data:
-            current_data["entity_name"] = entity_name
-            current_data["entity_type"] = entity_type
-            current_data["spawn_x"] = spawn_x
-            current_data["spawn_y"] = spawn_y
-            current_data["wander_radius"] = wander_radius
-            current_data["spawn_point_id"] = spawn_point_id
+            metadata: Dict[str, Any] = {
+                "entity_name": entity_name,
+                "entity_type": entity_type,
+                "spawn_x": spawn_x,
+                "spawn_y": spawn_y,
+                "wander_radius": wander_radius,
+                "spawn_point_id": spawn_point_id,
+            }
             if aggro_radius is not None:
-                current_data["aggro_radius"] = aggro_radius
+                metadata["aggro_radius"] = aggro_radius
             if disengage_radius is not None:
-                current_data["disengage_radius"] = disengage_radius
-            await self._cache_in_valkey(key, current_data, ENTITY_TTL)
+                metadata["disengage_radius"] = disengage_radius
+            await self._cache_in_valkey(key, metadata, ENTITY_TTL)
 
     async def get_time_based_respawn_queue(self, current_time: float) -> List[int]:
         """
@@ -16,6 +16,7 @@ from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
 from .base_manager import BaseManager, TIER2_TTL
+from .hash_codecs import FieldType, HashSchema
 
 logger = get_logger(__name__)
 
@@ -26,6 +27,9 @@ DIRTY_EQUIPMENT_KEY = "dirty:equipment"
 class EquipmentManager(BaseManager):
     """Manages player equipment persistence with transparent auto-loading."""
 
+    # Fields are equipment slots, each holding the slot's item data
+    HASH_SCHEMAS = {"equipment": HashSchema(default=FieldType.PACKED)}
+
     def __init__(
         self,
         valkey_client: Optional[GlideClient] = None,
@@ -95,19 +99,16 @@ class EquipmentManager(BaseManager):
             return
 
         key = EQUIPMENT_KEY.format(player_id=player_id)
-
-        # Get current equipment
-        equipment = await self._get_from_valkey(key) or {}
-
-        # Update slot
-        equipment[slot] = {
+        slot_data = {
             "item_id": item_id,
             "quantity": quantity,
             "current_durability": durability,
         }
-
-        await self._cache_in_valkey(key, equipment, TIER2_TTL)
-        await self._valkey.sadd(DIRTY_EQUIPMENT_KEY, [str(player_id)])
+        # Write only this slot field (plus TTL and dirty mark) in one round trip
+        await self._write_hash(
+            key, {slot: slot_data}, TIER2_TTL,
+            dirty_key=DIRTY_EQUIPMENT_KEY, dirty_member=player_id,
+        )
 
     async def _update_equipment_slot_in_db(
         self, player_id: int, slot: str, item_id: int, quantity: int, durability: float
@@ -145,10 +146,11 @@ class EquipmentManager(BaseManager):
             return
 
         key = EQUIPMENT_KEY.format(player_id=player_id)
-
-        # Delete the field from the hash
-        await self._valkey.hdel(key, [slot])
-        await self._valkey.sadd(DIRTY_EQUIPMENT_KEY, [str(player_id)])
+        await self._write_hash(
+            key, {}, 0,
+            dirty_key=DIRTY_EQUIPMENT_KEY, dirty_member=player_id,
+            delete_fields=[slot],
+        )
 
     async def _delete_equipment_slot_from_db(self, player_id: int, slot: str) -> None:
         if not self._session_factory:
@@ -3,12 +3,13 @@ Ground item management - ephemeral world items.
 
 Handles items dropped on the ground with despawn timers and loot protection.
 Pure persistence layer; business logic (loot rules, distance checks) in GroundItemService.
+Item positions are mirrored in an in-process SpatialIndex for proximity queries.
 """
 
 import traceback
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from glide import GlideClient
+from glide import Batch, GlideClient
 from sqlalchemy import select, delete
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -17,6 +18,8 @@ from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
 from .base_manager import BaseManager
+from .hash_codecs import FieldType, HashSchema
+from .spatial_index import SpatialIndex
 
 logger = get_logger(__name__)
 
@@ -33,12 +36,33 @@ GROUND_ITEM_TTL = 3600  # 1 hour
 class GroundItemManager(BaseManager):
     """Manages ground items (dropped items in the world)."""
 
+    HASH_SCHEMAS = {
+        "ground_item": HashSchema({
+            "ground_item_id": FieldType.INT,
+            "map_id": FieldType.STR,
+            "x": FieldType.INT,
+            "y": FieldType.INT,
+            "item_id": FieldType.INT,
+            "quantity": FieldType.INT,
+            "durability": FieldType.FLOAT,
+            "dropped_by_player_id": FieldType.INT,
+            "loot_protection_expires_at": FieldType.FLOAT,
+            "despawn_at": FieldType.FLOAT,
+            "created_at": FieldType.FLOAT,
+        }),
+    }
+
     def __init__(
         self,
         valkey_client: Optional[GlideClient] = None,
         session_factory: Optional[sessionmaker] = None,
     ):
         super().__init__(valkey_client, session_factory)
+        self._spatial_index = SpatialIndex()
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        return self._spatial_index
 
     # =========================================================================
     # Ground Item CRUD
@@ -95,6 +119,8 @@ class GroundItemManager(BaseManager):
             # Mark for DB sync
             await self._valkey.sadd(DIRTY_GROUND_ITEMS_KEY, [str(ground_item_id)])
 
+            self._spatial_index.update(ground_item_id, map_id, x, y)
+
         return ground_item_id
 
     async def remove_ground_item(self, ground_item_id: int, map_id: str) -> bool:
@@ -104,24 +130,89 @@ class GroundItemManager(BaseManager):
             await self._remove_from_db(ground_item_id)
             return True
 
-        key = GROUND_ITEM_KEY.format(ground_item_id=ground_item_id)
+        return await self.take_ground_item(ground_item_id, map_id) is not None
 
-        # Check if item exists
-        exists = await self._valkey.exists([key])
-        if not exists:
-            return False
+    async def take_ground_item(self, ground_item_id: int, map_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically remove a ground item from Valkey, its map index and mark it
+        for DB deletion. Only one of several concurrent callers gets the item.
 
-        # Remove from Valkey
-        await self._delete_from_valkey(key)
+        Returns:
+            The removed item, or None if it was already gone
+        """
+        if not self._valkey or not settings.USE_VALKEY:
+            item = await self._load_ground_item_from_db(ground_item_id)
+            if item is not None:
+                await self._remove_from_db(ground_item_id)
+            return item
 
-        # Remove from map index
+        key = GROUND_ITEM_KEY.format(ground_item_id=ground_item_id)
         map_key = GROUND_ITEMS_MAP_KEY.format(map_id=map_id)
-        await self._valkey.srem(map_key, [str(ground_item_id)])
+        self._ttl_refresh.forget(key)
+        fields = await self._fcall(
+            "rpg_take_hash", [key, map_key, GROUND_ITEMS_DELETE_KEY], [str(ground_item_id)]
+        )
+        if not fields:
+            return None
+
+        self._spatial_index.remove(ground_item_id)
+        raw = dict(zip(fields[::2], fields[1::2]))
+        return self._decode_ground_item(self._decode_hash(raw, key))
+
+    async def restore_ground_item(self, item: Dict[str, Any]) -> None:
+        """Put back an item returned by take_ground_item (e.g. a failed pickup)."""
+        if not self._valkey or not settings.USE_VALKEY:
+            # take_ground_item deleted the row; insert it again
+            await self._restore_to_db(item)
+            return
+
+        ground_item_id = item["ground_item_id"]
+        key = GROUND_ITEM_KEY.format(ground_item_id=ground_item_id)
+        map_key = GROUND_ITEMS_MAP_KEY.format(map_id=item["map_id"])
+        self._ttl_refresh.note_refreshed(key, GROUND_ITEM_TTL)
 
-        # Mark for DB deletion
-        await self._valkey.sadd(GROUND_ITEMS_DELETE_KEY, [str(ground_item_id)])
+        batch = Batch(is_atomic=True)
+        batch.hset(key, self._encode_hash(key, item))
+        batch.expire(key, GROUND_ITEM_TTL)
+        batch.sadd(map_key, [str(ground_item_id)])
+        batch.srem(GROUND_ITEMS_DELETE_KEY, [str(ground_item_id)])
+        # The row may already have been deleted by a sync in between
+        batch.sadd(DIRTY_GROUND_ITEMS_KEY, [str(ground_item_id)])
+        await self._valkey.exec(batch, raise_on_error=True)
 
-        return True
+        self._spatial_index.update(ground_item_id, item["map_id"], item["x"], item["y"])
+
+    async def _restore_to_db(self, item: Dict[str, Any]) -> None:
+        if not self._session_factory:
+            return
+
+        from server.src.models.item import GroundItem
+        from datetime import datetime, timezone
+
+        def to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+            return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp else None
+
+        # Loading maps a NULL durability to 1.0; map it back
+        durability = item.get("durability")
+        if durability is not None:
+            durability = int(durability) if durability != 1.0 else None
+
+        async with self._db_session() as db:
+            stmt = pg_insert(GroundItem).values(
+                id=item["ground_item_id"],
+                map_id=item["map_id"],
+                x=item["x"],
+                y=item["y"],
+                item_id=item["item_id"],
+                quantity=item["quantity"],
+                current_durability=durability,
+                dropped_by=item.get("dropped_by_player_id"),
+                public_at=to_datetime(item.get("loot_protection_expires_at")),
+                despawn_at=to_datetime(item.get("despawn_at")),
+                dropped_at=to_datetime(item.get("created_at")) or datetime.now(timezone.utc),
+            )
+            await db.execute(stmt.on_conflict_do_nothing(index_elements=["id"]))
+            await self._commit_if_not_test_session(db)
 
     async def _remove_from_db(self, ground_item_id: int) -> None:
         if not self._session_factory:
@@ -141,14 +232,39 @@ class GroundItemManager(BaseManager):
             return await self._load_ground_item_from_db(ground_item_id)
 
         key = GROUND_ITEM_KEY.format(ground_item_id=ground_item_id)
-        data = await self._get_from_valkey(key)
+        data = await self._get_from_valkey(key, GROUND_ITEM_TTL)
 
         if data:
-            await self._refresh_ttl(key, GROUND_ITEM_TTL)
             return self._decode_ground_item(data)
 
         return None
 
+    async def get_ground_items(self, ground_item_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several ground items in a single round trip (refreshing their TTL).
+
+        Returns:
+            Ground item data by ID (missing or expired items are omitted)
+        """
+        ground_item_ids = list(ground_item_ids)
+        if not ground_item_ids:
+            return {}
+        if not self._valkey or not settings.USE_VALKEY:
+            items = {}
+            for ground_item_id in ground_item_ids:
+                item = await self._load_ground_item_from_db(ground_item_id)
+                if item:
+                    items[ground_item_id] = item
+            return items
+
+        keys = [GROUND_ITEM_KEY.format(ground_item_id=item_id) for item_id in ground_item_ids]
+        results = await self._get_many_from_valkey(keys, ttl=GROUND_ITEM_TTL)
+        return {
+            item_id: self._decode_ground_item(data)
+            for item_id, data in zip(ground_item_ids, results)
+            if data
+        }
+
     async def _load_ground_item_from_db(
         self, ground_item_id: int
     ) -> Optional[Dict[str, Any]]:
@@ -186,26 +302,10 @@ class GroundItemManager(BaseManager):
             return None
 
     def _decode_ground_item(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Decode ground item data from Valkey."""
-        return {
-            "ground_item_id": self._decode_from_valkey(
-                data.get("ground_item_id"), int
-            ),
-            "map_id": data.get("map_id", ""),
-            "x": self._decode_from_valkey(data.get("x"), int),
-            "y": self._decode_from_valkey(data.get("y"), int),
-            "item_id": self._decode_from_valkey(data.get("item_id"), int),
-            "quantity": self._decode_from_valkey(data.get("quantity"), int),
-            "durability": self._decode_from_valkey(data.get("durability"), float),
-            "dropped_by_player_id": self._decode_from_valkey(
-                data.get("dropped_by_player_id"), int
-            ),
-            "loot_protection_expires_at": self._decode_from_valkey(
-                data.get("loot_protection_expires_at"), float
-            ),
-            "despawn_at": self._decode_from_valkey(data.get("despawn_at"), float),
-            "created_at": self._decode_from_valkey(data.get("created_at"), float),
-        }
+        """Pick the ground item fields from a decoded hash."""
+        item = {field: data.get(field) for field in self.HASH_SCHEMAS["ground_item"].fields}
+        item["map_id"] = data.get("map_id", "")
+        return item
 
     async def get_ground_items_on_map(self, map_id: str) -> List[Dict[str, Any]]:
         """Get all ground items on a specific map."""
@@ -213,17 +313,64 @@ class GroundItemManager(BaseManager):
             return await self._load_ground_items_for_map_from_db(map_id)
 
         map_key = GROUND_ITEMS_MAP_KEY.format(map_id=map_id)
-        item_ids = await self._valkey.smembers(map_key)
+        item_ids = [
+            int(self._decode_bytes(item_id_bytes))
+            for item_id_bytes in await self._valkey.smembers(map_key)
+        ]
+        found = await self.get_ground_items(item_ids)
 
         items = []
-        for item_id_bytes in item_ids:
-            item_id = int(self._decode_bytes(item_id_bytes))
-            item = await self.get_ground_item(item_id)
+        for item_id in item_ids:
+            item = found.get(item_id)
             if item:
                 items.append(item)
+                # Keeps the index complete for items left over from a previous run
+                self._spatial_index.update(item_id, map_id, item["x"] or 0, item["y"] or 0)
+            else:
+                self._spatial_index.remove(item_id)
 
         return items
 
+    async def get_ground_items_near(
+        self, map_id: str, x: int, y: int, radius: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Get ground items on a map within `radius` tiles of (x, y).
+
+        Candidates come from the spatial index and are fetched in one
+        pipelined round trip, instead of loading every item on the map.
+
+        Args:
+            map_id: Map to search
+            x, y: Center tile position
+            radius: Maximum distance in tiles (Chebyshev)
+
+        Returns:
+            List of ground item dicts (same format as get_ground_item)
+        """
+        if not self._valkey or not settings.USE_VALKEY:
+            return [
+                item
+                for item in await self._load_ground_items_for_map_from_db(map_id)
+                if abs(item["x"] - x) <= radius and abs(item["y"] - y) <= radius
+            ]
+
+        item_ids = self._spatial_index.query_radius(map_id, x, y, radius)
+        if not item_ids:
+            return []
+
+        found = await self.get_ground_items(item_ids)
+
+        items = []
+        for item_id in item_ids:
+            item = found.get(item_id)
+            if item:
+                items.append(item)
+            else:
+                # Key expired in Valkey without going through remove_ground_item
+                self._spatial_index.remove(item_id)
+        return items
+
     async def _load_ground_items_for_map_from_db(self, map_id: str) -> List[Dict[str, Any]]:
         if not self._session_factory:
             return []
@@ -303,6 +450,8 @@ class GroundItemManager(BaseManager):
                 await self._valkey.sadd(map_key, [str(item.id)])
                 await self._valkey.expire(map_key, GROUND_ITEM_TTL)
 
+                self._spatial_index.update(item.id, item.map_id, item.x, item.y)
+
                 count += 1
 
             # Set next ID
@@ -0,0 +1,135 @@
+"""
+Typed field codecs for game state hashes in Valkey.
+
+Each manager declares a HashSchema per key prefix (the part of the key
+before the first ":") listing the type of each hash field. Known fields are
+decoded straight to their type instead of trying json.loads on every value,
+and nested values (dicts/lists) are stored as msgpack instead of JSON text.
+The hash layout is unchanged, so single fields can still be written with a
+partial HSET.
+
+Scalars keep their text form ("12", "3.5", "True", "None") so existing
+values, HINCRBY-style commands and redis-cli output stay readable. Only
+PACKED fields are ever read as msgpack. Packed values start with a msgpack
+map/array marker byte, unlike the JSON text ("{", "[") older servers wrote
+to those fields; BaseManager.rewrite_packed_fields upgrades those in place.
+The markers are not unique to msgpack (0xDC-0xDF also begin UTF-8 text in
+U+0700-U+07FF), so other fields never look at them.
+
+Fields missing from a schema, and hashes without one, use the legacy
+string/JSON encoding and are never packed.
+"""
+
+import json
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional, Union
+
+import msgpack
+
+EncodedValue = Union[str, bytes]
+
+# First bytes of msgpack fixmap/fixarray/array16/array32/map16/map32
+_PACKED_CONTAINER_MARKERS = frozenset(range(0x80, 0xA0)) | frozenset(range(0xDC, 0xE0))
+
+
+class FieldType(str, Enum):
+    """Storage type of a hash field."""
+
+    INT = "int"
+    FLOAT = "float"
+    STR = "str"
+    BOOL = "bool"
+    PACKED = "packed"  # dict/list stored as msgpack
+
+
+def encode_legacy(value: Any) -> str:
+    """Encode a value the way fields without a schema are stored."""
+    if value is None:
+        return "None"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def decode_legacy(value: Union[bytes, str]) -> Any:
+    """Decode a value stored with encode_legacy (JSON text parsed when possible)."""
+    if isinstance(value, bytes):
+        value = value.decode()
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def is_packed(value: Union[bytes, str]) -> bool:
+    """
+    True if a raw value of a PACKED field holds a msgpack container (rather
+    than legacy JSON text). Meaningless for other fields.
+    """
+    return isinstance(value, bytes) and bool(value) and value[0] in _PACKED_CONTAINER_MARKERS
+
+
+def encode_value(value: Any, field_type: Optional[FieldType]) -> EncodedValue:
+    """Encode a single field value for HSET."""
+    if field_type is FieldType.PACKED and isinstance(value, (dict, list, tuple)):
+        return msgpack.packb(value, use_bin_type=True)
+    return encode_legacy(value)
+
+
+def decode_value(value: Union[bytes, str], field_type: Optional[FieldType]) -> Any:
+    """Decode a single raw field value read with HGET/HGETALL."""
+    if field_type is FieldType.PACKED and is_packed(value):
+        try:
+            return msgpack.unpackb(value, raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException):
+            # Text that happens to start with a marker byte
+            return decode_legacy(value)
+    if field_type is None:
+        return decode_legacy(value)
+
+    text = value.decode() if isinstance(value, bytes) else value
+    if text == "None":
+        return None
+    try:
+        if field_type is FieldType.INT:
+            return int(text)
+        if field_type is FieldType.FLOAT:
+            return float(text)
+    except ValueError:
+        # e.g. an int field written as "12.0" by an older server
+        return decode_legacy(text)
+    if field_type is FieldType.STR:
+        return text
+    if field_type is FieldType.BOOL:
+        return text.lower() == "true"
+    # PACKED field still holding JSON text from an older server
+    return decode_legacy(text)
+
+
+@dataclass(frozen=True)
+class HashSchema:
+    """
+    Field types of one kind of hash.
+
+    Attributes:
+        fields: Type of each known field
+        default: Type of fields not listed (e.g. inventory slots); None keeps
+            the legacy encoding for them
+    """
+
+    fields: Dict[str, FieldType] = field(default_factory=dict)
+    default: Optional[FieldType] = None
+
+    def field_type(self, name: str) -> Optional[FieldType]:
+        return self.fields.get(name, self.default)
+
+    def encode(self, data: Dict[str, Any]) -> Dict[str, EncodedValue]:
+        return {k: encode_value(v, self.field_type(k)) for k, v in data.items()}
+
+    def decode_field(self, name: str, value: Union[bytes, str]) -> Any:
+        return decode_value(value, self.field_type(name))
+
+    @property
+    def has_packed_fields(self) -> bool:
+        return self.default is FieldType.PACKED or FieldType.PACKED in self.fields.values()
@@ -0,0 +1,192 @@
+"""
+In-process hot state store for game-loop-owned players.
+
+The game loop reads every connected player's state every tick. Going to
+Valkey for each of those reads (HGETALL + JSON decode + EXPIRE) makes tick
+cost scale with network round trips. Once a player is attached to this
+store, the in-memory copy becomes authoritative for their player hash and
+combat state: PlayerStateManager reads are served from memory and writes
+are recorded as dirty fields that are flushed to Valkey in batches.
+
+This module holds data only; all Valkey I/O (attach, flush) lives in
+PlayerStateManager so encoding stays in one place.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class HotStateStore:
+    """
+    Authoritative in-memory player state with write-behind dirty tracking.
+
+    Two kinds of state are held per attached player:
+    - the ``player:{id}`` hash (position, facing, HP, username, ...)
+    - the ``player_combat:{id}`` hash (current combat target), or None
+    """
+
+    def __init__(self):
+        self._states: Dict[int, Dict[str, Any]] = {}
+        self._dirty_fields: Dict[int, Set[str]] = {}
+        self._combat_states: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._dirty_combat: Set[int] = set()
+        self._last_touched: Dict[int, float] = {}
+
+    # =========================================================================
+    # Attachment
+    # =========================================================================
+
+    def is_attached(self, player_id: int) -> bool:
+        """Check if the store is authoritative for this player."""
+        return player_id in self._states
+
+    def attach(
+        self,
+        player_id: int,
+        state: Dict[str, Any],
+        combat_state: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Start owning a player's state.
+
+        Args:
+            player_id: Player database ID
+            state: Current contents of the player hash (already decoded)
+            combat_state: Current combat state, or None if not in combat
+        """
+        self._states[player_id] = dict(state)
+        self._combat_states[player_id] = dict(combat_state) if combat_state else None
+        self._last_touched[player_id] = time.monotonic()
+
+    def detach(self, player_id: int) -> None:
+        """Stop owning a player's state, discarding any unflushed changes."""
+        self._states.pop(player_id, None)
+        self._dirty_fields.pop(player_id, None)
+        self._combat_states.pop(player_id, None)
+        self._dirty_combat.discard(player_id)
+        self._last_touched.pop(player_id, None)
+
+    def attached_player_ids(self) -> List[int]:
+        """Get IDs of all attached players."""
+        return list(self._states.keys())
+
+    # =========================================================================
+    # Player State
+    # =========================================================================
+
+    def get_state(self, player_id: int) -> Optional[Dict[str, Any]]:
+        """Get a shallow copy of the player's state, or None if not attached."""
+        state = self._states.get(player_id)
+        return dict(state) if state is not None else None
+
+    def update_state(self, player_id: int, fields: Dict[str, Any]) -> None:
+        """
+        Merge fields into the player's state and mark them dirty.
+
+        Has no effect if the player is not attached.
+        """
+        state = self._states.get(player_id)
+        if state is None:
+            return
+        state.update(fields)
+        self._dirty_fields.setdefault(player_id, set()).update(fields.keys())
+
+    # =========================================================================
+    # Combat State
+    # =========================================================================
+
+    def get_combat_state(self, player_id: int) -> Optional[Dict[str, Any]]:
+        """Get a copy of the player's combat state, or None."""
+        combat_state = self._combat_states.get(player_id)
+        return dict(combat_state) if combat_state is not None else None
+
+    def set_combat_state(
+        self, player_id: int, combat_state: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        Replace the player's combat state (None clears it) and mark it dirty.
+
+        Has no effect if the player is not attached.
+        """
+        if player_id not in self._states:
+            return
+        self._combat_states[player_id] = dict(combat_state) if combat_state else None
+        self._dirty_combat.add(player_id)
+
+    def get_all_combat_states(self) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Get combat state for every attached player (None if not in combat)."""
+        return {
+            player_id: dict(combat_state) if combat_state is not None else None
+            for player_id, combat_state in self._combat_states.items()
+        }
+
+    # =========================================================================
+    # Write-behind Support
+    # =========================================================================
+
+    def has_pending_writes(self, player_id: int) -> bool:
+        """Check if the player has changes not yet flushed to Valkey."""
+        return bool(self._dirty_fields.get(player_id)) or player_id in self._dirty_combat
+
+    def take_dirty(
+        self, player_ids: Optional[List[int]] = None
+    ) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, Optional[Dict[str, Any]]]]:
+        """
+        Collect and clear pending writes.
+
+        Args:
+            player_ids: Restrict to these players (default: all attached players)
+
+        Returns:
+            Tuple of (player_id -> dirty state fields, player_id -> combat state or None)
+        """
+        candidates = player_ids if player_ids is not None else list(self._states.keys())
+
+        state_writes: Dict[int, Dict[str, Any]] = {}
+        combat_writes: Dict[int, Optional[Dict[str, Any]]] = {}
+
+        for player_id in candidates:
+            fields = self._dirty_fields.pop(player_id, None)
+            state = self._states.get(player_id)
+            if fields and state is not None:
+                state_writes[player_id] = {field: state[field] for field in fields if field in state}
+
+            if player_id in self._dirty_combat:
+                self._dirty_combat.discard(player_id)
+                combat_writes[player_id] = self.get_combat_state(player_id)
+
+        return state_writes, combat_writes
+
+    def restore_dirty(
+        self,
+        state_writes: Dict[int, Dict[str, Any]],
+        combat_writes: Dict[int, Optional[Dict[str, Any]]],
+    ) -> None:
+        """Re-mark writes as dirty after a failed flush so they are retried."""
+        for player_id, fields in state_writes.items():
+            if player_id in self._states:
+                self._dirty_fields.setdefault(player_id, set()).update(fields.keys())
+        for player_id in combat_writes:
+            if player_id in self._states:
+                self._dirty_combat.add(player_id)
+
+    def take_stale_touches(self, max_age_seconds: float) -> List[int]:
+        """
+        Get attached players whose Valkey TTL has not been refreshed recently.
+
+        The returned players are marked as touched now.
+        """
+        now = time.monotonic()
+        stale = [
+            player_id
+            for player_id, touched in self._last_touched.items()
+            if now - touched >= max_age_seconds
+        ]
+        for player_id in stale:
+            self._last_touched[player_id] = now
+        return stale
+
+    def mark_touched(self, player_id: int) -> None:
+        """Record that the player's Valkey TTL was just refreshed."""
+        if player_id in self._states:
+            self._last_touched[player_id] = time.monotonic()
@@ -16,6 +16,7 @@ from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
 from .base_manager import BaseManager, TIER2_TTL
+from .hash_codecs import FieldType, HashSchema
 
 logger = get_logger(__name__)
 
@@ -26,6 +27,9 @@ DIRTY_INVENTORY_KEY = "dirty:inventory"
 class InventoryManager(BaseManager):
     """Manages player inventory persistence with transparent auto-loading."""
 
+    # Fields are slot numbers, each holding the slot's item data
+    HASH_SCHEMAS = {"inventory": HashSchema(default=FieldType.PACKED)}
+
     def __init__(
         self,
         valkey_client: Optional[GlideClient] = None,
@@ -86,20 +90,16 @@ class InventoryManager(BaseManager):
             return
 
         key = INVENTORY_KEY.format(player_id=player_id)
-        slot_str = str(slot)
-        
-        # Encode slot data for Valkey
         slot_data = {
             "item_id": item_id,
             "quantity": quantity,
             "current_durability": durability,
         }
-        encoded_slot_data = self._encode_for_valkey(slot_data)
-        
-        # Write only this slot field to the hash (atomic field-level operation)
-        await self._valkey.hset(key, {slot_str: encoded_slot_data})
-        await self._valkey.expire(key, TIER2_TTL)
-        await self._valkey.sadd(DIRTY_INVENTORY_KEY, [str(player_id)])
+        # Write only this slot field (plus TTL and dirty mark) in one round trip
+        await self._write_hash(
+            key, {str(slot): slot_data}, TIER2_TTL,
+            dirty_key=DIRTY_INVENTORY_KEY, dirty_member=player_id,
+        )
 
     async def _update_slot_in_db(
         self, player_id: int, slot: int, item_id: int, quantity: int, durability: float
@@ -137,11 +137,48 @@ class InventoryManager(BaseManager):
             return
 
         key = INVENTORY_KEY.format(player_id=player_id)
-        slot_str = str(slot)
+        await self._write_hash(
+            key, {}, 0,
+            dirty_key=DIRTY_INVENTORY_KEY, dirty_member=player_id,
+            delete_fields=[str(slot)],
+        )
 
-        # Delete the field from the hash
-        await self._valkey.hdel(key, [slot_str])
-        await self._valkey.sadd(DIRTY_INVENTORY_KEY, [str(player_id)])
+    async def move_inventory_slot(self, player_id: int, from_slot: int, to_slot: int) -> bool:
+        """
+        Move the item in from_slot to to_slot, swapping with any item already
+        there, in one atomic round trip.
+
+        Returns:
+            False if from_slot is empty
+        """
+        if not settings.USE_VALKEY or not self._valkey:
+            inventory = await self._load_inventory_from_db(player_id)
+            moving = inventory.get(str(from_slot))
+            if not moving:
+                return False
+            displaced = inventory.get(str(to_slot))
+            await self._update_slot_in_db(
+                player_id, to_slot, moving["item_id"], moving["quantity"],
+                moving["current_durability"],
+            )
+            if displaced:
+                await self._update_slot_in_db(
+                    player_id, from_slot, displaced["item_id"], displaced["quantity"],
+                    displaced["current_durability"],
+                )
+            else:
+                await self._delete_slot_from_db(player_id, from_slot)
+            return True
+
+        key = INVENTORY_KEY.format(player_id=player_id)
+        moved = await self._fcall(
+            "rpg_move_field",
+            [key, key, DIRTY_INVENTORY_KEY, DIRTY_INVENTORY_KEY],
+            [str(from_slot), str(to_slot), str(TIER2_TTL), str(player_id), str(player_id)],
+        )
+        if moved:
+            self._ttl_refresh.note_refreshed(key, TIER2_TTL)
+        return bool(moved)
 
     async def _delete_slot_from_db(self, player_id: int, slot: int) -> None:
         if not self._session_factory:
@@ -0,0 +1,148 @@
+"""
+In-process near-cache for cold data read through the game state managers.
+
+Entity definitions, usernames, appearances and roles rarely change but are
+read on hot paths (combat events, visual state, permission checks). The
+near-cache keeps them in process memory per namespace, each bounded by a
+TTL and an LRU size limit, so repeated reads skip Valkey and PostgreSQL.
+
+Writers invalidate through BaseManager._invalidate_near_cache, which drops
+the local entry and publishes the invalidation on NEAR_CACHE_CHANNEL. Every
+server process (including map workers) subscribes with a dedicated pub/sub
+client (see core.database.create_pubsub_client) and drops the entry as
+well. Without Valkey, invalidation stays in-process, which is what tests
+use. The TTL bounds staleness if an invalidation is missed (e.g. while a
+subscriber reconnects).
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+from glide import PubSubMsg
+
+from server.src.core.config import settings
+from server.src.core.logging_config import get_logger
+from server.src.core.metrics import cache_hits_total, cache_misses_total
+
+logger = get_logger(__name__)
+
+NEAR_CACHE_CHANNEL = "near_cache:invalidate"
+
+
+@dataclass(frozen=True)
+class NearCacheNamespace:
+    """
+    Limits of one near-cache namespace.
+
+    Attributes:
+        ttl: Seconds an entry is served before it is reloaded
+        max_size: Entries kept before the least recently used are evicted
+    """
+
+    ttl: float
+    max_size: int
+
+
+class NearCache:
+    """Bounded TTL + LRU caches, one per namespace."""
+
+    def __init__(self):
+        self._namespaces: Dict[str, NearCacheNamespace] = {}
+        self._entries: Dict[str, "OrderedDict[Hashable, Tuple[float, Any]]"] = {}
+
+    def configure(self, name: str, namespace: NearCacheNamespace) -> None:
+        """Register a namespace; settings.NEAR_CACHE overrides its limits."""
+        overrides = settings.NEAR_CACHE.get(name, {})
+        self._namespaces[name] = NearCacheNamespace(
+            ttl=float(overrides.get("ttl", namespace.ttl)),
+            max_size=int(overrides.get("max_size", namespace.max_size)),
+        )
+        self._entries.setdefault(name, OrderedDict())
+
+    def is_configured(self, name: str) -> bool:
+        return name in self._namespaces
+
+    def lookup(self, name: str, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Returns:
+            (True, value) on a fresh hit, (False, None) otherwise
+        """
+        entries = self._entries.get(name)
+        if entries is None or not settings.NEAR_CACHE_ENABLED:
+            return False, None
+
+        entry = entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del entries[key]
+            cache_misses_total.labels(key_type=f"near:{name}").inc()
+            return False, None
+
+        entries.move_to_end(key)
+        cache_hits_total.labels(key_type=f"near:{name}").inc()
+        return True, entry[1]
+
+    def store(self, name: str, key: Hashable, value: Any) -> None:
+        namespace = self._namespaces.get(name)
+        if namespace is None or namespace.max_size <= 0 or not settings.NEAR_CACHE_ENABLED:
+            return
+
+        entries = self._entries[name]
+        entries[key] = (time.monotonic() + namespace.ttl, value)
+        entries.move_to_end(key)
+        while len(entries) > namespace.max_size:
+            entries.popitem(last=False)
+
+    def invalidate(self, name: str, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or the whole namespace if key is None."""
+        entries = self._entries.get(name)
+        if entries is None:
+            return
+        if key is None:
+            entries.clear()
+        else:
+            entries.pop(key, None)
+
+    def clear(self) -> None:
+        for entries in self._entries.values():
+            entries.clear()
+
+    def size(self, name: str) -> int:
+        return len(self._entries.get(name, ()))
+
+    def handle_message(self, payload: Union[bytes, str]) -> None:
+        """Apply an invalidation received on NEAR_CACHE_CHANNEL."""
+        try:
+            message = json.loads(payload)
+            self.invalidate(message["namespace"], message.get("key"))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed near-cache invalidation", extra={"payload": payload})
+
+
+def on_invalidation_message(message: PubSubMsg, context: Any) -> None:
+    """Pub/sub callback applying invalidations to this process's near-cache."""
+    get_near_cache().handle_message(message.message)
+
+
+def encode_invalidation(name: str, key: Optional[Hashable] = None) -> str:
+    """Message published on NEAR_CACHE_CHANNEL for an invalidation."""
+    return json.dumps({"namespace": name, "key": key})
+
+
+# Singleton instance (shared by all managers of the process)
+_near_cache: Optional[NearCache] = None
+
+
+def get_near_cache() -> NearCache:
+    global _near_cache
+    if _near_cache is None:
+        _near_cache = NearCache()
+    return _near_cache
+
+
+def reset_near_cache() -> None:
+    global _near_cache
+    _near_cache = None
@@ -2,18 +2,33 @@
 Player state management.
 
 Handles player positions, HP, settings, and combat state.
+
+Players owned by the game loop are attached to a HotStateStore. While
+attached, their player hash and combat state are served from memory and
+writes are flushed to Valkey in batches by flush_hot_state().
+
+Player positions are also kept in a SpatialIndex so proximity queries
+(visibility, local chat) only look at nearby chunks.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List
 from datetime import datetime, timezone
+from glide import Batch
 from sqlalchemy import select
 from time import time
 
 from server.src.core.config import settings
+from server.src.core.constants import PlayerRole
 from server.src.core.logging_config import get_logger
 from server.src.schemas.player import PlayerData, Direction, AnimationState
 
 from .base_manager import BaseManager
+from .combat_scheduler import CombatScheduler, next_attack_tick
+from .hash_codecs import FieldType, HashSchema
+from .hot_state_store import HotStateStore
+from .near_cache import NearCacheNamespace
+from .spatial_index import SpatialIndex
+from .unit_of_work import unit_of_work
 
 logger = get_logger(__name__)
 
@@ -22,9 +37,16 @@ PLAYER_KEY = "player:{player_id}"
 PLAYER_SETTINGS_KEY = "player_settings:{player_id}"
 PLAYER_COMBAT_STATE_KEY = "player_combat:{player_id}"
 
+# Online player indexes (sets of player IDs)
+ONLINE_PLAYERS_KEY = "online_players"
+ONLINE_PLAYERS_MAP_KEY = "online_players:map:{map_id}"
+
 # Dirty tracking for batch sync
 DIRTY_POSITIONS_KEY = "dirty:positions"
 
+# Player hash fields persisted to the database by sync_player_position_to_db
+DB_SYNCED_FIELDS = frozenset({"x", "y", "map_id", "current_hp"})
+
 # TTL tiers
 TIER1_TTL = 300  # 5 minutes - frequently accessed
 TIER2_TTL = 600  # 10 minutes
@@ -33,8 +55,177 @@ TIER2_TTL = 600  # 10 minutes
 class PlayerStateManager(BaseManager):
     """Manages player state with Valkey caching."""
 
+    HASH_SCHEMAS = {
+        "player": HashSchema({
+            "player_id": FieldType.INT,
+            "username": FieldType.STR,
+            "online_since": FieldType.FLOAT,
+            "x": FieldType.INT,
+            "y": FieldType.INT,
+            "map_id": FieldType.STR,
+            "current_hp": FieldType.INT,
+            "max_hp": FieldType.INT,
+            "last_move_time": FieldType.FLOAT,
+            "appearance": FieldType.PACKED,
+        }),
+        "player_combat": HashSchema({
+            "target_type": FieldType.STR,
+            "target_id": FieldType.INT,
+            "last_attack_tick": FieldType.INT,
+            "attack_speed": FieldType.FLOAT,
+            "auto_retaliate": FieldType.BOOL,
+        }),
+        "player_settings": HashSchema({
+            "auto_retaliate": FieldType.BOOL,
+        }),
+    }
+    NEAR_CACHE_NAMESPACES = {
+        "usernames": NearCacheNamespace(ttl=600, max_size=10000),
+        "appearance": NearCacheNamespace(ttl=120, max_size=5000),
+    }
+
     def __init__(self, session_factory=None, valkey=None):
         super().__init__(valkey, session_factory)
+        self._hot_store = HotStateStore()
+        self._spatial_index = SpatialIndex()
+        self._combat_scheduler = CombatScheduler()
+        # Players this process registered online -> map they are indexed under
+        self._online_maps: Dict[int, Optional[str]] = {}
+
+    @property
+    def hot_store(self) -> HotStateStore:
+        return self._hot_store
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        return self._spatial_index
+
+    @property
+    def combat_scheduler(self) -> CombatScheduler:
+        return self._combat_scheduler
+
+    # =========================================================================
+    # Hot State (game-loop-owned, write-behind)
+    # =========================================================================
+
+    async def attach_hot_state(self, player_id: int) -> bool:
+        """
+        Load a player's state into the hot store so reads are served from memory.
+
+        Args:
+            player_id: Player database ID
+
+        Returns:
+            True if the player is attached, False if there was no cached state
+        """
+        return player_id in await self.attach_hot_states([player_id])
+
+    async def attach_hot_states(self, player_ids: List[int]) -> List[int]:
+        """
+        Attach several players to the hot store, loading them in one round trip.
+
+        Only players registered online by this process are attached, so a
+        player who logs out while their state is loading is not attached
+        again with the stale state.
+
+        Args:
+            player_ids: Player database IDs
+
+        Returns:
+            IDs of the players that are attached after the call
+        """
+        missing = [pid for pid in player_ids if not self._hot_store.is_attached(pid)]
+        if missing and self._valkey and settings.USE_VALKEY:
+            keys = []
+            for player_id in missing:
+                keys.append(PLAYER_KEY.format(player_id=player_id))
+                keys.append(PLAYER_COMBAT_STATE_KEY.format(player_id=player_id))
+            results = await self._get_many_from_valkey(keys)
+
+            for player_id, state, combat_state in zip(missing, results[::2], results[1::2]):
+                # While we were awaiting, another coroutine may have attached
+                # the player, or they may have logged out and been cleaned up
+                if (
+                    state
+                    and player_id in self._online_maps
+                    and not self._hot_store.is_attached(player_id)
+                ):
+                    self._hot_store.attach(player_id, state, combat_state)
+                    self._index_player_position(player_id, state)
+                    # Combat persisted before a restart resumes on the next tick
+                    if combat_state and player_id not in self._combat_scheduler:
+                        self._combat_scheduler.schedule(player_id, 0)
+
+        return [pid for pid in player_ids if self._hot_store.is_attached(pid)]
+
+    async def detach_hot_state(self, player_id: int) -> None:
+        """Flush a player's pending writes and release them from the hot store."""
+        if not self._hot_store.is_attached(player_id):
+            return
+        try:
+            await self.flush_hot_state([player_id])
+        finally:
+            self._hot_store.detach(player_id)
+            self._spatial_index.remove(player_id)
+            self._combat_scheduler.unschedule(player_id)
+
+    async def flush_hot_state(self, player_ids: Optional[List[int]] = None) -> int:
+        """
+        Write pending hot-state changes to Valkey.
+
+        Also refreshes the TTL of attached players that have not been written
+        recently, so their keys do not expire while they are only being read.
+
+        Args:
+            player_ids: Restrict the flush to these players (default: all attached)
+
+        Returns:
+            Number of players whose state or combat state was written
+        """
+        if not self._valkey or not settings.USE_VALKEY:
+            return 0
+
+        state_writes, combat_writes = self._hot_store.take_dirty(player_ids)
+
+        writes: Dict[str, Dict[str, Any]] = {}
+        db_dirty = []
+        for player_id, fields in state_writes.items():
+            writes[PLAYER_KEY.format(player_id=player_id)] = fields
+            if DB_SYNCED_FIELDS.intersection(fields):
+                db_dirty.append(str(player_id))
+
+        ended_combat = []
+        for player_id, combat_state in combat_writes.items():
+            key = PLAYER_COMBAT_STATE_KEY.format(player_id=player_id)
+            if combat_state:
+                writes[key] = combat_state
+            else:
+                ended_combat.append(key)
+
+        try:
+            async with unit_of_work(self._valkey):
+                await self._cache_many_in_valkey(writes, TIER1_TTL)
+                for key in ended_combat:
+                    await self._delete_from_valkey(key)
+            if db_dirty:
+                await self._valkey.sadd(DIRTY_POSITIONS_KEY, db_dirty)
+        except Exception:
+            # Re-mark everything; rewriting already-flushed fields is harmless
+            self._hot_store.restore_dirty(state_writes, combat_writes)
+            raise
+
+        for player_id in state_writes:
+            self._hot_store.mark_touched(player_id)
+
+        if player_ids is None:
+            stale_keys = []
+            for player_id in self._hot_store.take_stale_touches(TIER1_TTL / 2):
+                stale_keys.append(PLAYER_KEY.format(player_id=player_id))
+                if self._hot_store.get_combat_state(player_id) is not None:
+                    stale_keys.append(PLAYER_COMBAT_STATE_KEY.format(player_id=player_id))
+            await self._refresh_many_ttl(stale_keys, TIER1_TTL)
+
+        return len(set(state_writes) | set(combat_writes))
 
     # =========================================================================
     # Online Player Registry
@@ -64,58 +255,121 @@ class PlayerStateManager(BaseManager):
             "username": username,
             "online_since": self._utc_timestamp(),
         }
+        if self._valkey and settings.USE_VALKEY:
+            await self._valkey.sadd(ONLINE_PLAYERS_KEY, [str(player_id)])
+            self._online_maps.setdefault(player_id, None)
+            # The map is usually set right after login; index it now if known
+            indexed = self._spatial_index.get_position(player_id)
+            if indexed is not None:
+                await self._update_online_map(player_id, indexed[0])
+
+        if self._hot_store.is_attached(player_id):
+            self._hot_store.update_state(player_id, self._as_cached(PLAYER_KEY, data))
+            return
         await self._cache_in_valkey(key, data, TIER1_TTL)
 
     async def unregister_online_player(self, player_id: int) -> None:
         """Unregister player from online registry."""
+        self._hot_store.detach(player_id)
+        self._combat_scheduler.unschedule(player_id)
         key = PLAYER_KEY.format(player_id=player_id)
         if self._valkey and settings.USE_VALKEY:
+            await self._remove_from_online_indexes(player_id)
             await self._valkey.delete([key])
+        self._spatial_index.remove(player_id)
 
     async def is_online(self, player_id: int) -> bool:
         """Check if player is online."""
+        if self._hot_store.is_attached(player_id):
+            return True
         if not self._valkey or not settings.USE_VALKEY:
             return False
-        key = PLAYER_KEY.format(player_id=player_id)
-        exists = await self._valkey.exists([key])
-        return bool(exists)
+        return bool(await self._valkey.sismember(ONLINE_PLAYERS_KEY, str(player_id)))
+
+    async def _update_online_map(self, player_id: int, map_id: str) -> None:
+        """Move an online player to map_id's online index if their map changed."""
+        if self._online_maps.get(player_id, map_id) == map_id:
+            # Not registered by this process, or already indexed on this map
+            return
+        previous_map = self._online_maps[player_id]
+        self._online_maps[player_id] = map_id
+
+        batch = Batch(is_atomic=False)
+        if previous_map:
+            batch.srem(ONLINE_PLAYERS_MAP_KEY.format(map_id=previous_map), [str(player_id)])
+        batch.sadd(ONLINE_PLAYERS_MAP_KEY.format(map_id=map_id), [str(player_id)])
+        await self._valkey.exec(batch, raise_on_error=True)
+
+    async def _remove_from_online_indexes(self, player_id: int) -> None:
+        map_id = self._online_maps.pop(player_id, None)
+        if map_id is None:
+            indexed = self._spatial_index.get_position(player_id)
+            map_id = indexed[0] if indexed else None
+
+        batch = Batch(is_atomic=False)
+        batch.srem(ONLINE_PLAYERS_KEY, [str(player_id)])
+        if map_id:
+            batch.srem(ONLINE_PLAYERS_MAP_KEY.format(map_id=map_id), [str(player_id)])
+        await self._valkey.exec(batch, raise_on_error=True)
+
+    async def clear_online_players(self, map_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop stale online index entries left by a previous run (server startup).
+
+        Args:
+            map_ids: Only clear the players indexed on these maps (a map
+                worker leaves the other workers' players alone). None clears
+                the indexes entirely.
+        """
+        if not self._valkey or not settings.USE_VALKEY:
+            return
+
+        if map_ids is None:
+            map_keys = await self._scan_keys(ONLINE_PLAYERS_MAP_KEY.format(map_id="*"))
+            await self._valkey.delete([ONLINE_PLAYERS_KEY, *map_keys])
+            return
+
+        for map_id in map_ids:
+            map_key = ONLINE_PLAYERS_MAP_KEY.format(map_id=map_id)
+            stale = [self._decode_bytes(m) for m in await self._valkey.smembers(map_key)]
+            if stale:
+                await self._valkey.srem(ONLINE_PLAYERS_KEY, stale)
+            await self._valkey.delete([map_key])
 
     async def get_all_online_player_ids(self) -> List[int]:
         """Get all online player IDs."""
         if not self._valkey or not settings.USE_VALKEY:
             return []
 
-        player_ids = []
-        cursor = "0"
-        pattern = PLAYER_KEY.format(player_id="*")
+        members = await self._valkey.smembers(ONLINE_PLAYERS_KEY)
+        return [int(self._decode_bytes(member)) for member in members]
 
-        while True:
-            result = await self._valkey.scan(cursor, match=pattern, count=100)
-            next_cursor = result[0]
-            keys = result[1]   # list of key bytes
-            for key in keys:
-                key_str = self._decode_bytes(key)
-                # Extract player_id from key pattern "player:{player_id}"
-                if key_str.startswith("player:"):
-                    try:
-                        player_id = int(key_str.split(":")[1])
-                        player_ids.append(player_id)
-                    except (ValueError, IndexError):
-                        continue
-            # cursor "0" (or b"0") means we've completed the full scan
-            if next_cursor == b"0" or next_cursor == "0":
-                break
-            cursor = next_cursor.decode() if isinstance(next_cursor, bytes) else str(next_cursor)
+    async def get_online_player_ids_on_map(self, map_id: str) -> List[int]:
+        """Get the IDs of the online players on a map."""
+        if not self._valkey or not settings.USE_VALKEY:
+            return []
 
-        return player_ids
+        members = await self._valkey.smembers(ONLINE_PLAYERS_MAP_KEY.format(map_id=map_id))
+        return [int(self._decode_bytes(member)) for member in members]
 
     async def get_active_player_count(self) -> int:
         """Get count of currently active (online) players."""
-        online_players = await self.get_all_online_player_ids()
-        return len(online_players)
+        if not self._valkey or not settings.USE_VALKEY:
+            return 0
+        return await self._valkey.scard(ONLINE_PLAYERS_KEY)
 
     async def get_username_for_player(self, player_id: int) -> Optional[str]:
         """Get username for a player from cache or database."""
+        hot_state = self._hot_store.get_state(player_id)
+        if hot_state and "username" in hot_state:
+            return hot_state["username"]
+
+        # Usernames never change, so the near-cache needs no invalidation
+        return await self._near_cached(
+            "usernames", player_id, lambda: self._load_username(player_id)
+        )
+
+    async def _load_username(self, player_id: int) -> Optional[str]:
         if self._valkey and settings.USE_VALKEY:
             key = PLAYER_KEY.format(player_id=player_id)
             data = await self._get_from_valkey(key)
@@ -148,11 +402,13 @@ class PlayerStateManager(BaseManager):
         Returns:
             Dict with 'current_hp' and 'max_hp' or None if not cached
         """
-        if not self._valkey or not settings.USE_VALKEY:
-            return None
-            
-        key = PLAYER_KEY.format(player_id=player_id)
-        data = await self._get_from_valkey(key)
+        data = self._hot_store.get_state(player_id)
+        if data is None:
+            if not self._valkey or not settings.USE_VALKEY:
+                return None
+
+            key = PLAYER_KEY.format(player_id=player_id)
+            data = await self._get_from_valkey(key)
         
         if not data or "current_hp" not in data or "max_hp" not in data:
             return None
@@ -175,37 +431,34 @@ class PlayerStateManager(BaseManager):
         """
         if not self._valkey or not settings.USE_VALKEY:
             return
+
+        if self._hot_store.is_attached(player_id):
+            fields: Dict[str, Any] = {"current_hp": current_hp}
+            if max_hp is not None:
+                fields["max_hp"] = max_hp
+            self._hot_store.update_state(player_id, self._as_cached(PLAYER_KEY, fields))
+            return
             
         key = PLAYER_KEY.format(player_id=player_id)
-        
-        # Get existing data to preserve other fields and max_hp if not provided
-        existing_data = await self._get_from_valkey(key)
-        
-        if existing_data:
-            # Update existing cache entry
-            existing_data["current_hp"] = current_hp
-            if max_hp is not None:
-                existing_data["max_hp"] = max_hp
-            await self._cache_in_valkey(key, existing_data, TIER1_TTL)
-            # Mark as dirty for batch sync
-            await self._valkey.sadd(DIRTY_POSITIONS_KEY, [str(player_id)])
+        if max_hp is None:
+            # Only update a cached player; max_hp is needed to create the entry
+            fields = {"current_hp": current_hp}
         else:
-            # Create new cache entry (requires max_hp)
-            if max_hp is None:
-                logger.warning(
-                    "Attempting to set HP without max_hp for non-cached player",
-                    extra={"player_id": player_id}
-                )
-                return
-                
-            data = {
-                "player_id": player_id,
-                "current_hp": current_hp,
-                "max_hp": max_hp,
-            }
-            await self._cache_in_valkey(key, data, TIER1_TTL)
-            # Mark as dirty for batch sync
-            await self._valkey.sadd(DIRTY_POSITIONS_KEY, [str(player_id)])
+            fields = {"player_id": player_id, "current_hp": current_hp, "max_hp": max_hp}
+
+        written = await self._write_hash(
+            key,
+            fields,
+            TIER1_TTL,
+            dirty_key=DIRTY_POSITIONS_KEY,
+            dirty_member=player_id,
+            only_if_exists=max_hp is None,
+        )
+        if not written:
+            logger.warning(
+                "Attempting to set HP without max_hp for non-cached player",
+                extra={"player_id": player_id}
+            )
 
     # =========================================================================
     # Player Record Management
@@ -376,6 +629,10 @@ class PlayerStateManager(BaseManager):
 
     async def get_player_position(self, player_id: int) -> Optional[Dict[str, Any]]:
         """Get player position from cache or database."""
+        hot_state = self._hot_store.get_state(player_id)
+        if hot_state is not None:
+            return self._format_position(hot_state)
+
         try:
             if not settings.USE_VALKEY or not self._valkey:
                 return await self._load_position_from_db(player_id)
@@ -390,12 +647,9 @@ class PlayerStateManager(BaseManager):
             )
 
             if position:
-                return {
-                    "x": position.get("x", 0),
-                    "y": position.get("y", 0),
-                    "map_id": position.get("map_id", ""),
-                    "last_movement_time": float(position.get("last_move_time", 0)),
-                }
+                position = self._format_position(position)
+                self._index_player_position(player_id, position)
+                return position
             return None
         except Exception as e:
             logger.warning(
@@ -404,6 +658,42 @@ class PlayerStateManager(BaseManager):
             )
             return None
 
+    async def get_many_positions(self, player_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get positions for several players with a single Valkey round trip.
+
+        Players without cached state fall back to get_player_position(), which
+        loads them from the database.
+
+        Args:
+            player_ids: Player database IDs
+
+        Returns:
+            Dict of player_id -> position (same format as get_player_position);
+            players without a known position are omitted
+        """
+        states = await self.get_many_full_states(player_ids)
+
+        positions: Dict[int, Dict[str, Any]] = {}
+        for player_id in player_ids:
+            state = states.get(player_id)
+            position = (
+                self._format_position(state) if state
+                else await self.get_player_position(player_id)
+            )
+            if position:
+                positions[player_id] = position
+        return positions
+
+    def _format_position(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a position dict from a player hash."""
+        return {
+            "x": int(data.get("x", 0)),
+            "y": int(data.get("y", 0)),
+            "map_id": data.get("map_id", ""),
+            "last_movement_time": float(data.get("last_move_time", 0)),
+        }
+
     async def _load_position_from_db(self, player_id: int) -> Optional[Dict[str, Any]]:
         """Load player position from database."""
         if not self._session_factory:
@@ -432,6 +722,17 @@ class PlayerStateManager(BaseManager):
         self, player_id: int, x: int, y: int, map_id: str
     ) -> None:
         """Set player position in cache and mark as dirty for batch sync."""
+        self._spatial_index.update(player_id, map_id, x, y)
+        if self._valkey and settings.USE_VALKEY:
+            await self._update_online_map(player_id, map_id)
+
+        if self._hot_store.is_attached(player_id):
+            # Marked dirty for batch sync when the hot store is flushed
+            self._hot_store.update_state(
+                player_id, self._as_cached(PLAYER_KEY, {"x": x, "y": y, "map_id": map_id})
+            )
+            return
+
         key = PLAYER_KEY.format(player_id=player_id)
         data = await self._get_from_valkey(key) or {}
         data["x"] = x
@@ -443,6 +744,37 @@ class PlayerStateManager(BaseManager):
         if self._valkey and settings.USE_VALKEY:
             await self._valkey.sadd(DIRTY_POSITIONS_KEY, [str(player_id)])
 
+    def get_player_ids_near(
+        self, map_id: str, x: int, y: int, radius: int
+    ) -> List[int]:
+        """
+        Get IDs of players on a map within `radius` tiles of (x, y).
+
+        Served from the in-process spatial index, so only players whose
+        position was written or read through this manager are found.
+
+        Args:
+            map_id: Map to search
+            x, y: Center tile position
+            radius: Maximum distance in tiles (Chebyshev)
+
+        Returns:
+            Player IDs in range, in no particular order
+        """
+        return self._spatial_index.query_radius(map_id, x, y, radius)
+
+    def _index_player_position(self, player_id: int, data: Dict[str, Any]) -> None:
+        """Update the spatial index from a (partial) player hash."""
+        if "x" not in data or "y" not in data:
+            return
+        map_id = data.get("map_id")
+        if not map_id:
+            indexed = self._spatial_index.get_position(player_id)
+            if indexed is None:
+                return
+            map_id = indexed[0]
+        self._spatial_index.update(player_id, map_id, int(data["x"]), int(data["y"]))
+
     # =========================================================================
     # Batch Sync Support
     # =========================================================================
@@ -504,11 +836,103 @@ class PlayerStateManager(BaseManager):
 
     async def get_player_full_state(self, player_id: int) -> Optional[Dict[str, Any]]:
         """Get full player state from cache with TTL refresh."""
+        hot_state = self._hot_store.get_state(player_id)
+        if hot_state is not None:
+            return hot_state
+
         key = PLAYER_KEY.format(player_id=player_id)
-        data = await self._get_from_valkey(key)
-        if data:
-            await self._refresh_ttl(key, TIER1_TTL)
-        return data
+        return await self._get_from_valkey(key, TIER1_TTL)
+
+    async def get_many_full_states(self, player_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get full state for several players with a single Valkey round trip.
+
+        Attached players are served from the hot store; the rest are fetched
+        (and their TTL refreshed) in one pipelined batch.
+
+        Args:
+            player_ids: Player database IDs
+
+        Returns:
+            Dict of player_id -> state; players with no cached state are omitted
+        """
+        states: Dict[int, Dict[str, Any]] = {}
+        missing: List[int] = []
+        for player_id in player_ids:
+            hot_state = self._hot_store.get_state(player_id)
+            if hot_state is not None:
+                states[player_id] = hot_state
+            else:
+                missing.append(player_id)
+
+        if missing and self._valkey and settings.USE_VALKEY:
+            keys = [PLAYER_KEY.format(player_id=player_id) for player_id in missing]
+            results = await self._get_many_from_valkey(keys, ttl=TIER1_TTL)
+            for player_id, data in zip(missing, results):
+                if data:
+                    states[player_id] = data
+                    self._index_player_position(player_id, data)
+
+        return states
+
+    async def get_many_hp(self, player_ids: List[int]) -> Dict[int, Dict[str, int]]:
+        """
+        Get current and max HP for several players with a single round trip.
+
+        Returns:
+            Dict of player_id -> {'current_hp', 'max_hp'}; players without
+            cached HP are omitted
+        """
+        states = await self.get_many_full_states(player_ids)
+        return {
+            player_id: {"current_hp": int(data["current_hp"]), "max_hp": int(data["max_hp"])}
+            for player_id, data in states.items()
+            if "current_hp" in data and "max_hp" in data
+        }
+
+    async def set_many_hp(self, hp_updates: Dict[int, int]) -> int:
+        """
+        Set current HP of several players in one operation.
+
+        Players with attached hot state are updated in memory; the rest are
+        written with one pipelined read and one pipelined write. Players
+        without cached state are skipped.
+
+        Args:
+            hp_updates: Dict of player_id -> new current HP
+
+        Returns:
+            Number of players updated
+        """
+        if not hp_updates or not self._valkey or not settings.USE_VALKEY:
+            return 0
+
+        updated = 0
+        uncached: List[int] = []
+        for player_id, current_hp in hp_updates.items():
+            if self._hot_store.is_attached(player_id):
+                self._hot_store.update_state(player_id, self._as_cached(PLAYER_KEY, {"current_hp": current_hp}))
+                updated += 1
+            else:
+                uncached.append(player_id)
+
+        if not uncached:
+            return updated
+
+        keys = [PLAYER_KEY.format(player_id=player_id) for player_id in uncached]
+        existing = await self._get_many_from_valkey(keys)
+        batch = Batch(is_atomic=False)
+        dirty: List[str] = []
+        for player_id, key, data in zip(uncached, keys, existing):
+            if not data:
+                continue
+            batch.hset(key, {"current_hp": self._encode_field(key, "current_hp", hp_updates[player_id])})
+            batch.expire(key, TIER1_TTL)
+            dirty.append(str(player_id))
+        if dirty:
+            batch.sadd(DIRTY_POSITIONS_KEY, dirty)
+            await self._valkey.exec(batch, raise_on_error=True)
+        return updated + len(dirty)
 
     async def set_player_full_state(
         self, player_id: int, state: Dict[str, Any]
@@ -517,6 +941,14 @@ class PlayerStateManager(BaseManager):
         if not self._valkey or not settings.USE_VALKEY:
             return
 
+        self._index_player_position(player_id, state)
+        if state.get("map_id"):
+            await self._update_online_map(player_id, state["map_id"])
+
+        if self._hot_store.is_attached(player_id):
+            self._hot_store.update_state(player_id, self._as_cached(PLAYER_KEY, state))
+            return
+
         key = PLAYER_KEY.format(player_id=player_id)
         await self._cache_in_valkey(key, state, TIER1_TTL)
 
@@ -531,10 +963,9 @@ class PlayerStateManager(BaseManager):
             return {}
 
         key = PLAYER_SETTINGS_KEY.format(player_id=player_id)
-        data = await self._get_from_valkey(key)
+        data = await self._get_from_valkey(key, TIER1_TTL)
 
         if data:
-            await self._refresh_ttl(key, TIER1_TTL)
             return {
                 k: self._decode_from_valkey(v, bool if "auto" in k else str)
                 for k, v in data.items()
@@ -562,6 +993,9 @@ class PlayerStateManager(BaseManager):
 
     async def get_player_combat_state(self, player_id: int) -> Optional[Dict[str, Any]]:
         """Get player combat state."""
+        if self._hot_store.is_attached(player_id):
+            return self._hot_store.get_combat_state(player_id)
+
         if not settings.USE_VALKEY or not self._valkey:
             return None
 
@@ -571,10 +1005,24 @@ class PlayerStateManager(BaseManager):
     async def set_player_combat_state(
         self, player_id: int, combat_state: Dict[str, Any]
     ) -> None:
-        """Set player combat state."""
+        """
+        Set player combat state and schedule the player's next auto-attack.
+
+        Args:
+            player_id: Player database ID
+            combat_state: target_type, target_id, last_attack_tick (tick of
+                the last attack), attack_speed (seconds between attacks) and
+                auto_retaliate
+        """
         if not self._valkey or not settings.USE_VALKEY:
             return
 
+        self._combat_scheduler.schedule(player_id, next_attack_tick(combat_state))
+
+        if self._hot_store.is_attached(player_id):
+            self._hot_store.set_combat_state(player_id, self._as_cached(PLAYER_COMBAT_STATE_KEY, combat_state))
+            return
+
         key = PLAYER_COMBAT_STATE_KEY.format(player_id=player_id)
         await self._cache_in_valkey(key, combat_state, TIER1_TTL)
 
@@ -583,6 +1031,12 @@ class PlayerStateManager(BaseManager):
         if not self._valkey or not settings.USE_VALKEY:
             return
 
+        self._combat_scheduler.unschedule(player_id)
+
+        if self._hot_store.is_attached(player_id):
+            self._hot_store.set_combat_state(player_id, None)
+            return
+
         key = PLAYER_COMBAT_STATE_KEY.format(player_id=player_id)
         await self._valkey.delete(key)
 
@@ -590,13 +1044,20 @@ class PlayerStateManager(BaseManager):
         """
         Get all players currently in combat with their combat state.
         
-        Uses Valkey SCAN to find all player_combat:* keys.
+        Attached players are read from the hot store; everyone else is found
+        with a Valkey SCAN over player_combat:* keys. The game loop does not
+        use this; it takes due attackers from combat_scheduler instead.
         """
         if not self._valkey or not settings.USE_VALKEY:
             return []
 
+        result = [
+            {"player_id": player_id, "combat_state": combat_state}
+            for player_id, combat_state in self._hot_store.get_all_combat_states().items()
+            if combat_state
+        ]
+
         pattern = PLAYER_COMBAT_STATE_KEY.replace("{player_id}", "*")
-        result = []
         cursor = "0"
         
         # Use SCAN to iterate through matching keys
@@ -609,6 +1070,8 @@ class PlayerStateManager(BaseManager):
                 key_str = key.decode() if isinstance(key, bytes) else key
                 # Extract player_id from key (format: "player_combat:123")
                 player_id = int(key_str.split(":")[-1])
+                if self._hot_store.is_attached(player_id):
+                    continue
                 
                 combat_state = await self._get_from_valkey(key_str)
                 if combat_state:
@@ -629,7 +1092,7 @@ class PlayerStateManager(BaseManager):
 
     async def get_player_appearance(self, player_id: int) -> Optional[Dict[str, Any]]:
         """
-        Get player appearance from database.
+        Get player appearance from the near-cache or database.
         
         Args:
             player_id: Player ID
@@ -640,6 +1103,12 @@ class PlayerStateManager(BaseManager):
         if not self._session_factory:
             return None
 
+        return await self._near_cached(
+            "appearance", player_id, lambda: self._load_appearance(player_id)
+        )
+
+    async def _load_appearance(self, player_id: int) -> Optional[Dict[str, Any]]:
+
         from server.src.models.player import Player
 
         async with self._db_session() as db:
@@ -681,6 +1150,7 @@ class PlayerStateManager(BaseManager):
 
             player.appearance = appearance_dict
             await self._commit_if_not_test_session(db)
+            await self._invalidate_near_cache("appearance", player_id)
 
             logger.info(
                 "Player appearance updated",
@@ -704,6 +1174,10 @@ class PlayerStateManager(BaseManager):
         if not self._valkey or not settings.USE_VALKEY:
             return
         
+        if self._hot_store.is_attached(player_id):
+            self._hot_store.update_state(player_id, self._as_cached(PLAYER_KEY, {"appearance": appearance_dict}))
+            return
+
         key = PLAYER_KEY.format(player_id=player_id)
         
         # Get existing player data to preserve other fields
@@ -721,15 +1195,52 @@ class PlayerStateManager(BaseManager):
             }
             await self._cache_in_valkey(key, data, TIER1_TTL)
 
+    # =========================================================================
+    # Roles
+    # =========================================================================
+
+    async def get_player_role(self, player_id: int) -> Optional[PlayerRole]:
+        """
+        Get a player's role from the database.
+
+        Not near-cached: roles are changed directly in the database, so a
+        demotion must apply on the next check.
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            PlayerRole if the player exists, None otherwise
+        """
+        if not self._session_factory:
+            return None
+
+        return await self._load_role(player_id)
+
+    async def _load_role(self, player_id: int) -> Optional[PlayerRole]:
+        from server.src.models.player import Player
+
+        async with self._db_session() as db:
+            result = await db.execute(
+                select(Player.role).where(Player.id == player_id)
+            )
+            return result.scalar_one_or_none()
+
     # =========================================================================
     # Cleanup
     # =========================================================================
 
     async def cleanup_player(self, player_id: int) -> None:
         """Clean up all player data from cache."""
+        self._hot_store.detach(player_id)
+        self._combat_scheduler.unschedule(player_id)
         if not self._valkey or not settings.USE_VALKEY:
+            self._online_maps.pop(player_id, None)
+            self._spatial_index.remove(player_id)
             return
 
+        await self._remove_from_online_indexes(player_id)
+        self._spatial_index.remove(player_id)
         keys = [
             PLAYER_KEY.format(player_id=player_id),
             PLAYER_SETTINGS_KEY.format(player_id=player_id),
@@ -17,6 +17,8 @@ from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
 from .base_manager import BaseManager
+from .hash_codecs import FieldType, HashSchema
+from .near_cache import NearCacheNamespace
 
 logger = get_logger(__name__)
 
@@ -29,6 +31,12 @@ ENTITY_DEFS_KEY = "ref:entity_defs"
 class ReferenceDataManager(BaseManager):
     """Manages permanent reference data caches (items, skills, entity definitions)."""
 
+    # ref:items, ref:skills and ref:entity_defs map an ID or name to a definition
+    HASH_SCHEMAS = {"ref": HashSchema(default=FieldType.PACKED)}
+    NEAR_CACHE_NAMESPACES = {
+        "entity_definitions": NearCacheNamespace(ttl=300, max_size=1024),
+    }
+
     def __init__(
         self,
         valkey_client: Optional[GlideClient] = None,
@@ -378,7 +386,18 @@ class ReferenceDataManager(BaseManager):
                     "disengage_radius": entity.disengage_radius,
                 }
 
-            await self._cache_in_valkey(ENTITY_DEFS_KEY, entity_data, 0)
+            await self.cache_entity_definitions(entity_data)
+
+    async def cache_entity_definitions(self, entity_data: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Replace the cached entity definitions.
+
+        Args:
+            entity_data: Definitions by entity name, each with at least "id"
+                and "name" (the shape built from the entities table)
+        """
+        await self._cache_in_valkey(ENTITY_DEFS_KEY, entity_data, 0)
+        await self._invalidate_near_cache("entity_definitions")
 
     async def get_entity_definition(self, entity_name: str) -> Optional[Dict[str, Any]]:
         """Get entity definition by name."""
@@ -398,10 +417,17 @@ class ReferenceDataManager(BaseManager):
         return None
 
     async def get_entity_definition_by_id(self, entity_id: int) -> Optional[Dict[str, Any]]:
-        """Get entity definition by ID."""
+        """Get entity definition by ID (served from the near-cache when possible)."""
         if not self._valkey or not settings.USE_VALKEY:
             return None
 
+        return await self._near_cached(
+            "entity_definitions",
+            entity_id,
+            lambda: self._load_entity_definition_by_id(entity_id),
+        )
+
+    async def _load_entity_definition_by_id(self, entity_id: int) -> Optional[Dict[str, Any]]:
         entity_data = await self._get_from_valkey(ENTITY_DEFS_KEY)
         if entity_data:
             # Search through all entity definitions to find matching ID
@@ -16,6 +16,7 @@ from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
 from .base_manager import BaseManager, SKILLS_TTL
+from .hash_codecs import FieldType, HashSchema
 
 logger = get_logger(__name__)
 
@@ -26,6 +27,9 @@ DIRTY_SKILLS_KEY = "dirty:skills"
 class SkillsManager(BaseManager):
     """Manages player skills persistence with transparent auto-loading."""
 
+    # Fields are skill names, each holding level and experience
+    HASH_SCHEMAS = {"skills": HashSchema(default=FieldType.PACKED)}
+
     def __init__(
         self,
         valkey_client: Optional[GlideClient] = None,
@@ -0,0 +1,142 @@
+"""
+Chunk-bucketed spatial index for per-map proximity queries.
+
+Visibility, aggro and local chat all ask "what is within R tiles of (x, y)
+on this map". Answering that by scanning every player, entity or ground
+item on the map makes each query O(N). This index buckets objects by the
+chunk they stand in, so a radius query only touches the chunks overlapping
+the query square.
+
+The index is updated incrementally by the owning manager whenever an object
+spawns, moves or despawns. It holds positions only; callers resolve the
+returned keys against their own data.
+"""
+
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+# Default chunk size in tiles (same chunking the client streams map data in)
+CHUNK_SIZE = 16
+
+ChunkKey = Tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    Positions of keyed objects, bucketed by (map_id, chunk).
+
+    Radius queries use Chebyshev distance (square range), matching the
+    tile-range checks used for visibility and chat.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self._chunk_size = chunk_size
+        # map_id -> chunk -> keys in that chunk
+        self._buckets: Dict[str, Dict[ChunkKey, Set[Hashable]]] = {}
+        # key -> (map_id, x, y)
+        self._positions: Dict[Hashable, Tuple[str, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def _chunk_of(self, x: int, y: int) -> ChunkKey:
+        return (x // self._chunk_size, y // self._chunk_size)
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def update(self, key: Hashable, map_id: str, x: int, y: int) -> None:
+        """
+        Insert an object or move it to a new position.
+
+        Only re-buckets the object when it changes map or chunk.
+        """
+        x, y = int(x), int(y)
+        previous = self._positions.get(key)
+        self._positions[key] = (map_id, x, y)
+
+        chunk = self._chunk_of(x, y)
+        if previous is not None:
+            prev_map_id, prev_x, prev_y = previous
+            prev_chunk = self._chunk_of(prev_x, prev_y)
+            if prev_map_id == map_id and prev_chunk == chunk:
+                return
+            self._discard_from_bucket(key, prev_map_id, prev_chunk)
+
+        self._buckets.setdefault(map_id, {}).setdefault(chunk, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove an object. Unknown keys are ignored."""
+        previous = self._positions.pop(key, None)
+        if previous is None:
+            return
+        map_id, x, y = previous
+        self._discard_from_bucket(key, map_id, self._chunk_of(x, y))
+
+    def clear(self) -> None:
+        """Remove every object from the index."""
+        self._buckets.clear()
+        self._positions.clear()
+
+    def _discard_from_bucket(self, key: Hashable, map_id: str, chunk: ChunkKey) -> None:
+        map_buckets = self._buckets.get(map_id)
+        if map_buckets is None:
+            return
+        bucket = map_buckets.get(chunk)
+        if bucket is None:
+            return
+        bucket.discard(key)
+        # Drop empty buckets so long-running servers don't accumulate them
+        if not bucket:
+            del map_buckets[chunk]
+            if not map_buckets:
+                del self._buckets[map_id]
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def get_position(self, key: Hashable) -> Optional[Tuple[str, int, int]]:
+        """Get the indexed (map_id, x, y) of an object, or None."""
+        return self._positions.get(key)
+
+    def query_radius(self, map_id: str, x: int, y: int, radius: int) -> List[Hashable]:
+        """
+        Get keys of all objects on a map within `radius` tiles of (x, y).
+
+        Args:
+            map_id: Map to search
+            x, y: Center tile position
+            radius: Maximum Chebyshev distance in tiles (inclusive)
+
+        Returns:
+            Keys of matching objects, in no particular order
+        """
+        map_buckets = self._buckets.get(map_id)
+        if not map_buckets:
+            return []
+
+        min_cx, min_cy = self._chunk_of(x - radius, y - radius)
+        max_cx, max_cy = self._chunk_of(x + radius, y + radius)
+
+        found: List[Hashable] = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = map_buckets.get((cx, cy))
+                if not bucket:
+                    continue
+                for key in bucket:
+                    _, key_x, key_y = self._positions[key]
+                    if abs(key_x - x) <= radius and abs(key_y - y) <= radius:
+                        found.append(key)
+        return found
+
+    def keys_on_map(self, map_id: str) -> List[Hashable]:
+        """Get keys of all objects indexed on a map."""
+        map_buckets = self._buckets.get(map_id)
+        if not map_buckets:
+            return []
+        return [key for bucket in map_buckets.values() for key in bucket]
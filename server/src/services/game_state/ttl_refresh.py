@@ -0,0 +1,65 @@
+"""
+Lazy TTL refresh for game state keys.
+
+Reads used to send an EXPIRE after every successful HGETALL, doubling the
+commands of hot reads. A TtlRefreshTracker remembers when this process last
+set each key's TTL and only lets a read refresh it again once the refresh
+window has passed. The window is capped at half the TTL, so a key read at
+least once per window never gets closer than half its TTL to expiring.
+
+The tracker is local to a manager; another process refreshing the same key
+only makes it live longer, so skipping based on local state is safe.
+Permanent keys (ttl <= 0) are never refreshed.
+"""
+
+import time
+from typing import Dict
+
+from server.src.core.metrics import valkey_ttl_refreshes_skipped_total
+
+# Tracked keys before the entries already due are pruned
+MAX_TRACKED_KEYS = 100_000
+
+
+class TtlRefreshTracker:
+    """When each key's TTL next needs refreshing."""
+
+    def __init__(self, window: float):
+        self._window = window
+        self._next_refresh: Dict[str, float] = {}
+
+    def window_for(self, ttl: int) -> float:
+        return min(self._window, ttl / 2)
+
+    def is_due(self, key: str, ttl: int) -> bool:
+        """
+        True if a read of key should refresh its TTL. A False result is
+        counted as a saved TTL command.
+        """
+        if ttl <= 0:
+            return False
+        next_refresh = self._next_refresh.get(key)
+        if next_refresh is None or next_refresh <= time.monotonic():
+            return True
+        valkey_ttl_refreshes_skipped_total.labels(key_type=key.split(":", 1)[0]).inc()
+        return False
+
+    def note_refreshed(self, key: str, ttl: int) -> None:
+        """Record that key's TTL was just (re)set to ttl."""
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        if len(self._next_refresh) >= MAX_TRACKED_KEYS:
+            self._prune(now)
+        self._next_refresh[key] = now + self.window_for(ttl)
+
+    def forget(self, key: str) -> None:
+        self._next_refresh.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        self._next_refresh = {
+            key: due for key, due in self._next_refresh.items() if due > now
+        }
+        if len(self._next_refresh) >= MAX_TRACKED_KEYS:
+            # Everything is fresh: forgetting only costs a few early refreshes
+            self._next_refresh.clear()
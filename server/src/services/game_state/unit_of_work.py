@@ -0,0 +1,129 @@
+"""
+Unit of work batching Valkey writes from the game state managers.
+
+Inside `async with unit_of_work(valkey):` the BaseManager write helpers
+(_cache_in_valkey, _cache_many_in_valkey, _refresh_ttl, _refresh_many_ttl,
+_delete_from_valkey) queue their commands instead of sending them one round
+trip at a time, and the whole unit is sent as a single non-atomic glide
+Batch when the block exits. Hash reads through BaseManager see the unit's
+pending writes and deletes, so read-modify-write code keeps working; other
+tasks see them once the unit is flushed.
+
+The active unit lives in a ContextVar, so it only covers the task that
+opened it (and tasks spawned from it). A nested unit_of_work joins the
+outer one. Commands issued directly on the client (SADD, ZADD, INCR, ...)
+are not queued.
+
+Usage:
+    from server.src.services.game_state.unit_of_work import unit_of_work
+
+    async with unit_of_work(entity_mgr.valkey):
+        await entity_mgr.update_entity_position(instance_id, x, y)
+        await entity_mgr.set_entity_state(instance_id, "idle")
+"""
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from glide import Batch, GlideClient
+
+from .hash_codecs import EncodedValue
+
+
+class UnitOfWork:
+    """Valkey writes queued for one batch, with their pending hash state."""
+
+    def __init__(self):
+        self._batch = Batch(is_atomic=False)
+        self._command_count = 0
+        self._pending_fields: Dict[str, Dict[str, EncodedValue]] = {}
+        self._deleted: Set[str] = set()
+
+    def __len__(self) -> int:
+        return self._command_count
+
+    def hset(self, key: str, mapping: Dict[str, EncodedValue]) -> None:
+        self._batch.hset(key, mapping)
+        self._command_count += 1
+        self._pending_fields.setdefault(key, {}).update(mapping)
+
+    def expire(self, key: str, ttl: int) -> None:
+        self._batch.expire(key, ttl)
+        self._command_count += 1
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        self._batch.delete(keys)
+        self._command_count += 1
+        for key in keys:
+            self._pending_fields.pop(key, None)
+            self._deleted.add(key)
+
+    def is_deleted(self, key: str) -> bool:
+        """True if the key was deleted in this unit and not written since."""
+        return key in self._deleted and key not in self._pending_fields
+
+    def overlay(self, key: str, raw: Optional[Dict[Any, Any]]) -> Optional[Dict[Any, Any]]:
+        """
+        Apply this unit's pending writes of a hash to its HGETALL reply.
+
+        Returns:
+            The hash as it will be once the unit is flushed (None if empty)
+        """
+        pending = self._pending_fields.get(key)
+        if key in self._deleted:
+            raw = None
+        if not pending:
+            return raw or None
+        merged = {
+            (field.decode() if isinstance(field, bytes) else field): value
+            for field, value in (raw or {}).items()
+        }
+        merged.update(pending)
+        return merged
+
+    async def flush(self, valkey: Optional[GlideClient]) -> None:
+        """Send the queued commands as one batch and start a new one."""
+        if not self._command_count:
+            return
+        batch = self._batch
+        self._batch = Batch(is_atomic=False)
+        self._command_count = 0
+        self._pending_fields.clear()
+        self._deleted.clear()
+        if valkey is not None:
+            await valkey.exec(batch, raise_on_error=True)
+
+
+_current_unit_of_work: ContextVar[Optional[UnitOfWork]] = ContextVar(
+    "valkey_unit_of_work", default=None
+)
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """The unit of work active in this task, if any."""
+    return _current_unit_of_work.get()
+
+
+@asynccontextmanager
+async def unit_of_work(valkey: Optional[GlideClient]) -> AsyncIterator[UnitOfWork]:
+    """
+    Queue manager writes made inside the block and send them as one batch
+    on exit. The batch is also sent if the block raises, as the writes would
+    have been without a unit of work.
+    """
+    outer = _current_unit_of_work.get()
+    if outer is not None:
+        yield outer
+        return
+
+    unit = UnitOfWork()
+    token = _current_unit_of_work.set(unit)
+    try:
+        yield unit
+    finally:
+        _current_unit_of_work.reset(token)
+        await unit.flush(valkey)
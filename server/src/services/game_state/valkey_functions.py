@@ -0,0 +1,155 @@
+"""
+Valkey function library for compound game state writes.
+
+Operations that used to be several commands from Python (read the hash,
+write it back, refresh its TTL, mark it dirty) run as one registered Valkey
+function instead: a single round trip, executed atomically on the server.
+
+The library is loaded at startup (load_valkey_functions) and replaced when
+the loaded version differs from LIBRARY_VERSION; bump LIBRARY_VERSION with
+any change to LIBRARY_CODE. BaseManager._fcall reloads it if Valkey lost
+it (restart without persistence, FUNCTION FLUSH).
+
+Functions (all values are passed through as stored, already encoded):
+
+rpg_write_hash
+    KEYS: hash, dirty set
+    ARGV: only_if_exists ("1"/"0"), ttl, dirty member ("" = none),
+          number of fields to set, field/value pairs..., fields to delete...
+    HSET/HDEL the fields, EXPIRE the hash (ttl > 0) and SADD the member to
+    the dirty set. Returns 0 without writing if only_if_exists is "1" and
+    the hash does not exist, else 1.
+
+rpg_move_field
+    KEYS: source hash, destination hash, source dirty set, destination dirty set
+    ARGV: source field, destination field, ttl, source dirty member,
+          destination dirty member
+    Moves the source field's value to the destination field. A value
+    already there moves back to the source field (swap). Returns 0 if the
+    source field is empty, else 1.
+
+rpg_take_hash
+    KEYS: hash, index set, tombstone set
+    ARGV: member
+    Deletes the hash, SREMs the member from the index set and SADDs it to
+    the tombstone set. Returns the hash as a flat field/value list (empty
+    if it did not exist), so exactly one caller can take it.
+"""
+
+from typing import Any
+
+from glide import GlideClient
+
+from server.src.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+LIBRARY_NAME = "rpg"
+LIBRARY_VERSION = 1
+
+_LIBRARY_SOURCE = """#!lua name=rpg
+
+local VERSION = __VERSION__
+
+local function version()
+  return VERSION
+end
+
+local function refresh(key, ttl)
+  if ttl > 0 then
+    redis.call('EXPIRE', key, ttl)
+  end
+end
+
+local function mark_dirty(key, member)
+  if member ~= '' then
+    redis.call('SADD', key, member)
+  end
+end
+
+local function write_hash(keys, args)
+  if args[1] == '1' and redis.call('EXISTS', keys[1]) == 0 then
+    return 0
+  end
+  local last_set = 4 + tonumber(args[4]) * 2
+  if last_set > 4 then
+    redis.call('HSET', keys[1], unpack(args, 5, last_set))
+  end
+  if #args > last_set then
+    redis.call('HDEL', keys[1], unpack(args, last_set + 1, #args))
+  end
+  refresh(keys[1], tonumber(args[2]))
+  mark_dirty(keys[2], args[3])
+  return 1
+end
+
+local function move_field(keys, args)
+  local value = redis.call('HGET', keys[1], args[1])
+  if not value then
+    return 0
+  end
+  local displaced = redis.call('HGET', keys[2], args[2])
+  redis.call('HSET', keys[2], args[2], value)
+  if displaced then
+    redis.call('HSET', keys[1], args[1], displaced)
+  else
+    redis.call('HDEL', keys[1], args[1])
+  end
+  local ttl = tonumber(args[3])
+  refresh(keys[1], ttl)
+  if keys[2] ~= keys[1] then
+    refresh(keys[2], ttl)
+  end
+  mark_dirty(keys[3], args[4])
+  mark_dirty(keys[4], args[5])
+  return 1
+end
+
+local function take_hash(keys, args)
+  local fields = redis.call('HGETALL', keys[1])
+  if #fields == 0 then
+    return fields
+  end
+  redis.call('DEL', keys[1])
+  redis.call('SREM', keys[2], args[1])
+  redis.call('SADD', keys[3], args[1])
+  return fields
+end
+
+redis.register_function{function_name='rpg_version', callback=version, flags={'no-writes'}}
+redis.register_function('rpg_write_hash', write_hash)
+redis.register_function('rpg_move_field', move_field)
+redis.register_function('rpg_take_hash', take_hash)
+"""
+
+LIBRARY_CODE = _LIBRARY_SOURCE.replace("__VERSION__", str(LIBRARY_VERSION))
+
+
+def is_missing_function_error(error: Exception) -> bool:
+    """True if a FCALL failed because the library is not loaded."""
+    return "function not found" in str(error).lower()
+
+
+async def load_valkey_functions(valkey: GlideClient) -> bool:
+    """
+    Load the function library unless this version is already loaded.
+
+    Returns:
+        True if the library was (re)loaded
+    """
+    loaded: Any = None
+    try:
+        loaded = await valkey.fcall_ro("rpg_version")
+    except Exception as e:
+        if not is_missing_function_error(e):
+            raise
+
+    if loaded == LIBRARY_VERSION:
+        return False
+
+    await valkey.function_load(LIBRARY_CODE, replace=True)
+    logger.info(
+        "Loaded Valkey function library",
+        extra={"library": LIBRARY_NAME, "version": LIBRARY_VERSION, "previous_version": loaded},
+    )
+    return True
@@ -311,23 +311,36 @@ class GroundItemService:
             if durability_val is not None:
                 durability_int = int(durability_val) if durability_val != 1.0 else None
             
+            # Claim the item atomically first: the lock above only covers this
+            # player, so another player may be picking up the same item
+            if await ground_item_mgr.take_ground_item(ground_item_id, ground_item["map_id"]) is None:
+                return OperationResult(
+                    success=False,
+                    message="Item not found or already picked up",
+                    operation=OperationType.PICKUP,
+                )
+
             # Use internal variant since we already hold the inventory lock
-            add_result = await InventoryService._add_item_internal(
-                player_id=player_id,
-                item_id=ground_item["item_id"],
-                quantity=ground_item["quantity"],
-                durability=durability_int,
-            )
+            try:
+                add_result = await InventoryService._add_item_internal(
+                    player_id=player_id,
+                    item_id=ground_item["item_id"],
+                    quantity=ground_item["quantity"],
+                    durability=durability_int,
+                )
+            except Exception:
+                # The item is claimed; put it back before propagating
+                await ground_item_mgr.restore_ground_item(ground_item)
+                raise
 
             if not add_result.success:
+                await ground_item_mgr.restore_ground_item(ground_item)
                 return OperationResult(
                     success=False,
                     message=add_result.message,
                     operation=OperationType.PICKUP,
                 )
 
-            await ground_item_mgr.remove_ground_item(ground_item_id, ground_item["map_id"])
-
             logger.info(
                 "Player picked up item",
                 extra={
@@ -396,18 +409,15 @@ class GroundItemService:
             List of visible GroundItem objects
         """
         ground_item_mgr = get_ground_item_manager()
-        all_items = await ground_item_mgr.get_ground_items_on_map(map_id)
+        nearby_items = await ground_item_mgr.get_ground_items_near(
+            map_id, center_x, center_y, tile_radius
+        )
         now = datetime.now(timezone.utc).timestamp()
 
         visible_ground_items = []
         unique_item_ids = set()
         
-        for gi in all_items:
-            if abs(gi["x"] - center_x) > tile_radius:
-                continue
-            if abs(gi["y"] - center_y) > tile_radius:
-                continue
-            
+        for gi in nearby_items:
             # Skip items that have despawned
             despawn_at = gi.get("despawn_at")
             if despawn_at is not None and despawn_at <= now:
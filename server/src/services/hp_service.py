@@ -9,13 +9,14 @@ Handles:
 All state operations go through GameStateManager.
 """
 
-import asyncio
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 from server.src.core.skills import HITPOINTS_START_LEVEL
+from server.src.game.death_queue import get_death_queue
+from server.src.game.timing_wheel import get_timing_wheel
 from server.src.services.game_state import get_player_state_manager
 from server.src.services.equipment_service import EquipmentService
 from server.src.services.ground_item_service import GroundItemService
@@ -79,6 +80,29 @@ class HpService:
             return hp_data["current_hp"], hp_data["max_hp"]
         return HITPOINTS_START_LEVEL, HITPOINTS_START_LEVEL
 
+    @staticmethod
+    async def get_many_hp(player_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+        """
+        Get current and max HP for several players in one GSM round trip.
+
+        Args:
+            player_ids: Players' database IDs
+
+        Returns:
+            Dict of player_id -> (current_hp, max_hp), with the same defaults
+            as get_hp() for players without cached HP
+        """
+        player_mgr = get_player_state_manager()
+        hp_by_player = await player_mgr.get_many_hp(player_ids)
+        return {
+            player_id: (
+                (hp_by_player[player_id]["current_hp"], hp_by_player[player_id]["max_hp"])
+                if player_id in hp_by_player
+                else (HITPOINTS_START_LEVEL, HITPOINTS_START_LEVEL)
+            )
+            for player_id in player_ids
+        }
+
     @staticmethod
     async def set_hp(
         player_id: int, current_hp: int, max_hp: Optional[int] = None
@@ -86,6 +110,10 @@ class HpService:
         """
         Update HP via player state manager.
 
+        Every HP write goes through here (or batch_regenerate_hp), so this is
+        where players reaching zero HP are queued for the game loop's death
+        check.
+
         Args:
             player_id: Player's database ID
             current_hp: New current HP value
@@ -93,6 +121,7 @@ class HpService:
         """
         player_mgr = get_player_state_manager()
         await player_mgr.set_player_hp(player_id, current_hp, max_hp)
+        get_death_queue().report_hp(player_id, current_hp)
 
     @staticmethod
     async def deal_damage(
@@ -336,6 +365,7 @@ class HpService:
                 "max_hp": max_hp,
             }
         )
+        get_death_queue().report_hp(player_id, max_hp)
 
         logger.info(
             "Player respawned",
@@ -365,7 +395,7 @@ class HpService:
         Execute the full death sequence:
         1. Drop all items at death location
         2. Broadcast EVENT_PLAYER_DIED to nearby players
-        3. Wait for respawn delay
+        3. Wait for respawn delay (driven by the game loop's timing wheel)
         4. Respawn at spawn point with full HP
         5. Broadcast EVENT_PLAYER_RESPAWN
 
@@ -400,8 +430,10 @@ class HpService:
                 username,
             )
 
-        # Step 3: Wait for respawn delay
-        await asyncio.sleep(settings.DEATH_RESPAWN_DELAY)
+        # Step 3: Wait for respawn delay (in game ticks, on the timing wheel)
+        await get_timing_wheel().sleep(
+            round(settings.DEATH_RESPAWN_DELAY * settings.GAME_TICK_RATE)
+        )
 
         # Step 4: Respawn player
         respawn_result = await HpService.respawn_player(player_id)
@@ -441,8 +473,8 @@ class HpService:
         Batch HP regeneration for game loop tick processing.
         
         This method is optimized for high-frequency calls during the game loop
-        and uses direct GSM access for performance. It does not log individual
-        updates to avoid log spam.
+        and writes all updates through one batched GSM operation. It does not
+        log individual updates to avoid log spam.
         
         Args:
             hp_updates: List of (player_id, new_hp) tuples
@@ -454,14 +486,16 @@ class HpService:
             return 0
         
         player_mgr = get_player_state_manager()
-        updated = 0
-        
-        for player_id, new_hp in hp_updates:
-            try:
-                await player_mgr.set_player_hp(player_id, new_hp)
-                updated += 1
-            except Exception:
-                # Silently skip failed updates to avoid disrupting game loop
-                pass
-        
-        return updated
+        try:
+            updated = await player_mgr.set_many_hp(dict(hp_updates))
+            death_queue = get_death_queue()
+            for player_id, new_hp in hp_updates:
+                death_queue.report_hp(player_id, new_hp)
+            return updated
+        except Exception as e:
+            # Don't disrupt the game loop; regen is retried on the next interval
+            logger.warning(
+                "Batch HP regeneration failed",
+                extra={"player_count": len(hp_updates), "error": str(e)},
+            )
+            return 0
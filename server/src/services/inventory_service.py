@@ -586,34 +586,19 @@ class InventoryService:
                                 data={"from_slot": from_slot, "to_slot": to_slot, "merged_amount": transfer_amount},
                             )
                 
-                # Swap items
-                await inventory_mgr.set_inventory_slot(
-                    player_id, from_slot, to_data["item_id"], 
-                    to_data.get("quantity", 1), float(to_data.get("current_durability", 1.0))
-                )
-                await inventory_mgr.set_inventory_slot(
-                    player_id, to_slot, from_data["item_id"], 
-                    from_data.get("quantity", 1), float(from_data.get("current_durability", 1.0))
-                )
-                return OperationResult(
-                    success=True, 
-                    message="Items swapped",
-                    operation=OperationType.MOVE,
-                    data={"from_slot": from_slot, "to_slot": to_slot},
-                )
-            else:
-                # Move item to empty slot
-                await inventory_mgr.set_inventory_slot(
-                    player_id, to_slot, from_data["item_id"], 
-                    from_data.get("quantity", 1), float(from_data.get("current_durability", 1.0))
-                )
-                await inventory_mgr.delete_inventory_slot(player_id, from_slot)
+            # Move to an empty slot or swap, in one atomic operation
+            if not await inventory_mgr.move_inventory_slot(player_id, from_slot, to_slot):
                 return OperationResult(
-                    success=True, 
-                    message="Item moved",
+                    success=False, 
+                    message="Source slot is empty",
                     operation=OperationType.MOVE,
-                    data={"from_slot": from_slot, "to_slot": to_slot},
                 )
+            return OperationResult(
+                success=True, 
+                message="Items swapped" if to_data else "Item moved",
+                operation=OperationType.MOVE,
+                data={"from_slot": from_slot, "to_slot": to_slot},
+            )
 
     @staticmethod
     async def has_item(
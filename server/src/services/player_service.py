@@ -183,10 +183,8 @@ class PlayerService:
         Returns:
             PlayerRole if found, None otherwise
         """
-        player = await PlayerService.get_player_by_id(player_id)
-        if not player:
-            return None
-        return player.role
+        player_mgr = get_player_state_manager()
+        return await player_mgr.get_player_role(player_id)
 
     @staticmethod
     async def get_player_position(player_id: int) -> Optional[PlayerPosition]:
@@ -244,13 +242,16 @@ class PlayerService:
         my_map = my_position.get("map_id", "")
         
         nearby = []
-        online_players = await player_mgr.get_all_online_player_ids()
-        
-        for other_id in online_players:
-            if other_id == player_id:
-                continue
-            
-            other_position = await player_mgr.get_player_position(other_id)
+        # Candidates come from the spatial index; positions are re-checked below
+        other_ids = [
+            other_id
+            for other_id in player_mgr.get_player_ids_near(my_map, my_x, my_y, radius)
+            if other_id != player_id
+        ]
+        positions = await player_mgr.get_many_positions(other_ids)
+        
+        for other_id in other_ids:
+            other_position = positions.get(other_id)
             if not other_position:
                 continue
             
@@ -426,11 +427,12 @@ class PlayerService:
             List of NearbyPlayer models on the map
         """
         player_mgr = get_player_state_manager()
-        online_players = await player_mgr.get_all_online_player_ids()
+        online_players = await player_mgr.get_online_player_ids_on_map(map_id)
+        positions = await player_mgr.get_many_positions(online_players)
         
         players_on_map = []
         for player_id in online_players:
-            position = await player_mgr.get_player_position(player_id)
+            position = positions.get(player_id)
             if not position:
                 continue
             
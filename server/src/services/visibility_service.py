@@ -7,15 +7,86 @@ their last update, enabling efficient network usage by only sending differences.
 KEY DESIGN PRINCIPLE:
 - player_id (int) is the ONLY internal identifier for players
 - Entity keys use the format "player_{player_id}" or "entity_{instance_id}"
+- Each viewer's cache holds {entity_key: version}; changes are detected by
+  comparing integer versions, not entity dicts
 """
 
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Optional, Any, Set, Tuple
 import asyncio
+import itertools
 from server.src.core.config import settings
 from server.src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Cached version meaning "client state unknown"; never handed out by the tracker
+STALE_VERSION = 0
+
+
+class EntityVersionTracker:
+    """
+    Assigns each entity a version that increases whenever its payload changes.
+
+    The game loop builds each payload once per tick and shares it between
+    viewers, so most lookups short-circuit on identity; otherwise the payload
+    is compared once per entity per tick rather than once per viewer.
+    Versions come from a single counter, so a key that disappears and comes
+    back never reuses a version a viewer may still have cached.
+    """
+
+    def __init__(self):
+        self._counter = itertools.count(1)
+        # version_key -> (version, last payload)
+        self._entries: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._seen: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stamp(self, version_key: str, payload: Dict[str, Any]) -> int:
+        """
+        Get the current version of an entity, bumping it if the payload changed.
+
+        Args:
+            version_key: Stable key for the entity (usually its entity key)
+            payload: Entity data as it will be sent to clients
+
+        Returns:
+            Version number for this payload
+        """
+        self._seen.add(version_key)
+        entry = self._entries.get(version_key)
+        if entry is not None:
+            version, previous = entry
+            if previous is payload:
+                return version
+            if previous == payload:
+                # Keep the newest reference so later viewers hit the identity check
+                self._entries[version_key] = (version, payload)
+                return version
+
+        version = next(self._counter)
+        self._entries[version_key] = (version, payload)
+        return version
+
+    def prune_unseen(self) -> int:
+        """
+        Forget entities that were not stamped since the previous prune.
+
+        Returns:
+            Number of entries removed
+        """
+        stale = self._entries.keys() - self._seen
+        for version_key in stale:
+            del self._entries[version_key]
+        self._seen = set()
+        return len(stale)
+
+    def clear(self) -> None:
+        """Forget all entity versions."""
+        self._entries.clear()
+        self._seen = set()
+
 
 class VisibilityService:
     """
@@ -42,16 +113,23 @@ class VisibilityService:
         self.max_cache_size = max_cache_size or settings.MAX_PLAYERS
         self._lock = asyncio.Lock()
         
-        # Per-player visibility cache: player_id -> {entity_key: entity_data}
+        # Per-player visibility cache: player_id -> {entity_key: version}
         # LRU eviction ensures memory stays bounded even with admin over-capacity
-        self._player_visible_cache: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        self._player_visible_cache: Dict[int, Dict[str, int]] = {}
+        
+        # Shared across viewers so each entity's payload is compared at most once per tick
+        self._entity_versions = EntityVersionTracker()
         
         logger.info(
             "VisibilityService initialized",
             extra={"max_cache_size": self.max_cache_size}
         )
     
-    async def get_player_visible_entities(self, player_id: int) -> Dict[str, Dict[str, Any]]:
+    @property
+    def entity_versions(self) -> EntityVersionTracker:
+        return self._entity_versions
+    
+    async def get_player_visible_entities(self, player_id: int) -> Dict[str, int]:
         """
         Get currently visible entities for a player.
         
@@ -59,7 +137,7 @@ class VisibilityService:
             player_id: Player's unique database ID
             
         Returns:
-            Dict mapping entity_key to entity data, or empty dict if player not tracked
+            Dict mapping entity_key to the version last sent, or empty dict if player not tracked
         """
         async with self._lock:
             return self._player_visible_cache.get(player_id, {}).copy()
@@ -67,7 +145,8 @@ class VisibilityService:
     async def update_player_visible_entities(
         self, 
         player_id: int, 
-        visible_entities: Dict[str, Dict[str, Any]]
+        visible_entities: Dict[str, Dict[str, Any]],
+        versions: Optional[Dict[str, int]] = None,
     ) -> Dict[str, Any]:
         """
         Update visible entities for a player and return diff information.
@@ -75,6 +154,9 @@ class VisibilityService:
         Args:
             player_id: Player's unique database ID
             visible_entities: Dict mapping entity_key to current entity data
+            versions: Optional precomputed versions for some entity keys (for
+                payloads that differ per viewer); other keys are stamped
+                through entity_versions
             
         Returns:
             Dict with 'added', 'updated', 'removed' entity lists for broadcasting
@@ -91,11 +173,18 @@ class VisibilityService:
                 )
             
             # Get previous state
-            previous_entities = self._player_visible_cache.get(player_id, {})
+            previous_versions = self._player_visible_cache.get(player_id, {})
+            
+            current_versions: Dict[str, int] = {}
+            for entity_key, entity_data in visible_entities.items():
+                if versions is not None and entity_key in versions:
+                    current_versions[entity_key] = versions[entity_key]
+                else:
+                    current_versions[entity_key] = self._entity_versions.stamp(entity_key, entity_data)
             
             # Calculate diffs
-            current_entity_keys = set(visible_entities.keys())
-            previous_entity_keys = set(previous_entities.keys())
+            current_entity_keys = current_versions.keys()
+            previous_entity_keys = previous_versions.keys()
             
             added_keys = current_entity_keys - previous_entity_keys
             removed_keys = previous_entity_keys - current_entity_keys
@@ -109,23 +198,22 @@ class VisibilityService:
                         f"pos=({visible_entities[entity_key].get('x')}, {visible_entities[entity_key].get('y')})"
                     )
             
-            # Check for actual updates (entity data changed)
+            # Check for actual updates (entity version changed)
             updated_keys = set()
             for entity_key in potential_updates:
-                current_data = visible_entities[entity_key]
-                previous_data = previous_entities.get(entity_key, {})
-                if current_data != previous_data:
+                if current_versions[entity_key] != previous_versions[entity_key]:
                     updated_keys.add(entity_key)
                     # DEBUG: Log what changed for player entities
                     if entity_key.startswith("player_"):
+                        current_data = visible_entities[entity_key]
                         logger.info(
                             f"[DEBUG] Player entity changed: {entity_key}, "
-                            f"old=({previous_data.get('x')}, {previous_data.get('y')}), "
+                            f"version {previous_versions[entity_key]} -> {current_versions[entity_key]}, "
                             f"new=({current_data.get('x')}, {current_data.get('y')})"
                         )
             
             # Update cache with new state
-            self._player_visible_cache[player_id] = visible_entities.copy()
+            self._player_visible_cache[player_id] = current_versions
             
             # Build diff response
             diff = {
@@ -152,6 +240,39 @@ class VisibilityService:
                     extra={"player_id": player_id, "cache_size": len(self._player_visible_cache)}
                 )
     
+    def mark_resync(self, player_id: int, removed_keys: Iterable[str] = ()) -> None:
+        """
+        Force the next diff for a player to resend everything it can see.
+
+        Called when an update for the player was dropped before reaching the
+        client: every cached version is reset so all visible entities count as
+        updated, and keys the dropped update removed are put back so their
+        removal is sent again. Synchronous (no lock needed, it never awaits)
+        so the outbound queue can call it while enqueueing.
+
+        Args:
+            player_id: Player's unique database ID
+            removed_keys: Entity keys removed by the dropped update
+        """
+        cached = self._player_visible_cache.get(player_id)
+        if cached is None:
+            return
+        for entity_key in cached:
+            cached[entity_key] = STALE_VERSION
+        for entity_key in removed_keys:
+            cached[entity_key] = STALE_VERSION
+    
+    async def prune_entity_versions(self) -> int:
+        """
+        Drop version entries for entities that were not seen since the last prune.
+        Called by the game loop once per tick, after all maps are processed.
+        
+        Returns:
+            Number of entries removed
+        """
+        async with self._lock:
+            return self._entity_versions.prune_unseen()
+    
     async def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get visibility cache statistics for monitoring.
@@ -178,6 +299,7 @@ class VisibilityService:
         async with self._lock:
             cleared_count = len(self._player_visible_cache)
             self._player_visible_cache.clear()
+            self._entity_versions.clear()
             logger.info(
                 "Visibility cache cleared",
                 extra={"cleared_entries": cleared_count}
@@ -0,0 +1,104 @@
+"""
+Map worker process of the sharded deployment.
+
+Runs the full server startup (maps, managers, entity spawning) and game loop
+for the maps this worker owns (game/map_shards.py), and serves the players on
+them through the gateway instead of listening for websockets itself: the
+gateway opens one Unix socket connection per player, and each one is handled
+by the regular websocket_endpoint through a StreamWebSocket, as the player
+the gateway authenticated (the connection's session frame).
+
+Workers are started by the gateway (gateway.py); to run one by hand:
+    python -m server.src.shard_worker --index 0
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+
+from fastapi import status
+from glide import GlideClient
+
+from server.src.api.shard_transport import StreamWebSocket, encode_close_frame, read_session
+from server.src.api.websockets import websocket_endpoint
+from server.src.core.config import settings
+from server.src.core.database import get_valkey
+from server.src.core.logging_config import get_logger
+from server.src.game.map_shards import worker_socket_path
+from server.src.main import app, lifespan
+
+logger = get_logger(__name__)
+
+
+async def _serve_gateway_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    valkey: GlideClient,
+) -> None:
+    """Run one player's session, relayed by the gateway."""
+    player_id = await read_session(reader)
+    if player_id is None:
+        logger.warning("Gateway connection without a session frame")
+        writer.write(encode_close_frame(status.WS_1008_POLICY_VIOLATION))
+        writer.close()
+        return
+
+    websocket = StreamWebSocket(reader, writer, gateway_player_id=player_id)
+    try:
+        await websocket_endpoint(websocket, valkey)
+    finally:
+        await websocket.finish()
+
+
+async def run_worker(index: int) -> None:
+    """
+    Start the worker and serve gateway connections until SIGINT/SIGTERM.
+
+    Args:
+        index: Shard index of this worker (0 to SHARD_WORKERS - 1)
+    """
+    settings.SHARD_INDEX = index
+    path = worker_socket_path(index)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.unlink(path)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    async with lifespan(app):
+        valkey = await get_valkey()
+        server = await asyncio.start_unix_server(
+            lambda reader, writer: _serve_gateway_connection(reader, writer, valkey),
+            path=path,
+        )
+        # Connections are trusted with the player's identity (session frame),
+        # so only processes of the server's own user may connect
+        os.chmod(path, 0o600)
+        logger.info(
+            "Map worker listening",
+            extra={"shard_index": index, "workers": settings.SHARD_WORKERS, "socket": path},
+        )
+        try:
+            await stop.wait()
+        finally:
+            # Stop taking players; the lifespan shutdown then saves and
+            # disconnects the ones still here
+            server.close()
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a map worker of the sharded deployment")
+    parser.add_argument("--index", type=int, required=True, help="Shard index of this worker")
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.index))
+
+
+if __name__ == "__main__":
+    main()
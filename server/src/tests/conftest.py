@@ -230,7 +230,7 @@ class FakeValkeyPipeline:
                 _, key, field, value = cmd
                 if key not in self._valkey._data:
                     self._valkey._data[key] = {}
-                self._valkey._data[key][field] = str(value)
+                self._valkey._data[key][field] = value if isinstance(value, bytes) else str(value)
                 results.append(1)
             elif cmd[0] == 'hgetall':
                 _, key = cmd
@@ -238,7 +238,7 @@ class FakeValkeyPipeline:
                     results.append({})
                 else:
                     # Return bytes like real Valkey does
-                    results.append({k.encode(): v.encode() for k, v in self._valkey._data[key].items()})
+                    results.append({k.encode(): _as_bytes(v) for k, v in self._valkey._data[key].items()})
             elif cmd[0] == 'sadd':
                 _, key, member = cmd
                 if key not in self._valkey._set_data:
@@ -252,6 +252,20 @@ class FakeValkeyPipeline:
         return results
 
 
+def _glide_request_name(request_type: int) -> str:
+    """Map a glide protobuf RequestType value to its name (e.g. "HGetAll")."""
+    try:
+        from glide_shared.protobuf.command_request_pb2 import RequestType
+    except ImportError:
+        from glide.protobuf.command_request_pb2 import RequestType
+    return RequestType.Name(request_type)
+
+
+def _as_bytes(value: str | bytes) -> bytes:
+    """Encode a stored fake hash value the way Valkey returns it."""
+    return value if isinstance(value, bytes) else value.encode()
+
+
 class FakeValkey:
     """
     In-memory Valkey/Redis implementation for testing.
@@ -270,20 +284,22 @@ class FakeValkey:
         self._string_data: Dict[str, str] = {}
         self._set_data: Dict[str, set] = {}
         self._zset_data: Dict[str, Dict[str, float]] = {}
+        self.published: List[tuple] = []
+        self.loaded_libraries: Dict[str, str] = {}
     
     async def hset(self, key: str, mapping: Dict[str, str]) -> int:
         """Set multiple hash fields."""
         if key not in self._data:
             self._data[key] = {}
-        # Convert all values to strings
+        # Convert all values to strings (bytes, e.g. msgpack, are kept as-is)
         for k, v in mapping.items():
-            self._data[key][str(k)] = str(v)
+            self._data[key][str(k)] = v if isinstance(v, bytes) else str(v)
         return len(mapping)
     
     async def hget(self, key: str, field: str) -> Optional[bytes]:
         """Get a single hash field value."""
         if key in self._data and field in self._data[key]:
-            return self._data[key][field].encode()
+            return _as_bytes(self._data[key][field])
         return None
     
     async def hgetall(self, key: str) -> Dict[bytes, bytes]:
@@ -291,7 +307,7 @@ class FakeValkey:
         if key not in self._data:
             return {}
         # Return bytes like real Valkey does
-        return {k.encode(): v.encode() for k, v in self._data[key].items()}
+        return {k.encode(): _as_bytes(v) for k, v in self._data[key].items()}
     
     async def hdel(self, key: str, fields: list) -> int:
         """Delete one or more hash fields."""
@@ -417,6 +433,15 @@ class FakeValkey:
             return 0
         return 1 if str(member) in self._set_data[key] else 0
     
+    async def scard(self, key: str) -> int:
+        """Get the number of members in a set."""
+        return len(self._set_data.get(key, set()))
+    
+    async def publish(self, message: str, channel: str) -> int:
+        """Record a published message (there are no subscribers)."""
+        self.published.append((channel, message))
+        return 0
+    
     async def expire(self, key: str, seconds: int) -> int:
         """Set a timeout on key (for testing, we just return success)."""
         # In a real implementation this would set TTL, but for tests we don't need to track it
@@ -435,9 +460,123 @@ class FakeValkey:
             if member not in self._zset_data[key]:
                 added += 1
             self._zset_data[key][member] = score
-        
+
         return added
-    
+
+    async def zrem(self, key: str, members: list) -> int:
+        """Remove members from a sorted set. Returns number removed."""
+        zset = self._zset_data.get(key, {})
+        removed = 0
+        for member in members:
+            if zset.pop(str(member), None) is not None:
+                removed += 1
+        return removed
+
+    async def zrange(self, key: str, range_query) -> list:
+        """Get sorted set members (as bytes) in a glide RangeByScore range, by score."""
+        def in_range(score: float) -> bool:
+            start, end = str(range_query.start), str(range_query.end)
+            above = score > float(start[1:]) if start.startswith("(") else score >= float(start)
+            below = score < float(end[1:]) if end.startswith("(") else score <= float(end)
+            return above and below
+
+        members = sorted(self._zset_data.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+        return [member.encode() for member, score in members if in_range(score)]
+
+    # Valkey functions (Python mirrors of the rpg library in valkey_functions)
+    async def function_load(self, library_code: str, replace: bool = False) -> bytes:
+        """Register the rpg library (the Lua itself is not executed)."""
+        self.loaded_libraries["rpg"] = library_code
+        return b"rpg"
+
+    async def fcall(self, function: str, keys: list = None, arguments: list = None) -> Any:
+        """Call a function of a loaded library."""
+        from glide import RequestError
+
+        if "rpg" not in self.loaded_libraries:
+            raise RequestError("Function not found")
+        return await getattr(self, f"_{function}")(list(keys or []), list(arguments or []))
+
+    async def fcall_ro(self, function: str, keys: list = None, arguments: list = None) -> Any:
+        """Call a read-only function of a loaded library."""
+        return await self.fcall(function, keys, arguments)
+
+    async def _rpg_version(self, keys: list, args: list) -> int:
+        from server.src.services.game_state.valkey_functions import LIBRARY_VERSION
+
+        return LIBRARY_VERSION
+
+    async def _rpg_write_hash(self, keys: list, args: list) -> int:
+        if args[0] == "1" and not await self.exists([keys[0]]):
+            return 0
+        last_set = 4 + int(args[3]) * 2
+        fields = args[4:last_set]
+        if fields:
+            await self.hset(keys[0], dict(zip(fields[::2], fields[1::2])))
+        if args[last_set:]:
+            await self.hdel(keys[0], args[last_set:])
+        if args[2]:
+            await self.sadd(keys[1], [args[2]])
+        return 1
+
+    async def _rpg_move_field(self, keys: list, args: list) -> int:
+        source_field, dest_field = str(args[0]), str(args[1])
+        value = self._data.get(keys[0], {}).get(source_field)
+        if value is None:
+            return 0
+        displaced = self._data.get(keys[1], {}).get(dest_field)
+        await self.hset(keys[1], {dest_field: value})
+        if displaced is not None:
+            await self.hset(keys[0], {source_field: displaced})
+        else:
+            await self.hdel(keys[0], [source_field])
+        for dirty_key, member in ((keys[2], args[3]), (keys[3], args[4])):
+            if member:
+                await self.sadd(dirty_key, [member])
+        return 1
+
+    async def _rpg_take_hash(self, keys: list, args: list) -> list:
+        fields = []
+        for field, value in (await self.hgetall(keys[0])).items():
+            fields.extend((field, value))
+        if fields:
+            await self.delete([keys[0]])
+            await self.srem(keys[1], [args[0]])
+            await self.sadd(keys[2], [args[0]])
+        return fields
+
+    async def exec(self, batch, raise_on_error: bool = True, options=None) -> list:
+        """Execute a glide Batch by replaying its queued commands in order."""
+        results = []
+        for request_type, args in batch.commands:
+            results.append(await self._exec_batch_command(_glide_request_name(request_type), args))
+        return results
+
+    async def _exec_batch_command(self, name: str, args: list) -> Any:
+        """Dispatch a single queued glide command to the matching fake method."""
+        key, rest = args[0], args[1:]
+        if name == "HGetAll":
+            return await self.hgetall(key)
+        if name == "HGet":
+            return await self.hget(key, rest[0])
+        if name == "HSet":
+            return await self.hset(key, dict(zip(rest[::2], rest[1::2])))
+        if name == "HDel":
+            return await self.hdel(key, list(rest))
+        if name == "Expire":
+            return await self.expire(key, int(rest[0]))
+        if name == "Del":
+            return await self.delete(list(args))
+        if name == "Exists":
+            return await self.exists(list(args))
+        if name == "SAdd":
+            return await self.sadd(key, list(rest))
+        if name == "SRem":
+            return await self.srem(key, list(rest))
+        if name == "SMembers":
+            return await self.smembers(key)
+        raise NotImplementedError(f"FakeValkey batch does not support {name}")
+
     def multi(self):
         """Start a transaction and return a transaction object."""
         return FakeValkeyTransaction(self)
@@ -60,7 +60,9 @@ class TestGetPlayerVisibleEntities:
         
         result = await visibility_service.get_player_visible_entities("test_player")
         
-        assert result == entities
+        # The cache holds entity versions, not entity data
+        assert set(result) == set(entities)
+        assert all(isinstance(version, int) for version in result.values())
 
     @pytest.mark.asyncio
     async def test_returns_copy_not_reference(self, visibility_service):
@@ -426,7 +428,7 @@ class TestConcurrency:
         # All reads should have valid data (not empty or corrupted)
         for result in read_results:
             assert "entity1" in result
-            assert "id" in result["entity1"]
+            assert isinstance(result["entity1"], int)
 
 
 class TestEdgeCases:
@@ -490,7 +492,7 @@ class TestEdgeCases:
                 {"entity": {"id": "entity"}}
             )
             result = await visibility_service.get_player_visible_entities(username)
-            assert result == {"entity": {"id": "entity"}}
+            assert list(result) == ["entity"]
 
     @pytest.mark.asyncio
     async def test_nested_entity_data(self, visibility_service):
@@ -505,10 +507,16 @@ class TestEdgeCases:
             }
         }
         
-        await visibility_service.update_player_visible_entities(
+        diff = await visibility_service.update_player_visible_entities(
             "test_player",
             {"entity1": complex_entity}
         )
+        assert diff["added"] == [complex_entity]
         
-        result = await visibility_service.get_player_visible_entities("test_player")
-        assert result["entity1"] == complex_entity
+        # A nested change bumps the version and is reported as an update
+        changed_entity = {**complex_entity, "attributes": {**complex_entity["attributes"], "health": 90}}
+        diff = await visibility_service.update_player_visible_entities(
+            "test_player",
+            {"entity1": changed_entity}
+        )
+        assert diff["updated"] == [changed_entity]
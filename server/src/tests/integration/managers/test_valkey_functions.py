@@ -0,0 +1,187 @@
+"""
+Integration tests running the Valkey function library on a real Valkey.
+
+The unit tests use FakeValkey's Python mirrors of the functions; these load
+the Lua with FUNCTION LOAD and call it on the test Valkey (VALKEY_URL).
+They are skipped if it cannot be reached.
+"""
+
+import pytest
+import pytest_asyncio
+from glide import GlideClient
+
+from server.src.core.config import settings
+from server.src.core.database import valkey_config
+from server.src.services.game_state.ground_item_manager import (
+    DIRTY_GROUND_ITEMS_KEY,
+    GROUND_ITEM_KEY,
+    GROUND_ITEMS_DELETE_KEY,
+    GROUND_ITEMS_MAP_KEY,
+    GroundItemManager,
+)
+from server.src.services.game_state.inventory_manager import (
+    DIRTY_INVENTORY_KEY,
+    INVENTORY_KEY,
+    InventoryManager,
+)
+from server.src.services.game_state.player_state_manager import (
+    DIRTY_POSITIONS_KEY,
+    PLAYER_KEY,
+    PlayerStateManager,
+)
+from server.src.services.game_state.valkey_functions import (
+    LIBRARY_NAME,
+    LIBRARY_VERSION,
+    load_valkey_functions,
+)
+
+# Far above the ids of players created by other tests
+PLAYER_ID = 990001
+MAP_ID = "valkey_functions_test"
+
+
+@pytest_asyncio.fixture
+async def valkey():
+    try:
+        client = await GlideClient.create(valkey_config)
+    except Exception as e:
+        pytest.skip(f"Test Valkey not reachable at {settings.VALKEY_URL}: {e}")
+
+    ground_item_ids = []
+    yield client, ground_item_ids
+
+    player = str(PLAYER_ID)
+    items = [str(ground_item_id) for ground_item_id in ground_item_ids]
+    await client.delete(
+        [
+            INVENTORY_KEY.format(player_id=PLAYER_ID),
+            PLAYER_KEY.format(player_id=PLAYER_ID),
+            GROUND_ITEMS_MAP_KEY.format(map_id=MAP_ID),
+            *(GROUND_ITEM_KEY.format(ground_item_id=item) for item in items),
+        ]
+    )
+    await client.srem(DIRTY_INVENTORY_KEY, [player])
+    await client.srem(DIRTY_POSITIONS_KEY, [player])
+    if items:
+        await client.srem(DIRTY_GROUND_ITEMS_KEY, items)
+        await client.srem(GROUND_ITEMS_DELETE_KEY, items)
+    await client.close()
+
+
+class TestLibraryLoading:
+    """FUNCTION LOAD accepts the library and registers every function."""
+
+    @pytest.mark.asyncio
+    async def test_load_and_version(self, valkey):
+        client, _ = valkey
+        try:
+            await client.function_delete(LIBRARY_NAME)
+        except Exception:
+            pass  # Not loaded yet
+
+        assert await load_valkey_functions(client)
+        assert await client.fcall_ro("rpg_version") == LIBRARY_VERSION
+        assert not await load_valkey_functions(client)
+
+
+class TestWriteHash:
+    """rpg_write_hash: conditional HSET/HDEL, TTL and dirty mark."""
+
+    @pytest.mark.asyncio
+    async def test_only_if_exists_and_dirty_mark(self, valkey):
+        client, _ = valkey
+        await load_valkey_functions(client)
+        manager = PlayerStateManager(valkey=client)
+        key = PLAYER_KEY.format(player_id=PLAYER_ID)
+
+        await manager.set_player_hp(PLAYER_ID, 10)
+        assert await client.exists([key]) == 0
+
+        await manager._cache_in_valkey(key, {"current_hp": 5, "max_hp": 20}, 300)
+        await manager.set_player_hp(PLAYER_ID, 10)
+
+        assert (await manager.get_player_full_state(PLAYER_ID))["current_hp"] == 10
+        assert await client.sismember(DIRTY_POSITIONS_KEY, str(PLAYER_ID))
+        assert await client.ttl(key) > 0
+
+    @pytest.mark.asyncio
+    async def test_delete_fields(self, valkey):
+        client, _ = valkey
+        await load_valkey_functions(client)
+        manager = InventoryManager(valkey_client=client)
+        await manager.set_inventory_slot(PLAYER_ID, 0, item_id=5, quantity=3, durability=1.0)
+        await manager.set_inventory_slot(PLAYER_ID, 1, item_id=6, quantity=1, durability=0.5)
+
+        await manager.delete_inventory_slot(PLAYER_ID, 0)
+
+        assert set(await manager.get_inventory(PLAYER_ID)) == {"1"}
+
+
+class TestMoveField:
+    """rpg_move_field: inventory moves and swaps."""
+
+    @pytest_asyncio.fixture
+    async def inventory_mgr(self, valkey):
+        client, _ = valkey
+        await load_valkey_functions(client)
+        manager = InventoryManager(valkey_client=client)
+        await manager.set_inventory_slot(PLAYER_ID, 0, item_id=5, quantity=3, durability=1.0)
+        await manager.set_inventory_slot(PLAYER_ID, 1, item_id=6, quantity=1, durability=0.5)
+        await client.srem(DIRTY_INVENTORY_KEY, [str(PLAYER_ID)])
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_move_to_empty_slot(self, inventory_mgr, valkey):
+        client, _ = valkey
+
+        assert await inventory_mgr.move_inventory_slot(PLAYER_ID, 0, 7)
+
+        inventory = await inventory_mgr.get_inventory(PLAYER_ID)
+        assert inventory["7"]["item_id"] == 5 and inventory["7"]["quantity"] == 3
+        assert "0" not in inventory
+        assert await client.sismember(DIRTY_INVENTORY_KEY, str(PLAYER_ID))
+
+    @pytest.mark.asyncio
+    async def test_move_onto_occupied_slot_swaps(self, inventory_mgr):
+        assert await inventory_mgr.move_inventory_slot(PLAYER_ID, 0, 1)
+
+        inventory = await inventory_mgr.get_inventory(PLAYER_ID)
+        assert (inventory["0"]["item_id"], inventory["1"]["item_id"]) == (6, 5)
+
+    @pytest.mark.asyncio
+    async def test_move_from_empty_slot_is_rejected(self, inventory_mgr, valkey):
+        client, _ = valkey
+
+        assert not await inventory_mgr.move_inventory_slot(PLAYER_ID, 9, 0)
+
+        assert not await client.sismember(DIRTY_INVENTORY_KEY, str(PLAYER_ID))
+
+
+class TestTakeHash:
+    """rpg_take_hash: ground items are taken once and can be restored."""
+
+    @pytest.mark.asyncio
+    async def test_take_twice_then_restore(self, valkey):
+        client, ground_item_ids = valkey
+        await load_valkey_functions(client)
+        manager = GroundItemManager(valkey_client=client)
+        ground_item_id = await manager.add_ground_item(
+            item_id=5, map_id=MAP_ID, x=3, y=4, quantity=2, durability=1.0
+        )
+        ground_item_ids.append(ground_item_id)
+        member = str(ground_item_id)
+        map_key = GROUND_ITEMS_MAP_KEY.format(map_id=MAP_ID)
+
+        item = await manager.take_ground_item(ground_item_id, MAP_ID)
+
+        assert item["item_id"] == 5 and item["quantity"] == 2
+        assert await manager.take_ground_item(ground_item_id, MAP_ID) is None
+        assert await manager.get_ground_item(ground_item_id) is None
+        assert not await client.sismember(map_key, member)
+        assert await client.sismember(GROUND_ITEMS_DELETE_KEY, member)
+
+        await manager.restore_ground_item(item)
+
+        assert (await manager.get_ground_item(ground_item_id))["quantity"] == 2
+        assert await client.sismember(map_key, member)
+        assert not await client.sismember(GROUND_ITEMS_DELETE_KEY, member)
@@ -14,12 +14,17 @@ import uuid
 import pytest
 import pytest_asyncio
 from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from server.src.core.config import settings
+from server.src.models.item import GroundItem as GroundItemModel
 from server.src.models.skill import Skill, PlayerSkill
+from server.src.schemas.item import OperationResult, OperationType
 from server.src.services.item_service import ItemService
 from server.src.services.ground_item_service import GroundItemService
+from server.src.services.inventory_service import InventoryService
 from server.src.core.items import EquipmentSlot
 from server.src.services.game_state import (
     get_player_state_manager,
@@ -530,6 +535,83 @@ class TestPickupItem:
         ground = await ground_item_mgr.get_ground_item(ground_item_id)
         assert ground is not None
 
+    @pytest.mark.asyncio
+    async def test_pickup_error_restores_item(
+        self, session: AsyncSession, game_state_managers, player_for_ground_items
+    ):
+        """An error while adding to the inventory leaves the item on the ground."""
+        player = player_for_ground_items
+        item = await ItemService.get_item_by_name("bronze_shortsword")
+
+        ground_item_id = await GroundItemService.create_ground_item(
+            item_id=item.id,
+            map_id="testmap",
+            x=10,
+            y=10,
+            dropped_by=player.id,
+        )
+
+        with patch.object(
+            InventoryService, "_add_item_internal", AsyncMock(side_effect=RuntimeError("boom"))
+        ):
+            with pytest.raises(RuntimeError):
+                await GroundItemService.pickup_item(
+                    player_id=player.id,
+                    ground_item_id=ground_item_id,
+                    player_x=10,
+                    player_y=10,
+                    player_map_id="testmap",
+                )
+
+        ground = await get_ground_item_manager().get_ground_item(ground_item_id)
+        assert ground is not None
+        assert ground["item_id"] == item.id
+
+    @pytest.mark.asyncio
+    async def test_failed_pickup_keeps_item_without_valkey(
+        self, session: AsyncSession, game_state_managers, player_for_ground_items
+    ):
+        """Without Valkey, a failed add puts the deleted row back in the database."""
+        player = player_for_ground_items
+        item = await ItemService.get_item_by_name("bronze_shortsword")
+        now = datetime.now(timezone.utc)
+
+        row = GroundItemModel(
+            item_id=item.id,
+            map_id="testmap",
+            x=10,
+            y=10,
+            quantity=1,
+            dropped_by=player.id,
+            public_at=now,
+            despawn_at=now + timedelta(hours=1),
+        )
+        session.add(row)
+        await session.commit()
+        ground_item_id = row.id
+
+        failed_add = OperationResult(
+            success=False, message="Inventory is full", operation=OperationType.ADD
+        )
+        with patch.object(settings, "USE_VALKEY", False), patch.object(
+            InventoryService, "_add_item_internal", AsyncMock(return_value=failed_add)
+        ):
+            result = await GroundItemService.pickup_item(
+                player_id=player.id,
+                ground_item_id=ground_item_id,
+                player_x=10,
+                player_y=10,
+                player_map_id="testmap",
+            )
+
+            assert result.success is False
+            assert result.message == "Inventory is full"
+
+            ground = await get_ground_item_manager().get_ground_item(ground_item_id)
+            assert ground is not None
+            assert ground["dropped_by_player_id"] == player.id
+            assert ground["despawn_at"] == pytest.approx((now + timedelta(hours=1)).timestamp())
+
 
 # =============================================================================
 # Visibility Tests
@@ -0,0 +1,183 @@
+"""
+Headless synthetic-load benchmark of whole game loop ticks.
+
+Seeds a map with N players and M monsters on FakeValkey, attaches null
+websockets and runs game loop ticks back to back through a HeadlessServer
+(tests/stress/tick_harness.py), with each player sending a random move
+before a tick at the given rate. Reports tick time percentiles, a per-phase
+breakdown, Valkey commands and round trips per tick and bytes emitted, and
+can write the report as JSON to compare runs.
+
+Usage:
+    python -m server.src.tests.stress.benchmark_tick --players 200 --monsters 300
+    python -m server.src.tests.stress.benchmark_tick --ticks 500 --json before.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from server.src.core.config import settings
+from server.src.core.monsters import MonsterID
+from server.src.services.map_service import get_map_manager
+from server.src.tests.stress.tick_harness import (
+    HeadlessServer,
+    collect_phases,
+    format_report,
+    summarize,
+)
+
+from common.src.protocol import MessageType, PROTOCOL_VERSION, WSMessage
+
+DIRECTIONS = ["UP", "DOWN", "LEFT", "RIGHT"]
+
+
+async def run_benchmark(
+    map_id: str = "samplemap",
+    players: int = 100,
+    monsters: int = 200,
+    ticks: int = 200,
+    warmup_ticks: int = 20,
+    move_chance: float = 0.5,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Run the synthetic load and measure every tick after the warmup.
+
+    Returns:
+        Report with tick and per-phase timings (ms), Valkey commands and
+        round trips per tick and bytes sent per tick
+    """
+    rng = random.Random(seed)
+    server = HeadlessServer()
+    await server.start()
+
+    tile_map = get_map_manager().get_map(map_id)
+    if tile_map is None:
+        raise ValueError(f"Unknown map: {map_id}")
+    walkable = [
+        (x, y)
+        for y, row in enumerate(tile_map.get_collision_grid())
+        for x, blocked in enumerate(row)
+        if not blocked
+    ]
+
+    await server.seed_entity_definitions()
+    monster_types = list(MonsterID)
+    for i in range(monsters):
+        x, y = rng.choice(walkable)
+        await server.spawn_monster(monster_types[i % len(monster_types)], map_id, x, y)
+    for player_id in range(1, players + 1):
+        x, y = rng.choice(walkable)
+        await server.connect_player(player_id, f"bench_{player_id}", map_id, x, y, 10, 10)
+
+    tick_ms: List[float] = []
+    phases_ms: Dict[str, List[float]] = {}
+    commands: List[float] = []
+    round_trips: List[float] = []
+    bytes_sent: List[float] = []
+    started = time.perf_counter()
+    try:
+        for iteration in range(warmup_ticks + ticks):
+            bytes_before = server.bytes_sent
+            for player_id in range(1, players + 1):
+                if rng.random() < move_chance:
+                    await server.send_command(
+                        player_id,
+                        WSMessage(
+                            id=None,
+                            type=MessageType.CMD_MOVE,
+                            payload={"direction": rng.choice(DIRECTIONS)},
+                            version=PROTOCOL_VERSION,
+                        ),
+                    )
+
+            commands_before = server.valkey.commands
+            round_trips_before = server.valkey.round_trips
+            profiler, duration = await server.run_tick()
+            tick_commands = server.valkey.commands - commands_before
+            tick_round_trips = server.valkey.round_trips - round_trips_before
+            # Let the outbound writer tasks drain this tick's updates
+            await asyncio.sleep(0)
+
+            if iteration < warmup_ticks:
+                continue
+            tick_ms.append(duration * 1000)
+            collect_phases(profiler.get_breakdown(), phases_ms)
+            commands.append(tick_commands)
+            round_trips.append(tick_round_trips)
+            bytes_sent.append(server.bytes_sent - bytes_before)
+    finally:
+        await server.stop()
+
+    return {
+        "config": {
+            "map_id": map_id,
+            "players": players,
+            "monsters": monsters,
+            "warmup_ticks": warmup_ticks,
+            "move_chance": move_chance,
+            "seed": seed,
+            "tick_budget_ms": round(1000 / settings.GAME_TICK_RATE, 3),
+        },
+        "ticks": len(tick_ms),
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "tick_ms": summarize(tick_ms),
+        "phases_ms": {name: summarize(samples) for name, samples in phases_ms.items()},
+        "valkey_commands_per_tick": summarize(commands),
+        "valkey_round_trips_per_tick": summarize(round_trips),
+        "bytes_per_tick": summarize(bytes_sent),
+        "bytes_total": sum(bytes_sent),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark game loop ticks under synthetic load")
+    parser.add_argument("--map", dest="map_id", default="samplemap")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--monsters", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=200, help="Measured ticks")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured ticks run first")
+    parser.add_argument("--move-chance", type=float, default=0.5, help="Chance a player moves each tick")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON here")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_benchmark(
+            map_id=args.map_id,
+            players=args.players,
+            monsters=args.monsters,
+            ticks=args.ticks,
+            warmup_ticks=args.warmup,
+            move_chance=args.move_chance,
+            seed=args.seed,
+        )
+    )
+
+    config = report["config"]
+    print(
+        format_report(
+            f"Tick benchmark: {config['players']} players, {config['monsters']} monsters "
+            f"on {config['map_id']} (budget {config['tick_budget_ms']}ms)",
+            report,
+        )
+    )
+    print()
+    valkey_commands = report["valkey_commands_per_tick"]
+    round_trips = report["valkey_round_trips_per_tick"]
+    sent = report["bytes_per_tick"]
+    print(f"Valkey commands/tick:    mean {valkey_commands['mean']:.1f}  p99 {valkey_commands['p99']:.0f}")
+    print(f"Valkey round trips/tick: mean {round_trips['mean']:.1f}  p99 {round_trips['p99']:.0f}")
+    print(f"Bytes sent/tick:         mean {sent['mean']:.0f}  p99 {sent['p99']:.0f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Deterministic offline replay of a tick recording.
+
+Feeds the inputs of a recording made with TICK_RECORDING_PATH (see
+game/tick_recorder.py) through a HeadlessServer: each tick frame reseeds
+the global RNG with the recorded seed, replays the connections, commands
+and disconnections that preceded the tick, then runs the tick. Per-tick and
+per-phase timings of the replay are reported next to the recorded ones, and
+the state diffs sent during the replay are compared with the recorded ones
+to flag ticks that did not replay identically. Anything driven by the wall
+clock (movement cooldowns, rate limits, time-based respawns) can make
+ticks diverge, since the replay runs unpaced.
+
+Only the first recording session in the file is replayed (the server
+appends a new header frame every time it starts recording).
+
+Usage:
+    python -m server.src.tests.stress.replay_ticks recording.bin
+    python -m server.src.tests.stress.replay_ticks recording.bin --json replay.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import msgpack
+
+from server.src.game.tick_recorder import (
+    FRAME_HEADER,
+    FRAME_TICK,
+    INPUT_COMMAND,
+    INPUT_CONNECT,
+    INPUT_DISCONNECT,
+    RECORDING_FORMAT_VERSION,
+    read_tick_recording,
+)
+from server.src.tests.stress.tick_harness import (
+    HeadlessServer,
+    collect_phases,
+    format_report,
+    summarize,
+)
+
+from common.src.protocol import WSMessage
+
+
+def _tick_frames(path: str) -> Iterator[Dict[str, Any]]:
+    """Tick frames of the first recording session in a file."""
+    frames = read_tick_recording(path)
+    header = next(frames, None)
+    if not header or header.get("kind") != FRAME_HEADER:
+        raise ValueError(f"{path} is not a tick recording")
+    if header.get("version") != RECORDING_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported recording format {header.get('version')} "
+            f"(expected {RECORDING_FORMAT_VERSION})"
+        )
+    for frame in frames:
+        if frame.get("kind") == FRAME_HEADER:
+            print("Recording restarts here; only the first session is replayed", file=sys.stderr)
+            return
+        if frame.get("kind") == FRAME_TICK:
+            yield frame
+
+
+def _by_player(outbound: List[List[Any]]) -> List[Tuple[int, Any]]:
+    """
+    Payloads of outbound messages grouped by player, for comparison.
+
+    Only the order of messages per player is significant; entity lists are
+    sorted and message timestamps left out, since neither is deterministic.
+    """
+    payloads = []
+    for player_id, data in outbound:
+        payload = msgpack.unpackb(data)["payload"]
+        payloads.append(
+            (
+                player_id,
+                {
+                    key: sorted(value, key=repr) if isinstance(value, list) else value
+                    for key, value in payload.items()
+                },
+            )
+        )
+    return sorted(payloads, key=lambda message: message[0])
+
+
+async def _apply_inputs(server: HeadlessServer, inputs: List[Dict[str, Any]]) -> None:
+    for recorded in inputs:
+        kind = recorded["kind"]
+        if kind == INPUT_CONNECT:
+            await server.connect_player(
+                recorded["player_id"],
+                recorded["username"],
+                recorded["map_id"],
+                recorded["x"],
+                recorded["y"],
+                recorded["current_hp"],
+                recorded["max_hp"],
+            )
+        elif kind == INPUT_COMMAND:
+            await server.send_command(recorded["player_id"], WSMessage(**recorded["message"]))
+        elif kind == INPUT_DISCONNECT:
+            await server.disconnect_player(recorded["player_id"])
+
+
+async def replay(path: str, max_ticks: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Replay a recording and measure it.
+
+    Args:
+        path: Recording file
+        max_ticks: Stop after this many ticks
+
+    Returns:
+        Report with replayed and recorded tick timings (ms), per-phase
+        timings and the ticks whose state diffs differ from the recording
+    """
+    frames = _tick_frames(path)
+    first = next(frames, None)
+    if first is None:
+        raise ValueError(f"{path} contains no ticks")
+
+    fd, replay_path = tempfile.mkstemp(suffix=".ticks")
+    os.close(fd)
+    server = HeadlessServer(start_tick=first["tick"] - 1, record_path=replay_path)
+    await server.start()
+
+    recorded_outbound: Dict[int, List[List[Any]]] = {}
+    recorded_ms: List[float] = []
+    tick_ms: List[float] = []
+    phases_ms: Dict[str, List[float]] = {}
+    started = time.perf_counter()
+    try:
+        frame: Optional[Dict[str, Any]] = first
+        while frame is not None and (max_ticks is None or len(tick_ms) < max_ticks):
+            random.seed(frame["seed"])
+            await _apply_inputs(server, frame["inputs"])
+            profiler, duration = await server.run_tick()
+            if profiler.tick != frame["tick"]:
+                print(
+                    f"Recorded tick {frame['tick']} replayed as tick {profiler.tick}",
+                    file=sys.stderr,
+                )
+
+            recorded_outbound[profiler.tick] = frame["outbound"]
+            recorded_ms.append(frame["duration_ms"])
+            tick_ms.append(duration * 1000)
+            collect_phases(profiler.get_breakdown(), phases_ms)
+            frame = next(frames, None)
+    finally:
+        await server.stop()
+
+    divergent_ticks = [
+        replayed["tick"]
+        for replayed in _tick_frames(replay_path)
+        if _by_player(recorded_outbound.get(replayed["tick"], [])) != _by_player(replayed["outbound"])
+    ]
+    os.unlink(replay_path)
+
+    return {
+        "recording": path,
+        "ticks": len(tick_ms),
+        "first_tick": first["tick"],
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "tick_ms": summarize(tick_ms),
+        "recorded_tick_ms": summarize(recorded_ms),
+        "phases_ms": {name: summarize(samples) for name, samples in phases_ms.items()},
+        "divergent_ticks": divergent_ticks,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a tick recording offline")
+    parser.add_argument("recording", help="File written with TICK_RECORDING_PATH")
+    parser.add_argument("--max-ticks", type=int, default=None, help="Stop after this many ticks")
+    parser.add_argument("--json", dest="json_path", help="Also write the report as JSON here")
+    args = parser.parse_args()
+
+    report = asyncio.run(replay(args.recording, args.max_ticks))
+
+    print(format_report(f"Replay of {args.recording}", report))
+    recorded = report["recorded_tick_ms"]
+    print()
+    print(
+        f"Recorded: p50 {recorded['p50']:.3f}ms  p95 {recorded['p95']:.3f}ms  "
+        f"p99 {recorded['p99']:.3f}ms  max {recorded['max']:.3f}ms"
+    )
+    divergent = report["divergent_ticks"]
+    if divergent:
+        print(f"⚠️  {len(divergent)} tick(s) sent different state diffs than recorded, first: {divergent[:10]}")
+    else:
+        print("✅ Every tick sent the recorded state diffs")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Headless game server for tick benchmarks and replays.
+
+Runs the real game loop stages (run_game_tick) and WebSocket handlers
+against the in-memory FakeValkey from tests/conftest.py, with NullWebSocket
+connections instead of sockets and no database. Nothing is paced: each
+run_tick() call runs one tick as fast as it can and returns its profiler.
+Given a record_path, the run is itself written as a tick recording.
+Valkey traffic goes through a CountingValkey so callers can report
+commands per tick.
+
+Usage:
+    server = HeadlessServer()
+    await server.start()
+    await server.connect_player(1, "player_1", "samplemap", 10, 10, 10, 10)
+    profiler, duration = await server.run_tick()
+    await server.stop()
+"""
+
+import inspect
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from server.src.api.connection_manager import ConnectionManager
+from server.src.api.websockets import WebSocketHandler
+from server.src.core.concurrency import initialize_concurrency_infrastructure
+from server.src.core.config import settings
+from server.src.core.entities import EntityType
+from server.src.core.entity_utils import entity_def_to_dict
+from server.src.core.humanoids import HumanoidID
+from server.src.core.monsters import MonsterID
+from server.src.game.game_loop import (
+    cleanup_disconnected_player,
+    get_game_loop_state,
+    register_player_login,
+    reset_game_loop_state,
+    run_game_tick,
+)
+from server.src.game.death_queue import reset_death_queue
+from server.src.game.tick_profiler import TickProfiler
+from server.src.game.tick_recorder import get_tick_recorder, reset_tick_recorder
+from server.src.game.timing_wheel import reset_timing_wheel
+from server.src.services.ai_service import AIService
+from server.src.services.connection_service import ConnectionService
+from server.src.services.game_state import (
+    get_entity_manager,
+    get_player_state_manager,
+    get_reference_data_manager,
+    init_all_managers,
+    reset_all_managers,
+)
+from server.src.services.map_service import get_map_manager
+from server.src.tests.conftest import FakeValkey
+
+from common.src.protocol import WSMessage
+
+
+class NullWebSocket:
+    """Accepted WebSocket stand-in that discards and counts what is sent."""
+
+    def __init__(self):
+        self.messages_sent = 0
+        self.bytes_sent = 0
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.messages_sent += 1
+        self.bytes_sent += len(data)
+
+    async def send_text(self, data: str) -> None:
+        self.messages_sent += 1
+        self.bytes_sent += len(data.encode())
+
+    async def close(self, code: int = 1000, reason: Optional[str] = None) -> None:
+        pass
+
+
+class CountingValkey:
+    """
+    Proxy that counts the commands and round trips sent to a Valkey client.
+
+    Every awaited client method is one command and one round trip; a batch
+    passed to exec() is one round trip carrying all of its commands.
+    """
+
+    def __init__(self, valkey: Any):
+        self._valkey = valkey
+        self.commands = 0
+        self.round_trips = 0
+
+    async def exec(self, batch: Any, *args: Any, **kwargs: Any) -> Any:
+        self.commands += len(batch.commands)
+        self.round_trips += 1
+        return await self._valkey.exec(batch, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._valkey, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def counted(*args: Any, **kwargs: Any) -> Any:
+            self.commands += 1
+            self.round_trips += 1
+            return await attr(*args, **kwargs)
+
+        return counted
+
+
+class HeadlessServer:
+    """Game state, connections and handlers of a server with no sockets."""
+
+    def __init__(self, start_tick: int = 0, record_path: Optional[str] = None):
+        """
+        Args:
+            start_tick: Tick counter before the first run_tick()
+            record_path: Write the run as a tick recording to this file
+        """
+        self.start_tick = start_tick
+        self.record_path = record_path
+        self.valkey = CountingValkey(FakeValkey())
+        self.manager = ConnectionManager()
+        self.websockets: Dict[int, NullWebSocket] = {}
+        self.handlers: Dict[int, WebSocketHandler] = {}
+
+    async def start(self) -> None:
+        """Initialise managers on FakeValkey and load the maps."""
+        # Never append a headless run to the configured recording
+        settings.TICK_RECORDING_PATH = self.record_path or ""
+        reset_tick_recorder()
+        # Create the recorder now: it seeds the RNG when created
+        get_tick_recorder()
+        initialize_concurrency_infrastructure(self.valkey)
+        init_all_managers(self.valkey, None)
+        reset_game_loop_state(self.start_tick)
+        reset_timing_wheel(self.start_tick)
+        reset_death_queue()
+        AIService.reset_all_timers()
+
+        map_manager = get_map_manager()
+        if not map_manager.maps:
+            await map_manager.load_maps()
+
+    async def stop(self) -> None:
+        """Disconnect everyone and reset the managers."""
+        await self.manager.disconnect_all()
+        self.handlers.clear()
+        reset_all_managers()
+        reset_tick_recorder()
+
+    @property
+    def bytes_sent(self) -> int:
+        """Bytes sent to all connections so far."""
+        return sum(websocket.bytes_sent for websocket in self.websockets.values())
+
+    async def connect_player(
+        self,
+        player_id: int,
+        username: str,
+        map_id: str,
+        x: int,
+        y: int,
+        current_hp: int,
+        max_hp: int,
+    ) -> None:
+        """Bring a player online the way websocket_endpoint does, minus the database."""
+        await get_player_state_manager().register_online_player(player_id, username)
+        await ConnectionService.initialize_player_connection(
+            player_id, username, x, y, map_id, current_hp, max_hp
+        )
+        websocket = self.websockets.setdefault(player_id, NullWebSocket())
+        await self.manager.connect(websocket, player_id, map_id)
+        self.handlers[player_id] = WebSocketHandler(websocket, username, player_id, self.valkey)
+        await register_player_login(player_id)
+
+        recorder = get_tick_recorder()
+        if recorder:
+            recorder.record_connect(player_id, username, map_id, x, y, current_hp, max_hp)
+
+    async def seed_entity_definitions(self) -> None:
+        """
+        Cache every humanoid and monster definition as reference data.
+
+        Stands in for the entities table, numbering definitions in enum order.
+        """
+        entity_data: Dict[str, Dict[str, Any]] = {}
+        for entity_id, entity in enumerate([*HumanoidID, *MonsterID], start=1):
+            row = entity_def_to_dict(entity.name, entity.value)
+            entity_data[entity.name] = {
+                "id": entity_id,
+                "name": entity.name,
+                "entity_type": row["entity_type"],
+                "display_name": row["display_name"],
+                "behavior": row["behavior"],
+                "level": row["level"],
+                "max_hp": row["max_hp"],
+                "skills": row["skills"],
+                "aggro_radius": row["aggro_radius"],
+                "disengage_radius": row["disengage_radius"],
+            }
+        await get_reference_data_manager().cache_entity_definitions(entity_data)
+
+    async def spawn_monster(
+        self, monster: MonsterID, map_id: str, x: int, y: int, wander_radius: int = 5
+    ) -> int:
+        """
+        Spawn a monster the way EntitySpawnService does for a spawn point.
+
+        Requires seed_entity_definitions() first.
+
+        Returns:
+            Entity instance ID
+        """
+        entity_id = await get_reference_data_manager().get_entity_id_by_name(monster.name)
+        if entity_id is None:
+            raise ValueError(f"No reference data for {monster.name}; call seed_entity_definitions()")
+        entity_mgr = get_entity_manager()
+        instance_id = await entity_mgr.spawn_entity_instance(
+            entity_id=entity_id,
+            map_id=map_id,
+            x=x,
+            y=y,
+            current_hp=monster.value.max_hp,
+            max_hp=monster.value.max_hp,
+        )
+        await entity_mgr.store_spawn_metadata(
+            instance_id=instance_id,
+            entity_name=monster.name,
+            entity_type=EntityType.MONSTER.value,
+            spawn_x=x,
+            spawn_y=y,
+            wander_radius=wander_radius,
+            spawn_point_id=instance_id,
+        )
+        return instance_id
+
+    async def disconnect_player(self, player_id: int) -> None:
+        """Take a player offline; unknown players are ignored."""
+        if self.handlers.pop(player_id, None) is None:
+            return
+        await self.manager.disconnect(player_id)
+        await cleanup_disconnected_player(player_id)
+
+        recorder = get_tick_recorder()
+        if recorder:
+            recorder.record_disconnect(player_id)
+
+    async def send_command(self, player_id: int, message: WSMessage) -> bool:
+        """
+        Handle a message from a connected player.
+
+        Returns:
+            False if the player is not connected
+        """
+        handler = self.handlers.get(player_id)
+        if handler is None:
+            return False
+        await handler.process_message(message)
+        return True
+
+    async def run_tick(self) -> Tuple[TickProfiler, float]:
+        """
+        Run one game loop tick.
+
+        Returns:
+            The tick's profiler and its duration in seconds
+        """
+        current_tick = get_game_loop_state().increment_tick()
+        profiler = TickProfiler(tick=current_tick, budget_seconds=1 / settings.GAME_TICK_RATE)
+        await run_game_tick(self.manager, current_tick, profiler, sync_to_database=False)
+        duration = profiler.finish()
+
+        recorder = get_tick_recorder()
+        if recorder:
+            recorder.end_tick(current_tick, duration, profiler.get_breakdown())
+        return profiler, duration
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99/max/mean of a sample (0s when empty), rounded to 3 places."""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+    return {
+        "p50": round(percentile(samples, 50), 3),
+        "p95": round(percentile(samples, 95), 3),
+        "p99": round(percentile(samples, 99), 3),
+        "max": round(max(samples), 3),
+        "mean": round(sum(samples) / len(samples), 3),
+    }
+
+
+def collect_phases(breakdown: Dict[str, Dict[str, float]], into: Dict[str, List[float]]) -> None:
+    """Add one tick's phase breakdown (summed over maps) to per-phase samples in ms."""
+    totals: Dict[str, float] = {}
+    for phases in breakdown.values():
+        for name, duration_ms in phases.items():
+            totals[name] = totals.get(name, 0.0) + duration_ms
+    for name, duration_ms in totals.items():
+        into.setdefault(name, []).append(duration_ms)
+
+
+def format_report(title: str, report: Dict[str, Any]) -> str:
+    """Human-readable summary of a report with tick_ms and phases_ms sections."""
+    lines = ["=" * 70, title, "=" * 70]
+    tick_ms = report["tick_ms"]
+    lines.append(
+        f"Ticks: {report['ticks']}  p50 {tick_ms['p50']:.3f}ms  p95 {tick_ms['p95']:.3f}ms  "
+        f"p99 {tick_ms['p99']:.3f}ms  max {tick_ms['max']:.3f}ms"
+    )
+    lines.append("")
+    lines.append(f"{'phase':<28}{'mean ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    phases = sorted(report["phases_ms"].items(), key=lambda item: -item[1]["mean"])
+    for name, stats in phases:
+        lines.append(f"{name:<28}{stats['mean']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}")
+    return "\n".join(lines)
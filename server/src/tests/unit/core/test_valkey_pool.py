@@ -0,0 +1,169 @@
+"""
+Unit tests for the Valkey client pool and its lanes.
+"""
+
+import asyncio
+
+import pytest
+
+from server.src.core.metrics import valkey_command_duration_seconds, valkey_lane_healthy
+from server.src.core.valkey_pool import (
+    VALKEY_LANE_GAME_LOOP,
+    VALKEY_LANE_PERSISTENCE,
+    VALKEY_LANE_REQUESTS,
+    ValkeyClientPool,
+    current_valkey_lane,
+    in_valkey_lane,
+    use_valkey_lane,
+    valkey_lane,
+)
+
+
+class StubClient:
+    """Records the commands it receives."""
+
+    def __init__(self):
+        self.calls = []
+        self.healthy = True
+        self.was_reset = False
+
+    async def get(self, key):
+        self.calls.append(key)
+        return key
+
+    async def ping(self):
+        if not self.healthy:
+            raise ConnectionError("connection refused")
+        return b"PONG"
+
+    def reset(self):
+        self.was_reset = True
+
+
+@pytest.fixture
+def pool():
+    return ValkeyClientPool({VALKEY_LANE_REQUESTS: 2}, StubClient)
+
+
+def lane_calls(pool, lane):
+    return [client.calls for client in pool.clients(lane)]
+
+
+class TestLaneRouting:
+    """Calls go to the clients of the calling task's lane."""
+
+    @pytest.mark.asyncio
+    async def test_requests_is_the_default_lane(self, pool):
+        await pool.get("a")
+
+        assert current_valkey_lane() == VALKEY_LANE_REQUESTS
+        assert lane_calls(pool, VALKEY_LANE_REQUESTS) == [["a"], []]
+        assert lane_calls(pool, VALKEY_LANE_GAME_LOOP) == [[]]
+
+    @pytest.mark.asyncio
+    async def test_lane_clients_are_used_round_robin(self, pool):
+        for key in ("a", "b", "c"):
+            await pool.get(key)
+
+        assert lane_calls(pool, VALKEY_LANE_REQUESTS) == [["a", "c"], ["b"]]
+
+    @pytest.mark.asyncio
+    async def test_lane_block_and_decorator(self, pool):
+        @in_valkey_lane(VALKEY_LANE_PERSISTENCE)
+        async def sync():
+            await pool.get("sync")
+
+        with valkey_lane(VALKEY_LANE_GAME_LOOP):
+            await pool.get("tick")
+            await sync()
+        await pool.get("request")
+
+        assert lane_calls(pool, VALKEY_LANE_GAME_LOOP) == [["tick"]]
+        assert lane_calls(pool, VALKEY_LANE_PERSISTENCE) == [["sync"]]
+        assert lane_calls(pool, VALKEY_LANE_REQUESTS) == [["request"], []]
+
+    @pytest.mark.asyncio
+    async def test_task_lane_is_inherited_by_child_tasks(self, pool):
+        async def game_loop():
+            use_valkey_lane(VALKEY_LANE_GAME_LOOP)
+            await asyncio.create_task(pool.get("map"))
+
+        await asyncio.create_task(game_loop())
+        await pool.get("request")
+
+        assert lane_calls(pool, VALKEY_LANE_GAME_LOOP) == [["map"]]
+        assert lane_calls(pool, VALKEY_LANE_REQUESTS) == [["request"], []]
+
+    def test_unknown_lanes_are_rejected(self):
+        with pytest.raises(ValueError):
+            ValkeyClientPool({"background": 1}, StubClient)
+        with pytest.raises(ValueError):
+            use_valkey_lane("background")
+
+
+class TestPoolObservability:
+    """Latency metrics and health checks per lane."""
+
+    @pytest.mark.asyncio
+    async def test_latency_is_recorded_per_lane(self, pool):
+        histogram = valkey_command_duration_seconds.labels(lane=VALKEY_LANE_GAME_LOOP, command="get")
+        observations = lambda: sum(bucket.get() for bucket in histogram._buckets)
+        before = observations()
+
+        with valkey_lane(VALKEY_LANE_GAME_LOOP):
+            await pool.get("a")
+
+        assert observations() == before + 1
+
+    @pytest.mark.asyncio
+    async def test_health_check_reports_each_lane(self, pool):
+        pool.clients(VALKEY_LANE_PERSISTENCE)[0].healthy = False
+
+        health = await pool.check_health()
+
+        assert health == {
+            VALKEY_LANE_GAME_LOOP: True,
+            VALKEY_LANE_REQUESTS: True,
+            VALKEY_LANE_PERSISTENCE: False,
+        }
+        assert valkey_lane_healthy.labels(lane=VALKEY_LANE_PERSISTENCE)._value.get() == 0
+        assert valkey_lane_healthy.labels(lane=VALKEY_LANE_GAME_LOOP)._value.get() == 1
+
+    @pytest.mark.asyncio
+    async def test_health_check_loop_survives_errors(self, pool, monkeypatch):
+        checks = []
+
+        async def check_health():
+            checks.append(len(checks))
+            if len(checks) == 1:
+                raise RuntimeError("bad label")
+            return {}
+
+        monkeypatch.setattr(pool, "check_health", check_health)
+        task = asyncio.create_task(pool.run_health_checks(0))
+        while len(checks) < 3:
+            await asyncio.sleep(0)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    def test_reset_drops_every_connection(self, pool):
+        pool.reset()
+
+        assert all(
+            client.was_reset
+            for lane in (VALKEY_LANE_GAME_LOOP, VALKEY_LANE_REQUESTS, VALKEY_LANE_PERSISTENCE)
+            for client in pool.clients(lane)
+        )
+
+    @pytest.mark.asyncio
+    async def test_reset_valkey_replaces_the_closed_pool(self):
+        from server.src.core import database
+
+        closed = await database.get_valkey()
+        await closed.close()
+        database.reset_valkey()
+
+        assert await database.get_valkey() is not closed
+        database.reset_valkey()
@@ -0,0 +1,75 @@
+"""
+Unit tests for the queue of players whose HP reached zero.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from server.src.game.death_queue import PlayerDeathQueue, get_death_queue, reset_death_queue
+from server.src.services.hp_service import HpService
+
+
+class TestPlayerDeathQueue:
+    """Tests for queueing and taking dead players."""
+
+    def test_zero_hp_is_queued_until_taken(self):
+        queue = PlayerDeathQueue()
+        queue.report_hp(1, 0)
+        queue.report_hp(2, 5)
+
+        assert queue.take([1, 2]) == [1]
+        assert queue.take([1, 2]) == []
+
+    def test_hp_back_above_zero_unqueues(self):
+        queue = PlayerDeathQueue()
+        queue.report_hp(1, 0)
+        queue.report_hp(1, 3)
+
+        assert queue.take([1]) == []
+
+    def test_players_on_other_maps_stay_queued(self):
+        queue = PlayerDeathQueue()
+        queue.report_hp(1, 0)
+        queue.report_hp(2, 0)
+
+        assert queue.take([1, 3]) == [1]
+        assert len(queue) == 1
+        queue.discard(2)
+        assert len(queue) == 0
+
+
+class TestHpServiceReportsDeaths:
+    """HP writes through HpService feed the death queue."""
+
+    @pytest.fixture(autouse=True)
+    def player_mgr(self):
+        reset_death_queue()
+        player_mgr = MagicMock()
+        player_mgr.set_player_hp = AsyncMock()
+        player_mgr.get_player_hp = AsyncMock(return_value={"current_hp": 4, "max_hp": 10})
+        player_mgr.set_many_hp = AsyncMock(return_value=1)
+        with patch("server.src.services.hp_service.get_player_state_manager", return_value=player_mgr), \
+                patch("server.src.services.player_service.PlayerService.get_player_by_id", AsyncMock(return_value=None)):
+            yield player_mgr
+        reset_death_queue()
+
+    @pytest.mark.asyncio
+    async def test_lethal_damage_queues_player(self):
+        result = await HpService.deal_damage(7, 10)
+
+        assert result.player_died
+        assert get_death_queue().take([7]) == [7]
+
+    @pytest.mark.asyncio
+    async def test_non_lethal_damage_does_not_queue(self):
+        await HpService.deal_damage(7, 2)
+
+        assert get_death_queue().take([7]) == []
+
+    @pytest.mark.asyncio
+    async def test_regeneration_unqueues(self):
+        await HpService.set_hp(7, 0)
+        await HpService.batch_regenerate_hp([(7, 1)])
+
+        assert get_death_queue().take([7]) == []
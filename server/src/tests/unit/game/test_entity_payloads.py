@@ -0,0 +1,65 @@
+"""
+Unit tests for the per-tick entity payload snapshot in the game loop.
+"""
+
+from unittest.mock import patch
+
+from server.src.game.game_loop import (
+    build_npc_entity_payloads,
+    build_player_payloads,
+    get_visible_npc_entities,
+    get_visible_players,
+)
+
+
+def _entity(instance_id, x=25, y=25, state="idle"):
+    return {
+        "instance_id": instance_id,
+        "entity_name": "GOBLIN",
+        "entity_type": "monster",
+        "x": x,
+        "y": y,
+        "current_hp": 10,
+        "max_hp": 10,
+        "state": state,
+    }
+
+
+class TestEntityPayloads:
+    """Tests for build_player_payloads and build_npc_entity_payloads."""
+
+    def test_npc_payloads_skip_dead_entities(self):
+        payloads = build_npc_entity_payloads([_entity(1), _entity(2, state="dead")])
+
+        assert list(payloads.keys()) == [1]
+        assert payloads[1]["id"] == 1
+
+    def test_npc_payloads_match_per_viewer_builder(self):
+        entities = [_entity(1), _entity(2, x=30)]
+
+        payloads = build_npc_entity_payloads(entities)
+        visible = get_visible_npc_entities(25, 25, entities)
+
+        assert visible == {f"entity_{key}": value for key, value in payloads.items()}
+
+    def test_player_payloads_match_per_viewer_builder(self):
+        players = [
+            {"player_id": 1, "username": "alice", "x": 5, "y": 5, "visual_hash": "abc"},
+            {"player_id": 2, "username": "bob", "x": 6, "y": 6},
+        ]
+
+        payloads = build_player_payloads(players)
+        visible = get_visible_players(5, 5, players, own_player_id=1)
+
+        assert visible == {2: payloads[2]}
+        assert payloads[1]["id"] == "player_1"
+        assert payloads[1]["visual_hash"] == "abc"
+
+    def test_payloads_use_precomputed_render_descriptors(self):
+        entities = [_entity(1), _entity(2)]
+
+        with patch("server.src.core.entities.get_entity_by_name") as lookup:
+            payloads = build_npc_entity_payloads(entities)
+
+        lookup.assert_not_called()
+        assert payloads[1]["display_name"] == payloads[2]["display_name"] != "GOBLIN"
@@ -0,0 +1,66 @@
+"""
+Unit tests for the event-scheduled HP regeneration queue.
+"""
+
+import pytest
+
+from server.src.game.game_loop import GameLoopState
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+
+
+class TestHpRegenSchedule:
+    """Tests for GameLoopState's regen due-time queue."""
+
+    @pytest.mark.asyncio
+    async def test_regen_ticks_are_staggered_from_login(self):
+        state = GameLoopState()
+        for _ in range(3):
+            state.increment_tick()
+        await state.register_player_login(1)
+
+        assert state.schedule_hp_regen(1, current_tick=10, interval=5) == 13
+        # Already queued: the due tick is kept
+        assert state.schedule_hp_regen(1, current_tick=11, interval=5) == 13
+        # No login tick: due one interval from now
+        assert state.schedule_hp_regen(2, current_tick=10, interval=5) == 15
+
+    def test_only_due_players_are_collected(self):
+        state = GameLoopState()
+        state.schedule_hp_regen(1, current_tick=0, interval=5)
+        state.schedule_hp_regen(2, current_tick=2, interval=5)
+
+        assert state.collect_hp_regen_due(4) == 0
+        assert state.collect_hp_regen_due(5) == 1
+        assert state.take_hp_regen_due(1)
+        assert not state.take_hp_regen_due(1)
+        assert not state.take_hp_regen_due(2)
+        assert not state.is_hp_regen_scheduled(1)
+        assert state.is_hp_regen_scheduled(2)
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_queued_player(self):
+        state = GameLoopState()
+        state.schedule_hp_regen(1, current_tick=0, interval=5)
+
+        await state.cleanup_player(1)
+
+        assert state.collect_hp_regen_due(100) == 0
+
+
+class TestSetManyHp:
+    """Tests for PlayerStateManager.set_many_hp."""
+
+    @pytest.mark.asyncio
+    async def test_writes_cached_and_hot_players(self, fake_valkey):
+        await fake_valkey.hset("player:1", {"current_hp": "3", "max_hp": "10"})
+        await fake_valkey.hset("player:2", {"current_hp": "4", "max_hp": "10"})
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        await player_mgr.register_online_player(2, "player2")
+        await player_mgr.attach_hot_state(2)
+
+        updated = await player_mgr.set_many_hp({1: 4, 2: 5, 3: 6})
+
+        assert updated == 2
+        assert (await player_mgr.get_player_hp(1))["current_hp"] == 4
+        assert (await player_mgr.get_player_hp(2))["current_hp"] == 5
+        assert not await fake_valkey.exists(["player:3"])
@@ -0,0 +1,97 @@
+"""
+Unit tests for concurrent per-map tick processing in the game loop.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from server.src.core.metrics import game_loop_map_errors_total
+from server.src.game import game_loop
+from server.src.game.tick_profiler import TickProfiler
+from server.src.game.timing_wheel import reset_timing_wheel
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+
+
+class TestRunGameTick:
+    """Map tasks run concurrently and fail independently."""
+
+    @pytest.fixture
+    def tick_state(self, fake_valkey):
+        game_loop.reset_game_loop_state()
+        reset_timing_wheel()
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        with patch.object(game_loop, "get_player_state_manager", return_value=player_mgr):
+            yield
+        reset_timing_wheel()
+        game_loop.reset_game_loop_state()
+
+    @staticmethod
+    def _manager(*map_ids):
+        return SimpleNamespace(
+            connections_by_map={map_id: {index: object()} for index, map_id in enumerate(map_ids)}
+        )
+
+    @staticmethod
+    async def _run_tick(manager):
+        # Tick 1 runs none of the periodic stages, only the map ticks
+        profiler = TickProfiler(tick=1, budget_seconds=10.0)
+        await asyncio.wait_for(
+            game_loop.run_game_tick(manager, 1, profiler, sync_to_database=False), timeout=5
+        )
+
+    @pytest.mark.asyncio
+    async def test_maps_run_concurrently(self, tick_state):
+        map_ids = ("map_a", "map_b", "map_c", "map_d")
+        # Only passable once every map is in flight at the same time
+        barrier = asyncio.Barrier(len(map_ids))
+        processed = []
+
+        async def fake_process_map_tick(map_id, map_connections, manager, current_tick, profiler):
+            await barrier.wait()
+            processed.append(map_id)
+
+        with patch.object(game_loop, "_process_map_tick", fake_process_map_tick):
+            await self._run_tick(self._manager(*map_ids))
+
+        assert sorted(processed) == sorted(map_ids)
+
+    @pytest.mark.asyncio
+    async def test_maps_without_players_are_skipped(self, tick_state):
+        processed = []
+
+        async def fake_process_map_tick(map_id, map_connections, manager, current_tick, profiler):
+            processed.append(map_id)
+
+        manager = self._manager("map_a")
+        manager.connections_by_map["empty_map"] = {}
+        with patch.object(game_loop, "_process_map_tick", fake_process_map_tick):
+            await self._run_tick(manager)
+
+        assert processed == ["map_a"]
+
+    @pytest.mark.asyncio
+    async def test_failing_map_does_not_cancel_other_maps(self, tick_state):
+        # The healthy maps are still waiting on each other when the broken one fails
+        barrier = asyncio.Barrier(2)
+        broken_failed = asyncio.Event()
+        processed = []
+
+        async def fake_process_map_tick(map_id, map_connections, manager, current_tick, profiler):
+            if map_id == "broken_map":
+                broken_failed.set()
+                raise RuntimeError("boom")
+            await broken_failed.wait()
+            await barrier.wait()
+            processed.append(map_id)
+
+        errors_before = game_loop_map_errors_total.labels(map_id="broken_map")._value.get()
+
+        with patch.object(game_loop, "_process_map_tick", fake_process_map_tick):
+            await self._run_tick(self._manager("map_a", "broken_map", "map_b"))
+
+        assert sorted(processed) == ["map_a", "map_b"]
+        errors_after = game_loop_map_errors_total.labels(map_id="broken_map")._value.get()
+        assert errors_after == errors_before + 1
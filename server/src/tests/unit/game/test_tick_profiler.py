@@ -0,0 +1,80 @@
+"""
+Unit tests for the TickProfiler used by the game loop.
+"""
+
+import logging
+import time
+
+from server.src.core.metrics import game_loop_overruns_total
+from server.src.game.tick_profiler import TickProfiler, GLOBAL_MAP_ID
+
+
+class TestTickProfiler:
+    """Tests for phase accumulation and overrun reporting."""
+
+    def test_phase_durations_are_accumulated_per_map(self):
+        """Repeated phases on the same map are summed into one entry."""
+        profiler = TickProfiler(tick=1, budget_seconds=10.0)
+
+        for _ in range(3):
+            with profiler.phase("player_fetch", "map_a"):
+                time.sleep(0.001)
+        with profiler.phase("player_fetch", "map_b"):
+            pass
+
+        breakdown = profiler.get_breakdown()
+
+        assert set(breakdown.keys()) == {"map_a", "map_b"}
+        assert breakdown["map_a"]["player_fetch"] >= 3.0
+        assert breakdown["map_b"]["player_fetch"] < breakdown["map_a"]["player_fetch"]
+
+    def test_phase_without_map_uses_global_label(self):
+        """Phases not tied to a map are grouped under the global label."""
+        profiler = TickProfiler(tick=1, budget_seconds=10.0)
+
+        with profiler.phase("db_sync"):
+            pass
+
+        assert "db_sync" in profiler.get_breakdown()[GLOBAL_MAP_ID]
+
+    def test_phase_recorded_when_block_raises(self):
+        """A failing phase is still timed."""
+        profiler = TickProfiler(tick=1, budget_seconds=10.0)
+
+        try:
+            with profiler.phase("ai", "map_a"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+        assert "ai" in profiler.get_breakdown()["map_a"]
+
+    def test_no_overrun_within_budget(self, caplog):
+        """Ticks within budget do not log or count an overrun."""
+        profiler = TickProfiler(tick=5, budget_seconds=10.0)
+        before = game_loop_overruns_total._value.get()
+
+        with caplog.at_level(logging.WARNING):
+            profiler.finish()
+
+        assert game_loop_overruns_total._value.get() == before
+        assert not [r for r in caplog.records if r.getMessage() == "Tick overrun"]
+
+    def test_overrun_logs_phase_breakdown(self, caplog):
+        """Ticks over budget emit a structured overrun record with phases."""
+        profiler = TickProfiler(tick=7, budget_seconds=0.001)
+        before = game_loop_overruns_total._value.get()
+
+        with profiler.phase("visibility", "map_a"):
+            time.sleep(0.005)
+
+        with caplog.at_level(logging.WARNING):
+            duration = profiler.finish()
+
+        assert duration > 0.001
+        assert game_loop_overruns_total._value.get() == before + 1
+
+        records = [r for r in caplog.records if r.getMessage() == "Tick overrun"]
+        assert len(records) == 1
+        assert records[0].tick == 7
+        assert "visibility" in records[0].phases["map_a"]
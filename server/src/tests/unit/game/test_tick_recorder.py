@@ -0,0 +1,78 @@
+"""
+Unit tests for the TickRecorder used for offline tick replay.
+"""
+
+import random
+
+from common.src.protocol import MessageType, PROTOCOL_VERSION, WSMessage
+from server.src.game.tick_recorder import (
+    FRAME_HEADER,
+    FRAME_TICK,
+    INPUT_COMMAND,
+    INPUT_CONNECT,
+    INPUT_DISCONNECT,
+    TickRecorder,
+    read_tick_recording,
+)
+
+
+def _move(direction: str) -> WSMessage:
+    return WSMessage(
+        id="1",
+        type=MessageType.CMD_MOVE,
+        payload={"direction": direction},
+        version=PROTOCOL_VERSION,
+    )
+
+
+class TestTickRecorder:
+    """Tests for recording frames and reading them back."""
+
+    def test_frames_round_trip(self, tmp_path):
+        path = str(tmp_path / "ticks.bin")
+        recorder = TickRecorder(path)
+
+        recorder.record_connect(1, "alice", "samplemap", 10, 12, 8, 10)
+        recorder.record_command(1, _move("UP"))
+        recorder.record_outbound(1, b"\x81\xa1a\x01")
+        recorder.end_tick(7, 0.0125, {"samplemap": {"ai": 1.5}})
+        recorder.record_disconnect(1)
+        recorder.end_tick(8, 0.001, {})
+        recorder.close()
+
+        header, first, second = list(read_tick_recording(path))
+        assert header["kind"] == FRAME_HEADER
+        assert first["kind"] == FRAME_TICK
+        assert first["tick"] == 7
+        assert [i["kind"] for i in first["inputs"]] == [INPUT_CONNECT, INPUT_COMMAND]
+        assert first["inputs"][1]["message"]["payload"] == {"direction": "UP"}
+        assert WSMessage(**first["inputs"][1]["message"]).type == MessageType.CMD_MOVE
+        assert first["outbound"] == [[1, b"\x81\xa1a\x01"]]
+        assert first["duration_ms"] == 12.5
+        assert first["phases"] == {"samplemap": {"ai": 1.5}}
+        assert second["inputs"] == [{"kind": INPUT_DISCONNECT, "player_id": 1}]
+        assert second["outbound"] == []
+
+    def test_recorded_seed_reproduces_random_draws(self, tmp_path):
+        path = str(tmp_path / "ticks.bin")
+        recorder = TickRecorder(path)
+        drawn = [random.randint(0, 1000) for _ in range(5)]
+        recorder.end_tick(1, 0.0, {})
+        recorder.close()
+
+        frame = list(read_tick_recording(path))[1]
+        random.seed(frame["seed"])
+        assert [random.randint(0, 1000) for _ in range(5)] == drawn
+
+    def test_truncated_last_frame_is_ignored(self, tmp_path):
+        path = tmp_path / "ticks.bin"
+        recorder = TickRecorder(str(path))
+        recorder.end_tick(1, 0.0, {})
+        recorder.record_outbound(1, b"x" * 100)
+        recorder.end_tick(2, 0.0, {})
+        recorder.close()
+
+        path.write_bytes(path.read_bytes()[:-20])
+
+        frames = list(read_tick_recording(str(path)))
+        assert [frame.get("tick") for frame in frames] == [None, 1]
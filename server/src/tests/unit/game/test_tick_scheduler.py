@@ -0,0 +1,98 @@
+"""
+Unit tests for the deadline-based TickScheduler used by the game loop.
+"""
+
+import pytest
+
+from server.src.core.config import Settings
+from server.src.game.tick_scheduler import TickOverrunPolicy, TickScheduler
+
+MS = 1_000_000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def _scheduler(policy=TickOverrunPolicy.CATCH_UP, max_catch_up_ticks=5):
+    clock = FakeClock()
+    scheduler = TickScheduler(
+        tick_interval=0.05,
+        overrun_policy=policy,
+        max_catch_up_ticks=max_catch_up_ticks,
+        clock=clock,
+    )
+    scheduler.begin_tick()
+    return scheduler, clock
+
+
+class TestTickScheduler:
+    """Tests for deadline tracking and overrun policies."""
+
+    def test_sleeps_until_absolute_deadline(self):
+        scheduler, clock = _scheduler()
+
+        clock.now = 10 * MS
+        assert scheduler.schedule_next_tick() == pytest.approx(0.040)
+
+        # Oversleeping by 5ms is taken off the following wait
+        clock.now = 55 * MS
+        assert scheduler.begin_tick() == pytest.approx(0.005)
+        clock.now = 60 * MS
+        assert scheduler.schedule_next_tick() == pytest.approx(0.040)
+
+    def test_catch_up_runs_late_ticks_back_to_back(self):
+        scheduler, clock = _scheduler()
+
+        clock.now = 120 * MS
+        assert scheduler.schedule_next_tick() == 0.0
+        assert scheduler.schedule_next_tick() == 0.0
+        assert scheduler.schedule_next_tick() == pytest.approx(0.030)
+        assert scheduler.skipped_ticks == 0
+
+    def test_catch_up_skips_backlog_beyond_limit(self):
+        scheduler, clock = _scheduler(max_catch_up_ticks=2)
+
+        # Next deadline is 50ms; 500ms is 9 further deadlines behind
+        clock.now = 500 * MS
+        assert scheduler.schedule_next_tick() == 0.0
+
+        assert scheduler.skipped_ticks == 7
+
+    def test_skip_policy_realigns_to_schedule(self):
+        scheduler, clock = _scheduler(policy=TickOverrunPolicy.SKIP)
+
+        clock.now = 120 * MS
+        assert scheduler.schedule_next_tick() == 0.0
+        assert scheduler.skipped_ticks == 1
+        assert scheduler.schedule_next_tick() == pytest.approx(0.030)
+
+    def test_reset_forgets_backlog(self):
+        scheduler, clock = _scheduler()
+
+        clock.now = 1000 * MS
+        scheduler.reset()
+
+        assert scheduler.begin_tick() == 0.0
+        assert scheduler.schedule_next_tick() == pytest.approx(0.050)
+
+
+class TestTickSchedulerSettings:
+    """Invalid tick scheduler settings fail when the settings load."""
+
+    def test_allowed_policies_match_the_enum(self):
+        assert set(Settings.TICK_OVERRUN_POLICIES) == {policy.value for policy in TickOverrunPolicy}
+
+    def test_unknown_policy_is_rejected(self):
+        with pytest.raises(ValueError, match="catch_up, skip"):
+            Settings(TICK_OVERRUN_POLICY="catchup")
+
+    def test_negative_catch_up_limit_is_rejected(self):
+        with pytest.raises(ValueError, match="max_catch_up_ticks"):
+            Settings(TICK_MAX_CATCH_UP_TICKS=-1)
+
+        assert Settings(TICK_MAX_CATCH_UP_TICKS=0).TICK_MAX_CATCH_UP_TICKS == 0
@@ -0,0 +1,127 @@
+"""
+Unit tests for the hierarchical timing wheel.
+"""
+
+import asyncio
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from server.src.game import game_loop
+from server.src.game.timing_wheel import TimingWheel, get_timing_wheel, reset_timing_wheel
+from server.src.services.game_state.entity_manager import EntityManager
+
+
+def _fire_order(wheel, until_tick):
+    fired = []
+    for tick in range(wheel.current_tick + 1, until_tick + 1):
+        for handle in wheel.advance(tick):
+            fired.append((tick, handle.args[0]))
+    return fired
+
+
+class TestTimingWheel:
+    """Tests for scheduling, cascading and cancellation."""
+
+    def test_timers_fire_on_their_tick_across_levels(self):
+        wheel = TimingWheel()
+        due_ticks = [1, 63, 64, 65, 4095, 4096, 4097, 70000, 300000]
+        for due in due_ticks:
+            wheel.schedule_at(due, lambda _: None, due)
+
+        fired = _fire_order(wheel, 300000)
+
+        assert fired == [(due, due) for due in due_ticks]
+        assert len(wheel) == 0
+
+    def test_random_schedule_from_arbitrary_start(self):
+        rng = random.Random(7)
+        wheel = TimingWheel(current_tick=12345)
+        due_ticks = [12345 + rng.randint(1, 20000) for _ in range(200)]
+        for due in due_ticks:
+            wheel.schedule_at(due, lambda _: None, due)
+
+        fired = _fire_order(wheel, 12345 + 20000)
+
+        assert all(tick == due for tick, due in fired)
+        assert sorted(due for _, due in fired) == sorted(due_ticks)
+
+    def test_cancelled_and_past_timers(self):
+        wheel = TimingWheel(current_tick=10)
+        cancelled = wheel.schedule_at(20, lambda _: None, "cancelled")
+        wheel.schedule_at(5, lambda _: None, "past")
+        cancelled.cancel()
+
+        assert [h.args[0] for h in wheel.advance(11)] == ["past"]
+        assert wheel.advance(30) == []
+        assert len(wheel) == 0
+
+    @pytest.mark.asyncio
+    async def test_run_due_awaits_callbacks_and_isolates_errors(self):
+        wheel = TimingWheel()
+        calls = []
+
+        async def record(value):
+            calls.append(value)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        wheel.schedule_at(2, fail)
+        wheel.schedule_at(2, record, "ok")
+
+        assert await wheel.run_due(2) == 2
+        assert calls == ["ok"]
+
+    @pytest.mark.asyncio
+    async def test_sleep_resumes_when_wheel_advances(self):
+        wheel = TimingWheel()
+        sleeper = asyncio.create_task(wheel.sleep(3))
+
+        await asyncio.sleep(0)
+        await wheel.run_due(2)
+        await asyncio.sleep(0)
+        assert not sleeper.done()
+
+        await wheel.run_due(3)
+        await asyncio.sleep(0)
+        assert sleeper.done()
+
+
+class TestDyingEntityTimers:
+    """Dying entities get their death timer back when the game loop starts."""
+
+    @pytest.fixture
+    def entity_mgr(self, fake_valkey):
+        manager = EntityManager(valkey_client=fake_valkey)
+        manager.finalize_entity_death = AsyncMock(wraps=manager.finalize_entity_death)
+        map_manager = MagicMock(maps={"samplemap": None})
+        reset_timing_wheel(100)
+        with patch.object(game_loop, "get_entity_manager", return_value=manager), \
+                patch.object(game_loop, "get_map_manager", return_value=map_manager):
+            yield manager
+        reset_timing_wheel()
+
+    async def _spawn(self, entity_mgr):
+        return await entity_mgr.spawn_entity_instance(
+            entity_id=2, map_id="samplemap", x=3, y=4, current_hp=10, max_hp=10
+        )
+
+    @pytest.mark.asyncio
+    async def test_entities_left_dying_are_finalized(self, entity_mgr):
+        alive = await self._spawn(entity_mgr)
+        # death_tick of a previous process, far beyond the current tick
+        stale = await self._spawn(entity_mgr)
+        await entity_mgr.mark_entity_dying(stale, death_tick=500000)
+        # Died just before the loop restarted, animation still running
+        recent = await self._spawn(entity_mgr)
+        await entity_mgr.mark_entity_dying(recent, death_tick=105)
+
+        assert await game_loop.rearm_dying_entities(100) == 2
+
+        await get_timing_wheel().run_due(101)
+        entity_mgr.finalize_entity_death.assert_awaited_once_with(stale)
+        await get_timing_wheel().run_due(105)
+        assert [c.args[0] for c in entity_mgr.finalize_entity_death.await_args_list] == [stale, recent]
+        assert alive not in [c.args[0] for c in entity_mgr.finalize_entity_death.await_args_list]
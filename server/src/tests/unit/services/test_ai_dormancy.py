@@ -0,0 +1,82 @@
+"""
+Unit tests for interest-based entity AI activation.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from server.src.core.entities import EntityState
+from server.src.schemas.player import AnimationState, Direction, NearbyPlayer
+from server.src.services.ai_service import AIService
+from server.src.services.game_state.spatial_index import CHUNK_SIZE
+
+
+def _player(x, y):
+    return NearbyPlayer(
+        player_id=1,
+        username="player",
+        x=x,
+        y=y,
+        direction=Direction.SOUTH,
+        animation_state=AnimationState.IDLE,
+    )
+
+
+def _entity(instance_id, x, y, state=EntityState.IDLE):
+    return {"instance_id": instance_id, "x": x, "y": y, "state": state.value}
+
+
+@pytest.fixture(autouse=True)
+def reset_ai_timers():
+    AIService.reset_all_timers()
+    yield
+    AIService.reset_all_timers()
+
+
+class TestAIDormancy:
+    """Tests for putting entities far from players to sleep."""
+
+    @pytest.mark.asyncio
+    async def test_only_entities_near_players_stay_active(self):
+        entity_mgr = AsyncMock()
+        far = 3 * CHUNK_SIZE
+        entities = [
+            _entity(1, 5, 5),
+            _entity(2, 2 * CHUNK_SIZE, 0),
+            _entity(3, far, 0),
+            _entity(4, far, far, state=EntityState.COMBAT),
+        ]
+
+        active = await AIService._split_dormant_entities(
+            entity_mgr, "map", entities, [_player(1, 1)], wake_radius_chunks=2
+        )
+
+        assert [entity["instance_id"] for entity in active] == [1, 2, 4]
+        assert AIService._dormant_entities == {3}
+
+    @pytest.mark.asyncio
+    async def test_wandering_entity_goes_idle_when_dormant_and_wakes(self):
+        entity_mgr = AsyncMock()
+        AIService._entity_timers[1] = {"idle_timer": 0, "wander_target": (9, 9)}
+        entity = _entity(1, 5 * CHUNK_SIZE, 0, state=EntityState.WANDER)
+
+        active = await AIService._split_dormant_entities(
+            entity_mgr, "map", [entity], [_player(0, 0)], wake_radius_chunks=1
+        )
+
+        assert active == []
+        entity_mgr.set_entity_state.assert_awaited_once_with(1, EntityState.IDLE)
+        assert AIService._entity_timers[1]["wander_target"] is None
+
+        # Still dormant next tick: no further state writes
+        await AIService._split_dormant_entities(
+            entity_mgr, "map", [entity], [_player(0, 0)], wake_radius_chunks=1
+        )
+        entity_mgr.set_entity_state.assert_awaited_once()
+
+        active = await AIService._split_dormant_entities(
+            entity_mgr, "map", [entity], [_player(5 * CHUNK_SIZE, 0)], wake_radius_chunks=1
+        )
+        assert active == [entity]
+        assert AIService._dormant_entities == set()
@@ -0,0 +1,109 @@
+"""
+Unit tests for the auto-attack schedule kept by PlayerStateManager.
+"""
+
+import pytest
+
+from server.src.core.config import settings
+from server.src.services.game_state.combat_scheduler import (
+    CombatScheduler,
+    attack_interval_ticks,
+    next_attack_tick,
+)
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+
+
+class TestCombatScheduler:
+    """Tests for ordering and claiming due attackers."""
+
+    def test_only_due_players_are_collected(self):
+        scheduler = CombatScheduler()
+        scheduler.schedule(1, 10)
+        scheduler.schedule(2, 20)
+
+        assert scheduler.collect_due(9) == 0
+        assert scheduler.collect_due(10) == 1
+        assert scheduler.take_due() == [1]
+        assert 1 not in scheduler
+        assert scheduler.get_next_attack_tick(2) == 20
+
+    def test_rescheduled_entry_is_skipped(self):
+        scheduler = CombatScheduler()
+        scheduler.schedule(1, 10)
+        scheduler.schedule(1, 30)
+
+        scheduler.collect_due(10)
+        assert scheduler.take_due() == []
+        scheduler.collect_due(30)
+        assert scheduler.take_due() == [1]
+
+    def test_maps_claim_their_own_players(self):
+        scheduler = CombatScheduler()
+        scheduler.schedule(1, 5)
+        scheduler.schedule(2, 5)
+        scheduler.collect_due(5)
+
+        assert scheduler.take_due({1, 3}) == [1]
+        # Unclaimed players stay due until a map claims them
+        scheduler.collect_due(6)
+        assert scheduler.take_due({2}) == [2]
+
+    def test_unschedule_drops_due_player(self):
+        scheduler = CombatScheduler()
+        scheduler.schedule(1, 5)
+        scheduler.collect_due(5)
+        scheduler.unschedule(1)
+
+        assert scheduler.take_due() == []
+        assert len(scheduler) == 0
+
+    def test_next_attack_tick_from_combat_state(self):
+        state = {"last_attack_tick": 100, "attack_speed": 2.4}
+
+        assert attack_interval_ticks(state) == int(2.4 * settings.GAME_TICK_RATE)
+        assert next_attack_tick(state) == 100 + attack_interval_ticks(state)
+        assert next_attack_tick({"target_id": 1}) == 0
+
+
+class TestPlayerStateManagerSchedule:
+    """Combat state writes keep the schedule in step."""
+
+    @pytest.mark.asyncio
+    async def test_set_and_clear_combat_state(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        combat_state = {
+            "target_type": "entity",
+            "target_id": 3,
+            "last_attack_tick": 40,
+            "attack_speed": 3.0,
+        }
+
+        await player_mgr.set_player_combat_state(1, combat_state)
+        assert player_mgr.combat_scheduler.get_next_attack_tick(1) == next_attack_tick(combat_state)
+
+        await player_mgr.clear_player_combat_state(1)
+        assert 1 not in player_mgr.combat_scheduler
+
+    @pytest.mark.asyncio
+    async def test_persisted_combat_resumes_on_attach(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        await fake_valkey.hset("player:1", {"x": "1", "y": "1"})
+        await fake_valkey.hset("player_combat:1", {"target_id": "3", "last_attack_tick": "900"})
+
+        await player_mgr.register_online_player(1, "player1")
+        await player_mgr.attach_hot_state(1)
+
+        player_mgr.combat_scheduler.collect_due(0)
+        assert player_mgr.combat_scheduler.take_due() == [1]
+
+    @pytest.mark.asyncio
+    async def test_detach_unschedules(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        await fake_valkey.hset("player:1", {"x": "1", "y": "1"})
+        await player_mgr.register_online_player(1, "player1")
+        await player_mgr.attach_hot_state(1)
+        await player_mgr.set_player_combat_state(1, {"target_id": 3, "last_attack_tick": 0})
+
+        await player_mgr.detach_hot_state(1)
+
+        assert 1 not in player_mgr.combat_scheduler
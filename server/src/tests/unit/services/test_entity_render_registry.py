@@ -0,0 +1,55 @@
+"""
+Unit tests for the precomputed entity render descriptors.
+"""
+
+from server.src.core.humanoids import HumanoidID
+from server.src.core.monsters import MonsterID
+from server.src.game.game_loop import _build_npc_entity_payload
+from server.src.services.entity_render_registry import EntityRenderRegistry
+from server.src.services.visual_state_service import VisualStateService
+
+
+class TestEntityRenderRegistry:
+    """Tests for descriptor contents and lookups."""
+
+    def test_covers_every_definition_case_insensitively(self):
+        registry = EntityRenderRegistry()
+
+        assert len(registry) == len({e.name for e in list(MonsterID) + list(HumanoidID)})
+        assert registry.get("giant_rat") is registry.get("GIANT_RAT")
+        assert registry.get("NOT_AN_ENTITY") is None
+
+    def test_monster_descriptor(self):
+        definition = MonsterID.GIANT_RAT.value
+        descriptor = EntityRenderRegistry().get("GIANT_RAT")
+
+        assert descriptor.display_name == definition.display_name
+        assert descriptor.behavior_type == definition.behavior.name
+        assert descriptor.sprite_sheet_id == definition.sprite_sheet_id
+        assert descriptor.visual_state is None
+
+    def test_humanoid_descriptor_matches_visual_state_service(self):
+        humanoid = next(iter(HumanoidID))
+        definition = humanoid.value
+        descriptor = EntityRenderRegistry().get(humanoid.name)
+
+        appearance = definition.appearance.to_dict() if definition.appearance else None
+        equipped = {
+            slot.value: item.value.equipped_sprite_id
+            for slot, item in (definition.equipped_items or {}).items()
+            if item.value.equipped_sprite_id
+        } or None
+        expected = VisualStateService._build_visual_state(appearance, equipped)
+
+        assert descriptor.visual_hash == expected.compute_hash()
+        assert descriptor.visual_state == expected.to_dict()
+
+    def test_dying_entities_are_not_attackable(self):
+        entity = {
+            "instance_id": 1,
+            "entity_name": "GIANT_RAT",
+            "entity_type": "monster",
+            "state": "dying",
+        }
+
+        assert _build_npc_entity_payload(entity)["is_attackable"] is False
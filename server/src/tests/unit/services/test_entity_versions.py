@@ -0,0 +1,68 @@
+"""
+Unit tests for version-stamped visibility diffs.
+"""
+
+import pytest
+
+from server.src.services.visibility_service import EntityVersionTracker, VisibilityService
+
+
+class TestEntityVersionTracker:
+    """Tests for EntityVersionTracker."""
+
+    def test_version_is_stable_for_equal_payloads(self):
+        tracker = EntityVersionTracker()
+
+        first = tracker.stamp("entity_1", {"x": 1})
+
+        assert tracker.stamp("entity_1", {"x": 1}) == first
+        assert tracker.stamp("entity_1", {"x": 2}) > first
+
+    def test_versions_are_never_reused_after_prune(self):
+        tracker = EntityVersionTracker()
+        old_version = tracker.stamp("entity_1", {"x": 1})
+
+        tracker.prune_unseen()
+        assert tracker.prune_unseen() == 1
+
+        assert tracker.stamp("entity_1", {"x": 1}) > old_version
+
+    def test_prune_keeps_entities_seen_since_last_prune(self):
+        tracker = EntityVersionTracker()
+        tracker.stamp("entity_1", {"x": 1})
+        tracker.stamp("entity_2", {"x": 1})
+        tracker.prune_unseen()
+
+        tracker.stamp("entity_1", {"x": 1})
+
+        assert tracker.prune_unseen() == 1
+        assert len(tracker) == 1
+
+
+class TestVersionedVisibilityDiff:
+    """Tests for VisibilityService diffs driven by versions."""
+
+    @pytest.mark.asyncio
+    async def test_shared_payload_counts_once_for_all_viewers(self):
+        service = VisibilityService(max_cache_size=10)
+        payload = {"id": "entity_1", "x": 1}
+
+        await service.update_player_visible_entities(1, {"entity_1": payload})
+        await service.update_player_visible_entities(2, {"entity_1": payload})
+
+        moved = {"id": "entity_1", "x": 2}
+        diff_1 = await service.update_player_visible_entities(1, {"entity_1": moved})
+        diff_2 = await service.update_player_visible_entities(2, {"entity_1": moved})
+
+        assert diff_1["updated"] == [moved]
+        assert diff_2["updated"] == [moved]
+        assert await service.get_player_visible_entities(1) == await service.get_player_visible_entities(2)
+
+    @pytest.mark.asyncio
+    async def test_explicit_versions_override_stamping(self):
+        service = VisibilityService(max_cache_size=10)
+
+        await service.update_player_visible_entities(1, {"item": {"x": 1}}, versions={"item": 7})
+        diff = await service.update_player_visible_entities(1, {"item": {"x": 99}}, versions={"item": 7})
+
+        assert diff["updated"] == []
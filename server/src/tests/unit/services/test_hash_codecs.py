@@ -0,0 +1,132 @@
+"""
+Unit tests for typed Valkey hash field codecs.
+"""
+
+import json
+
+import msgpack
+import pytest
+
+from server.src.services.game_state.entity_manager import EntityManager
+from server.src.services.game_state.hash_codecs import (
+    FieldType,
+    HashSchema,
+    decode_value,
+    encode_value,
+    is_packed,
+)
+from server.src.services.game_state.inventory_manager import InventoryManager
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+
+
+class TestFieldCodecs:
+    """Tests for encoding and decoding single fields."""
+
+    def test_scalars_keep_text_form(self):
+        assert encode_value(12, FieldType.INT) == "12"
+        assert encode_value(None, FieldType.INT) == "None"
+        assert encode_value(True, FieldType.BOOL) == "True"
+
+    def test_typed_decode(self):
+        assert decode_value(b"12", FieldType.INT) == 12
+        assert decode_value(b"2.5", FieldType.FLOAT) == 2.5
+        assert decode_value(b"False", FieldType.BOOL) is False
+        assert decode_value(b"None", FieldType.INT) is None
+        # Strings that look like JSON stay strings
+        assert decode_value(b"123", FieldType.STR) == "123"
+
+    def test_packed_round_trip(self):
+        value = {"item_id": 3, "quantity": 2, "tags": ["a"]}
+        encoded = encode_value(value, FieldType.PACKED)
+
+        assert is_packed(encoded)
+        assert decode_value(encoded, FieldType.PACKED) == value
+
+    def test_legacy_json_is_still_read(self):
+        legacy = json.dumps({"item_id": 3}).encode()
+
+        assert not is_packed(legacy)
+        assert decode_value(legacy, FieldType.PACKED) == {"item_id": 3}
+        assert decode_value(legacy, None) == {"item_id": 3}
+
+    def test_text_starting_with_marker_bytes_is_not_unpacked(self):
+        # U+0710 encodes as 0xDC 0x90, the msgpack array16 marker
+        text = "\u0710bc"
+
+        assert decode_value(text.encode(), FieldType.STR) == text
+        assert decode_value(text.encode(), None) == text
+        assert decode_value(encode_value(text, FieldType.PACKED), FieldType.PACKED) == text
+
+    def test_int_field_written_as_float(self):
+        assert decode_value(b"12.0", FieldType.INT) == 12.0
+
+    def test_schema_default_applies_to_unlisted_fields(self):
+        schema = HashSchema({"x": FieldType.INT}, default=FieldType.PACKED)
+
+        assert schema.field_type("x") is FieldType.INT
+        assert schema.field_type("7") is FieldType.PACKED
+        assert HashSchema({"x": FieldType.INT}).field_type("7") is None
+
+
+class TestManagerHashes:
+    """Managers read and write their hashes through the schemas."""
+
+    @pytest.mark.asyncio
+    async def test_player_hash_round_trip(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        appearance = {"body_type": "male", "hair_color": "#ffffff"}
+        state = {"x": 4, "y": 5, "map_id": "101", "current_hp": 9, "appearance": appearance}
+
+        await player_mgr._cache_in_valkey("player:1", state, 0)
+        stored = fake_valkey.get_hash_data("player:1")
+
+        assert stored["x"] == "4"
+        assert msgpack.unpackb(stored["appearance"]) == appearance
+        assert await player_mgr._get_from_valkey("player:1") == state
+        assert player_mgr._as_cached("player:{player_id}", state) == state
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("username", ["\u0700x", "\u0710bc", "\u07ff\u0780z"])
+    async def test_non_ascii_username_round_trip(self, fake_valkey, username):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        state = {"player_id": 1, "username": username, "x": 4, "y": 5}
+
+        encoded = player_mgr._encode_hash("player:1", state)
+        raw = {field.encode(): value.encode() for field, value in encoded.items()}
+
+        assert player_mgr._decode_hash(raw, "player:1") == state
+        await player_mgr._cache_in_valkey("player:1", state, 0)
+        assert (await player_mgr.get_many_full_states([1]))[1]["username"] == username
+
+    @pytest.mark.asyncio
+    async def test_combat_state_bool(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        await player_mgr._cache_in_valkey("player_combat:1", {"auto_retaliate": False}, 0)
+
+        assert await player_mgr._get_from_valkey("player_combat:1") == {"auto_retaliate": False}
+
+    @pytest.mark.asyncio
+    async def test_entity_instance_fields_are_typed(self, fake_valkey):
+        entity_mgr = EntityManager(valkey_client=fake_valkey)
+        instance_id = await entity_mgr.spawn_entity_instance(
+            entity_id=2, map_id="samplemap", x=3, y=4, current_hp=10, max_hp=10
+        )
+
+        entity = await entity_mgr.get_entity_instance(instance_id)
+
+        assert entity["x"] == 3
+        assert entity["target_player_id"] is None
+        assert isinstance(entity["spawned_at"], float)
+        assert entity["facing_direction"] == "DOWN"
+
+    @pytest.mark.asyncio
+    async def test_rewrite_packed_fields(self, fake_valkey):
+        inventory_mgr = InventoryManager(valkey_client=fake_valkey)
+        slot = {"item_id": 1, "quantity": 5, "current_durability": None}
+        await fake_valkey.hset("inventory:1", {"0": json.dumps(slot)})
+
+        assert await inventory_mgr.rewrite_packed_fields() == 1
+        assert is_packed(fake_valkey.get_hash_data("inventory:1")["0"])
+        assert await inventory_mgr._get_from_valkey("inventory:1") == {"0": slot}
+        # Already migrated
+        assert await inventory_mgr.rewrite_packed_fields() == 0
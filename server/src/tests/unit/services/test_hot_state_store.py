@@ -0,0 +1,120 @@
+"""
+Unit tests for the in-process hot state store and PlayerStateManager read-through.
+"""
+
+import pytest
+
+from server.src.services.game_state.hot_state_store import HotStateStore
+from server.src.services.game_state.player_state_manager import (
+    PlayerStateManager,
+    DIRTY_POSITIONS_KEY,
+)
+
+
+class TestHotStateStore:
+    """Tests for attachment and dirty tracking."""
+
+    def test_update_ignored_for_detached_player(self):
+        store = HotStateStore()
+
+        store.update_state(1, {"x": 5})
+
+        assert not store.is_attached(1)
+        assert store.get_state(1) is None
+
+    def test_take_dirty_returns_only_changed_fields(self):
+        store = HotStateStore()
+        store.attach(1, {"x": 1, "y": 2, "username": "alice"})
+
+        store.update_state(1, {"x": 3})
+        state_writes, combat_writes = store.take_dirty()
+
+        assert state_writes == {1: {"x": 3}}
+        assert combat_writes == {}
+        assert not store.has_pending_writes(1)
+
+    def test_cleared_combat_state_is_flushed_as_none(self):
+        store = HotStateStore()
+        store.attach(1, {"x": 1}, {"target_id": 7})
+
+        store.set_combat_state(1, None)
+        _, combat_writes = store.take_dirty()
+
+        assert combat_writes == {1: None}
+
+    def test_restore_dirty_remarks_writes(self):
+        store = HotStateStore()
+        store.attach(1, {"x": 1})
+        store.update_state(1, {"x": 2})
+
+        writes = store.take_dirty()
+        store.restore_dirty(*writes)
+
+        assert store.has_pending_writes(1)
+
+    def test_returned_state_is_a_copy(self):
+        store = HotStateStore()
+        store.attach(1, {"x": 1})
+
+        store.get_state(1)["x"] = 99
+
+        assert store.get_state(1)["x"] == 1
+
+
+class TestPlayerStateManagerHotState:
+    """Tests for PlayerStateManager reads and writes while a player is attached."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_deferred_until_flush(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        await fake_valkey.hset("player:1", {"x": "1", "y": "1", "current_hp": "10", "max_hp": "10"})
+
+        await player_mgr.register_online_player(1, "player1")
+        assert await player_mgr.attach_hot_state(1)
+        await player_mgr.set_player_position(1, 4, 5, "samplemap")
+        await player_mgr.set_player_hp(1, 7)
+
+        # Reads are served from memory, Valkey is untouched
+        position = await player_mgr.get_player_position(1)
+        assert (position["x"], position["y"]) == (4, 5)
+        assert (await player_mgr.get_player_hp(1))["current_hp"] == 7
+        assert fake_valkey.get_hash_data("player:1")["x"] == "1"
+
+        assert await player_mgr.flush_hot_state() == 1
+
+        assert fake_valkey.get_hash_data("player:1")["x"] == "4"
+        assert fake_valkey.get_hash_data("player:1")["current_hp"] == "7"
+        assert "1" in fake_valkey.get_set_data(DIRTY_POSITIONS_KEY)
+
+    @pytest.mark.asyncio
+    async def test_combat_state_read_through(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        await fake_valkey.hset("player:1", {"x": "1", "y": "1"})
+        await player_mgr.register_online_player(1, "player1")
+        await player_mgr.attach_hot_state(1)
+
+        await player_mgr.set_player_combat_state(1, {"target_id": 3, "last_attack_tick": 0})
+
+        in_combat = await player_mgr.get_all_players_in_combat()
+        assert in_combat == [
+            {"player_id": 1, "combat_state": {"target_id": 3, "last_attack_tick": 0}}
+        ]
+
+        await player_mgr.clear_player_combat_state(1)
+        await player_mgr.flush_hot_state()
+
+        assert await player_mgr.get_player_combat_state(1) is None
+        assert fake_valkey.get_hash_data("player_combat:1") == {}
+
+    @pytest.mark.asyncio
+    async def test_detach_flushes_pending_writes(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        await fake_valkey.hset("player:1", {"x": "1", "y": "1"})
+        await player_mgr.register_online_player(1, "player1")
+        await player_mgr.attach_hot_state(1)
+
+        await player_mgr.set_player_position(1, 9, 9, "samplemap")
+        await player_mgr.detach_hot_state(1)
+
+        assert not player_mgr.hot_store.is_attached(1)
+        assert fake_valkey.get_hash_data("player:1")["x"] == "9"
@@ -0,0 +1,336 @@
+"""
+Unit tests for map ownership, the gateway <-> map worker transport and the
+broadcast relay between workers.
+"""
+
+import asyncio
+import socket
+from unittest.mock import patch
+
+import msgpack
+import pytest
+import pytest_asyncio
+from fastapi import WebSocketDisconnect, status
+from glide import PubSubMsg
+from starlette.websockets import WebSocketState
+
+from server.src import gateway, shard_worker
+from server.src.api.broadcast_relay import BROADCAST_RELAY_CHANNEL, BroadcastRelay
+from server.src.api.connection_manager import ConnectionManager
+from server.src.api.shard_transport import (
+    FRAME_CLOSE,
+    FRAME_DATA,
+    SHARD_HANDOFF_CLOSE_CODE,
+    StreamWebSocket,
+    decode_close_code,
+    encode_close_frame,
+    encode_frame,
+    encode_session_frame,
+    read_frame,
+    read_session,
+)
+from server.src.core.config import settings
+from server.src.game.map_shards import owned_map_ids, owns_map, shard_for_map
+from common.src.protocol import MessageType, WSMessage
+
+
+@pytest.fixture
+def two_workers(monkeypatch):
+    monkeypatch.setattr(settings, "SHARD_WORKERS", 2)
+    monkeypatch.setattr(settings, "SHARD_INDEX", 0)
+    monkeypatch.setattr(settings, "SHARD_MAP_ASSIGNMENTS", {"town": 0, "dungeon": 1})
+
+
+class TestMapShards:
+    """Tests for assigning maps to workers."""
+
+    def test_single_process_owns_every_map(self, monkeypatch):
+        monkeypatch.setattr(settings, "SHARD_WORKERS", 1)
+        assert owns_map("anything")
+        assert owned_map_ids(["town", "dungeon"]) is None
+
+    def test_configured_assignments(self, two_workers):
+        assert shard_for_map("town") == 0
+        assert shard_for_map("dungeon") == 1
+        assert owns_map("town")
+        assert not owns_map("dungeon")
+        assert owned_map_ids(["town", "dungeon"]) == {"town"}
+
+    def test_unassigned_maps_hash_stably(self, two_workers):
+        first = shard_for_map("forest")
+        assert first in (0, 1)
+        assert all(shard_for_map("forest") == first for _ in range(10))
+
+
+@pytest_asyncio.fixture
+async def streams():
+    """(reader, writer) of the gateway and of the worker end of a connection."""
+    gateway_sock, worker_sock = socket.socketpair()
+    gateway = await asyncio.open_connection(sock=gateway_sock)
+    worker = await asyncio.open_connection(sock=worker_sock)
+    yield gateway, worker
+    for _, writer in (gateway, worker):
+        writer.close()
+
+
+class TestShardTransport:
+    """Tests for frames and the StreamWebSocket adapter."""
+
+    def test_close_code_round_trip(self):
+        frame = encode_close_frame(SHARD_HANDOFF_CLOSE_CODE)
+        assert frame[0] == FRAME_CLOSE
+        assert decode_close_code(frame[5:]) == SHARD_HANDOFF_CLOSE_CODE
+
+    @pytest.mark.asyncio
+    async def test_messages_relay_both_ways(self, streams):
+        (gateway_reader, gateway_writer), (worker_reader, worker_writer) = streams
+        websocket = StreamWebSocket(worker_reader, worker_writer)
+        await websocket.accept()
+
+        gateway_writer.write(encode_frame(FRAME_DATA, b"\x81\xa1a\x01"))
+        assert await websocket.receive_bytes() == b"\x81\xa1a\x01"
+
+        await websocket.send_bytes(b"state")
+        assert await read_frame(gateway_reader) == (FRAME_DATA, b"state")
+
+    @pytest.mark.asyncio
+    async def test_gateway_close_ends_session(self, streams):
+        (_, gateway_writer), (worker_reader, worker_writer) = streams
+        websocket = StreamWebSocket(worker_reader, worker_writer)
+        await websocket.accept()
+
+        gateway_writer.write(encode_close_frame(1001))
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            await websocket.receive_bytes()
+        assert exc_info.value.code == 1001
+        assert websocket.client_state == WebSocketState.DISCONNECTED
+
+    @pytest.mark.asyncio
+    async def test_handoff_close_is_sent_on_finish(self, streams):
+        (gateway_reader, _), (worker_reader, worker_writer) = streams
+        websocket = StreamWebSocket(worker_reader, worker_writer)
+        await websocket.accept()
+
+        # close() wakes the endpoint's pending receive ...
+        receive = asyncio.create_task(websocket.receive_bytes())
+        await asyncio.sleep(0)
+        await websocket.close(code=SHARD_HANDOFF_CLOSE_CODE)
+        with pytest.raises(WebSocketDisconnect):
+            await receive
+        with pytest.raises(RuntimeError):
+            await websocket.send_bytes(b"late")
+
+        # ... and the gateway only learns about it once the session finished
+        await websocket.finish()
+        kind, payload = await read_frame(gateway_reader)
+        assert kind == FRAME_CLOSE
+        assert decode_close_code(payload) == SHARD_HANDOFF_CLOSE_CODE
+        assert await read_frame(gateway_reader) is None
+
+    @pytest.mark.asyncio
+    async def test_session_frame_round_trip(self, streams):
+        (_, gateway_writer), (worker_reader, _) = streams
+
+        gateway_writer.write(encode_session_frame(42))
+        assert await read_session(worker_reader) == 42
+
+        gateway_writer.write(encode_frame(FRAME_DATA, b"token"))
+        assert await read_session(worker_reader) is None
+
+    @pytest.mark.asyncio
+    async def test_worker_requires_a_session_frame(self, streams):
+        (gateway_reader, gateway_writer), (worker_reader, worker_writer) = streams
+        sessions = []
+
+        async def fake_endpoint(websocket, valkey):
+            sessions.append(websocket.gateway_player_id)
+
+        with patch.object(shard_worker, "websocket_endpoint", fake_endpoint):
+            gateway_writer.write(encode_frame(FRAME_DATA, b"token"))
+            await shard_worker._serve_gateway_connection(worker_reader, worker_writer, None)
+
+        assert sessions == []
+        kind, payload = await read_frame(gateway_reader)
+        assert kind == FRAME_CLOSE
+        assert decode_close_code(payload) == status.WS_1008_POLICY_VIOLATION
+
+
+class FakeClientWebSocket:
+    """Client side of the gateway: sends its auth message, then idles."""
+
+    def __init__(self, auth_bytes: bytes):
+        self._incoming = [auth_bytes]
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def receive_bytes(self):
+        if self._incoming:
+            return self._incoming.pop(0)
+        await asyncio.Event().wait()
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=status.WS_1000_NORMAL_CLOSURE):
+        self.close_code = code
+
+
+class TestGatewayHandoff:
+    """The gateway moves players between workers without their token."""
+
+    @pytest.mark.asyncio
+    async def test_handoff_after_token_expiry(self, tmp_path):
+        player_id = 7
+        sessions = []
+
+        async def serve(index, reader, writer):
+            sessions.append((index, await read_session(reader)))
+            if index == 0:
+                # The player walked onto a map of worker 1
+                writer.write(encode_close_frame(SHARD_HANDOFF_CLOSE_CODE))
+            else:
+                writer.write(encode_frame(FRAME_DATA, b"welcome"))
+                writer.write(encode_close_frame(status.WS_1000_NORMAL_CLOSURE))
+            await writer.drain()
+            writer.close()
+
+        servers = [
+            await asyncio.start_unix_server(
+                lambda reader, writer, index=index: serve(index, reader, writer),
+                path=str(tmp_path / f"worker-{index}.sock"),
+            )
+            for index in (0, 1)
+        ]
+
+        validations = []
+
+        async def authenticate_once(auth_message):
+            # The token expires right after login: validating it again fails
+            validations.append(auth_message.payload["token"])
+            if len(validations) > 1:
+                raise WebSocketDisconnect(code=status.WS_1008_POLICY_VIOLATION)
+            return "hero", player_id
+
+        maps = iter(["town", "dungeon"])
+
+        async def load_player_map(_player_id):
+            return next(maps)
+
+        auth_bytes = msgpack.packb(
+            WSMessage(type=MessageType.CMD_AUTHENTICATE, payload={"token": "jwt"}).model_dump()
+        )
+        websocket = FakeClientWebSocket(auth_bytes)
+
+        try:
+            with patch.object(gateway, "authenticate_player", authenticate_once), \
+                    patch.object(gateway, "_load_player_map", load_player_map), \
+                    patch.object(gateway, "shard_for_map", {"town": 0, "dungeon": 1}.get), \
+                    patch.object(
+                        gateway, "worker_socket_path",
+                        lambda index: str(tmp_path / f"worker-{index}.sock"),
+                    ):
+                await asyncio.wait_for(gateway.gateway_endpoint(websocket), timeout=5)
+        finally:
+            for server in servers:
+                server.close()
+
+        assert validations == ["jwt"]
+        assert sessions == [(0, player_id), (1, player_id)]
+        assert websocket.sent == [b"welcome"]
+        assert websocket.close_code == status.WS_1000_NORMAL_CLOSURE
+
+
+class FakeRelayChannel:
+    """Valkey pub/sub stand-in delivering published envelopes to every relay."""
+
+    def __init__(self):
+        self.relays = []
+        self.published = []
+
+    async def publish(self, message, channel):
+        self.published.append(msgpack.unpackb(message))
+        for relay in self.relays:
+            relay.on_message(PubSubMsg(message=message, channel=channel, pattern=None), None)
+        return len(self.relays)
+
+
+class TestBroadcastRelay:
+    """Messages reach players connected to other map workers."""
+
+    @pytest_asyncio.fixture
+    async def workers(self):
+        """Two workers' connection managers, each with players 1 and 2 of its own."""
+        channel = FakeRelayChannel()
+        managers, relays = [], []
+        for index in range(2):
+            manager = ConnectionManager()
+            relay = BroadcastRelay(channel, manager, index)
+            manager.set_relay(relay)
+            channel.relays.append(relay)
+            managers.append(manager)
+            relays.append(relay)
+        sockets = {}
+        for index, manager in enumerate(managers):
+            for player_id in (10 * index + 1, 10 * index + 2):
+                # No outbound queue: sends go straight to the socket
+                sockets[player_id] = FakeClientWebSocket(b"")
+                manager.connections_by_map[f"map_{index}"][player_id] = sockets[player_id]
+                manager.player_to_map[player_id] = f"map_{index}"
+        return channel, managers, relays, sockets
+
+    @staticmethod
+    async def _delivered(relays):
+        await asyncio.sleep(0)
+        await asyncio.gather(*(task for relay in relays for task in relay._tasks))
+
+    @pytest.mark.asyncio
+    async def test_broadcast_to_all_reaches_every_worker_once(self, workers):
+        channel, managers, relays, sockets = workers
+
+        await managers[0].broadcast_to_all(b"hello")
+        await self._delivered(relays)
+
+        assert {player_id: ws.sent for player_id, ws in sockets.items()} == {
+            1: [b"hello"], 2: [b"hello"], 11: [b"hello"], 12: [b"hello"],
+        }
+        assert channel.published == [{"origin": 0, "players": None, "message": b"hello"}]
+
+    @pytest.mark.asyncio
+    async def test_personal_message_to_other_worker(self, workers):
+        channel, managers, relays, sockets = workers
+
+        assert not await managers[0].send_personal_message(11, b"tick")
+        assert channel.published == []
+
+        assert await managers[0].send_personal_message(11, b"dm", relay=True)
+        await self._delivered(relays)
+
+        assert sockets[11].sent == [b"dm"]
+        assert all(not sockets[player_id].sent for player_id in (1, 2, 12))
+
+    @pytest.mark.asyncio
+    async def test_only_remote_players_are_relayed(self, workers):
+        channel, managers, relays, sockets = workers
+
+        await managers[0].broadcast_to_players([1, 12], b"notice", relay=True)
+        await self._delivered(relays)
+
+        assert sockets[1].sent == [b"notice"]
+        assert sockets[12].sent == [b"notice"]
+        assert [envelope["players"] for envelope in channel.published] == [[12]]
+
+    @pytest.mark.asyncio
+    async def test_relayed_messages_are_not_relayed_again(self, workers):
+        channel, managers, relays, sockets = workers
+        envelope = msgpack.packb({"origin": 1, "players": None, "message": b"hi"})
+
+        message = PubSubMsg(message=envelope, channel=BROADCAST_RELAY_CHANNEL, pattern=None)
+        relays[0].on_message(message, None)
+        await self._delivered(relays)
+
+        assert sockets[1].sent == [b"hi"] and sockets[2].sent == [b"hi"]
+        assert not sockets[11].sent
+        assert channel.published == []
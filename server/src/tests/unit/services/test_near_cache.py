@@ -0,0 +1,138 @@
+"""
+Unit tests for the in-process near-cache and its use by the managers.
+"""
+
+import pytest
+import pytest_asyncio
+
+from server.src.services.game_state import near_cache as near_cache_module
+from server.src.services.game_state.near_cache import (
+    NEAR_CACHE_CHANNEL,
+    NearCache,
+    NearCacheNamespace,
+    encode_invalidation,
+    get_near_cache,
+    reset_near_cache,
+)
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+from server.src.services.game_state.reference_data_manager import ReferenceDataManager
+
+
+@pytest.fixture(autouse=True)
+def fresh_near_cache():
+    reset_near_cache()
+    yield
+    reset_near_cache()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(near_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestNearCache:
+    """TTL, size limit and invalidation of one namespace."""
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = NearCache()
+        cache.configure("names", NearCacheNamespace(ttl=10, max_size=10))
+        cache.store("names", 1, "alice")
+
+        assert cache.lookup("names", 1) == (True, "alice")
+        clock[0] += 10
+        assert cache.lookup("names", 1) == (False, None)
+        assert cache.size("names") == 0
+
+    def test_least_recently_used_is_evicted(self, clock):
+        cache = NearCache()
+        cache.configure("names", NearCacheNamespace(ttl=10, max_size=2))
+        cache.store("names", 1, "alice")
+        cache.store("names", 2, "bob")
+        cache.lookup("names", 1)
+
+        cache.store("names", 3, "carol")
+
+        assert cache.lookup("names", 2) == (False, None)
+        assert cache.lookup("names", 1) == (True, "alice")
+
+    def test_unconfigured_namespace_is_not_cached(self):
+        cache = NearCache()
+        cache.store("names", 1, "alice")
+
+        assert cache.lookup("names", 1) == (False, None)
+
+    def test_invalidation_messages(self):
+        cache = NearCache()
+        cache.configure("names", NearCacheNamespace(ttl=10, max_size=10))
+        cache.store("names", 1, "alice")
+        cache.store("names", 2, "bob")
+
+        cache.handle_message(encode_invalidation("names", 1).encode())
+        assert cache.lookup("names", 1) == (False, None)
+        assert cache.lookup("names", 2) == (True, "bob")
+
+        cache.handle_message(b"not json")
+        cache.handle_message(encode_invalidation("names"))
+        assert cache.size("names") == 0
+
+
+class TestManagerNearCache:
+    """Managers serve cold lookups from the near-cache."""
+
+    @pytest_asyncio.fixture
+    async def ref_mgr(self, fake_valkey):
+        manager = ReferenceDataManager(valkey_client=fake_valkey)
+        await manager.cache_entity_definitions({"GOBLIN": {"id": 7, "name": "GOBLIN"}})
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_entity_definition_is_served_from_memory(self, ref_mgr, fake_valkey):
+        assert (await ref_mgr.get_entity_definition_by_id(7))["name"] == "GOBLIN"
+
+        await fake_valkey.delete(["ref:entity_defs"])
+
+        assert (await ref_mgr.get_entity_definition_by_id(7))["name"] == "GOBLIN"
+        assert await ref_mgr.get_entity_definition_by_id(8) is None
+
+    @pytest.mark.asyncio
+    async def test_recaching_definitions_invalidates_everywhere(self, ref_mgr, fake_valkey):
+        await ref_mgr.get_entity_definition_by_id(7)
+
+        await ref_mgr.cache_entity_definitions({"GOBLIN": {"id": 7, "name": "GOBLIN_KING"}})
+
+        assert (await ref_mgr.get_entity_definition_by_id(7))["name"] == "GOBLIN_KING"
+        assert fake_valkey.published[-1] == (
+            NEAR_CACHE_CHANNEL,
+            encode_invalidation("entity_definitions"),
+        )
+
+    @pytest.mark.asyncio
+    async def test_username_is_cached_but_missing_player_is_not(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+        assert await player_mgr.get_username_for_player(3) is None
+
+        await fake_valkey.hset("player:3", {"username": "alice"})
+        assert await player_mgr.get_username_for_player(3) == "alice"
+
+        await fake_valkey.delete(["player:3"])
+        assert await player_mgr.get_username_for_player(3) == "alice"
+        assert get_near_cache().size("usernames") == 1
+
+    @pytest.mark.asyncio
+    async def test_roles_are_read_from_the_database_every_time(self, fake_valkey, monkeypatch):
+        from server.src.core.constants import PlayerRole
+
+        player_mgr = PlayerStateManager(valkey=fake_valkey, session_factory=object())
+        roles = iter([PlayerRole.ADMIN, PlayerRole.PLAYER])
+
+        async def load_role(player_id):
+            return next(roles)
+
+        monkeypatch.setattr(player_mgr, "_load_role", load_role)
+
+        assert await player_mgr.get_player_role(3) == PlayerRole.ADMIN
+        # Demoted in the database: applies on the next check
+        assert await player_mgr.get_player_role(3) == PlayerRole.PLAYER
+        assert get_near_cache().size("player_roles") == 0
@@ -0,0 +1,75 @@
+"""
+Unit tests for the online player indexes kept by PlayerStateManager.
+"""
+
+import pytest
+import pytest_asyncio
+
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+
+
+@pytest_asyncio.fixture
+async def player_mgr(fake_valkey):
+    return PlayerStateManager(valkey=fake_valkey)
+
+
+async def _login(player_mgr, player_id, map_id="samplemap"):
+    await player_mgr.register_online_player(player_id, f"player{player_id}")
+    await player_mgr.set_player_full_state(
+        player_id, {"x": 1, "y": 1, "map_id": map_id, "current_hp": 10, "max_hp": 10}
+    )
+
+
+class TestOnlinePlayerIndex:
+    """Register, map changes and logout keep both indexes in step."""
+
+    @pytest.mark.asyncio
+    async def test_register_adds_to_global_and_map_index(self, player_mgr):
+        await _login(player_mgr, 1)
+        await _login(player_mgr, 2, map_id="othermap")
+
+        assert sorted(await player_mgr.get_all_online_player_ids()) == [1, 2]
+        assert await player_mgr.get_online_player_ids_on_map("samplemap") == [1]
+        assert await player_mgr.get_active_player_count() == 2
+        assert await player_mgr.is_online(2)
+
+    @pytest.mark.asyncio
+    async def test_map_change_moves_player(self, player_mgr):
+        await _login(player_mgr, 1)
+
+        await player_mgr.set_player_position(1, 5, 5, "othermap")
+
+        assert await player_mgr.get_online_player_ids_on_map("samplemap") == []
+        assert await player_mgr.get_online_player_ids_on_map("othermap") == [1]
+
+    @pytest.mark.asyncio
+    async def test_logout_removes_player(self, player_mgr):
+        await _login(player_mgr, 1)
+        await _login(player_mgr, 2)
+
+        await player_mgr.cleanup_player(1)
+        await player_mgr.unregister_online_player(2)
+
+        assert await player_mgr.get_all_online_player_ids() == []
+        assert await player_mgr.get_online_player_ids_on_map("samplemap") == []
+        assert not await player_mgr.is_online(1)
+
+    @pytest.mark.asyncio
+    async def test_cached_state_alone_is_not_online(self, player_mgr, fake_valkey):
+        await fake_valkey.hset("player:9", {"x": "1", "y": "1", "map_id": "samplemap"})
+
+        assert await player_mgr.get_all_online_player_ids() == []
+        assert not await player_mgr.is_online(9)
+
+    @pytest.mark.asyncio
+    async def test_clear_online_players_for_owned_maps(self, player_mgr):
+        await _login(player_mgr, 1)
+        await _login(player_mgr, 2, map_id="othermap")
+
+        # A restarted map worker only clears its own maps
+        await PlayerStateManager(valkey=player_mgr.valkey).clear_online_players(["samplemap"])
+        assert await player_mgr.get_all_online_player_ids() == [2]
+
+        await PlayerStateManager(valkey=player_mgr.valkey).clear_online_players()
+        assert await player_mgr.get_all_online_player_ids() == []
+        assert await player_mgr.get_online_player_ids_on_map("othermap") == []
@@ -0,0 +1,132 @@
+"""
+Unit tests for per-connection outbound queues.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from server.src.api.outbound_queue import OutboundQueue, OutboundQueuePolicy
+from server.src.services.visibility_service import STALE_VERSION, VisibilityService
+
+
+def _queue(policy, max_messages=3, websocket=None, on_failure=None):
+    return OutboundQueue(
+        websocket or AsyncMock(),
+        player_id=1,
+        max_messages=max_messages,
+        policy=policy,
+        on_failure=on_failure or AsyncMock(),
+    )
+
+
+def _payloads(queue):
+    return [message.data for message in queue._queue]
+
+
+class TestOutboundQueue:
+    """Tests for full-queue policies and the writer task."""
+
+    @pytest.mark.asyncio
+    async def test_drop_stale_sheds_oldest_state_update(self):
+        dropped = []
+        queue = _queue(OutboundQueuePolicy.DROP_STALE)
+
+        queue.enqueue(b"event1")
+        queue.enqueue(b"state1", droppable=True, on_drop=lambda: dropped.append("state1"))
+        queue.enqueue(b"state2", droppable=True)
+        assert queue.enqueue(b"event2")
+
+        assert _payloads(queue) == [b"event1", b"state2", b"event2"]
+        assert dropped == ["state1"]
+
+    @pytest.mark.asyncio
+    async def test_drop_stale_disconnects_when_only_events_are_queued(self):
+        on_failure = AsyncMock()
+        queue = _queue(OutboundQueuePolicy.DROP_STALE, max_messages=2, on_failure=on_failure)
+        queue.enqueue(b"event1")
+        queue.enqueue(b"event2")
+
+        assert not queue.enqueue(b"state", droppable=True)
+        assert not queue.closed
+
+        assert not queue.enqueue(b"event3")
+        await asyncio.sleep(0)
+
+        assert queue.closed
+        on_failure.assert_awaited_once_with(1, queue.websocket)
+
+    @pytest.mark.asyncio
+    async def test_coalesce_keeps_only_latest_state_update(self):
+        dropped = []
+        queue = _queue(OutboundQueuePolicy.COALESCE, max_messages=10)
+
+        queue.enqueue(b"state1", droppable=True, on_drop=lambda: dropped.append(1))
+        queue.enqueue(b"event")
+        queue.enqueue(b"state2", droppable=True, on_drop=lambda: dropped.append(2))
+        queue.enqueue(b"state3", droppable=True)
+
+        assert _payloads(queue) == [b"event", b"state3"]
+        assert dropped == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_fails_when_full(self):
+        on_failure = AsyncMock()
+        queue = _queue(OutboundQueuePolicy.DISCONNECT, max_messages=1, on_failure=on_failure)
+        queue.enqueue(b"state", droppable=True)
+
+        assert not queue.enqueue(b"state", droppable=True)
+        await asyncio.sleep(0)
+
+        on_failure.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_writer_sends_in_order(self):
+        websocket = AsyncMock()
+        queue = _queue(OutboundQueuePolicy.DROP_STALE, websocket=websocket)
+        queue.start()
+
+        queue.enqueue(b"a")
+        queue.enqueue(b"b", droppable=True)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        await queue.close()
+
+        assert [call.args[0] for call in websocket.send_bytes.await_args_list] == [b"a", b"b"]
+
+    @pytest.mark.asyncio
+    async def test_send_failure_reports_connection(self):
+        websocket = AsyncMock()
+        websocket.send_bytes.side_effect = RuntimeError("closed")
+        on_failure = AsyncMock()
+        queue = _queue(OutboundQueuePolicy.DROP_STALE, websocket=websocket, on_failure=on_failure)
+        queue.start()
+
+        queue.enqueue(b"a")
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert queue.closed
+        on_failure.assert_awaited_once_with(1, websocket)
+        assert not queue.enqueue(b"b")
+
+
+class TestVisibilityResync:
+    """Tests for resynchronising a player after a dropped update."""
+
+    @pytest.mark.asyncio
+    async def test_next_diff_resends_visible_and_removed_entities(self):
+        service = VisibilityService(max_cache_size=10)
+        entity_a = {"id": "a", "x": 1}
+        entity_b = {"id": "b", "x": 2}
+        await service.update_player_visible_entities(1, {"a": entity_a, "b": entity_b})
+        dropped = await service.update_player_visible_entities(1, {"a": entity_a})
+
+        service.mark_resync(1, [e["id"] for e in dropped["removed"]])
+        assert set((await service.get_player_visible_entities(1)).values()) == {STALE_VERSION}
+
+        diff = await service.update_player_visible_entities(1, {"a": entity_a})
+
+        assert diff["updated"] == [entity_a]
+        assert diff["removed"] == [{"id": "b"}]
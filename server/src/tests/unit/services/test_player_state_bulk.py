@@ -0,0 +1,90 @@
+"""
+Unit tests for PlayerStateManager multi-player getters.
+"""
+
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+
+
+@pytest_asyncio.fixture
+async def player_mgr(fake_valkey):
+    await fake_valkey.hset(
+        "player:1",
+        {"username": "alice", "x": "3", "y": "4", "map_id": "samplemap", "current_hp": "8", "max_hp": "10"},
+    )
+    await fake_valkey.hset(
+        "player:2",
+        {"username": "bob", "x": "7", "y": "9", "map_id": "samplemap", "current_hp": "0", "max_hp": "12"},
+    )
+    player_mgr = PlayerStateManager(valkey=fake_valkey)
+    await player_mgr.register_online_player(1, "alice")
+    await player_mgr.register_online_player(2, "bob")
+    return player_mgr
+
+
+class TestPlayerStateManagerBulk:
+    """Tests for get_many_* and attach_hot_states."""
+
+    @pytest.mark.asyncio
+    async def test_get_many_full_states_omits_unknown_players(self, player_mgr):
+        states = await player_mgr.get_many_full_states([1, 2, 3])
+
+        assert set(states.keys()) == {1, 2}
+        assert states[1]["username"] == "alice"
+        assert states[2]["x"] == 7
+
+    @pytest.mark.asyncio
+    async def test_get_many_full_states_prefers_hot_store(self, player_mgr):
+        await player_mgr.attach_hot_state(1)
+        await player_mgr.set_player_position(1, 20, 21, "samplemap")
+
+        states = await player_mgr.get_many_full_states([1, 2])
+
+        assert (states[1]["x"], states[1]["y"]) == (20, 21)
+        assert states[2]["x"] == 7
+
+    @pytest.mark.asyncio
+    async def test_get_many_positions_matches_single_getter(self, player_mgr):
+        positions = await player_mgr.get_many_positions([1, 2])
+
+        for player_id in (1, 2):
+            assert positions[player_id] == await player_mgr.get_player_position(player_id)
+
+    @pytest.mark.asyncio
+    async def test_get_many_hp(self, player_mgr):
+        hp = await player_mgr.get_many_hp([1, 2])
+
+        assert hp == {
+            1: {"current_hp": 8, "max_hp": 10},
+            2: {"current_hp": 0, "max_hp": 12},
+        }
+
+    @pytest.mark.asyncio
+    async def test_attach_hot_states_skips_players_without_state(self, player_mgr):
+        attached = await player_mgr.attach_hot_states([1, 2, 3])
+
+        assert attached == [1, 2]
+        assert not player_mgr.hot_store.is_attached(3)
+
+    @pytest.mark.asyncio
+    async def test_player_logging_out_during_load_is_not_attached(self, player_mgr):
+        get_many_from_valkey = player_mgr._get_many_from_valkey
+
+        async def logout_during_read(keys):
+            results = await get_many_from_valkey(keys)
+            # Player 1 disconnects while the batched read is in flight
+            await player_mgr.cleanup_player(1)
+            return results
+
+        with patch.object(player_mgr, "_get_many_from_valkey", logout_during_read):
+            attached = await player_mgr.attach_hot_states([1, 2])
+
+        assert attached == [2]
+        assert not player_mgr.hot_store.is_attached(1)
+        assert not await player_mgr.is_online(1)
+        assert player_mgr.spatial_index.get_position(1) is None
+        assert player_mgr.spatial_index.get_position(2) is not None
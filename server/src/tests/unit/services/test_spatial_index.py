@@ -0,0 +1,85 @@
+"""
+Unit tests for the chunk-bucketed spatial index and the manager queries built on it.
+"""
+
+import pytest
+
+from server.src.services.game_state.ground_item_manager import GroundItemManager
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+from server.src.services.game_state.spatial_index import SpatialIndex
+
+
+class TestSpatialIndex:
+    """Tests for bucketing and radius queries."""
+
+    def test_query_spans_chunk_boundaries(self):
+        index = SpatialIndex(chunk_size=16)
+        index.update("a", "map", 15, 15)
+        index.update("b", "map", 16, 16)
+        index.update("c", "map", 40, 40)
+
+        assert sorted(index.query_radius("map", 15, 15, 1)) == ["a", "b"]
+
+    def test_query_is_exact_and_per_map(self):
+        index = SpatialIndex(chunk_size=16)
+        index.update("near", "map", 10, 10)
+        index.update("edge", "map", 13, 7)
+        index.update("outside", "map", 14, 10)
+        index.update("other_map", "elsewhere", 10, 10)
+
+        assert sorted(index.query_radius("map", 10, 10, 3)) == ["edge", "near"]
+
+    def test_update_moves_between_chunks_and_maps(self):
+        index = SpatialIndex(chunk_size=16)
+        index.update(1, "map", 0, 0)
+
+        index.update(1, "map", 100, 100)
+        assert index.query_radius("map", 0, 0, 5) == []
+        assert index.query_radius("map", 100, 100, 0) == [1]
+
+        index.update(1, "dungeon", 100, 100)
+        assert index.query_radius("map", 100, 100, 5) == []
+        assert index.keys_on_map("dungeon") == [1]
+
+    def test_remove_drops_empty_buckets(self):
+        index = SpatialIndex(chunk_size=16)
+        index.update(1, "map", 3, 3)
+
+        index.remove(1)
+        index.remove(2)
+
+        assert 1 not in index
+        assert index.query_radius("map", 3, 3, 16) == []
+        assert index.keys_on_map("map") == []
+
+
+class TestManagerProximityQueries:
+    """Tests for manager-maintained indexes."""
+
+    @pytest.mark.asyncio
+    async def test_player_index_follows_position_writes(self, fake_valkey):
+        player_mgr = PlayerStateManager(valkey=fake_valkey)
+
+        await player_mgr.set_player_position(1, 10, 10, "samplemap")
+        await player_mgr.set_player_full_state(2, {"x": 50, "y": 50, "map_id": "samplemap"})
+        assert sorted(player_mgr.get_player_ids_near("samplemap", 12, 12, 5)) == [1]
+
+        await player_mgr.set_player_position(2, 11, 11, "samplemap")
+        assert sorted(player_mgr.get_player_ids_near("samplemap", 12, 12, 5)) == [1, 2]
+
+        await player_mgr.unregister_online_player(1)
+        assert player_mgr.get_player_ids_near("samplemap", 12, 12, 5) == [2]
+
+    @pytest.mark.asyncio
+    async def test_ground_items_near_skips_far_and_removed_items(self, fake_valkey):
+        ground_item_mgr = GroundItemManager(valkey_client=fake_valkey)
+
+        near_id = await ground_item_mgr.add_ground_item("samplemap", 5, 5, item_id=1, quantity=1, durability=1.0)
+        await ground_item_mgr.add_ground_item("samplemap", 90, 90, item_id=2, quantity=1, durability=1.0)
+        removed_id = await ground_item_mgr.add_ground_item("samplemap", 6, 6, item_id=3, quantity=1, durability=1.0)
+        await ground_item_mgr.remove_ground_item(removed_id, "samplemap")
+
+        items = await ground_item_mgr.get_ground_items_near("samplemap", 0, 0, 32)
+
+        assert [item["ground_item_id"] for item in items] == [near_id]
+        assert items[0]["x"] == 5
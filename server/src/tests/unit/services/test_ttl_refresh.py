@@ -0,0 +1,123 @@
+"""
+Unit tests for lazy TTL refresh on game state reads.
+"""
+
+import pytest
+import pytest_asyncio
+
+from server.src.core.metrics import valkey_ttl_refreshes_skipped_total
+from server.src.services.game_state import ttl_refresh as ttl_refresh_module
+from server.src.services.game_state.base_manager import TIER1_TTL
+from server.src.services.game_state.entity_manager import EntityManager
+from server.src.services.game_state.player_state_manager import PlayerStateManager
+from server.src.services.game_state.ttl_refresh import TtlRefreshTracker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_refresh_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def expires(fake_valkey, monkeypatch):
+    """Keys passed to EXPIRE, directly or in a batch."""
+    sent = []
+    original = fake_valkey.expire
+
+    async def expire(key, seconds):
+        sent.append(key)
+        return await original(key, seconds)
+
+    monkeypatch.setattr(fake_valkey, "expire", expire)
+    return sent
+
+
+class TestTtlRefreshTracker:
+    """Refresh windows per key."""
+
+    def test_refresh_is_due_once_per_window(self, clock):
+        tracker = TtlRefreshTracker(window=60)
+
+        assert tracker.is_due("player:1", 3600)
+        tracker.note_refreshed("player:1", 3600)
+        assert not tracker.is_due("player:1", 3600)
+
+        clock[0] += 60
+        assert tracker.is_due("player:1", 3600)
+
+    def test_window_is_capped_at_half_the_ttl(self, clock):
+        tracker = TtlRefreshTracker(window=60)
+        tracker.note_refreshed("entity_instance:1", 30)
+
+        clock[0] += 15
+        assert tracker.is_due("entity_instance:1", 30)
+
+    def test_permanent_keys_are_never_refreshed(self):
+        tracker = TtlRefreshTracker(window=60)
+
+        assert not tracker.is_due("ref:items", 0)
+
+    def test_skipped_refreshes_are_counted(self):
+        tracker = TtlRefreshTracker(window=60)
+        tracker.note_refreshed("skills:1", 900)
+        skipped = valkey_ttl_refreshes_skipped_total.labels(key_type="skills")
+        before = skipped._value.get()
+
+        tracker.is_due("skills:1", 900)
+
+        assert skipped._value.get() == before + 1
+
+
+class TestLazyRefreshOnReads:
+    """Manager reads only send EXPIRE when the key is due."""
+
+    @pytest_asyncio.fixture
+    async def player_mgr(self, fake_valkey, clock):
+        manager = PlayerStateManager(valkey=fake_valkey)
+        for player_id in (1, 2):
+            await manager._cache_in_valkey(
+                f"player:{player_id}", {"x": player_id, "y": 1, "map_id": "samplemap"}, TIER1_TTL
+            )
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_skip_refresh(self, player_mgr, expires):
+        expires.clear()
+
+        # Caching set the TTL, so reads within the window skip EXPIRE
+        for _ in range(3):
+            assert await player_mgr.get_player_full_state(1) is not None
+            assert len(await player_mgr.get_many_full_states([1, 2])) == 2
+        assert expires == []
+
+    @pytest.mark.asyncio
+    async def test_due_read_refreshes_in_same_batch(self, player_mgr, expires, clock):
+        expires.clear()
+        clock[0] += TIER1_TTL
+
+        state = await player_mgr.get_player_full_state(1)
+        await player_mgr.get_player_full_state(1)
+        await player_mgr.get_many_full_states([1, 2])
+
+        assert state["x"] == 1
+        assert expires == ["player:1", "player:2"]
+
+    @pytest.mark.asyncio
+    async def test_missing_key_is_not_probed_every_read(self, player_mgr, expires):
+        for _ in range(3):
+            assert await player_mgr.get_player_full_state(404) is None
+
+        assert expires == ["player:404"]
+
+    @pytest.mark.asyncio
+    async def test_permanent_keys_skip_refresh(self, fake_valkey, expires):
+        entity_mgr = EntityManager(valkey_client=fake_valkey)
+        instance_id = await entity_mgr.spawn_entity_instance(
+            entity_id=2, map_id="samplemap", x=3, y=4, current_hp=10, max_hp=10
+        )
+
+        await entity_mgr.get_entity_instance(instance_id)
+
+        assert expires == []
@@ -0,0 +1,116 @@
+"""
+Unit tests for batched manager writes (unit of work and bulk helpers).
+"""
+
+import pytest
+import pytest_asyncio
+
+from server.src.services.game_state.entity_manager import EntityManager
+from server.src.services.game_state.ground_item_manager import GroundItemManager
+from server.src.services.game_state.unit_of_work import current_unit_of_work, unit_of_work
+
+
+@pytest_asyncio.fixture
+async def entity_mgr(fake_valkey):
+    return EntityManager(valkey_client=fake_valkey)
+
+
+async def _spawn(entity_mgr, x=3, y=4):
+    return await entity_mgr.spawn_entity_instance(
+        entity_id=2, map_id="samplemap", x=x, y=y, current_hp=10, max_hp=10
+    )
+
+
+class TestUnitOfWork:
+    """Writes inside a unit of work are queued and sent on exit."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_sent_on_exit(self, entity_mgr, fake_valkey):
+        instance_id = await _spawn(entity_mgr)
+        key = f"entity_instance:{instance_id}"
+
+        async with unit_of_work(fake_valkey) as unit:
+            await entity_mgr.update_entity_hp(instance_id, 4)
+            assert len(unit) == 1
+            assert fake_valkey.get_hash_data(key)["current_hp"] == "10"
+
+        assert current_unit_of_work() is None
+        assert fake_valkey.get_hash_data(key)["current_hp"] == "4"
+
+    @pytest.mark.asyncio
+    async def test_reads_see_pending_writes(self, entity_mgr, fake_valkey):
+        instance_id = await _spawn(entity_mgr)
+
+        async with unit_of_work(fake_valkey):
+            await entity_mgr.set_entity_state(instance_id, "wander")
+            await entity_mgr.update_entity_position(instance_id, 5, 6, "LEFT")
+
+            entity = await entity_mgr.get_entity_instance(instance_id)
+            assert (entity["state"], entity["x"], entity["facing_direction"]) == ("wander", 5, "LEFT")
+
+    @pytest.mark.asyncio
+    async def test_pending_delete_hides_hash(self, entity_mgr, fake_valkey):
+        instance_id = await _spawn(entity_mgr)
+        key = f"entity_instance:{instance_id}"
+
+        async with unit_of_work(fake_valkey):
+            await entity_mgr._delete_from_valkey(key)
+            assert await entity_mgr.get_entity_instance(instance_id) is None
+            assert await entity_mgr.get_entity_instances([instance_id]) == {}
+            # Writes to a deleted entity are skipped rather than recreating it
+            await entity_mgr.update_entity_hp(instance_id, 1)
+
+        assert fake_valkey.get_hash_data(key) == {}
+
+    @pytest.mark.asyncio
+    async def test_nested_unit_joins_outer(self, fake_valkey):
+        async with unit_of_work(fake_valkey) as outer:
+            async with unit_of_work(fake_valkey) as inner:
+                assert inner is outer
+
+    @pytest.mark.asyncio
+    async def test_queued_writes_are_sent_if_block_raises(self, entity_mgr, fake_valkey):
+        instance_id = await _spawn(entity_mgr)
+
+        with pytest.raises(RuntimeError):
+            async with unit_of_work(fake_valkey):
+                await entity_mgr.update_entity_hp(instance_id, 7)
+                raise RuntimeError("AI failed")
+
+        assert fake_valkey.get_hash_data(f"entity_instance:{instance_id}")["current_hp"] == "7"
+
+
+class TestBulkHelpers:
+    """Bulk variants fetch and write several hashes at once."""
+
+    @pytest.mark.asyncio
+    async def test_update_entity_positions(self, entity_mgr):
+        first = await _spawn(entity_mgr)
+        second = await _spawn(entity_mgr)
+
+        await entity_mgr.update_entity_positions({first: (7, 7, "UP"), second: (8, 9, "DOWN"), 999: (1, 1, "UP")})
+
+        entities = await entity_mgr.get_entity_instances([first, second, 999])
+        assert sorted(entities) == [first, second]
+        assert (entities[second]["x"], entities[second]["y"]) == (8, 9)
+        assert entity_mgr.get_entity_ids_near("samplemap", 7, 7, 0) == [first]
+
+    @pytest.mark.asyncio
+    async def test_partial_writes_keep_other_fields(self, entity_mgr, fake_valkey):
+        instance_id = await _spawn(entity_mgr)
+
+        await entity_mgr.update_entity_hp(instance_id, 2)
+
+        stored = fake_valkey.get_hash_data(f"entity_instance:{instance_id}")
+        assert stored["current_hp"] == "2"
+        assert stored["x"] == "3"
+
+    @pytest.mark.asyncio
+    async def test_get_ground_items(self, fake_valkey):
+        ground_item_mgr = GroundItemManager(valkey_client=fake_valkey)
+        await fake_valkey.hset("ground_item:1", {"ground_item_id": "1", "map_id": "samplemap", "x": "2", "y": "3"})
+
+        items = await ground_item_mgr.get_ground_items([1, 2])
+
+        assert list(items) == [1]
+        assert items[1]["x"] == 2
@@ -0,0 +1,136 @@
+"""
+Unit tests for compound game state writes run as Valkey functions.
+"""
+
+import pytest
+import pytest_asyncio
+
+from server.src.services.game_state.base_manager import TIER1_TTL
+from server.src.services.game_state.ground_item_manager import (
+    DIRTY_GROUND_ITEMS_KEY,
+    GROUND_ITEMS_DELETE_KEY,
+    GroundItemManager,
+)
+from server.src.services.game_state.inventory_manager import (
+    DIRTY_INVENTORY_KEY,
+    InventoryManager,
+)
+from server.src.services.game_state.player_state_manager import (
+    DIRTY_POSITIONS_KEY,
+    PlayerStateManager,
+)
+from server.src.services.game_state.valkey_functions import (
+    LIBRARY_CODE,
+    load_valkey_functions,
+)
+
+
+class TestLibraryLoading:
+    """The function library is loaded once per version."""
+
+    @pytest.mark.asyncio
+    async def test_loads_only_when_missing(self, fake_valkey):
+        assert await load_valkey_functions(fake_valkey)
+        assert fake_valkey.loaded_libraries["rpg"] == LIBRARY_CODE
+
+        assert not await load_valkey_functions(fake_valkey)
+
+    @pytest.mark.asyncio
+    async def test_managers_reload_a_lost_library(self, fake_valkey):
+        manager = InventoryManager(valkey_client=fake_valkey)
+
+        await manager.set_inventory_slot(1, 0, item_id=5, quantity=1, durability=1.0)
+
+        assert "rpg" in fake_valkey.loaded_libraries
+        assert fake_valkey.get_hash_data("inventory:1").keys() == {"0"}
+
+
+class TestCompoundWrites:
+    """Writes, TTLs and dirty marks happen in one call."""
+
+    @pytest_asyncio.fixture
+    async def inventory_mgr(self, fake_valkey):
+        await load_valkey_functions(fake_valkey)
+        manager = InventoryManager(valkey_client=fake_valkey)
+        await manager.set_inventory_slot(1, 0, item_id=5, quantity=3, durability=1.0)
+        await manager.set_inventory_slot(1, 1, item_id=6, quantity=1, durability=0.5)
+        fake_valkey._set_data.clear()
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_set_player_hp_only_updates_existing_state(self, fake_valkey):
+        await load_valkey_functions(fake_valkey)
+        manager = PlayerStateManager(valkey=fake_valkey)
+
+        await manager.set_player_hp(1, 10)
+        assert fake_valkey.get_hash_data("player:1") == {}
+
+        await manager._cache_in_valkey("player:1", {"current_hp": 5, "max_hp": 20}, TIER1_TTL)
+        await manager.set_player_hp(1, 10)
+
+        assert (await manager.get_player_full_state(1))["current_hp"] == 10
+        assert fake_valkey.get_set_data(DIRTY_POSITIONS_KEY) == {"1"}
+
+    @pytest.mark.asyncio
+    async def test_move_to_empty_slot(self, inventory_mgr, fake_valkey):
+        assert await inventory_mgr.move_inventory_slot(1, 0, 7)
+
+        inventory = await inventory_mgr.get_inventory(1)
+        assert inventory["7"]["item_id"] == 5
+        assert "0" not in inventory
+        assert fake_valkey.get_set_data(DIRTY_INVENTORY_KEY) == {"1"}
+
+    @pytest.mark.asyncio
+    async def test_move_onto_occupied_slot_swaps(self, inventory_mgr):
+        assert await inventory_mgr.move_inventory_slot(1, 0, 1)
+
+        inventory = await inventory_mgr.get_inventory(1)
+        assert (inventory["0"]["item_id"], inventory["1"]["item_id"]) == (6, 5)
+
+    @pytest.mark.asyncio
+    async def test_move_from_empty_slot_is_rejected(self, inventory_mgr, fake_valkey):
+        assert not await inventory_mgr.move_inventory_slot(1, 9, 0)
+
+        assert fake_valkey.get_set_data(DIRTY_INVENTORY_KEY) == set()
+
+    @pytest.mark.asyncio
+    async def test_delete_slot_marks_dirty(self, inventory_mgr, fake_valkey):
+        await inventory_mgr.delete_inventory_slot(1, 0)
+
+        assert set(await inventory_mgr.get_inventory(1)) == {"1"}
+        assert fake_valkey.get_set_data(DIRTY_INVENTORY_KEY) == {"1"}
+
+
+class TestTakeGroundItem:
+    """Ground items can only be taken once."""
+
+    @pytest_asyncio.fixture
+    async def ground_mgr(self, fake_valkey):
+        await load_valkey_functions(fake_valkey)
+        return GroundItemManager(valkey_client=fake_valkey)
+
+    @pytest.mark.asyncio
+    async def test_only_first_take_gets_the_item(self, ground_mgr, fake_valkey):
+        ground_item_id = await ground_mgr.add_ground_item(
+            item_id=5, map_id="samplemap", x=3, y=4, quantity=2, durability=1.0
+        )
+
+        item = await ground_mgr.take_ground_item(ground_item_id, "samplemap")
+
+        assert item["item_id"] == 5 and item["quantity"] == 2
+        assert await ground_mgr.take_ground_item(ground_item_id, "samplemap") is None
+        assert str(ground_item_id) in fake_valkey.get_set_data(GROUND_ITEMS_DELETE_KEY)
+        assert await ground_mgr.get_ground_item(ground_item_id) is None
+
+    @pytest.mark.asyncio
+    async def test_restore_puts_item_back(self, ground_mgr, fake_valkey):
+        ground_item_id = await ground_mgr.add_ground_item(
+            item_id=5, map_id="samplemap", x=3, y=4, quantity=2, durability=1.0
+        )
+        item = await ground_mgr.take_ground_item(ground_item_id, "samplemap")
+
+        await ground_mgr.restore_ground_item(item)
+
+        assert (await ground_mgr.get_ground_item(ground_item_id))["quantity"] == 2
+        assert str(ground_item_id) not in fake_valkey.get_set_data(GROUND_ITEMS_DELETE_KEY)
+        assert str(ground_item_id) in fake_valkey.get_set_data(DIRTY_GROUND_ITEMS_KEY)